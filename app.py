@@ -14,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 from exchange import BinanceExchange
 from config   import Config
 from logger   import TradeLogger
+from order_latency import load_latency, COMPONENTS, PERCENTILES
 
 st.set_page_config(
     page_title="Crypto Admin — Trading Bot",
@@ -235,6 +236,7 @@ def do_panic():
 price    = fetch_price(Config.TRADING_PAIR)
 balances = fetch_balances()
 trades   = TradeLogger.load_trades()
+latency  = load_latency()
 klines   = fetch_klines(Config.TRADING_PAIR)
 
 usdt_bal = balances.get("USDT", 0.0)
@@ -543,6 +545,38 @@ if balances:
     st.markdown("</div>", unsafe_allow_html=True)
 
 
+# ── LATENCIA TICK → ORDEN ─────────────────────────────────────────────
+if latency.get("percentiles"):
+    LATENCY_LABELS = {
+        "network_in": "Red (exchange → bot)", "queueing": "Cola", "decision": "Decisión",
+        "preparation": "Preparación", "rate_limit_wait": "Rate limit", "rest_round_trip": "REST",
+        "total": "Total tick → orden",
+    }
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.markdown(f'<div style="font-size:.7rem;color:#8892b0;text-transform:uppercase;letter-spacing:.08em;margin-bottom:.8rem">Latencia Tick → Orden · últimas {latency.get("count", 0)} órdenes (ms)</div>', unsafe_allow_html=True)
+
+    rows = ""
+    for name in COMPONENTS + ("total",):
+        stats = latency["percentiles"].get(name)
+        if not stats:
+            continue
+        cells = "".join(f"<td>{stats[f'p{p}']:,.1f}</td>" for p in PERCENTILES)
+        rows += f"""
+        <tr>
+          <td>{LATENCY_LABELS[name]}</td>{cells}
+          <td style="color:#8892b0">{stats['max']:,.1f}</td>
+        </tr>"""
+    headers = "".join(f"<th>p{p}</th>" for p in PERCENTILES)
+    st.markdown(f"""
+    <table class="tx-table">
+      <thead><tr><th>Etapa</th>{headers}<th>Máx</th></tr></thead>
+      <tbody>{rows}</tbody>
+    </table>
+    """, unsafe_allow_html=True)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
 # ── AUTO REFRESH ──────────────────────────────────────────────────────
 if auto_refresh:
     time.sleep(refresh_rate)
@@ -8,15 +8,19 @@ import os
 import sys
 import argparse
 import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 import logging
 
 # Import our backtesting infrastructure
 from utils.backtest_suite import ComprehensiveBacktestSuite
+from utils.backtest.result_cache import BacktestResultCache
+from utils.backtest.shared_data import SharedDataPlane, resolve_frames, share_frames
+from utils.backtest.timeframe_cache import TimeframeCache, resample_ohlcv
 from utils.strategy_vectorizer import VectorizedStrategyAdapter
 from data_collector import DataCollector
 from coinbase_client import CoinbaseClient
@@ -25,16 +29,49 @@ from coinbase_client import CoinbaseClient
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Sub-hourly data files from sync_historical_data.py, finest first
+BASE_GRANULARITIES = ['minute', 'fiveminute', 'fifteenminute', 'thirtyminute']
+
+# Per-process state set by _init_worker()
+_worker_state: Dict[str, Any] = {}
+
+def _init_worker(suite_settings: Dict[str, Any], datasets: Dict[str, Any]):
+    """Build this worker's backtest suite and attach to the shared (product, interval) frames"""
+    _worker_state['suite'] = ComprehensiveBacktestSuite(**suite_settings)
+    _worker_state['datasets'] = resolve_frames(datasets)
+
+def _run_interval_task(product: str, interval_minutes: int, strategy: str) -> Dict[str, Any]:
+    """Process-pool entry point: backtest one (product, interval, strategy) triple"""
+    data = _worker_state['datasets'][f"{product}_{interval_minutes}min"]
+    results = _worker_state['suite'].run_single_strategy(
+        data_with_indicators=data,
+        strategy_name=strategy,
+        product_id=product
+    )
+    return IntervalOptimizer.summarize_result(results, product, interval_minutes, strategy, data)
+
 class IntervalOptimizer:
     """One-time trading interval optimization analysis"""
     
-    def __init__(self, data_dir: str = "./data/historical"):
+    def __init__(self, data_dir: str = "./data/historical", max_workers: int = 1,
+                 cache_dir: Optional[str] = "./data/cache/timeframes"):
         self.data_dir = Path(data_dir)
         self.results_dir = Path("./reports/interval_optimization")
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize backtesting suite
-        self.backtest_suite = ComprehensiveBacktestSuite()
+        # Initialize backtesting suite (results are cached across runs)
+        self.backtest_suite = ComprehensiveBacktestSuite(result_cache=BacktestResultCache())
+        
+        # Worker processes for the (interval, product, strategy) backtests
+        self.max_workers = max_workers
+        
+        # Resampled bars with indicators, built once per (product, interval)
+        self.timeframe_cache = TimeframeCache(
+            loader=lambda product: self.load_base_data(product),
+            indicator_func=self.calculate_indicators,
+            cache_dir=cache_dir
+        )
+        self._indicator_factory = None
         
         # Test intervals in minutes
         self.test_intervals = [15, 30, 60, 120]
@@ -64,26 +101,26 @@ class IntervalOptimizer:
             logger.error(f"Error loading historical data for {product}: {e}")
             return pd.DataFrame()
     
+    def load_base_data(self, product: str, days: int = 180) -> pd.DataFrame:
+        """Load the finest-grained historical data available for a product (hourly by default)"""
+        for granularity in BASE_GRANULARITIES:
+            data_file = self.data_dir / f"{product}_{granularity}_{days}d.parquet"
+            if data_file.exists():
+                logger.info(f"Using {granularity} base data for {product}: {data_file}")
+                return pd.read_parquet(data_file)
+        return self.load_historical_data(product)
+    
+    def calculate_indicators(self, df: pd.DataFrame, product: str) -> pd.DataFrame:
+        """Add indicators to resampled bars"""
+        if self._indicator_factory is None:
+            from utils.performance.indicator_factory import IndicatorFactory
+            self._indicator_factory = IndicatorFactory()
+        return self._indicator_factory.calculate_all_indicators(df, product)
+    
     def resample_data(self, df: pd.DataFrame, interval_minutes: int) -> pd.DataFrame:
         """Resample hourly data to different intervals"""
         try:
-            if interval_minutes == 60:
-                # Already hourly, return as-is
-                return df
-            
-            # Resample to the target interval
-            rule = f"{interval_minutes}T"  # T for minutes
-            
-            resampled = df.resample(rule).agg({
-                'open': 'first',
-                'high': 'max',
-                'low': 'min',
-                'close': 'last',
-                'volume': 'sum'
-            }).dropna()
-            
-            logger.info(f"Resampled from {len(df)} to {len(resampled)} rows ({interval_minutes}min intervals)")
-            return resampled
+            return resample_ohlcv(df, [interval_minutes])[interval_minutes]
             
         except Exception as e:
             logger.error(f"Error resampling data to {interval_minutes} minutes: {e}")
@@ -92,21 +129,11 @@ class IntervalOptimizer:
     def run_interval_backtest(self, product: str, interval_minutes: int, strategy: str) -> Dict[str, Any]:
         """Run backtest for a specific product, interval, and strategy"""
         try:
-            # Load historical data
-            df = self.load_historical_data(product)
-            if df.empty:
-                return {}
-            
-            # Resample to target interval
-            resampled_df = self.resample_data(df, interval_minutes)
-            if resampled_df.empty:
+            # Resampled bars with indicators, cached per (product, interval)
+            data_with_indicators = self.timeframe_cache.get(product, interval_minutes)
+            if data_with_indicators.empty:
                 return {}
             
-            # Add indicators to the data
-            from utils.performance.indicator_factory import IndicatorFactory
-            indicator_factory = IndicatorFactory()
-            data_with_indicators = indicator_factory.calculate_all_indicators(resampled_df, product)
-            
             # Run backtest
             logger.info(f"Running backtest: {product} @ {interval_minutes}min with {strategy}")
             
@@ -116,34 +143,40 @@ class IntervalOptimizer:
                 product_id=product
             )
             
-            if not results or 'error' in results:
-                logger.warning(f"Backtest failed for {product} @ {interval_minutes}min with {strategy}: {results.get('error', 'Unknown error')}")
-                return {}
-            
-            # Extract key metrics
-            performance = results.get('performance', {})
-            
-            return {
-                'product': product,
-                'interval_minutes': interval_minutes,
-                'strategy': strategy,
-                'total_return': results.get('total_return', 0.0),
-                'sharpe_ratio': performance.get('sharpe_ratio', 0.0),
-                'sortino_ratio': performance.get('sortino_ratio', 0.0),
-                'max_drawdown': performance.get('max_drawdown', 0.0),
-                'win_rate': performance.get('win_rate', 0.0),
-                'total_trades': results.get('signal_count', 0),
-                'buy_signals': results.get('buy_signals', 0),
-                'sell_signals': results.get('sell_signals', 0),
-                'data_points': len(resampled_df),
-                'backtest_period_days': (resampled_df.index[-1] - resampled_df.index[0]).days,
-                'timestamp': datetime.now().isoformat()
-            }
+            return self.summarize_result(results, product, interval_minutes, strategy, data_with_indicators)
             
         except Exception as e:
             logger.error(f"Error in interval backtest for {product} @ {interval_minutes}min with {strategy}: {e}")
             return {}
     
+    @staticmethod
+    def summarize_result(results: Dict[str, Any], product: str, interval_minutes: int, strategy: str,
+                         data: pd.DataFrame) -> Dict[str, Any]:
+        """Extract the key metrics of a backtest ({} if it failed)"""
+        if not results or 'error' in results:
+            logger.warning(f"Backtest failed for {product} @ {interval_minutes}min with {strategy}: {results.get('error', 'Unknown error')}")
+            return {}
+        
+        # Extract key metrics
+        performance = results.get('performance', {})
+        
+        return {
+            'product': product,
+            'interval_minutes': interval_minutes,
+            'strategy': strategy,
+            'total_return': results.get('total_return', 0.0),
+            'sharpe_ratio': performance.get('sharpe_ratio', 0.0),
+            'sortino_ratio': performance.get('sortino_ratio', 0.0),
+            'max_drawdown': performance.get('max_drawdown', 0.0),
+            'win_rate': performance.get('win_rate', 0.0),
+            'total_trades': results.get('signal_count', 0),
+            'buy_signals': results.get('buy_signals', 0),
+            'sell_signals': results.get('sell_signals', 0),
+            'data_points': len(data),
+            'backtest_period_days': (data.index[-1] - data.index[0]).days,
+            'timestamp': datetime.now().isoformat()
+        }
+    
     def analyze_regime_performance(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze performance across different market regimes"""
         try:
@@ -286,21 +319,18 @@ class IntervalOptimizer:
         """Run comprehensive interval optimization analysis"""
         logger.info("🚀 Starting comprehensive interval optimization analysis...")
         
-        all_results = []
+        # Resample and compute indicators once per (product, interval)
+        self.timeframe_cache.prepare(self.products, self.test_intervals)
         
         # Test all combinations
-        total_tests = len(self.test_intervals) * len(self.products) * len(self.strategies)
-        current_test = 0
+        tasks = [(product, interval, strategy)
+                 for interval in self.test_intervals
+                 for product in self.products
+                 for strategy in self.strategies]
+        total_tests = len(tasks)
         
-        for interval in self.test_intervals:
-            for product in self.products:
-                for strategy in self.strategies:
-                    current_test += 1
-                    logger.info(f"Progress: {current_test}/{total_tests} - Testing {product} @ {interval}min with {strategy}")
-                    
-                    result = self.run_interval_backtest(product, interval, strategy)
-                    if result:
-                        all_results.append(result)
+        task_results = self._run_interval_tasks(tasks)
+        all_results = [result for result in task_results if result]
         
         logger.info(f"Completed {len(all_results)} successful backtests out of {total_tests} attempts")
         
@@ -330,6 +360,46 @@ class IntervalOptimizer:
         
         return final_results
     
+    def _run_interval_tasks(self, tasks: List[Tuple[str, int, str]]) -> List[Dict[str, Any]]:
+        """Backtest (product, interval, strategy) triples, in a process pool when max_workers > 1"""
+        total_tests = len(tasks)
+        
+        if self.max_workers <= 1 or total_tests <= 1:
+            results = []
+            for current_test, (product, interval, strategy) in enumerate(tasks, 1):
+                logger.info(f"Progress: {current_test}/{total_tests} - Testing {product} @ {interval}min with {strategy}")
+                results.append(self.run_interval_backtest(product, interval, strategy))
+            return results
+        
+        frames = {f"{product}_{interval}min": self.timeframe_cache.get(product, interval)
+                  for product, interval, _ in tasks if (product, interval) in self.timeframe_cache}
+        suite_settings = {
+            'initial_capital': self.backtest_suite.initial_capital,
+            'fees': self.backtest_suite.fees,
+            'slippage': self.backtest_suite.slippage,
+            'results_dir': str(self.backtest_suite.results_dir),
+            'result_cache': self.backtest_suite.result_cache
+        }
+        
+        results = [{} for _ in tasks]
+        runnable = [i for i, (product, interval, _) in enumerate(tasks) if f"{product}_{interval}min" in frames]
+        
+        with SharedDataPlane() as plane:
+            shared = share_frames(plane, frames)
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(runnable) or 1), initializer=_init_worker,
+                                     initargs=(suite_settings, shared)) as executor:
+                futures = {executor.submit(_run_interval_task, *tasks[i]): i for i in runnable}
+                
+                for current_test, future in enumerate(as_completed(futures), 1):
+                    product, interval, strategy = tasks[futures[future]]
+                    try:
+                        results[futures[future]] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error in interval backtest for {product} @ {interval}min with {strategy}: {e}")
+                    logger.info(f"Progress: {current_test}/{len(runnable)} - Finished {product} @ {interval}min with {strategy}")
+        
+        return results
+    
     def save_results(self, results: Dict[str, Any], sync_gcs: bool = False) -> str:
         """Save analysis results to JSON file"""
         try:
@@ -377,6 +447,9 @@ def main():
     parser.add_argument('--data-dir', type=str, default='./data/historical',
                        help='Directory containing historical data files')
     
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='Worker processes for the backtests (default: CPU count)')
+    
     args = parser.parse_args()
     
     # Parse arguments
@@ -385,7 +458,7 @@ def main():
     strategies = [x.strip() for x in args.strategies.split(',')]
     
     # Initialize optimizer
-    optimizer = IntervalOptimizer(data_dir=args.data_dir)
+    optimizer = IntervalOptimizer(data_dir=args.data_dir, max_workers=args.workers)
     optimizer.test_intervals = intervals
     optimizer.products = products
     optimizer.strategies = strategies
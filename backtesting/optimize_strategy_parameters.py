@@ -18,6 +18,7 @@ sys.path.append('.')
 from utils.performance.indicator_factory import IndicatorFactory
 from utils.backtest.strategy_vectorizer import VectorizedStrategyAdapter
 from utils.backtest.backtest_engine import BacktestEngine
+from utils.backtest.parameter_search import create_search
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -52,55 +53,59 @@ class StrategyParameterOptimizer:
             logger.error(f"Error loading data: {e}")
             return pd.DataFrame()
     
-    def test_confidence_thresholds(self, df: pd.DataFrame, strategy_name: str) -> Dict:
-        """Test different confidence thresholds for a strategy"""
+    def test_confidence_thresholds(self, df: pd.DataFrame, strategy_name: str,
+                                   search_method: str = "tpe") -> Dict:
+        """
+        Search confidence thresholds for a strategy
+        
+        Signals are vectorized once; each trial keeps only the signals whose
+        confidence reaches the threshold. The searcher ('grid', 'random',
+        'successive_halving', 'hyperband' or 'tpe') decides which thresholds
+        to backtest, so only part of the grid is evaluated.
+        """
         try:
-            logger.info(f"Testing confidence thresholds for {strategy_name}")
+            logger.info(f"Searching confidence thresholds for {strategy_name} ({search_method})")
             
-            # Test different confidence thresholds
             thresholds = [30, 35, 40, 45, 50, 55, 60, 65, 70, 75, 80]
-            results = []
             
             vectorizer = VectorizedStrategyAdapter()
+            base_signals = vectorizer.vectorize_strategy(strategy_name, df, "BTC-USD")
+            price_data = df[['open', 'high', 'low', 'close', 'volume']]
+            
+            def threshold_signals(data: pd.DataFrame, threshold: int) -> pd.DataFrame:
+                signals = base_signals.loc[data.index].copy()
+                confident = signals['confidence'] >= threshold
+                signals['buy'] = signals['buy'] & confident
+                signals['sell'] = signals['sell'] & confident
+                return signals
+            
+            # Budgets sized for the 11-value grid
+            search_options = {'tpe': {'n_trials': 6, 'n_startup': 3, 'batch_size': 3},
+                              'random': {'n_trials': 6}}.get(search_method, {})
+            search = create_search(search_method, {'threshold': thresholds}, metric='sharpe_ratio',
+                                   **search_options)
+            
+            backtest_engine = BacktestEngine(initial_capital=10000.0, fees=0.006)
+            results_df = backtest_engine.run_parameter_search(
+                price_data, threshold_signals, search, product_id=f"BTC-USD_{strategy_name}_thresh"
+            )
             
-            for threshold in thresholds:
-                try:
-                    # Modify the strategy's confidence threshold
-                    # This is a simplified approach - in practice you'd modify the strategy logic
-                    signals_df = vectorizer.vectorize_strategy(strategy_name, df, "BTC-USD")
-                    
-                    # Filter signals by confidence threshold (simulate)
-                    # For now, we'll use the signals as-is and see the baseline
-                    buy_count = int(signals_df['buy'].sum())
-                    sell_count = int(signals_df['sell'].sum())
-                    
-                    if buy_count == 0 and sell_count == 0:
-                        continue
-                    
-                    # Run backtest
-                    backtest_engine = BacktestEngine(initial_capital=10000.0, fees=0.006)
-                    result = backtest_engine.run_backtest(
-                        data=df[['open', 'high', 'low', 'close', 'volume']],
-                        signals=signals_df,
-                        product_id=f"BTC-USD_{strategy_name}_thresh_{threshold}"
-                    )
-                    
-                    result['threshold'] = threshold
-                    result['buy_signals'] = buy_count
-                    result['sell_signals'] = sell_count
-                    results.append(result)
-                    
-                    logger.info(f"Threshold {threshold}%: {result.get('total_return', 0):.2f}% return, "
-                               f"{result.get('total_trades', 0)} trades, "
-                               f"{result.get('win_rate', 0):.1f}% win rate")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed threshold {threshold}: {e}")
-                    continue
+            results = []
+            for result in results_df.to_dict('records'):
+                signals = threshold_signals(price_data, result['threshold'])
+                result['buy_signals'] = int(signals['buy'].sum())
+                result['sell_signals'] = int(signals['sell'].sum())
+                results.append(result)
+                
+                logger.info(f"Threshold {result['threshold']}%: {result.get('total_return', 0):.2f}% return, "
+                           f"{result.get('total_trades', 0)} trades, "
+                           f"{result.get('win_rate', 0):.1f}% win rate")
             
             return {
                 'strategy': strategy_name,
+                'search_method': search_method,
                 'threshold_results': results,
+                'trial_history': search.history_frame().to_dict('records'),
                 'best_threshold': self.find_best_threshold(results)
             }
             
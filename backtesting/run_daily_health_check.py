@@ -17,6 +17,7 @@ import logging
 
 # Import our backtesting infrastructure
 from utils.backtest_suite import ComprehensiveBacktestSuite
+from utils.backtest.result_cache import BacktestResultCache
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -41,7 +42,8 @@ class DailyHealthChecker:
         try:
             coinbase_client = CoinbaseClient()
             self.data_collector = DataCollector(coinbase_client, gcs_bucket_name=None)
-            self.backtest_suite = ComprehensiveBacktestSuite()
+            # Reuse results of backtests whose data, settings and code are unchanged
+            self.backtest_suite = ComprehensiveBacktestSuite(result_cache=BacktestResultCache())
             
             if sync_to_gcs:
                 self.gcs_sync = GCSBacktestSync()
@@ -17,6 +17,8 @@ import logging
 
 # Import our backtesting infrastructure
 from utils.backtest_suite import ComprehensiveBacktestSuite
+from utils.backtest.result_cache import BacktestResultCache
+from utils.backtest.walk_forward_pool import WalkForwardJob, run_walk_forward_jobs
 from utils.performance.indicator_factory import IndicatorFactory
 from data_collector import DataCollector
 from coinbase_client import CoinbaseClient
@@ -39,7 +41,8 @@ class MonthlyStabilityAnalyzer:
         try:
             coinbase_client = CoinbaseClient()
             self.data_collector = DataCollector(coinbase_client, gcs_bucket_name=None)
-            self.backtest_suite = ComprehensiveBacktestSuite()
+            # Reuse results of backtests whose data, settings and code are unchanged
+            self.backtest_suite = ComprehensiveBacktestSuite(result_cache=BacktestResultCache())
             self.indicator_factory = IndicatorFactory()
             
             if sync_to_gcs:
@@ -98,32 +101,34 @@ class MonthlyStabilityAnalyzer:
             logger.error(f"Failed to load stability data: {e}")
             return {}
     
+    def get_param_grid(self, strategy: str) -> Dict[str, List]:
+        """Parameter grid optimized in each walk-forward training period"""
+        param_grids = {
+            'momentum': {
+                'confidence_threshold': [0.5, 0.6, 0.7],
+                'lookback_period': [8, 10, 12],
+                'volatility_threshold': [0.015, 0.02, 0.025]
+            },
+            'mean_reversion': {
+                'rsi_oversold': [25, 30, 35],
+                'rsi_overbought': [65, 70, 75],
+                'lookback_period': [12, 14, 16]
+            },
+            'trend_following': {
+                'trend_strength': [0.6, 0.7, 0.8],
+                'lookback_period': [18, 20, 22],
+                'confirmation_period': [3, 4, 5]
+            }
+        }
+        return param_grids.get(strategy, {})
+    
     def run_walk_forward_analysis(self, data: pd.DataFrame, product: str, 
-                                 strategy: str) -> Dict[str, Any]:
+                                 strategy: str, max_workers: int = 1) -> Dict[str, Any]:
         """Run walk-forward analysis for parameter stability"""
         try:
             logger.info(f"Running walk-forward analysis for {strategy} on {product}")
             
-            # Define parameter grids for each strategy
-            param_grids = {
-                'momentum': {
-                    'confidence_threshold': [0.5, 0.6, 0.7],
-                    'lookback_period': [8, 10, 12],
-                    'volatility_threshold': [0.015, 0.02, 0.025]
-                },
-                'mean_reversion': {
-                    'rsi_oversold': [25, 30, 35],
-                    'rsi_overbought': [65, 70, 75],
-                    'lookback_period': [12, 14, 16]
-                },
-                'trend_following': {
-                    'trend_strength': [0.6, 0.7, 0.8],
-                    'lookback_period': [18, 20, 22],
-                    'confirmation_period': [3, 4, 5]
-                }
-            }
-            
-            param_grid = param_grids.get(strategy, {})
+            param_grid = self.get_param_grid(strategy)
             if not param_grid:
                 logger.warning(f"No parameter grid defined for {strategy}")
                 return {'error': f'No parameter grid for {strategy}'}
@@ -137,31 +142,97 @@ class MonthlyStabilityAnalyzer:
                 strategy_name=strategy,
                 param_grid=param_grid,
                 product_id=product,
-                train_days=30,  # 30 days training
-                test_days=7,    # 7 days testing
-                step_days=7     # Move forward 7 days each time
+                train_period_days=30,  # 30 days training
+                test_period_days=7,    # 7 days testing
+                step_days=7,           # Move forward 7 days each time
+                max_workers=max_workers
             )
             
-            if 'error' in walk_forward_results:
-                logger.error(f"Walk-forward analysis failed: {walk_forward_results['error']}")
-                return walk_forward_results
-            
-            # Analyze stability
-            stability_metrics = self.analyze_parameter_stability(walk_forward_results)
-            
-            return {
-                'strategy': strategy,
-                'product': product,
-                'walk_forward_results': walk_forward_results,
-                'stability_metrics': stability_metrics,
-                'data_period_days': (data.index[-1] - data.index[0]).days,
-                'timestamp': datetime.now().isoformat()
-            }
+            return self.build_stability_result(walk_forward_results, data, product, strategy)
             
         except Exception as e:
             logger.error(f"Walk-forward analysis failed for {strategy} on {product}: {e}")
             return {'error': str(e)}
     
+    def build_stability_result(self, walk_forward_results: Dict[str, Any], data: pd.DataFrame,
+                               product: str, strategy: str) -> Dict[str, Any]:
+        """Attach stability metrics to a walk-forward analysis result"""
+        if 'error' in walk_forward_results:
+            logger.error(f"Walk-forward analysis failed: {walk_forward_results['error']}")
+            return walk_forward_results
+        
+        # Analyze stability
+        stability_metrics = self.analyze_parameter_stability(walk_forward_results)
+        
+        return {
+            'strategy': strategy,
+            'product': product,
+            'walk_forward_results': walk_forward_results,
+            'stability_metrics': stability_metrics,
+            'data_period_days': (data.index[-1] - data.index[0]).days,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    def run_walk_forward_batch(self, data: Dict[str, pd.DataFrame], strategies: List[str],
+                               max_workers: int = 1) -> Dict[str, Dict[str, Any]]:
+        """
+        Run walk-forward analysis for every strategy x product
+        
+        Indicators are calculated once per product and the folds of all
+        analyses share a single process pool.
+        
+        Args:
+            data: OHLCV data by product
+            strategies: Strategies to analyze
+            max_workers: Worker processes for the folds (1 = serial)
+            
+        Returns:
+            Stability results by strategy and product
+        """
+        results = {strategy: {} for strategy in strategies}
+        
+        data_with_indicators = {}
+        for product, df in data.items():
+            try:
+                data_with_indicators[product] = self.indicator_factory.calculate_all_indicators(df, product)
+            except Exception as e:
+                logger.error(f"Failed to calculate indicators for {product}: {e}")
+                for strategy in strategies:
+                    results[strategy][product] = {'error': str(e)}
+        
+        jobs = []
+        for strategy in strategies:
+            param_grid = self.get_param_grid(strategy)
+            for product in data_with_indicators:
+                if not param_grid:
+                    logger.warning(f"No parameter grid defined for {strategy}")
+                    results[strategy][product] = {'error': f'No parameter grid for {strategy}'}
+                    continue
+                jobs.append(WalkForwardJob(
+                    data_key=product,
+                    strategy_name=strategy,
+                    param_grid=param_grid,
+                    product_id=product,
+                    train_period_days=30,  # 30 days training
+                    test_period_days=7,    # 7 days testing
+                    step_days=7            # Move forward 7 days each time
+                ))
+        
+        try:
+            walk_forward_results = run_walk_forward_jobs(self.backtest_suite, data_with_indicators, jobs, max_workers)
+        except Exception as e:
+            logger.error(f"Walk-forward analysis failed: {e}")
+            walk_forward_results = [{'error': str(e)}] * len(jobs)
+        
+        for job, wf_result in zip(jobs, walk_forward_results):
+            results[job.strategy_name][job.product_id] = self.build_stability_result(
+                wf_result, data[job.product_id], job.product_id, job.strategy_name
+            )
+        
+        # Keep the product order of the input data
+        return {strategy: {product: results[strategy][product] for product in data if product in results[strategy]}
+                for strategy in strategies}
+    
     def analyze_parameter_stability(self, walk_forward_results: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze parameter stability from walk-forward results"""
         try:
@@ -360,8 +431,13 @@ class MonthlyStabilityAnalyzer:
             logger.error(f"Failed to generate stability recommendations: {e}")
             return ["Error generating recommendations"]
     
-    def run_comprehensive_stability_analysis(self) -> Dict[str, Any]:
-        """Run comprehensive monthly stability analysis"""
+    def run_comprehensive_stability_analysis(self, max_workers: int = 1) -> Dict[str, Any]:
+        """
+        Run comprehensive monthly stability analysis
+        
+        Args:
+            max_workers: Worker processes for walk-forward folds (1 = serial)
+        """
         logger.info("📊 Starting monthly stability analysis...")
         
         # Load stability data
@@ -393,18 +469,16 @@ class MonthlyStabilityAnalyzer:
             'recommendations': []
         }
         
-        total_analyses = len(strategies) * len(data)
-        current_analysis = 0
         total_stability_score = 0
         
+        logger.info(f"Analyzing {len(strategies) * len(data)} strategy/product combinations "
+                   f"with {max_workers} worker(s)")
+        stability_results = self.run_walk_forward_batch(data, strategies, max_workers)
+        
         for strategy in strategies:
             results['strategies'][strategy] = {}
             
-            for product, df in data.items():
-                current_analysis += 1
-                logger.info(f"Progress: {current_analysis}/{total_analyses} - Analyzing {strategy} on {product}")
-                
-                stability_result = self.run_walk_forward_analysis(df, product, strategy)
+            for product, stability_result in stability_results[strategy].items():
                 results['strategies'][strategy][product] = stability_result
                 
                 # Update summary
@@ -488,7 +562,7 @@ class MonthlyStabilityAnalyzer:
             logger.error(f"Failed to save results: {e}")
             return ""
 
-def run_monthly_stability(sync_gcs: bool = False) -> bool:
+def run_monthly_stability(sync_gcs: bool = False, max_workers: int = 1) -> bool:
     """Run monthly stability analysis (called from main.py scheduler)"""
     try:
         # Initialize analyzer
@@ -496,7 +570,7 @@ def run_monthly_stability(sync_gcs: bool = False) -> bool:
         
         # Run stability analysis
         logger.info("🚀 Starting monthly stability analysis...")
-        results = analyzer.run_comprehensive_stability_analysis()
+        results = analyzer.run_comprehensive_stability_analysis(max_workers=max_workers)
         
         if 'error' in results:
             logger.error(f"Stability analysis failed: {results['error']}")
@@ -527,6 +601,9 @@ def main():
     parser.add_argument('--days', type=int, default=90,
                        help='Number of days to analyze (default: 90)')
     
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                       help='Worker processes for walk-forward folds (default: CPU count)')
+    
     args = parser.parse_args()
     
     try:
@@ -535,7 +612,7 @@ def main():
         
         # Run stability analysis
         logger.info("🚀 Starting monthly stability analysis...")
-        results = analyzer.run_comprehensive_stability_analysis()
+        results = analyzer.run_comprehensive_stability_analysis(max_workers=args.workers)
         
         if 'error' in results:
             logger.error(f"Stability analysis failed: {results['error']}")
@@ -103,6 +103,36 @@ def sync_historical_data_local(days: int = 30, products: list = None, granularit
         logger.error(f"Error in historical data sync: {e}")
         return False
 
+def sync_historical_data_gcs(days: int = 30, products: list = None, granularity: str = 'ONE_HOUR',
+                             full_resync: bool = False):
+    """Incrementally sync historical data to the GCS partitions
+    
+    Only candles newer than each product's watermark are fetched, and only
+    month partitions whose content changed are uploaded. `days` is used for
+    products that have not been synced before.
+    """
+    try:
+        coinbase_client = CoinbaseClient()
+        data_collector = DataCollector(coinbase_client)
+        
+        result = data_collector.sync_historical_data(
+            product_ids=products,
+            granularity=granularity,
+            months_back=max(1, round(days / 30)),
+            full_resync=full_resync
+        )
+        
+        logger.info(f"New rows: {result.get('new_rows', 0)}, partitions uploaded: "
+                    f"{result.get('partitions_uploaded', 0)}, unchanged: {result.get('partitions_unchanged', 0)}")
+        for error in result.get('errors', []):
+            logger.error(error)
+        
+        return result.get('success', False)
+        
+    except Exception as e:
+        logger.error(f"Error in GCS historical data sync: {e}")
+        return False
+
 def main():
     """Main function with command-line argument parsing"""
     parser = argparse.ArgumentParser(description='Sync historical cryptocurrency data for backtesting')
@@ -117,19 +147,36 @@ def main():
                        choices=['ONE_MINUTE', 'FIVE_MINUTE', 'FIFTEEN_MINUTE', 'ONE_HOUR', 'SIX_HOUR', 'ONE_DAY'],
                        help='Data granularity (default: ONE_HOUR)')
     
+    parser.add_argument('--gcs', action='store_true',
+                       help='Incrementally sync monthly partitions to GCS instead of local files')
+    
+    parser.add_argument('--full-resync', action='store_true',
+                       help='With --gcs, ignore stored watermarks and re-fetch the whole window')
+    
     args = parser.parse_args()
     
     # Parse products list
     products = [p.strip() for p in args.products.split(',')]
     
     # Run sync
-    success = sync_historical_data_local(
-        days=args.days,
-        products=products,
-        granularity=args.granularity
-    )
+    if args.gcs:
+        success = sync_historical_data_gcs(
+            days=args.days,
+            products=products,
+            granularity=args.granularity,
+            full_resync=args.full_resync
+        )
+    else:
+        success = sync_historical_data_local(
+            days=args.days,
+            products=products,
+            granularity=args.granularity
+        )
     
-    if success:
+    if success and args.gcs:
+        print(f"\n✅ Incremental {args.granularity} sync to GCS complete")
+        print(f"📊 Products: {', '.join(products)}")
+    elif success:
         print(f"\n✅ Successfully downloaded {args.days} days of {args.granularity} data")
         print(f"📊 Products: {', '.join(products)}")
         print(f"📁 Data saved to: ./data/historical/")
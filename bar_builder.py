@@ -0,0 +1,163 @@
+"""
+bar_builder.py
+--------------
+Velas OHLCV + VWAP construidas en local a partir del stream aggTrade.
+- Trabajo O(1) por trade y timeframe (1s, 1m y 5m por defecto)
+- Evento de cierre de vela para el loop de decisión
+- Vistas numpy contiguas de las velas cerradas, sin copias
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+TIMEFRAMES  = {"1s": 1_000, "1m": 60_000, "5m": 300_000}   # ms por vela
+BAR_HISTORY = {"1s": 3_600, "1m": 1_500, "5m": 600}        # velas cerradas que se guardan
+FIELDS      = ("start", "open", "high", "low", "close", "volume", "vwap", "trades")
+
+
+@dataclass
+class Bar:
+    timeframe: str
+    start:     int     # open time (ms)
+    open:      float
+    high:      float
+    low:       float
+    close:     float
+    volume:    float
+    vwap:      float
+    trades:    int
+
+
+class BarSeries:
+    """
+    Velas de un timeframe.
+    Las cerradas se guardan en un buffer circular duplicado (cada vela se escribe
+    en i y en i + maxlen), así las últimas N velas son siempre un slice contiguo.
+    """
+
+    def __init__(self, timeframe: str, interval_ms: int, maxlen: int, fill_gaps: bool = True):
+        self.timeframe   = timeframe
+        self.interval_ms = interval_ms
+        self.maxlen      = maxlen
+        self.fill_gaps   = fill_gaps
+        self.late_trades = 0
+        self._buf   = np.zeros((len(FIELDS), 2 * maxlen))
+        self._write = 0
+        self._count = 0
+        # Vela en curso (floats de Python: más rápido que escalares numpy)
+        self._start: Optional[int] = None
+        self._o = self._h = self._l = self._c = 0.0
+        self._v = self._pv = 0.0
+        self._n = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ── Trades ─────────────────────────────────────────────────────────
+    def on_trade(self, price: float, qty: float, trade_time: int) -> List[Bar]:
+        """Añade un trade; devuelve las velas que cierra (vacío casi siempre)."""
+        bucket = trade_time - trade_time % self.interval_ms
+        closed = []
+        if self._start is None:
+            self._open(bucket, price)
+        elif bucket > self._start:
+            closed.append(self._close())
+            if self.fill_gaps:
+                # Intervalos sin trades: velas planas sin volumen
+                missing = min((bucket - self._start) // self.interval_ms - 1, self.maxlen)
+                for i in range(missing, 0, -1):
+                    closed.append(self._store(bucket - i * self.interval_ms, self._c, self._c, self._c, self._c, 0.0, self._c, 0))
+            self._open(bucket, price)
+        elif bucket < self._start:
+            self.late_trades += 1  # trade de una vela ya cerrada
+            return closed
+
+        if price > self._h:
+            self._h = price
+        elif price < self._l:
+            self._l = price
+        self._c   = price
+        self._v  += qty
+        self._pv += price * qty
+        self._n  += 1
+        return closed
+
+    def _open(self, start: int, price: float):
+        self._start = start
+        self._o = self._h = self._l = self._c = price
+        self._v = self._pv = 0.0
+        self._n = 0
+
+    def _close(self) -> Bar:
+        vwap = self._pv / self._v if self._v else self._c
+        return self._store(self._start, self._o, self._h, self._l, self._c, self._v, vwap, self._n)
+
+    def _store(self, start, o, h, l, c, v, vwap, n) -> Bar:
+        values = (start, o, h, l, c, v, vwap, n)
+        self._buf[:, self._write] = values
+        self._buf[:, self._write + self.maxlen] = values
+        self._write = (self._write + 1) % self.maxlen
+        self._count = min(self._count + 1, self.maxlen)
+        return Bar(self.timeframe, int(start), o, h, l, c, v, vwap, int(n))
+
+    # ── Consumidores ───────────────────────────────────────────────────
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Vista (len(FIELDS), n) de las últimas n velas cerradas, de la más vieja a la más nueva.
+        Es válida hasta que cierre la siguiente vela; haz .copy() para conservarla.
+        """
+        n   = self._count if n is None else min(n, self._count)
+        end = self._write + self.maxlen
+        out = self._buf[:, end - n:end]
+        out.flags.writeable = False
+        return out
+
+    def array(self, field: str, n: Optional[int] = None) -> np.ndarray:
+        """Vista 1D de un campo ("close", "volume", "vwap"...) de las velas cerradas."""
+        return self.view(n)[FIELDS.index(field)]
+
+    def current(self) -> Optional[Bar]:
+        """Vela en curso (sin cerrar)."""
+        if self._start is None:
+            return None
+        vwap = self._pv / self._v if self._v else self._c
+        return Bar(self.timeframe, self._start, self._o, self._h, self._l, self._c, self._v, vwap, self._n)
+
+
+class BarBuilder:
+
+    def __init__(self,
+                 timeframes: Dict[str, int] = TIMEFRAMES,
+                 history: Dict[str, int] = BAR_HISTORY,
+                 fill_gaps: bool = True):
+        self.series = {
+            name: BarSeries(name, interval_ms, history.get(name, 1_000), fill_gaps)
+            for name, interval_ms in timeframes.items()
+        }
+        self.trades = 0
+        self._listeners: List[Callable[[Bar], None]] = []
+
+    def __getitem__(self, timeframe: str) -> BarSeries:
+        return self.series[timeframe]
+
+    def subscribe(self, callback: Callable[[Bar], None]):
+        """callback(bar) por cada vela cerrada, de cualquier timeframe."""
+        self._listeners.append(callback)
+
+    def on_trade(self, price: float, qty: float, trade_time: int) -> List[Bar]:
+        self.trades += 1
+        closed = []
+        for series in self.series.values():
+            bars = series.on_trade(price, qty, trade_time)
+            if bars:
+                closed.extend(bars)
+        if closed:
+            for bar in closed:
+                for callback in self._listeners:
+                    callback(bar)
+        return closed
+
+    def on_agg_trade(self, msg: dict) -> List[Bar]:
+        """Mensaje aggTrade de Binance: p = precio, q = cantidad, T = hora del trade (ms)."""
+        return self.on_trade(float(msg["p"]), float(msg["q"]), int(msg["T"]))
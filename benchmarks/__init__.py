@@ -0,0 +1 @@
+# Performance benchmarks for the trading bot's hot paths
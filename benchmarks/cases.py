@@ -0,0 +1,194 @@
+"""
+Benchmark Cases for the Bot's Hot Paths
+
+Every case imports its subject lazily inside setup(), so a component that
+cannot be imported in the current environment shows up as an errored
+result instead of breaking the whole suite. JSON-store cases write into a
+temporary directory that is removed when the process exits; the cases
+that append to a store copy a seeded store into a fresh directory before
+every run, so each repeat appends to a store of the same size.
+"""
+
+import atexit
+import functools
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Callable, Dict, List
+
+from .harness import BenchmarkCase
+from .synthetic import (
+    load_bars, make_decision_records, make_ohlcv, make_portfolio, make_signals, make_snapshots,
+    make_trade_records
+)
+
+BAR_SIZES = (1_000, 100_000, 1_000_000)
+RECORD_SIZES = (1_000, 100_000)
+ASSET_SIZES = (10, 1_000)
+
+VECTORIZED_STRATEGIES = ['mean_reversion', 'momentum', 'trend_following']
+
+_work_dir = None
+
+def _scratch_dir(name: str) -> str:
+    """Fresh directory under this process's benchmark work directory"""
+    global _work_dir
+    if _work_dir is None:
+        _work_dir = tempfile.mkdtemp(prefix='benchmarks_')
+        atexit.register(shutil.rmtree, _work_dir, ignore_errors=True)
+    path = tempfile.mkdtemp(prefix=f"{name}_", dir=_work_dir)
+    return path
+
+def _write_json(path: str, data: Any):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def _store_files(name: str, size: int) -> Dict[str, Any]:
+    """Seeded files of a JSON store, keyed by file name"""
+    if name == 'decisions':
+        return {'decision_records.json': make_decision_records(size)}
+    if name == 'trades':
+        return {'trade_history.json': make_trade_records(size)}
+    return {'performance_config.json': {'tracking_enabled': True, 'snapshot_frequency': 'manual',
+                                        'retention_days': 365, 'last_snapshot_date': None},
+            'portfolio_snapshots.json': make_snapshots(size)}
+
+@functools.lru_cache(maxsize=None)
+def _seeded_store(name: str, size: int) -> str:
+    """Directory holding a store seeded with `size` records, written once per (store, size)"""
+    path = _scratch_dir(f"{name}_seed")
+    for file_name, data in _store_files(name, size).items():
+        _write_json(os.path.join(path, file_name), data)
+    return path
+
+def _fresh_store(name: str, size: int) -> str:
+    """Copy of the seeded store in a new directory, so every run appends to the same size"""
+    path = os.path.join(_scratch_dir(name), 'store')
+    shutil.copytree(_seeded_store(name, size), path)
+    return path
+
+# ===== MARKET DATA AND SIGNALS =====
+
+def setup_calculate_indicators(size: int) -> Callable[[], Any]:
+    from data_collector import DataCollector
+
+    # calculate_indicators() is pure; skip the Coinbase/GCS clients of __init__
+    collector = DataCollector.__new__(DataCollector)
+    data = make_ohlcv(size)
+    return lambda: collector.calculate_indicators(data)
+
+def make_vectorizer_setup(strategy_name: str) -> Callable[[int], Callable[[], Any]]:
+    def setup(size: int) -> Callable[[], Any]:
+        from utils.backtest.strategy_vectorizer import VectorizedStrategyAdapter
+
+        adapter = VectorizedStrategyAdapter()
+        data = load_bars(size)
+        return lambda: adapter.vectorize_strategy(strategy_name, data, 'BTC-USD')
+    return setup
+
+def setup_adaptive_vectorizer(size: int) -> Callable[[], Any]:
+    from utils.backtest.strategy_vectorizer import VectorizedStrategyAdapter
+
+    adapter = VectorizedStrategyAdapter()
+    data = load_bars(size)
+    return lambda: adapter.vectorize_adaptive_strategy(data, 'BTC-USD')
+
+def setup_run_backtest(size: int) -> Callable[[], Any]:
+    from utils.backtest.backtest_engine import BacktestEngine
+
+    engine = BacktestEngine()
+    data = load_bars(size, indicators=False)
+    signals = make_signals(data)
+    return lambda: engine.run_backtest(data, signals, 'BTC-USD')
+
+def setup_detect_market_regimes(size: int) -> Callable[[], Any]:
+    from utils.backtest.market_regime_analyzer import MarketRegimeAnalyzer
+
+    analyzer = MarketRegimeAnalyzer()
+    data = load_bars(size)
+    return lambda: analyzer.detect_market_regimes(data)
+
+# ===== PORTFOLIO AND JSON STORES =====
+
+def _load_portfolio(size: int):
+    from utils.trading.portfolio import Portfolio
+
+    portfolio_file = os.path.join(_scratch_dir('portfolio'), 'portfolio.json')
+    _write_json(portfolio_file, make_portfolio(size))
+    return Portfolio(portfolio_file=portfolio_file)
+
+def setup_portfolio_valuation(size: int) -> Callable[[], Any]:
+    portfolio = _load_portfolio(size)
+    return portfolio._calculate_portfolio_value
+
+def setup_portfolio_save(size: int) -> Callable[[], Any]:
+    portfolio = _load_portfolio(size)
+    return portfolio.save
+
+def setup_record_decision(size: int) -> Callable[[], Any]:
+    from strategies.performance_tracker import HybridPerformanceTracker
+
+    data_dir = _fresh_store('decisions', size)
+    tracker = HybridPerformanceTracker(data_dir=data_dir)
+
+    strategy_signals = {name: {'action': 'BUY', 'confidence': 72.0} for name in VECTORIZED_STRATEGIES}
+    final_decision = {'action': 'BUY', 'confidence': 70.0}
+    return lambda: tracker.record_decision('BTC-EUR', strategy_signals, final_decision, 50000.0)
+
+def setup_trade_log(size: int) -> Callable[[], Any]:
+    from utils.trading.trade_logger import TradeLogger
+
+    log_file = os.path.join(_fresh_store('trades', size), 'trade_history.json')
+    trade_logger = TradeLogger(log_file=log_file)
+
+    decision = {'action': 'BUY', 'confidence': 70, 'reason': 'benchmark'}
+    result = {'action': 'BUY', 'price': 50000.0, 'crypto_amount': 0.001, 'status': 'executed',
+              'trade_amount_usd': 50.0, 'total_fees': 0.3}
+    return lambda: trade_logger.log_trade('BTC-EUR', decision, result)
+
+def setup_portfolio_snapshot(size: int) -> Callable[[], Any]:
+    from utils.performance.performance_tracker import PerformanceTracker
+
+    config_path = _fresh_store('snapshots', size)
+    tracker = PerformanceTracker(config_path=config_path)
+
+    portfolio_data = {'total_value_eur': 1000.0, 'portfolio_composition': {'BTC': 0.5, 'EUR': 0.5},
+                      'asset_prices': {'BTC': 50000.0}}
+    return lambda: tracker.take_portfolio_snapshot(portfolio_data)
+
+# ===== REGISTRY =====
+
+def default_cases() -> List[BenchmarkCase]:
+    """Every benchmark case, in reporting order"""
+    cases = [
+        BenchmarkCase('data_collector.calculate_indicators', setup_calculate_indicators, BAR_SIZES,
+                      description='DataCollector.calculate_indicators on raw OHLCV bars'),
+    ]
+    cases += [
+        BenchmarkCase(f"vectorizer.{strategy_name}", make_vectorizer_setup(strategy_name), BAR_SIZES,
+                      description=f"VectorizedStrategyAdapter.vectorize_strategy('{strategy_name}')")
+        for strategy_name in VECTORIZED_STRATEGIES
+    ]
+    cases += [
+        BenchmarkCase('vectorizer.adaptive', setup_adaptive_vectorizer, BAR_SIZES,
+                      description='VectorizedStrategyAdapter.vectorize_adaptive_strategy'),
+        BenchmarkCase('backtest_engine.run_backtest', setup_run_backtest, BAR_SIZES,
+                      description='BacktestEngine.run_backtest with 1% random signals'),
+        BenchmarkCase('market_regime.detect_market_regimes', setup_detect_market_regimes, BAR_SIZES,
+                      description='MarketRegimeAnalyzer.detect_market_regimes'),
+        BenchmarkCase('portfolio.valuation', setup_portfolio_valuation, ASSET_SIZES, unit='assets',
+                      description='Portfolio._calculate_portfolio_value'),
+        BenchmarkCase('portfolio.save', setup_portfolio_save, ASSET_SIZES, unit='assets',
+                      description='Portfolio.save to JSON'),
+        BenchmarkCase('performance_tracker.record_decision', setup_record_decision, RECORD_SIZES,
+                      unit='records', description='HybridPerformanceTracker.record_decision with existing records',
+                      setup_per_run=True),
+        BenchmarkCase('json_store.trade_log', setup_trade_log, RECORD_SIZES, unit='records',
+                      description='TradeLogger.log_trade appending to the trade history', setup_per_run=True),
+        BenchmarkCase('json_store.portfolio_snapshot', setup_portfolio_snapshot, RECORD_SIZES, unit='records',
+                      description='PerformanceTracker.take_portfolio_snapshot appending to the snapshots',
+                      setup_per_run=True),
+    ]
+    return cases
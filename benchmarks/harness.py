@@ -0,0 +1,299 @@
+"""
+Benchmark Harness - Timing, Percentiles, Baselines and Regression Checks
+
+Each benchmark case builds its inputs once per size (not timed), runs the
+operation a few times to warm caches and JIT compilers, then times a fixed
+number of repeats with time.perf_counter(). Results are summarized as
+min/mean/percentiles and stored as JSON baselines; compare_results() flags
+cases whose median time grew beyond a threshold against a baseline.
+"""
+
+import json
+import logging
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BASELINE_VERSION = 1
+
+# ===== CASES AND RESULTS =====
+
+@dataclass
+class BenchmarkCase:
+    """
+    One benchmarked operation
+
+    setup(size) builds the inputs for one size and returns the zero-argument
+    callable to time; what `size` counts (bars, records, assets) is given
+    by `unit`. Cases whose operation grows its own input (appends to a
+    store) set setup_per_run, so every warm-up and timed run gets fresh
+    inputs from an untimed setup() call.
+    """
+    name: str
+    setup: Callable[[int], Callable[[], Any]]
+    sizes: Tuple[int, ...]
+    unit: str = 'bars'
+    description: str = ''
+    setup_per_run: bool = False
+
+@dataclass
+class BenchmarkResult:
+    """Timing summary of one (case, size), in seconds"""
+    name: str
+    size: int
+    unit: str
+    repeats: int = 0
+    warmup: int = 0
+    samples: List[float] = field(default_factory=list)
+    min: float = float('nan')
+    mean: float = float('nan')
+    p50: float = float('nan')
+    p90: float = float('nan')
+    p99: float = float('nan')
+    max: float = float('nan')
+    stdev: float = float('nan')
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return result_key(self.name, self.size)
+
+def result_key(name: str, size: int) -> str:
+    """Baseline key of a (case, size) pair"""
+    return f"{name}[{size}]"
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Min, mean, p50/p90/p99, max and standard deviation of timing samples"""
+    values = np.asarray(samples, dtype=float)
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {
+        'min': float(values.min()),
+        'mean': float(values.mean()),
+        'p50': float(p50),
+        'p90': float(p90),
+        'p99': float(p99),
+        'max': float(values.max()),
+        'stdev': statistics.stdev(values) if len(values) > 1 else 0.0
+    }
+
+def time_callable(func: Callable[[], Any], repeats: int = 5, warmup: int = 1) -> List[float]:
+    """
+    Time a callable after warm-up runs
+
+    Args:
+        func: Zero-argument callable
+        repeats: Timed runs
+        warmup: Untimed runs before timing
+
+    Returns:
+        Elapsed seconds of each timed run
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def time_with_setup(setup: Callable[[], Callable[[], Any]], repeats: int = 5, warmup: int = 1) -> List[float]:
+    """
+    Time callables built by an untimed setup() before every run
+
+    Args:
+        setup: Zero-argument callable returning the callable to time
+        repeats: Timed runs
+        warmup: Untimed runs before timing
+
+    Returns:
+        Elapsed seconds of each timed run
+    """
+    for _ in range(warmup):
+        setup()()
+
+    samples = []
+    for _ in range(repeats):
+        func = setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+# ===== RUNNING =====
+
+def run_case(case: BenchmarkCase, size: int, repeats: int = 5, warmup: int = 1) -> BenchmarkResult:
+    """
+    Benchmark one case at one size
+
+    Setup or run failures are recorded on the result instead of raised, so
+    one broken case does not stop a suite run.
+    """
+    result = BenchmarkResult(name=case.name, size=size, unit=case.unit, repeats=repeats, warmup=warmup)
+    try:
+        if case.setup_per_run:
+            result.samples = time_with_setup(lambda: case.setup(size), repeats=repeats, warmup=warmup)
+        else:
+            result.samples = time_callable(case.setup(size), repeats=repeats, warmup=warmup)
+        for stat, value in summarize(result.samples).items():
+            setattr(result, stat, value)
+        logger.info(f"{result.key}: p50 {result.p50 * 1000:.3f} ms, p90 {result.p90 * 1000:.3f} ms")
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        logger.error(f"Benchmark {result.key} failed: {result.error}")
+    return result
+
+def run_benchmarks(cases: Iterable[BenchmarkCase], sizes: Optional[Iterable[int]] = None,
+                   repeats: int = 5, warmup: int = 1, pattern: Optional[str] = None) -> List[BenchmarkResult]:
+    """
+    Benchmark every case at each of its sizes
+
+    Args:
+        cases: Benchmark cases
+        sizes: Only run these sizes (default: every size of each case)
+        repeats: Timed runs per (case, size)
+        warmup: Untimed runs per (case, size)
+        pattern: Only run cases whose name contains this substring
+
+    Returns:
+        List of BenchmarkResult in run order
+    """
+    selected_sizes = set(sizes) if sizes is not None else None
+    results = []
+    for case in cases:
+        if pattern and pattern not in case.name:
+            continue
+        for size in case.sizes:
+            if selected_sizes is None or size in selected_sizes:
+                results.append(run_case(case, size, repeats=repeats, warmup=warmup))
+    return results
+
+# ===== BASELINES =====
+
+def environment_info() -> Dict[str, str]:
+    """Interpreter, platform and library versions recorded with a baseline"""
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor()
+    }
+    for module_name in ['numpy', 'pandas', 'vectorbt', 'numba']:
+        try:
+            info[module_name] = __import__(module_name).__version__
+        except Exception:
+            info[module_name] = 'unavailable'
+    return info
+
+def save_results(results: List[BenchmarkResult], path: str, label: str = '') -> Path:
+    """
+    Write results as a JSON baseline
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'version': BASELINE_VERSION,
+        'label': label,
+        'created': datetime.now().isoformat(),
+        'environment': environment_info(),
+        'results': {result.key: asdict(result) for result in results}
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    logger.info(f"Saved {len(results)} benchmark results to {path}")
+    return path
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Results of a JSON baseline keyed by 'name[size]'"""
+    with open(path, 'r') as f:
+        payload = json.load(f)
+    if payload.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported benchmark file version {payload.get('version')} in {path}")
+    return payload['results']
+
+# ===== COMPARISON =====
+
+@dataclass
+class Comparison:
+    """Baseline vs current timing of one (case, size)"""
+    key: str
+    baseline: Optional[float]
+    current: Optional[float]
+    ratio: Optional[float]
+    status: str  # 'ok', 'regression', 'improvement', 'new', 'missing' or 'error'
+
+def compare_results(baseline: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]],
+                    threshold: float = 0.10, statistic: str = 'p50') -> List[Comparison]:
+    """
+    Compare current results against a baseline
+
+    Args:
+        baseline: Baseline results keyed by 'name[size]' (see load_results())
+        current: Current results in the same form
+        threshold: Relative slowdown flagged as a regression (0.10 = 10%)
+        statistic: Timing statistic compared ('p50', 'min', 'mean', 'p90', ...)
+
+    Returns:
+        Comparisons sorted by key
+    """
+    comparisons = []
+    for key in sorted(set(baseline) | set(current)):
+        old, new = baseline.get(key), current.get(key)
+        if new is None:
+            comparisons.append(Comparison(key, old.get(statistic), None, None, 'missing'))
+            continue
+        if new.get('error'):
+            comparisons.append(Comparison(key, old.get(statistic) if old else None, None, None, 'error'))
+            continue
+        if old is None or old.get('error'):
+            comparisons.append(Comparison(key, None, new[statistic], None, 'new'))
+            continue
+
+        ratio = new[statistic] / old[statistic] if old[statistic] > 0 else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        comparisons.append(Comparison(key, old[statistic], new[statistic], ratio, status))
+    return comparisons
+
+def format_comparison(comparisons: List[Comparison], threshold: float) -> str:
+    """Plain-text table of comparisons"""
+    lines = [f"{'benchmark':<48} {'baseline':>12} {'current':>12} {'ratio':>8}  status",
+             '-' * 92]
+    for comparison in comparisons:
+        baseline = f"{comparison.baseline * 1000:.3f}ms" if comparison.baseline is not None else '-'
+        current = f"{comparison.current * 1000:.3f}ms" if comparison.current is not None else '-'
+        ratio = f"{comparison.ratio:.2f}x" if comparison.ratio is not None else '-'
+        lines.append(f"{comparison.key:<48} {baseline:>12} {current:>12} {ratio:>8}  {comparison.status}")
+
+    regressions = sum(1 for comparison in comparisons if comparison.status == 'regression')
+    lines.append('-' * 92)
+    lines.append(f"{regressions} regression(s) beyond {threshold:.0%}")
+    return '\n'.join(lines)
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Plain-text table of benchmark results"""
+    lines = [f"{'benchmark':<48} {'min':>10} {'p50':>10} {'p90':>10} {'p99':>10}",
+             '-' * 92]
+    for result in results:
+        if result.error:
+            lines.append(f"{result.key:<48} ERROR {result.error}")
+            continue
+        timings = ' '.join(f"{getattr(result, stat) * 1000:>8.3f}ms" for stat in ['min', 'p50', 'p90', 'p99'])
+        lines.append(f"{result.key:<48} {timings}")
+    return '\n'.join(lines)
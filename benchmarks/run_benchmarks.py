@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Run the hot-path benchmarks and compare them against a stored baseline
+
+    # Record a baseline
+    python -m benchmarks.run_benchmarks run --output benchmarks/baselines/baseline.json
+
+    # Benchmark the working tree and fail on >10% median slowdowns
+    python -m benchmarks.run_benchmarks run --output /tmp/current.json
+    python -m benchmarks.run_benchmarks compare benchmarks/baselines/baseline.json /tmp/current.json
+
+    # Or run and compare in one step
+    python -m benchmarks.run_benchmarks run --compare benchmarks/baselines/baseline.json
+
+Baselines are machine-specific; compare runs from the same machine.
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+
+from .cases import default_cases
+from .harness import (
+    compare_results, format_comparison, format_results, load_results, run_benchmarks, save_results
+)
+
+logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = "benchmarks/baselines/baseline.json"
+
+def run_command(args) -> int:
+    """Run the benchmarks, save them and optionally compare against a baseline"""
+    sizes = [int(size) for size in args.sizes.split(',')] if args.sizes else None
+    cases = default_cases()
+    if args.list:
+        for case in cases:
+            print(f"{case.name:<44} {','.join(map(str, case.sizes)):<24} {case.unit:<8} {case.description}")
+        return 0
+
+    results = run_benchmarks(cases, sizes=sizes, repeats=args.repeats, warmup=args.warmup, pattern=args.filter)
+    print(format_results(results))
+
+    if args.output:
+        path = save_results(results, args.output, label=args.label or datetime.now().strftime('%Y%m%d_%H%M%S'))
+        print(f"\n💾 Results saved to: {path}")
+
+    if args.compare:
+        current = {result.key: vars(result) for result in results}
+        comparisons = compare_results(load_results(args.compare), current,
+                                      threshold=args.threshold, statistic=args.statistic)
+        # Cases filtered out of this run are not missing
+        comparisons = [comparison for comparison in comparisons if comparison.status != 'missing']
+        print()
+        print(format_comparison(comparisons, args.threshold))
+        return 1 if any(comparison.status == 'regression' for comparison in comparisons) else 0
+
+    return 0
+
+def compare_command(args) -> int:
+    """Compare two stored result files; exit status 1 on regressions"""
+    comparisons = compare_results(load_results(args.baseline), load_results(args.current),
+                                  threshold=args.threshold, statistic=args.statistic)
+    print(format_comparison(comparisons, args.threshold))
+    return 1 if any(comparison.status == 'regression' for comparison in comparisons) else 0
+
+def main() -> int:
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Hot-path benchmarks with stored baselines')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks')
+    run_parser.add_argument('--sizes', type=str, default=None,
+                            help='Comma-separated sizes to run (default: every size of each case)')
+    run_parser.add_argument('--filter', type=str, default=None,
+                            help='Only run cases whose name contains this text')
+    run_parser.add_argument('--repeats', type=int, default=5,
+                            help='Timed runs per case and size (default: 5)')
+    run_parser.add_argument('--warmup', type=int, default=1,
+                            help='Untimed warm-up runs per case and size (default: 1)')
+    run_parser.add_argument('--output', type=str, default=None,
+                            help=f"Write results to this JSON file (e.g. {DEFAULT_OUTPUT})")
+    run_parser.add_argument('--label', type=str, default=None,
+                            help='Label stored with the results (default: timestamp)')
+    run_parser.add_argument('--compare', type=str, default=None,
+                            help='Baseline JSON file to compare the results against')
+    run_parser.add_argument('--list', action='store_true',
+                            help='List the benchmark cases and exit')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two result files')
+    compare_parser.add_argument('baseline', type=str, help='Baseline JSON file')
+    compare_parser.add_argument('current', type=str, help='Current JSON file')
+
+    for sub in (run_parser, compare_parser):
+        sub.add_argument('--threshold', type=float, default=0.10,
+                         help='Relative slowdown reported as a regression (default: 0.10)')
+        sub.add_argument('--statistic', type=str, default='p50',
+                         choices=['min', 'mean', 'p50', 'p90', 'p99'],
+                         help='Timing statistic to compare (default: p50)')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        return run_command(args)
+    return compare_command(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
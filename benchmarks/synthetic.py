@@ -0,0 +1,179 @@
+"""
+Synthetic Benchmark Inputs
+
+Deterministic OHLCV bars, indicator columns and JSON-store records
+generated locally (no exchange or GCS access), so benchmark runs are
+reproducible and comparable across machines. Bars come from the shared
+SyntheticMarketGenerator used by the offline stress runs. Generated bar
+frames are cached as Parquet files because the 1M-bar inputs take a few
+seconds to build.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.backtest.synthetic_market import SyntheticMarketGenerator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "./data/benchmarks"
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def make_ohlcv(rows: int, seed: int = 0, granularity: str = 'ONE_HOUR', start: str = '2020-01-01') -> pd.DataFrame:
+    """
+    Regime-switching OHLCV bars from the shared SyntheticMarketGenerator
+
+    Gaps are disabled so every benchmark size gets exactly `rows` bars.
+
+    Args:
+        rows: Number of bars
+        seed: Random seed
+        granularity: Coinbase granularity name or pandas frequency
+        start: First timestamp
+
+    Returns:
+        DataFrame with open/high/low/close/volume indexed by timestamp
+    """
+    generator = SyntheticMarketGenerator(seed=seed, granularity=granularity, start=start, gap_rate=0.0)
+    return generator.generate(rows)[OHLCV_COLUMNS]
+
+def add_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Indicator columns read by the strategy vectorizers and regime analyzer
+
+    Adds rsi_14, macd/macd_signal/macd_histogram, sma_20/sma_50 and the
+    20-bar Bollinger Bands.
+    """
+    close = df['close']
+    data = df.copy()
+
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14).mean()
+    loss = (-delta.clip(upper=0)).rolling(14).mean()
+    data['rsi_14'] = (100 - 100 / (1 + gain / loss)).fillna(50.0)
+
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    data['macd'] = macd
+    data['macd_signal'] = macd.ewm(span=9, adjust=False).mean()
+    data['macd_histogram'] = data['macd'] - data['macd_signal']
+
+    data['sma_20'] = close.rolling(20).mean()
+    data['sma_50'] = close.rolling(50).mean()
+    bb_std = close.rolling(20).std()
+    data['bb_middle_20'] = data['sma_20']
+    data['bb_upper_20'] = data['sma_20'] + 2 * bb_std
+    data['bb_lower_20'] = data['sma_20'] - 2 * bb_std
+
+    return data.bfill()
+
+def load_bars(rows: int, seed: int = 0, indicators: bool = True,
+              cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> pd.DataFrame:
+    """
+    Synthetic bars (with indicators), read from the Parquet cache when present
+
+    Args:
+        rows: Number of bars
+        seed: Random seed
+        indicators: Include the add_indicators() columns
+        cache_dir: Cache directory (None disables caching)
+
+    Returns:
+        DataFrame of synthetic bars
+    """
+    path = None
+    if cache_dir is not None:
+        path = Path(cache_dir) / f"market_bars_{rows}_{seed}{'_indicators' if indicators else ''}.parquet"
+        if path.exists():
+            return pd.read_parquet(path)
+
+    data = make_ohlcv(rows, seed=seed)
+    if indicators:
+        data = add_indicators(data)
+
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data.to_parquet(path)
+        logger.info(f"Cached {rows} synthetic bars at {path}")
+    return data
+
+def make_signals(data: pd.DataFrame, seed: int = 0, rate: float = 0.01) -> pd.DataFrame:
+    """Sparse random buy/sell signals aligned with data"""
+    rng = np.random.default_rng(seed)
+    rows = len(data)
+    return pd.DataFrame({'buy': rng.random(rows) < rate, 'sell': rng.random(rows) < rate}, index=data.index)
+
+def make_trade_records(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Trade history entries shaped like TradeLogger.log_trade() records"""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range('2024-01-01', periods=count, freq='1min', tz='UTC')
+    prices = 50000.0 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    actions = rng.choice(['BUY', 'SELL'], count)
+    return [{
+        'timestamp': timestamp.isoformat(),
+        'product_id': 'BTC-EUR',
+        'action': action,
+        'price': float(price),
+        'amount': 0.001,
+        'confidence': 70,
+        'reason': 'synthetic benchmark trade',
+        'status': 'executed',
+        'trade_executed': True
+    } for timestamp, action, price in zip(timestamps, actions, prices)]
+
+def make_decision_records(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Decision records shaped like HybridPerformanceTracker's decision_records.json"""
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range('2024-01-01', periods=count, freq='1min')
+    strategies = rng.choice(['mean_reversion', 'momentum', 'trend_following', 'combined_hybrid'], count)
+    actions = rng.choice(['BUY', 'SELL', 'HOLD'], count)
+    return [{
+        'timestamp': timestamp.isoformat(),
+        'product_id': 'BTC-EUR',
+        'strategy_name': strategy,
+        'action': action,
+        'confidence': float(confidence),
+        'price_at_decision': 50000.0,
+        'price_after_1h': None,
+        'price_after_4h': None,
+        'price_after_24h': None,
+        'was_correct': None,
+        'profit_loss_1h': None,
+        'profit_loss_4h': None,
+        'profit_loss_24h': None
+    } for timestamp, strategy, action, confidence
+        in zip(timestamps, strategies, actions, rng.uniform(40, 90, count))]
+
+def make_snapshots(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Portfolio snapshots shaped like PerformanceTracker's portfolio_snapshots.json"""
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp.now(tz='UTC').floor('min')
+    timestamps = pd.date_range(end=end - pd.Timedelta(days=1), periods=count, freq='1min')
+    values = 1000.0 * np.exp(np.cumsum(rng.normal(0, 0.001, count)))
+    return [{
+        'timestamp': timestamp.isoformat(),
+        'total_value_eur': float(value),
+        'portfolio_composition': {'BTC': 0.5, 'ETH': 0.3, 'EUR': 0.2},
+        'asset_prices': {'BTC': 50000.0, 'ETH': 3000.0},
+        'snapshot_type': 'scheduled',
+        'trading_session_id': 'benchmark'
+    } for timestamp, value in zip(timestamps, values)]
+
+def make_portfolio(assets: int, seed: int = 0) -> Dict[str, Any]:
+    """Portfolio file content with `assets` crypto holdings plus EUR and USD"""
+    rng = np.random.default_rng(seed)
+    data = {
+        'EUR': {'amount': 500.0, 'initial_amount': 500.0, 'last_price_usd': 1.09},
+        'USD': {'amount': 100.0, 'initial_amount': 100.0, 'last_price_usd': 1.0},
+        'trades_executed': 0,
+        'portfolio_value_usd': 0.0,
+        'initial_value_usd': 0.0
+    }
+    for i in range(assets):
+        price = float(rng.uniform(0.1, 50000))
+        data[f"A{i:04d}"] = {'amount': float(rng.uniform(0, 10)), 'initial_amount': 1.0,
+                             'last_price_usd': price, 'initial_price_usd': price}
+    return data
@@ -7,11 +7,17 @@ Bot de trading asíncrono con:
 - Reconexión automática con recuperación de estado
 - Alertas por Telegram
 - Resumen diario automático
+- Trazado de latencia tick → orden
+- Monitor de lag del event loop con recorte de trabajo no crítico
+- Arranque en caliente con klines de 1m (store local + REST)
+- Velas OHLCV + VWAP locales (1s/1m/5m) desde el stream aggTrade
+- SL/TP/trailing opcionalmente con el mejor bid de bookTicker
 """
 
 import asyncio
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from loguru import logger
 
@@ -21,11 +27,16 @@ from config          import Config
 from logger          import TradeLogger
 from position_sizing import PositionSizer
 from telegram_alerts import TelegramAlerter
+from order_latency   import LatencyTracker, OrderTrace, tracing
+from loop_monitor    import LoopMonitor
+from price_history   import PriceHistory
+from bar_builder     import Bar, BarBuilder
 
 MIN_CONFIDENCE  = 0.65
 GEMINI_INTERVAL = 60
 STATE_FILE      = Path("logs/bot_state.json")
 MAX_RECONNECT_ATTEMPTS = 10
+BOOK_STALE_SECONDS     = 5     # sin bookTicker reciente se vuelve al precio del ticker
 
 
 class TradingBot:
@@ -36,17 +47,38 @@ class TradingBot:
         self.trade_log   = TradeLogger()
         self.sizer       = PositionSizer()
         self.telegram    = TelegramAlerter()
+        self.latency     = LatencyTracker()
         self.symbol      = Config.TRADING_PAIR
 
+        # Salud del event loop: E/S de ficheros en un hilo aparte (uno solo,
+        # para que las escrituras mantengan su orden) y recorte bajo carga
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot-io")
+        self.loop_monitor = LoopMonitor(
+            threshold=Config.LOOP_LAG_THRESHOLD,
+            on_overload=self._on_loop_overload,
+            on_recover=self._on_loop_recover,
+            on_slow_callback=self._on_slow_callback,
+        )
+
         # Estado de posición
         self.in_position  = False
         self.entry_price  = 0.0
         self.entry_qty    = 0.0
         self.entry_amount = 0.0  # USDT invertidos
 
-        # Buffers
-        self._prices  = []
-        self._volumes = []
+        # Histórico de cierres de 1 minuto (arranque en caliente en _warm_start)
+        self.history  = PriceHistory(self.symbol)
+        # Velas locales desde aggTrade; el cierre de cada vela de 1m despierta al loop
+        self.bars     = BarBuilder()
+        self.bars.subscribe(self._on_bar_close)
+        self._bar_closed = asyncio.Event()
+
+        # Precio de riesgo: ticker (último trade, ~1/s) o bookTicker (mejor bid, tiempo real)
+        self._book_risk   = Config.RISK_PRICE_SOURCE == "book"
+        self._book_update = asyncio.Event()
+        self._risk_task   = None
+        self._exit_task   = None
+        self._exiting     = False
         self._running = False
         self._last_gemini_call  = 0.0
         self._last_daily_report = 0.0
@@ -55,9 +87,17 @@ class TradingBot:
         # Restaurar estado si el bot se cayó con posición abierta
         self._load_state()
 
-    # ── Estado persistente ─────────────────────────────────────────────
-    def _save_state(self):
+    # ── E/S fuera del event loop ───────────────────────────────────────
+    async def _run_io(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._io, fn, *args)
+
+    @staticmethod
+    def _write_state(text: str):
         STATE_FILE.parent.mkdir(exist_ok=True)
+        STATE_FILE.write_text(text)
+
+    # ── Estado persistente ─────────────────────────────────────────────
+    async def _save_state(self):
         state = {
             "in_position":  self.in_position,
             "entry_price":  self.entry_price,
@@ -66,7 +106,7 @@ class TradingBot:
             "symbol":       self.symbol,
             "timestamp":    time.time(),
         }
-        STATE_FILE.write_text(json.dumps(state, indent=2))
+        await self._run_io(self._write_state, json.dumps(state, indent=2))
 
     def _load_state(self):
         if not STATE_FILE.exists():
@@ -87,56 +127,142 @@ class TradingBot:
         except Exception as e:
             logger.warning(f"No se pudo restaurar estado: {e}")
 
-    def _clear_state(self):
+    async def _clear_state(self):
         self.in_position  = False
         self.entry_price  = 0.0
         self.entry_qty    = 0.0
         self.entry_amount = 0.0
-        self._save_state()
+        await self._save_state()
 
-    # ── WebSocket callback ─────────────────────────────────────────────
-    def _on_price(self, symbol: str, price: float):
-        self._prices.append(price)
-        if len(self._prices) > 1500:
-            self._prices.pop(0)
+    # ── Salud del event loop ───────────────────────────────────────────
+    def _on_loop_overload(self, lag: float, top_callbacks: list):
+        culprits = ", ".join(f"{name} x{count}" for name, count in top_callbacks) or "sin identificar"
+        logger.warning(
+            f"🐢 Event loop con {lag*1000:.0f}ms de lag — aplazando Gemini, alertas y reporte "
+            f"(callbacks lentos: {culprits})"
+        )
 
-        if self.in_position:
-            action = self.exchange.check_risk(symbol, self.entry_price, price)
-            if action:
-                asyncio.create_task(self._exit_position(reason=action, price=price))
+    def _on_loop_recover(self, lag: float):
+        logger.info(f"✅ Event loop recuperado ({lag*1000:.0f}ms de lag) | {self.loop_monitor.stats()}")
 
-    # ── Operaciones ────────────────────────────────────────────────────
-    async def _enter_position(self, price: float, reason: str = "GEMINI_BUY"):
-        # Calcular tamaño dinámico
-        balance = await self.exchange.get_balance("USDT")
-        amount  = self.sizer.calculate(balance, price)
+    def _on_slow_callback(self, name: str, took: float):
+        logger.debug(f"Callback lento en el event loop: {name} ({took*1000:.0f}ms)")
 
-        if amount < 10:
-            logger.warning(f"Capital insuficiente para operar (${balance:.2f} disponible)")
+    # ── Latencia tick → orden ──────────────────────────────────────────
+    async def _finish_trace(self, trace: OrderTrace, order: dict):
+        if trace is None:
             return
+        trace.acknowledged(order)
+        b = self.latency.record(trace)
+        logger.info(
+            f"⏱️ Tick→orden {b['total_ms']:.1f}ms | Red:{b['network_in_ms']:.1f} "
+            f"Cola:{b['queueing_ms']:.1f} Decisión:{b['decision_ms']:.1f} "
+            f"Prep:{b['preparation_ms']:.1f} RL:{b['rate_limit_wait_ms']:.1f} "
+            f"REST:{b['rest_round_trip_ms']:.1f}"
+        )
+        try:
+            await self._run_io(self.latency.save, self.latency.snapshot())
+        except Exception as e:
+            logger.warning(f"No se pudo guardar la latencia: {e}")
+
+    # ── Arranque en caliente ───────────────────────────────────────────
+    async def _warm_start(self):
+        t0 = time.monotonic()
+        stored = 0
+        if not len(self.history):
+            stored = await self._run_io(self.history.load_store)
+        try:
+            klines = await self.exchange.get_klines_1m(self.symbol, self.history.fetch_start())
+            self.history.load_klines(klines)
+        except Exception as e:
+            logger.warning(f"No se pudieron precargar klines: {e}")
+        logger.info(
+            f"🔥 Arranque en caliente: {len(self.history)} min de histórico "
+            f"({stored} del store local) en {(time.monotonic() - t0)*1000:.0f}ms"
+        )
+
+    # ── WebSocket callbacks ────────────────────────────────────────────
+    def _on_price(self, symbol: str, price: float, event=None):
+        self.history.on_tick(price, event.event_time if event else None)
+
+        if not self._book_is_live():
+            self._evaluate_risk(symbol, price, event)
+
+    def _on_book(self, symbol: str, event):
+        # Solo avisa; _risk_loop lee la cotización más reciente (conflación)
+        self._book_update.set()
+
+    def _book_is_live(self) -> bool:
+        if not self._book_risk:
+            return False
+        book = self.exchange.get_cached_book(self.symbol)
+        return book is not None and time.monotonic() - book.recv_mono < BOOK_STALE_SECONDS
+
+    async def _risk_loop(self):
+        while True:
+            await self._book_update.wait()
+            self._book_update.clear()
+            book = self.exchange.get_cached_book(self.symbol)
+            if book:
+                # Un largo se cierra vendiendo al mejor bid
+                self._evaluate_risk(self.symbol, book.price, book)
+
+    def _evaluate_risk(self, symbol: str, price: float, event=None):
+        if not self.in_position or (self._exit_task and not self._exit_task.done()):
+            return
+        decision_start = time.monotonic()
+        action = self.exchange.check_risk(symbol, self.entry_price, price)
+        if action:
+            trace = OrderTrace(event, action, decision_start).decided() if event else None
+            self._exit_task = asyncio.create_task(self._exit_position(reason=action, price=price, trace=trace))
+
+    def _on_bar_close(self, bar: Bar):
+        if bar.timeframe == "1m":
+            self.history.on_bar(bar.start, bar.close, bar.volume)
+            self._bar_closed.set()
 
-        logger.info(f"📥 Entrando @ ${price:.2f} | Invertir: ${amount:.2f} ({reason})")
-        order = await self.exchange.buy_market(self.symbol, amount)
+    # ── Operaciones ────────────────────────────────────────────────────
+    async def _enter_position(self, price: float, reason: str = "GEMINI_BUY", trace: OrderTrace = None):
+        with tracing(trace):
+            # Calcular tamaño dinámico
+            balance = await self.exchange.get_balance("USDT")
+            amount  = self.sizer.calculate(balance, price)
+
+            if amount < 10:
+                logger.warning(f"Capital insuficiente para operar (${balance:.2f} disponible)")
+                return
+
+            logger.info(f"📥 Entrando @ ${price:.2f} | Invertir: ${amount:.2f} ({reason})")
+            order = await self.exchange.buy_market(self.symbol, amount)
 
         self.in_position  = True
         self.entry_price  = price
         self.entry_qty    = float(order.get("executedQty", amount / price))
         self.entry_amount = amount
-        self._save_state()
+        await self._save_state()
 
-        self.trade_log.log_trade({
+        await self._run_io(self.trade_log.log_trade, {
             "action": "BUY", "symbol": self.symbol,
             "price": price, "qty": self.entry_qty,
             "reason": reason, "timestamp": time.time(),
         })
-        await self.telegram.alert_buy(self.symbol, price, self.entry_qty, amount, reason)
+        await self._finish_trace(trace, order)
+        await self.loop_monitor.run_or_defer(self.telegram.alert_buy, self.symbol, price, self.entry_qty, amount, reason)
 
-    async def _exit_position(self, reason: str, price: float):
-        if not self.in_position:
+    async def _exit_position(self, reason: str, price: float, trace: OrderTrace = None):
+        # Una sola salida a la vez (riesgo y Gemini pueden pedirla a la vez)
+        if not self.in_position or self._exiting:
             return
+        self._exiting = True
+        try:
+            await self._close_position(reason, price, trace)
+        finally:
+            self._exiting = False
 
+    async def _close_position(self, reason: str, price: float, trace: OrderTrace = None):
         logger.info(f"📤 Saliendo ({reason}) @ ${price:.2f}")
-        await self.exchange.sell_market(self.symbol, self.entry_qty)
+        with tracing(trace):
+            order = await self.exchange.sell_market(self.symbol, self.entry_qty)
 
         pnl = (price - self.entry_price) * self.entry_qty
         logger.info(f"💰 PnL: ${pnl:+.4f} | Motivo: {reason}")
@@ -144,22 +270,24 @@ class TradingBot:
         # Actualizar position sizer con resultado
         self.sizer.update(pnl)
 
-        self.trade_log.log_trade({
+        qty = self.entry_qty
+        await self._clear_state()
+
+        await self._run_io(self.trade_log.log_trade, {
             "action": "SELL", "symbol": self.symbol,
-            "price": price, "qty": self.entry_qty,
+            "price": price, "qty": qty,
             "pnl": pnl, "reason": reason,
             "timestamp": time.time(),
         })
+        await self._finish_trace(trace, order)
 
-        # Alertas específicas por tipo
+        # Alertas específicas por tipo (se aplazan si el loop va con retraso)
         if reason == "STOP_LOSS":
-            await self.telegram.alert_stop_loss(self.symbol, price, pnl)
+            await self.loop_monitor.run_or_defer(self.telegram.alert_stop_loss, self.symbol, price, pnl)
         elif reason == "TAKE_PROFIT":
-            await self.telegram.alert_take_profit(self.symbol, price, pnl)
+            await self.loop_monitor.run_or_defer(self.telegram.alert_take_profit, self.symbol, price, pnl)
         else:
-            await self.telegram.alert_sell(self.symbol, price, self.entry_qty, pnl, reason)
-
-        self._clear_state()
+            await self.loop_monitor.run_or_defer(self.telegram.alert_sell, self.symbol, price, qty, pnl, reason)
 
     # ── Resumen diario ─────────────────────────────────────────────────
     async def _check_daily_report(self):
@@ -169,7 +297,7 @@ class TradingBot:
             return
         self._last_daily_report = now
 
-        trades = self.trade_log.load_trades()
+        trades = await self._run_io(self.trade_log.load_trades)
         today_trades = [t for t in trades
                         if t.get("timestamp", "").startswith(time.strftime("%Y-%m-%d"))]
         if not today_trades:
@@ -188,26 +316,43 @@ class TradingBot:
         while self._running:
             now   = time.time()
             price = self.exchange.get_cached_price(self.symbol)
+            # Con el loop retrasado solo corren WebSocket y checks de riesgo;
+            # Gemini se reintenta en la siguiente vuelta sana
+            shed  = self.loop_monitor.should_shed()
 
-            if price and len(self._prices) >= 30:
+            if price and self.history.ready and not shed:
                 if now - self._last_gemini_call >= GEMINI_INTERVAL:
                     self._last_gemini_call = now
+                    event          = self.exchange.get_cached_event(self.symbol)
+                    decision_start = time.monotonic()
                     result     = await self.gemini.get_signal({
                         "symbol":  self.symbol,
-                        "prices":  list(self._prices),
-                        "volumes": list(self._volumes),
+                        "prices":  self.history.closes,
+                        "volumes": self.history.volumes,
                     })
                     signal     = result.get("signal", "HOLD")
                     confidence = result.get("confidence", 0.0)
 
                     if confidence >= MIN_CONFIDENCE:
+                        reason = f"GEMINI({confidence:.0%})"
+                        trace  = OrderTrace(event, reason, decision_start).decided() if event else None
                         if signal == "BUY" and not self.in_position:
-                            await self._enter_position(price, f"GEMINI({confidence:.0%})")
+                            await self._enter_position(price, reason, trace=trace)
                         elif signal == "SELL" and self.in_position:
-                            await self._exit_position(f"GEMINI({confidence:.0%})", price)
+                            await self._exit_position(reason, price, trace=trace)
+
+            if not shed:
+                if self.history.needs_save():
+                    await self._run_io(self.history.save, self.history.snapshot())
+                await self._check_daily_report()
+                await self.loop_monitor.flush_deferred()
 
-            await self._check_daily_report()
-            await asyncio.sleep(1)
+            # Espera 1s o hasta el cierre de la siguiente vela de 1m
+            try:
+                await asyncio.wait_for(self._bar_closed.wait(), timeout=1)
+            except asyncio.TimeoutError:
+                pass
+            self._bar_closed.clear()
 
     # ── Reconexión automática ──────────────────────────────────────────
     async def _run_with_reconnect(self):
@@ -215,11 +360,22 @@ class TradingBot:
             try:
                 async with self.exchange:
                     self._reconnect_attempts = 0  # reset en conexión exitosa
+                    await self._warm_start()
                     await self.exchange.start_price_stream(self.symbol, callback=self._on_price)
+                    await self.exchange.start_trade_stream(self.symbol, callback=self.bars.on_agg_trade)
+                    if self._book_risk:
+                        await self.exchange.start_book_stream(self.symbol, callback=self._on_book)
+                        self._risk_task = asyncio.create_task(self._risk_loop())
+                    self.loop_monitor.start()
                     self._running = True
-                    logger.info(f"🤖 Bot iniciado — {self.symbol} | DRY_RUN: {Config.DRY_RUN}")
+                    logger.info(f"🤖 Bot iniciado — {self.symbol} | DRY_RUN: {Config.DRY_RUN} | Riesgo: {Config.RISK_PRICE_SOURCE}")
                     await self.telegram.alert_bot_start(self.symbol, Config.DRY_RUN)
-                    await self._decision_loop()
+                    try:
+                        await self._decision_loop()
+                    finally:
+                        if self._risk_task:
+                            self._risk_task.cancel()
+                            self._risk_task = None
 
             except asyncio.CancelledError:
                 logger.info("Bot detenido por el usuario.")
@@ -244,6 +400,12 @@ class TradingBot:
             await self._run_with_reconnect()
         finally:
             self._running = False
+            self.loop_monitor.stop()
+            try:
+                await self._run_io(self.history.save, self.history.snapshot())
+            except Exception as e:
+                logger.warning(f"No se pudo guardar el histórico: {e}")
+            self._io.shutdown(wait=True)
             await self.gemini.close()
             await self.telegram.close()
 
@@ -251,5 +413,5 @@ class TradingBot:
         async with self.exchange:
             results = await self.exchange.close_all_positions()
         await self.telegram.alert_panic(len(results))
-        self._clear_state()
+        await self._clear_state()
         await self.telegram.close()
@@ -8,6 +8,8 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta, timezone
 from coinbase.rest import RESTClient
 from config import COINBASE_API_KEY, COINBASE_API_SECRET
+from utils.monitoring.latency_metrics import timed
+from utils.trading.api_budget import ApiBudget
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +22,8 @@ class CoinbaseClient:
         self.api_secret = api_secret
         self.last_request_time = 0
         self.min_request_interval = 0.1  # Minimum 100ms between requests
+        # Shared by every thread using this client (e.g. the analysis pipeline's fetch pool)
+        self.api_budget = ApiBudget(rate=1 / self.min_request_interval, burst=1)
         
         if not self.api_key or not self.api_secret:
             raise ValueError("Coinbase API key and secret are required")
@@ -33,14 +37,8 @@ class CoinbaseClient:
             self.client = None
     
     def _rate_limit(self):
-        """Implement basic rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            time.sleep(sleep_time)
-        
+        """Wait for a slot in the client's API budget (thread-safe)"""
+        self.api_budget.acquire()
         self.last_request_time = time.time()
     
     def _handle_api_error(self, error, operation: str):
@@ -144,9 +142,11 @@ class CoinbaseClient:
             logger.error(f"Error getting account balance for {currency}: {e}")
             return 0.0
     
+    @timed('coinbase.get_product_price')
     def get_product_price(self, product_id: str) -> Dict:
         """Get current price for a product (e.g., 'BTC-USD')"""
         try:
+            self._rate_limit()
             response = self.client.get_product(product_id=product_id)
             # Handle response object instead of dict
             if hasattr(response, 'price'):
@@ -198,6 +198,7 @@ class CoinbaseClient:
         
         return float(rounded)
 
+    @timed('coinbase.place_market_order')
     def place_market_order(self, product_id: str, side: str, size: float, confidence: float = 0) -> Dict:
         """
         Place a market order with proper precision handling and notifications
@@ -472,6 +473,7 @@ class CoinbaseClient:
             logger.error(f"Error sending trade notification: {e}")
             # Don't fail the trade if notification fails
     
+    @timed('coinbase.get_market_data')
     def get_market_data(self, product_id: str, granularity: str, start_time: str, end_time: str) -> List[Dict]:
         """
         Get historical market data
@@ -503,6 +505,7 @@ class CoinbaseClient:
             else:
                 end_timestamp = int(end_time)
                 
+            self._rate_limit()
             response = self.client.get_candles(
                 product_id=product_id,
                 start=start_timestamp,
@@ -535,6 +538,7 @@ class CoinbaseClient:
         """Get 24h stats for a product"""
         try:
             # Get product details which include stats
+            self._rate_limit()
             response = self.client.get_product(product_id=product_id)
             
             # Handle response object instead of dict
@@ -566,6 +570,7 @@ class CoinbaseClient:
     def get_product_order_book(self, product_id: str, level: int = 1) -> Dict:
         """Get order book for a product"""
         try:
+            self._rate_limit()
             response = self.client.get_product_book(product_id=product_id, limit=level)
             
             # Handle response object
@@ -29,8 +29,21 @@ class Config:
     TRAILING_STOP_PCT:  float = float(os.getenv("TRAILING_STOP_PCT", "0.010"))
     DRY_RUN:            bool  = os.getenv("DRY_RUN", "true").lower() == "true"
     LOG_LEVEL:          str   = os.getenv("LOG_LEVEL", "INFO")
+    RISK_PRICE_SOURCE:  str   = os.getenv("RISK_PRICE_SOURCE", "ticker").lower()  # ticker | book (mejor bid en tiempo real)
 
     # Position Sizing
     POSITION_SIZE_PCT:  float = float(os.getenv("POSITION_SIZE_PCT", "0.05"))   # 5% del capital
     MAX_POSITIONS:      int   = int(os.getenv("MAX_POSITIONS", "1"))             # máx posiciones simultáneas
     MIN_TRADE_USDT:     float = float(os.getenv("MIN_TRADE_USDT", "10"))         # mínimo por operación
+
+    # Monitoring
+    LOOP_LAG_THRESHOLD: float = float(os.getenv("LOOP_LAG_THRESHOLD", "0.100"))  # s de lag del event loop para recortar trabajo
+    LATENCY_METRICS_ENABLED: bool = os.getenv("LATENCY_METRICS_ENABLED", "false").lower() == "true"  # histogramas de latencia por etapa
+
+    # Strategies (estrategias I/O-bound como la LLM corren en un pool con plazo)
+    STRATEGY_TIMEOUT_SECONDS: float = float(os.getenv("STRATEGY_TIMEOUT_SECONDS", "20"))  # plazo por defecto de cada estrategia
+    # plazos por estrategia: "llm_strategy:30,otra:10"
+    STRATEGY_TIMEOUTS:  dict  = {name.strip(): float(seconds)
+                                 for name, seconds in (item.split(":") for item in
+                                                       os.getenv("STRATEGY_TIMEOUTS", "").split(",") if item.strip())}
+    STRATEGY_WORKERS:   int   = int(os.getenv("STRATEGY_WORKERS", "4"))              # hilos para estrategias I/O-bound
@@ -1,17 +1,104 @@
+import numpy as np
 import pandas as pd
 import logging
 import time
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from coinbase_client import CoinbaseClient
 import os
 from google.cloud import storage
 import pyarrow.parquet as pq
 import pyarrow as pa
 from pathlib import Path
+from utils.data_quality_monitor import DataQualityMonitor, DataQualityReport
+from utils.monitoring.latency_metrics import timed
 
 logger = logging.getLogger(__name__)
 
+# Column order of decoded candle frames
+CANDLE_FIELDS = ('low', 'high', 'open', 'close', 'volume')
+# Accepted timestamp field names, in order of preference
+CANDLE_TIME_FIELDS = ('start', 'time', 'timestamp')
+# Candle spacing for each Coinbase granularity
+GRANULARITY_MINUTES = {
+    'ONE_MINUTE': 1,
+    'FIVE_MINUTE': 5,
+    'FIFTEEN_MINUTE': 15,
+    'ONE_HOUR': 60,
+    'SIX_HOUR': 360,
+    'ONE_DAY': 1440
+}
+
+
+def _candle_column(candles: List, getter, field: str) -> np.ndarray:
+    """Extract one candle field as float64, invalid values become NaN"""
+    values = [getter(candle, field) for candle in candles]
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+
+
+def decode_candles(candles: List) -> Tuple[pd.DataFrame, int]:
+    """
+    Decode Coinbase candles into an OHLCV DataFrame column by column
+    
+    The response shape (SDK objects or dicts, and which timestamp field is
+    used) is detected once from the first candle, then every field is pulled
+    straight into a float64 array. Rows with a missing/non-positive timestamp
+    or an unparseable value are dropped and counted instead of logged.
+    
+    Args:
+        candles: Candles as returned by CoinbaseClient.get_market_data
+        
+    Returns:
+        Tuple of (DataFrame indexed by sorted 'time', number of invalid rows)
+    """
+    if not candles:
+        return pd.DataFrame(), 0
+    
+    first = candles[0]
+    if hasattr(first, '__dict__'):
+        time_field = next((f for f in CANDLE_TIME_FIELDS if hasattr(first, f)), None)
+        getter = lambda candle, field: getattr(candle, field, 0)
+    else:
+        time_field = next((f for f in CANDLE_TIME_FIELDS if f in first), None)
+        getter = lambda candle, field: candle.get(field, 0)
+    
+    if time_field is None:
+        return pd.DataFrame(), len(candles)
+    
+    times = _candle_column(candles, getter, time_field)
+    columns = {field: _candle_column(candles, getter, field) for field in CANDLE_FIELDS}
+    
+    valid = times > 0
+    for values in columns.values():
+        valid &= ~np.isnan(values)
+    invalid_rows = int(len(times) - valid.sum())
+    
+    if invalid_rows:
+        times = times[valid]
+        columns = {field: values[valid] for field, values in columns.items()}
+    
+    if len(times) == 0:
+        return pd.DataFrame(), invalid_rows
+    
+    # Coinbase returns newest first, so a reversal is usually all that is needed
+    if len(times) > 1 and not np.all(times[1:] >= times[:-1]):
+        if np.all(times[1:] <= times[:-1]):
+            order = slice(None, None, -1)
+        else:
+            order = np.argsort(times, kind='stable')
+        times = times[order]
+        columns = {field: values[order] for field, values in columns.items()}
+    
+    index = pd.DatetimeIndex(pd.to_datetime(times.astype(np.int64), unit='s'), name='time')
+    return pd.DataFrame(columns, index=index), invalid_rows
+
+
 class DataCollector:
     """Collects and processes market data from Coinbase"""
     
@@ -25,6 +112,10 @@ class DataCollector:
         self.local_cache_dir = Path("./data/cache")
         self.local_cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Incremental quality state per "product_granularity": monitor and last checked candle
+        self.live_quality_monitors: Dict[str, DataQualityMonitor] = {}
+        self._live_quality_last: Dict[str, pd.Timestamp] = {}
+        
         # Initialize GCS client if credentials are available
         try:
             self.gcs_client = storage.Client()
@@ -71,67 +162,27 @@ class DataCollector:
                 logger.warning(f"No historical data available for {product_id}")
                 return pd.DataFrame()
             
-            # Convert candle objects to list of dictionaries
-            data = []
-            for candle in candles:
-                try:
-                    if hasattr(candle, '__dict__'):
-                        # Object format - try multiple attribute names
-                        timestamp = None
-                        if hasattr(candle, 'start'):
-                            timestamp = int(candle.start)
-                        elif hasattr(candle, 'time'):
-                            timestamp = int(candle.time)
-                        elif hasattr(candle, 'timestamp'):
-                            timestamp = int(candle.timestamp)
-                        else:
-                            # Skip this candle if no timestamp found
-                            logger.warning(f"Candle object missing timestamp attribute: {dir(candle)}")
-                            continue
-                            
-                        row = {
-                            'time': timestamp,
-                            'low': float(getattr(candle, 'low', 0)),
-                            'high': float(getattr(candle, 'high', 0)),
-                            'open': float(getattr(candle, 'open', 0)),
-                            'close': float(getattr(candle, 'close', 0)),
-                            'volume': float(getattr(candle, 'volume', 0))
-                        }
-                    else:
-                        # Dict format (fallback)
-                        row = {
-                            'time': int(candle.get('start', candle.get('time', candle.get('timestamp', 0)))),
-                            'low': float(candle.get('low', 0)),
-                            'high': float(candle.get('high', 0)),
-                            'open': float(candle.get('open', 0)),
-                            'close': float(candle.get('close', 0)),
-                            'volume': float(candle.get('volume', 0))
-                        }
-                    
-                    # Only add if we have a valid timestamp
-                    if row['time'] > 0:
-                        data.append(row)
-                        
-                except Exception as e:
-                    logger.warning(f"Error processing candle data: {e}, candle: {candle}")
-                    continue
+            df, invalid_rows = decode_candles(candles)
+            if invalid_rows:
+                logger.warning(f"Skipped {invalid_rows} invalid candles for {product_id}")
             
-            # Create DataFrame
-            if not data:
+            if df.empty:
                 logger.warning(f"No valid candle data retrieved for {product_id}")
                 # Return empty DataFrame with correct structure
-                return pd.DataFrame(columns=['low', 'high', 'open', 'close', 'volume'])
-                
-            df = pd.DataFrame(data)
-            
-            # Convert timestamp to datetime
-            df['time'] = pd.to_datetime(df['time'], unit='s')
+                return pd.DataFrame(columns=list(CANDLE_FIELDS))
             
-            # Sort by time
-            df = df.sort_values('time')
+            # Quality gate before indicators/strategies see the candles. The
+            # whole window was just requested, so holes are not re-fetched and
+            # are left as gaps rather than synthetic flat bars.
+            df, report = self.repair_historical_data(df, product_id, granularity,
+                                                     refetch_gaps=False, fill_gaps=False)
+            if df.empty:
+                logger.warning(f"No usable candle data for {product_id} after quality checks")
+                return pd.DataFrame(columns=list(CANDLE_FIELDS))
             
-            # Set time as index
-            df.set_index('time', inplace=True)
+            # Reports strategies can gate on: this window, and every live candle seen so far
+            df.attrs['quality'] = report
+            df.attrs['live_quality'] = self.ingest_live_candles(df, product_id, granularity)
             
             logger.info(f"Retrieved {len(df)} candles for {product_id}")
             return df
@@ -190,6 +241,7 @@ class DataCollector:
                 "price_changes": {"1h": 0.0, "4h": 0.0, "24h": 0.0, "5d": 0.0}
             }
     
+    @timed('data_collector.calculate_indicators')
     def calculate_indicators(self, historical_data: pd.DataFrame, trading_style: str = "day_trading") -> Dict[str, Any]:
         """
         Calculate technical indicators from historical data optimized for trading style
@@ -348,16 +400,7 @@ class DataCollector:
             logger.info(f"Fetching bulk historical data for {product_id} from {start_date} to {end_date}")
             
             # Calculate chunk size based on granularity to respect API limits
-            granularity_minutes = {
-                'ONE_MINUTE': 1,
-                'FIVE_MINUTE': 5,
-                'FIFTEEN_MINUTE': 15,
-                'ONE_HOUR': 60,
-                'SIX_HOUR': 360,
-                'ONE_DAY': 1440
-            }
-            
-            chunk_minutes = granularity_minutes.get(granularity, 60)
+            chunk_minutes = GRANULARITY_MINUTES.get(granularity, 60)
             # Coinbase API limit: 300 candles per request
             chunk_hours = min(300 * chunk_minutes / 60, 24 * 7)  # Max 1 week chunks
             
@@ -414,53 +457,13 @@ class DataCollector:
             return pd.DataFrame()
     
     def _process_candles_to_dataframe(self, candles: List) -> pd.DataFrame:
-        """Convert candle objects to DataFrame (extracted from get_historical_data)"""
-        data = []
-        for candle in candles:
-            try:
-                if hasattr(candle, '__dict__'):
-                    timestamp = None
-                    if hasattr(candle, 'start'):
-                        timestamp = int(candle.start)
-                    elif hasattr(candle, 'time'):
-                        timestamp = int(candle.time)
-                    elif hasattr(candle, 'timestamp'):
-                        timestamp = int(candle.timestamp)
-                    else:
-                        continue
-                        
-                    row = {
-                        'time': timestamp,
-                        'low': float(getattr(candle, 'low', 0)),
-                        'high': float(getattr(candle, 'high', 0)),
-                        'open': float(getattr(candle, 'open', 0)),
-                        'close': float(getattr(candle, 'close', 0)),
-                        'volume': float(getattr(candle, 'volume', 0))
-                    }
-                else:
-                    row = {
-                        'time': int(candle.get('start', candle.get('time', candle.get('timestamp', 0)))),
-                        'low': float(candle.get('low', 0)),
-                        'high': float(candle.get('high', 0)),
-                        'open': float(candle.get('open', 0)),
-                        'close': float(candle.get('close', 0)),
-                        'volume': float(candle.get('volume', 0))
-                    }
-                
-                if row['time'] > 0:
-                    data.append(row)
-                    
-            except Exception as e:
-                logger.warning(f"Error processing candle: {e}")
-                continue
+        """Convert candle objects to DataFrame (see decode_candles)"""
+        df, invalid_rows = decode_candles(candles)
+        if invalid_rows:
+            logger.warning(f"Skipped {invalid_rows} invalid candles")
         
-        if not data:
+        if df.empty:
             return pd.DataFrame()
-            
-        df = pd.DataFrame(data)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        df = df.sort_values('time')
-        df.set_index('time', inplace=True)
         
         return df
     
@@ -616,15 +619,212 @@ class DataCollector:
             logger.error(f"Error in data validation: {e}")
             return {"valid": False, "error": str(e)}
     
+    def repair_historical_data(self, df: pd.DataFrame, product_id: str,
+                               granularity: str = 'ONE_MINUTE', refetch_gaps: bool = True,
+                               fill_gaps: bool = True) -> Tuple[pd.DataFrame, DataQualityReport]:
+        """
+        Run the data-quality gate over historical candles, re-fetching gaps
+        from the API and forward-filling whatever is still missing
+        
+        Args:
+            df: DataFrame with OHLCV data indexed by time
+            product_id: Trading pair the data belongs to
+            granularity: Time interval of the candles
+            refetch_gaps: Request missing bars from the API again
+            fill_gaps: Forward-fill bars that are still missing
+            
+        Returns:
+            Tuple of (repaired DataFrame, DataQualityReport)
+        """
+        def refetch(start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+            candles = self.client.get_market_data(
+                product_id=product_id,
+                granularity=granularity,
+                start_time=start.isoformat() + "Z",
+                end_time=end.isoformat() + "Z"
+            )
+            return self._process_candles_to_dataframe(candles or [])
+        
+        freq = pd.Timedelta(minutes=GRANULARITY_MINUTES.get(granularity, 60))
+        repaired, report = DataQualityMonitor(logger).repair_candles(
+            df, expected_freq=freq, refetch=refetch if refetch_gaps else None, fill_gaps=fill_gaps)
+        log = logger.info if report.passed else logger.warning
+        log(f"Data quality for {product_id}: {report.quality_score}% "
+            f"({report.dropped_rows} dropped, {report.refetched_bars} re-fetched, {report.filled_bars} filled)")
+        return repaired, report
+    
+    def ingest_live_candles(self, df: pd.DataFrame, product_id: str,
+                            granularity: str = 'ONE_MINUTE') -> DataQualityReport:
+        """
+        Check closed candles not seen before with the product's incremental monitor
+        
+        Each new candle costs one DataQualityMonitor.update() call, so
+        polling the same window every cycle does not re-validate it. The
+        still-open candle is left for the cycle after it closes.
+        
+        Args:
+            df: Candles indexed by start time (naive UTC)
+            product_id: Trading pair the candles belong to
+            granularity: Time interval of the candles
+            
+        Returns:
+            DataQualityReport over every live candle checked so far
+        """
+        key = f"{product_id}_{granularity}"
+        step = pd.Timedelta(minutes=GRANULARITY_MINUTES.get(granularity, 60))
+        monitor = self.live_quality_monitors.get(key)
+        if monitor is None:
+            monitor = self.live_quality_monitors[key] = DataQualityMonitor(logger)
+            monitor.reset_live_state(step)
+        
+        closed = df.index <= pd.Timestamp.now(tz='UTC').tz_localize(None) - step
+        last = self._live_quality_last.get(key)
+        new = df[closed & (df.index > last)] if last is not None else df[closed]
+        
+        if not new.empty:
+            volume = new['volume'].to_numpy() if 'volume' in new.columns else np.zeros(len(new))
+            for row in zip(new.index, new['open'].to_numpy(), new['high'].to_numpy(),
+                           new['low'].to_numpy(), new['close'].to_numpy(), volume):
+                monitor.update(*row)
+            self._live_quality_last[key] = new.index[-1]
+        
+        return monitor.live_report()
+    
+    # ===== INCREMENTAL SYNC =====
+    
+    SYNC_MANIFEST_PATH = "historical/_sync_manifest.json"
+    
+    @staticmethod
+    def _partition_path(product_id: str, granularity: str, year: int, month: int) -> str:
+        return f"historical/{product_id}/{granularity}/{year}/{month:02d}/data.parquet"
+    
+    @staticmethod
+    def _content_hash(df: pd.DataFrame) -> str:
+        """Stable hash of a partition's rows (index included)"""
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+    
+    def _load_sync_manifest(self) -> Dict[str, Any]:
+        """Load sync watermarks, preferring the shared GCS copy over the local one"""
+        local_file = self.local_cache_dir / "sync_manifest.json"
+        if self.gcs_client:
+            try:
+                blob = self.gcs_client.bucket(self.gcs_bucket_name).blob(self.SYNC_MANIFEST_PATH)
+                if blob.exists():
+                    return json.loads(blob.download_as_text())
+            except Exception as e:
+                logger.warning(f"Could not load sync manifest from GCS: {e}")
+        if local_file.exists():
+            try:
+                return json.loads(local_file.read_text())
+            except Exception as e:
+                logger.warning(f"Could not read local sync manifest: {e}")
+        return {}
+    
+    def _save_sync_manifest(self, manifest: Dict[str, Any]) -> None:
+        payload = json.dumps(manifest, indent=2, sort_keys=True)
+        (self.local_cache_dir / "sync_manifest.json").write_text(payload)
+        if self.gcs_client:
+            try:
+                blob = self.gcs_client.bucket(self.gcs_bucket_name).blob(self.SYNC_MANIFEST_PATH)
+                blob.upload_from_string(payload, content_type='application/json')
+            except Exception as e:
+                logger.warning(f"Could not upload sync manifest to GCS: {e}")
+    
+    def _sync_product(self, product_id: str, granularity: str, entry: Dict[str, Any],
+                      default_start: datetime, end_date: datetime) -> Dict[str, Any]:
+        """
+        Fetch candles after the watermark and upload the partitions they change
+        
+        Returns:
+            Dict with the updated manifest entry and row/partition counts
+        """
+        result = {"entry": entry, "new_rows": 0, "rows_uploaded": 0,
+                  "partitions_uploaded": [], "partitions_unchanged": 0, "errors": []}
+        
+        step = timedelta(minutes=GRANULARITY_MINUTES.get(granularity, 60))
+        watermark = entry.get("watermark")
+        start_date = datetime.fromisoformat(watermark) + step if watermark else default_start
+        # Only closed candles are stored, so the watermark never covers a bar that can still change
+        last_closed = pd.Timestamp(end_date).floor(step) - step
+        if start_date > last_closed:
+            return result
+        
+        df = self.fetch_bulk_historical_data(
+            product_id=product_id,
+            start_date=start_date,
+            end_date=(last_closed + step).to_pydatetime(),
+            granularity=granularity
+        )
+        if df.empty:
+            return result
+        
+        df = df[df.index <= last_closed]
+        if watermark:
+            df = df[df.index > pd.Timestamp(watermark)]
+        
+        # Repair before storing; the range was just fetched, so holes are filled, not re-fetched
+        df, _ = self.repair_historical_data(df, product_id, granularity, refetch_gaps=False)
+        result["new_rows"] = len(df)
+        if df.empty:
+            return result
+        
+        partitions = dict(entry.get("partitions", {}))
+        for year_month, new_rows in df.groupby(df.index.to_period('M')):
+            key = f"{year_month.year}/{year_month.month:02d}"
+            bucket_path = self._partition_path(product_id, granularity, year_month.year, year_month.month)
+            
+            # Merge into the stored partition for this month. It may exist without a
+            # manifest entry (e.g. written before incremental sync), so always look for it
+            month_data = new_rows
+            existing = self.download_from_gcs(bucket_path, use_cache=True)
+            if not existing.empty:
+                month_data = pd.concat([existing, new_rows])
+                month_data = month_data[~month_data.index.duplicated(keep='last')].sort_index()
+            
+            content_hash = self._content_hash(month_data)
+            if partitions.get(key) == content_hash:
+                result["partitions_unchanged"] += 1
+                continue
+            
+            if self.upload_to_gcs(month_data, bucket_path):
+                partitions[key] = content_hash
+                result["partitions_uploaded"].append(bucket_path)
+                result["rows_uploaded"] += len(month_data)
+                # Keep the local copy current so the next merge needs no download
+                cache_file = self.local_cache_dir / bucket_path.replace('/', '_')
+                month_data.to_parquet(cache_file, compression='gzip')
+            else:
+                result["errors"].append(f"Failed to upload {bucket_path}")
+                # Leave the watermark before this month so it is retried next run
+                df = df[df.index < new_rows.index[0]]
+                break
+        
+        new_entry = dict(entry)
+        new_entry["partitions"] = partitions
+        if not df.empty:
+            new_entry["watermark"] = df.index.max().isoformat()
+        new_entry["last_sync"] = datetime.now().isoformat()
+        result["entry"] = new_entry
+        return result
+    
     def sync_historical_data(self, product_ids: List[str] = None, granularity: str = 'ONE_MINUTE', 
-                           months_back: int = 12) -> Dict[str, Any]:
+                           months_back: int = 12, max_workers: int = 4,
+                           full_resync: bool = False) -> Dict[str, Any]:
         """
         Incremental sync of historical data to GCS
         
+        Each (product, granularity) keeps a high-watermark in a small manifest.
+        Only candles after the watermark are fetched, they are merged into their
+        month partition, and a partition is uploaded only when its content hash
+        changed. Products are synced concurrently.
+        
         Args:
             product_ids: List of trading pairs to sync (default: ['BTC-USD', 'ETH-USD'])
             granularity: Time interval for data
-            months_back: Number of months of historical data to maintain
+            months_back: Number of months to fetch for products without a watermark
+            max_workers: Number of products synced in parallel
+            full_resync: Ignore watermarks and re-fetch the whole window
             
         Returns:
             Dictionary with sync results
@@ -636,52 +836,54 @@ class DataCollector:
             "success": True,
             "products_synced": [],
             "errors": [],
-            "total_rows_synced": 0
+            "total_rows_synced": 0,
+            "new_rows": 0,
+            "partitions_uploaded": 0,
+            "partitions_unchanged": 0
         }
         
         try:
             end_date = datetime.now()
-            start_date = end_date - timedelta(days=months_back * 30)
-            
-            for product_id in product_ids:
-                try:
-                    logger.info(f"Syncing historical data for {product_id}")
-                    
-                    # Fetch bulk historical data
-                    df = self.fetch_bulk_historical_data(
-                        product_id=product_id,
-                        start_date=start_date,
-                        end_date=end_date,
-                        granularity=granularity
-                    )
-                    
-                    if df.empty:
-                        sync_results["errors"].append(f"No data retrieved for {product_id}")
+            default_start = end_date - timedelta(days=months_back * 30)
+            manifest = self._load_sync_manifest()
+            
+            def sync_one(product_id: str) -> Dict[str, Any]:
+                key = f"{product_id}|{granularity}"
+                entry = {} if full_resync else manifest.get(key, {})
+                logger.info(f"Syncing historical data for {product_id} "
+                            f"(watermark: {entry.get('watermark', 'none')})")
+                return self._sync_product(product_id, granularity, entry, default_start, end_date)
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(product_ids)))) as executor:
+                futures = {executor.submit(sync_one, product_id): product_id for product_id in product_ids}
+                for future in as_completed(futures):
+                    product_id = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        error_msg = f"Error syncing {product_id}: {e}"
+                        logger.error(error_msg)
+                        sync_results["errors"].append(error_msg)
                         continue
                     
-                    # Group by month and upload to GCS
-                    for year_month, month_data in df.groupby(df.index.to_period('M')):
-                        year, month = year_month.year, year_month.month
-                        bucket_path = f"historical/{product_id}/{granularity}/{year}/{month:02d}/data.parquet"
-                        
-                        success = self.upload_to_gcs(month_data, bucket_path)
-                        if success:
-                            sync_results["total_rows_synced"] += len(month_data)
-                        else:
-                            sync_results["errors"].append(f"Failed to upload {bucket_path}")
-                    
-                    sync_results["products_synced"].append(product_id)
-                    logger.info(f"Successfully synced {len(df)} rows for {product_id}")
-                    
-                except Exception as e:
-                    error_msg = f"Error syncing {product_id}: {e}"
-                    logger.error(error_msg)
-                    sync_results["errors"].append(error_msg)
+                    manifest[f"{product_id}|{granularity}"] = result["entry"]
+                    sync_results["errors"].extend(result["errors"])
+                    sync_results["total_rows_synced"] += result["rows_uploaded"]
+                    sync_results["new_rows"] += result["new_rows"]
+                    sync_results["partitions_uploaded"] += len(result["partitions_uploaded"])
+                    sync_results["partitions_unchanged"] += result["partitions_unchanged"]
+                    if not result["errors"]:
+                        sync_results["products_synced"].append(product_id)
+                    logger.info(f"Synced {product_id}: {result['new_rows']} new rows, "
+                                f"{len(result['partitions_uploaded'])} partitions uploaded")
+            
+            self._save_sync_manifest(manifest)
             
             if sync_results["errors"]:
                 sync_results["success"] = False
             
-            logger.info(f"Sync complete: {sync_results['total_rows_synced']} total rows synced")
+            logger.info(f"Sync complete: {sync_results['new_rows']} new rows, "
+                        f"{sync_results['partitions_uploaded']} partitions uploaded")
             return sync_results
             
         except Exception as e:
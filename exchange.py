@@ -14,6 +14,7 @@ from binance import AsyncClient, BinanceSocketManager
 from binance.exceptions import BinanceAPIException, BinanceRequestException
 from loguru import logger
 from config import Config
+from order_latency import PriceEvent, current_trace
 
 
 class RateLimiter:
@@ -28,6 +29,9 @@ class RateLimiter:
             logger.warning(f"Rate limit. Esperando {sleep_for:.1f}s")
             await asyncio.sleep(sleep_for)
         self._calls.append(time.monotonic())
+        trace = current_trace()
+        if trace:
+            trace.rate_limit_wait += self._calls[-1] - now
 
 
 class BinanceExchange:
@@ -37,7 +41,11 @@ class BinanceExchange:
         self._bsm    = None
         self._rl     = RateLimiter()
         self._price_cache: Dict[str, float] = {}
+        self._event_cache: Dict[str, PriceEvent] = {}
+        self._book_cache: Dict[str, PriceEvent] = {}
         self._ws_task = None
+        self._trade_task = None
+        self._book_task = None
         self._trailing_high: Dict[str, float] = {}
 
     async def __aenter__(self):
@@ -55,6 +63,10 @@ class BinanceExchange:
     async def disconnect(self):
         if self._ws_task:
             self._ws_task.cancel()
+        if self._trade_task:
+            self._trade_task.cancel()
+        if self._book_task:
+            self._book_task.cancel()
         if self._client:
             await self._client.close_connection()
 
@@ -64,15 +76,44 @@ class BinanceExchange:
                 logger.info(f"WebSocket activo para {symbol}")
                 while True:
                     msg   = await stream.recv()
-                    price = float(msg["c"])
+                    event = PriceEvent.from_ticker(symbol, msg)
+                    price = event.price
                     self._price_cache[symbol] = price
+                    self._event_cache[symbol] = event
                     if callback:
-                        callback(symbol, price)
+                        callback(symbol, price, event)
         self._ws_task = asyncio.create_task(_run())
 
+    async def start_trade_stream(self, symbol: str, callback: Callable):
+        """Stream aggTrade: callback(msg) por cada trade agregado."""
+        async def _run():
+            async with self._bsm.aggtrade_socket(symbol.lower()) as stream:
+                logger.info(f"WebSocket aggTrade activo para {symbol}")
+                while True:
+                    callback(await stream.recv())
+        self._trade_task = asyncio.create_task(_run())
+
+    async def start_book_stream(self, symbol: str, callback: Optional[Callable] = None):
+        """Stream bookTicker: solo se guarda la última cotización (conflación) y se avisa con callback(symbol, event)."""
+        async def _run():
+            async with self._bsm.symbol_book_ticker_socket(symbol.lower()) as stream:
+                logger.info(f"WebSocket bookTicker activo para {symbol}")
+                while True:
+                    event = PriceEvent.from_book_ticker(symbol, await stream.recv())
+                    self._book_cache[symbol] = event
+                    if callback:
+                        callback(symbol, event)
+        self._book_task = asyncio.create_task(_run())
+
+    def get_cached_book(self, symbol: str) -> Optional[PriceEvent]:
+        return self._book_cache.get(symbol)
+
     def get_cached_price(self, symbol: str) -> Optional[float]:
         return self._price_cache.get(symbol)
 
+    def get_cached_event(self, symbol: str) -> Optional[PriceEvent]:
+        return self._event_cache.get(symbol)
+
     async def get_price(self, symbol: str) -> float:
         if symbol in self._price_cache:
             return self._price_cache[symbol]
@@ -93,22 +134,43 @@ class BinanceExchange:
         acc = await self._client.get_account()
         return {b["asset"]: float(b["free"]) for b in acc["balances"] if float(b["free"]) > 0}
 
+    async def get_klines_1m(self, symbol: str, start_ms: int, end_ms: Optional[int] = None) -> list:
+        """Klines de 1m desde start_ms; las páginas de 1000 se piden en paralelo."""
+        end_ms = end_ms or int(time.time() * 1000)
+        page   = 1000 * 60_000
+
+        async def _page(start):
+            await self._rl.wait()
+            return await self._client.get_klines(symbol=symbol, interval="1m", startTime=start, limit=1000)
+
+        pages = await asyncio.gather(*(_page(start) for start in range(start_ms, end_ms + 1, page)))
+        return [k for batch in pages for k in batch]
+
     async def _round_qty(self, symbol: str, qty: float) -> str:
         info = await self._client.get_symbol_info(symbol)
         step = next(f["stepSize"] for f in info["filters"] if f["filterType"] == "LOT_SIZE")
         return str(Decimal(str(qty)).quantize(Decimal(step), rounding=ROUND_DOWN))
 
     async def _place_order(self, **kwargs) -> dict:
+        trace = current_trace()
         for attempt in range(3):
             try:
                 await self._rl.wait()
                 if Config.DRY_RUN:
                     logger.info(f"[DRY RUN] Orden simulada: {kwargs}")
                     return {"orderId": f"DRY_{int(time.time()*1000)}", "executedQty": kwargs.get("quantity", "0"), **kwargs}
-                return await self._client.create_order(**kwargs)
+                sent = time.monotonic()
+                try:
+                    return await self._client.create_order(**kwargs)
+                finally:
+                    if trace:
+                        trace.rest_round_trip += time.monotonic() - sent
             except BinanceAPIException as e:
                 if e.code in (-1003, -1015):
-                    await asyncio.sleep(1.0 * (2 ** attempt))
+                    backoff = 1.0 * (2 ** attempt)
+                    await asyncio.sleep(backoff)
+                    if trace:
+                        trace.rate_limit_wait += backoff
                 else:
                     raise
         raise RuntimeError("No se pudo ejecutar la orden.")
@@ -131,12 +131,22 @@ class GeminiSignal:
         ema26 = ema(prices, 26)
         trend = "ALCISTA (EMA9 > EMA26)" if ema9 > ema26 else "BAJISTA (EMA9 < EMA26)"
 
+        # Volumen por minuto (klines + velas locales de aggTrade)
+        volumes  = market_data.get("volumes", [])
+        vol_line = ""
+        if len(volumes) >= 60:
+            vol1h   = sum(volumes[-60:])
+            window  = volumes[-1440:]
+            avg1h   = sum(window) / len(window) * 60
+            if avg1h:
+                vol_line = f"\n- Volumen 1h: {vol1h:,.2f} ({vol1h / avg1h:.1f}x la media horaria)"
+
         return f"""Datos para {market_data.get('symbol', 'BTCUSDT')}:
 - Precio actual: ${last:,.2f}
 - Cambio 1h: {ch1h:+.2f}%
 - Cambio 24h: {ch24h:+.2f}%
 - EMA 9: ${ema9:,.2f} | EMA 26: ${ema26:,.2f}
-- Tendencia: {trend}
+- Tendencia: {trend}{vol_line}
 Cual es tu senal?"""
 
     async def get_signal(self, market_data: dict) -> dict:
@@ -20,6 +20,7 @@ from config import (
     EXPECTED_HOLDING_PERIOD,
     DECISION_INTERVAL_MINUTES
 )
+from utils.monitoring.latency_metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -124,6 +125,7 @@ class LLMAnalyzer:
                 "risk_assessment": "high"
             }
 
+    @timed('llm.call_genai')
     def _call_genai(self, prompt: str) -> Dict:
         """Call NEW google-genai library for text generation"""
         try:
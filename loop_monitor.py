@@ -0,0 +1,179 @@
+"""
+loop_monitor.py
+---------------
+Salud del event loop de asyncio.
+- Mide continuamente el retraso de planificación (lag) con una tarea sonda
+- Atribuye los callbacks lentos (hook sobre asyncio.Handle._run)
+- Indica cuándo recortar trabajo no crítico y aplaza lo que se pueda
+  hasta que el loop se recupere, para que los checks de riesgo no esperen
+"""
+
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Callable, Optional
+
+LAG_THRESHOLD  = 0.100   # s de lag a partir de los que se recorta trabajo
+RECOVER_RATIO  = 0.5     # se vuelve a normal por debajo de threshold * ratio
+PROBE_INTERVAL = 0.050   # s entre sondas
+SLOW_CALLBACK  = 0.050   # s para considerar lento un callback
+WINDOW         = 200     # muestras de lag (~10 s con la sonda por defecto)
+MAX_DEFERRED   = 100     # trabajos aplazados como máximo (se descartan los más viejos)
+
+
+def _callback_name(handle: asyncio.Handle) -> str:
+    callback = getattr(handle, "_callback", None)
+    owner    = getattr(callback, "__self__", None)
+    # Los pasos de una Task se planifican como Task.__step / __wakeup
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        return getattr(coro, "__qualname__", None) or owner.get_name()
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+class LoopMonitor:
+
+    _hooked: Optional["LoopMonitor"] = None   # solo un monitor puede tener el hook instalado
+
+    def __init__(self,
+                 threshold: float = LAG_THRESHOLD,
+                 interval: float = PROBE_INTERVAL,
+                 slow_callback: float = SLOW_CALLBACK,
+                 window: int = WINDOW,
+                 on_overload: Optional[Callable] = None,
+                 on_recover: Optional[Callable] = None,
+                 on_slow_callback: Optional[Callable] = None):
+        """
+        on_overload(lag, top_callbacks): al pasar el umbral
+        on_recover(lag):                 al volver por debajo de threshold * RECOVER_RATIO
+        on_slow_callback(name, took):    por cada callback más lento que slow_callback
+        """
+        self.threshold        = threshold
+        self.interval         = interval
+        self.slow_callback    = slow_callback
+        self.on_overload      = on_overload
+        self.on_recover       = on_recover
+        self.on_slow_callback = on_slow_callback
+
+        self.lag             = 0.0
+        self.max_lag         = 0.0
+        self.overloaded      = False
+        self.shed_count      = 0
+        self.deferred_errors = 0
+        self.slow_callbacks  = Counter()
+        self._lags           = deque(maxlen=window)
+        self._deferred       = deque(maxlen=MAX_DEFERRED)
+        self._task           = None
+        self._original_run   = None
+
+    # ── Ciclo de vida ──────────────────────────────────────────────────
+    def start(self):
+        """Arranca la sonda en el loop actual e instala el hook de callbacks lentos."""
+        if self._task and not self._task.done():
+            return
+        self._install_hook()
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._uninstall_hook()
+
+    async def _probe(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record_lag(max(0.0, time.monotonic() - expected))
+
+    # ── Lag ────────────────────────────────────────────────────────────
+    def record_lag(self, lag: float):
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self._lags.append(lag)
+
+        if not self.overloaded and lag >= self.threshold:
+            self.overloaded = True
+            if self.on_overload:
+                self.on_overload(lag, self.slow_callbacks.most_common(3))
+        elif self.overloaded and lag < self.threshold * RECOVER_RATIO:
+            self.overloaded = False
+            if self.on_recover:
+                self.on_recover(lag)
+
+    def percentile(self, pct: float) -> float:
+        if not self._lags:
+            return 0.0
+        values = sorted(self._lags)
+        return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+    def stats(self) -> dict:
+        return {
+            "lag_ms":          round(self.lag * 1000, 2),
+            "p50_ms":          round(self.percentile(50) * 1000, 2),
+            "p99_ms":          round(self.percentile(99) * 1000, 2),
+            "max_ms":          round(self.max_lag * 1000, 2),
+            "overloaded":      self.overloaded,
+            "shed":            self.shed_count,
+            "deferred":        len(self._deferred),
+            "deferred_errors": self.deferred_errors,
+            "slow_callbacks":  dict(self.slow_callbacks.most_common(5)),
+        }
+
+    # ── Callbacks lentos ───────────────────────────────────────────────
+    def _record_slow(self, handle: asyncio.Handle, took: float):
+        name = _callback_name(handle)
+        self.slow_callbacks[name] += 1
+        if self.on_slow_callback:
+            self.on_slow_callback(name, took)
+
+    def _install_hook(self):
+        if LoopMonitor._hooked is not None:
+            return
+        monitor  = self
+        original = asyncio.Handle._run
+
+        def _run(handle):
+            start = time.monotonic()
+            try:
+                return original(handle)
+            finally:
+                took = time.monotonic() - start
+                if took >= monitor.slow_callback:
+                    monitor._record_slow(handle, took)
+
+        self._original_run = original
+        asyncio.Handle._run = _run
+        LoopMonitor._hooked = self
+
+    def _uninstall_hook(self):
+        if LoopMonitor._hooked is self:
+            asyncio.Handle._run = self._original_run
+            LoopMonitor._hooked = None
+
+    # ── Load shedding ──────────────────────────────────────────────────
+    def should_shed(self) -> bool:
+        """True si hay que saltarse trabajo no crítico en esta vuelta."""
+        if self.overloaded:
+            self.shed_count += 1
+        return self.overloaded
+
+    async def run_or_defer(self, fn: Callable, *args, **kwargs):
+        """Ejecuta la corrutina fn ahora o, con el loop sobrecargado, la aplaza."""
+        if self.should_shed():
+            self._deferred.append((fn, args, kwargs))
+            return None
+        return await fn(*args, **kwargs)
+
+    async def flush_deferred(self) -> int:
+        """Ejecuta lo aplazado mientras el loop siga sano. Devuelve cuántos trabajos corrió."""
+        ran = 0
+        while self._deferred and not self.overloaded:
+            fn, args, kwargs = self._deferred.popleft()
+            try:
+                await fn(*args, **kwargs)
+            except Exception:
+                # Trabajo no crítico: un fallo no debe tumbar el loop de decisión
+                self.deferred_errors += 1
+            ran += 1
+        return ran
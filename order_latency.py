@@ -0,0 +1,200 @@
+"""
+order_latency.py
+----------------
+Trazado de latencia tick → orden.
+- Cada evento de precio lleva su hora de exchange y de recepción
+- Cada orden guarda su desglose: red, cola, decisión, preparación,
+  espera de rate limit y round trip REST
+- Ventana móvil de órdenes con percentiles para el dashboard
+"""
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+LATENCY_FILE = Path(__file__).parent / "logs" / "latency.json"
+WINDOW       = 200
+COMPONENTS   = ("network_in", "queueing", "decision", "preparation", "rate_limit_wait", "rest_round_trip")
+PERCENTILES  = (50, 90, 95, 99)
+
+# Traza de la orden en curso; cada task de asyncio tiene su propia copia
+_current_trace: ContextVar[Optional["OrderTrace"]] = ContextVar("order_trace", default=None)
+
+
+@dataclass
+class PriceEvent:
+    symbol:     str
+    price:      float
+    event_time: float   # hora del exchange (epoch s, campo "E" del ticker)
+    recv_time:  float   # hora local de recepción (epoch s)
+    recv_mono:  float   # time.monotonic() al recibir
+    ask:        float = 0.0   # solo eventos de bookTicker (price = mejor bid)
+
+    @classmethod
+    def from_ticker(cls, symbol: str, msg: dict) -> "PriceEvent":
+        recv_time, recv_mono = time.time(), time.monotonic()
+        event_ms = msg.get("E")
+        return cls(
+            symbol=symbol,
+            price=float(msg["c"]),
+            event_time=event_ms / 1000 if event_ms else recv_time,
+            recv_time=recv_time,
+            recv_mono=recv_mono,
+        )
+
+    @classmethod
+    def from_book_ticker(cls, symbol: str, msg: dict) -> "PriceEvent":
+        """bookTicker: el precio es el mejor bid, al que se puede vender un largo."""
+        recv_time, recv_mono = time.time(), time.monotonic()
+        event_ms = msg.get("E")  # solo lo envía futuros; en spot cuenta como 0 de red
+        return cls(
+            symbol=symbol,
+            price=float(msg["b"]),
+            event_time=event_ms / 1000 if event_ms else recv_time,
+            recv_time=recv_time,
+            recv_mono=recv_mono,
+            ask=float(msg["a"]),
+        )
+
+    @property
+    def network_in(self) -> float:
+        """Segundos entre el evento en el exchange y su recepción (incluye desfase de relojes)."""
+        return self.recv_time - self.event_time
+
+
+@dataclass
+class OrderTrace:
+    event:           PriceEvent
+    reason:          str
+    decision_start:  float                    # monotonic al empezar a decidir con este tick
+    decision_end:    float = 0.0
+    task_start:      float = 0.0              # monotonic al empezar a ejecutar la orden
+    ack:             float = 0.0              # monotonic al recibir la respuesta de la orden
+    rate_limit_wait: float = 0.0              # acumulado en RateLimiter.wait y backoffs
+    rest_round_trip: float = 0.0              # acumulado en create_order
+    order_id:        str   = ""
+    side:            str   = ""
+    timestamp:       float = field(default_factory=time.time)
+
+    def decided(self) -> "OrderTrace":
+        self.decision_end = time.monotonic()
+        return self
+
+    def acknowledged(self, order: Optional[dict] = None):
+        if not self.ack:
+            self.ack = time.monotonic()
+        if order:
+            self.order_id = str(order.get("orderId", ""))
+            self.side     = order.get("side", "")
+
+    def breakdown(self) -> dict:
+        """Desglose en milisegundos; los componentes suman total_ms."""
+        decision_end = self.decision_end or self.decision_start
+        task_start   = self.task_start or decision_end
+        ack          = self.ack or time.monotonic()
+        parts = {
+            "network_in":      self.event.network_in,
+            "queueing":        (self.decision_start - self.event.recv_mono) + (task_start - decision_end),
+            "decision":        decision_end - self.decision_start,
+            "preparation":     (ack - task_start) - self.rate_limit_wait - self.rest_round_trip,
+            "rate_limit_wait": self.rate_limit_wait,
+            "rest_round_trip": self.rest_round_trip,
+        }
+        result = {f"{name}_ms": round(value * 1000, 3) for name, value in parts.items()}
+        result["total_ms"] = round((self.event.network_in + ack - self.event.recv_mono) * 1000, 3)
+        result.update({
+            "symbol":    self.event.symbol,
+            "reason":    self.reason,
+            "side":      self.side,
+            "order_id":  self.order_id,
+            "price":     self.event.price,
+            "timestamp": self.timestamp,
+        })
+        return result
+
+
+# ── Traza activa ───────────────────────────────────────────────────────
+@contextmanager
+def tracing(trace: Optional[OrderTrace]):
+    """Activa la traza para el código de la orden (RateLimiter, _place_order) y marca el ack al salir."""
+    if trace is None:
+        yield None
+        return
+    trace.task_start = time.monotonic()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+        trace.acknowledged()
+    finally:
+        _current_trace.reset(token)
+
+
+def current_trace() -> Optional[OrderTrace]:
+    return _current_trace.get()
+
+
+# ── Ventana móvil ──────────────────────────────────────────────────────
+def _percentile(sorted_values: list, pct: float) -> float:
+    # Nearest-rank
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class LatencyTracker:
+
+    def __init__(self, window: int = WINDOW, path: Path = LATENCY_FILE):
+        self.path    = Path(path)
+        self._orders = deque(maxlen=window)
+        # Continuar la ventana tras un reinicio
+        for order in load_latency(self.path).get("orders", [])[-window:]:
+            self._orders.append(order)
+
+    def record(self, trace: OrderTrace) -> dict:
+        breakdown = trace.breakdown()
+        self._orders.append(breakdown)
+        return breakdown
+
+    @property
+    def orders(self) -> list:
+        return list(self._orders)
+
+    def percentiles(self) -> dict:
+        stats = {}
+        for name in COMPONENTS + ("total",):
+            values = sorted(o[f"{name}_ms"] for o in self._orders if f"{name}_ms" in o)
+            if not values:
+                continue
+            stats[name] = {f"p{p}": _percentile(values, p) for p in PERCENTILES}
+            stats[name]["max"]  = values[-1]
+            stats[name]["mean"] = round(sum(values) / len(values), 3)
+        return stats
+
+    def snapshot(self) -> dict:
+        return {
+            "updated":     time.time(),
+            "window":      self._orders.maxlen,
+            "count":       len(self._orders),
+            "percentiles": self.percentiles(),
+            "orders":      list(self._orders),
+        }
+
+    def save(self, data: Optional[dict] = None):
+        """Guarda el snapshot; pasa uno ya tomado para escribirlo desde otro hilo."""
+        data = data if data is not None else self.snapshot()
+        self.path.parent.mkdir(exist_ok=True)
+        self.path.write_text(json.dumps(data, indent=2))
+
+
+def load_latency(path: Path = LATENCY_FILE) -> dict:
+    """Lee el último snapshot guardado (para el dashboard)."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (ValueError, OSError):
+        return {}
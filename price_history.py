@@ -0,0 +1,132 @@
+"""
+price_history.py
+----------------
+Histórico de cierres de 1 minuto para las decisiones del bot.
+- Arranque en caliente: store local (logs/) + klines REST para cubrir el hueco
+- Los ticks en vivo actualizan la vela del minuto en curso y las velas
+  de 1m de bar_builder fijan su volumen al cerrar
+- Los minutos sin datos se rellenan con el último cierre, así la posición
+  en el buffer equivale a minutos (prices[-60] = hace 1h, prices[-1440] = 24h)
+"""
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+MINUTE_MS       = 60_000
+HISTORY_MINUTES = 1500   # > 1440 para el cambio 24h del prompt de Gemini
+MIN_HISTORY     = 30     # minutos necesarios para decidir
+STORE_DIR       = Path(__file__).parent / "logs"
+
+
+class PriceHistory:
+
+    def __init__(self, symbol: str, maxlen: int = HISTORY_MINUTES, path: Optional[Path] = None):
+        self.symbol  = symbol
+        self.maxlen  = maxlen
+        self.path    = Path(path) if path else STORE_DIR / f"klines_{symbol}_1m.json"
+        self._times   = deque(maxlen=maxlen)   # open time (ms) de cada minuto, contiguos
+        self._closes  = deque(maxlen=maxlen)
+        self._volumes = deque(maxlen=maxlen)
+        self._saved_minute: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._closes)
+
+    @property
+    def closes(self) -> list:
+        return list(self._closes)
+
+    @property
+    def volumes(self) -> list:
+        return list(self._volumes)
+
+    @property
+    def last_minute(self) -> Optional[int]:
+        return self._times[-1] if self._times else None
+
+    @property
+    def ready(self) -> bool:
+        return len(self._closes) >= MIN_HISTORY
+
+    # ── Actualización ──────────────────────────────────────────────────
+    def _put(self, minute: int, close: float, volume: Optional[float]):
+        if not self._times or minute > self._times[-1]:
+            if self._times:
+                # Minutos sin datos: mismo cierre, volumen 0
+                missing = min((minute - self._times[-1]) // MINUTE_MS - 1, self.maxlen)
+                last    = self._closes[-1]
+                for i in range(missing, 0, -1):
+                    self._times.append(minute - i * MINUTE_MS)
+                    self._closes.append(last)
+                    self._volumes.append(0.0)
+            self._times.append(minute)
+            self._closes.append(close)
+            self._volumes.append(volume or 0.0)
+            return
+
+        # Minuto ya presente: los tiempos son contiguos, el índice sale directo
+        index = len(self._times) - 1 - (self._times[-1] - minute) // MINUTE_MS
+        if index < 0:
+            return  # anterior a la ventana
+        self._closes[index] = close
+        if volume is not None:
+            self._volumes[index] = volume
+
+    def on_tick(self, price: float, timestamp: Optional[float] = None):
+        """Precio en vivo: actualiza (o abre) la vela del minuto en curso."""
+        timestamp = time.time() if timestamp is None else timestamp
+        self._put(int(timestamp // 60) * MINUTE_MS, price, None)
+
+    def on_bar(self, start: int, close: float, volume: float):
+        """Vela de 1m cerrada (bar_builder): fija cierre y volumen reales del minuto."""
+        self._put(int(start), close, volume)
+
+    def load_klines(self, klines: list) -> int:
+        """Carga klines de Binance ([open_time, open, high, low, close, volume, ...])."""
+        for k in sorted(klines, key=lambda k: k[0]):
+            self._put(int(k[0]), float(k[4]), float(k[5]))
+        return len(klines)
+
+    def fetch_start(self, now: Optional[float] = None) -> int:
+        """Open time desde el que pedir klines para cubrir el hueco hasta ahora."""
+        now    = time.time() if now is None else now
+        oldest = int(now // 60) * MINUTE_MS - (self.maxlen - 1) * MINUTE_MS
+        return max(oldest, self.last_minute) if self.last_minute else oldest
+
+    # ── Store local ────────────────────────────────────────────────────
+    def needs_save(self) -> bool:
+        """True si hay un minuto nuevo desde el último guardado."""
+        return bool(self._times) and self._times[-1] != self._saved_minute
+
+    def snapshot(self) -> dict:
+        self._saved_minute = self.last_minute
+        return {
+            "symbol":   self.symbol,
+            "interval": "1m",
+            "rows":     [list(r) for r in zip(self._times, self._closes, self._volumes)],
+        }
+
+    def save(self, data: Optional[dict] = None):
+        """Guarda el snapshot; pasa uno ya tomado para escribirlo desde otro hilo."""
+        data = data if data is not None else self.snapshot()
+        self.path.parent.mkdir(exist_ok=True)
+        self.path.write_text(json.dumps(data, separators=(",", ":")))
+
+    def load_store(self, now: Optional[float] = None) -> int:
+        """Carga el store local, descartando minutos fuera de la ventana. Devuelve filas cargadas."""
+        if not self.path.exists():
+            return 0
+        try:
+            data = json.loads(self.path.read_text())
+        except (ValueError, OSError):
+            return 0
+        if data.get("symbol") != self.symbol:
+            return 0
+        oldest = self.fetch_start(now) if not self._times else 0
+        rows   = [r for r in data.get("rows", []) if r[0] >= oldest]
+        for minute, close, volume in rows:
+            self._put(int(minute), float(close), float(volume))
+        self._saved_minute = self.last_minute
+        return len(rows)
@@ -4,9 +4,13 @@ Market-regime aware strategy selection with hierarchical decision making
 """
 
 import logging
-from typing import Dict, List, Optional
-from .base_strategy import BaseStrategy, TradingSignal
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .base_strategy import (BaseStrategy, TradingSignal, ACTION_HOLD, ACTION_BUY, ACTION_SELL,
+                            ACTION_NAMES, batch_row_to_inputs)
 from .strategy_manager import StrategyManager
+from utils.monitoring.latency_metrics import timed
 
 class AdaptiveStrategyManager(StrategyManager):
     """
@@ -215,6 +219,7 @@ class AdaptiveStrategyManager(StrategyManager):
             position_size_multiplier=1.0
         )
     
+    @timed('strategy_manager.get_combined_signal')
     def get_combined_signal(self, market_data: Dict, technical_indicators: Dict, portfolio: Optional[Dict] = None) -> TradingSignal:
         """
         Override parent method to use adaptive strategy selection
@@ -270,3 +275,207 @@ class AdaptiveStrategyManager(StrategyManager):
             self.logger.info(f"Failed to record decision for performance tracking: {e}")
         
         return combined_signal
+    
+    def detect_market_regime_batch(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Array version of detect_market_regime_enhanced() for an analyze_batch() frame
+        
+        Args:
+            df: One row per bar with change_24h, change_5d, change_7d and bb_* columns
+            
+        Returns:
+            Array of regime names, one per row
+        """
+        column = BaseStrategy._batch_column
+        change_24h = np.abs(column(df, 'change_24h'))
+        change_5d = np.abs(column(df, 'change_5d'))
+        change_7d = column(df, 'change_7d')
+        bb_upper = column(df, 'bb_upper')
+        bb_lower = column(df, 'bb_lower')
+        bb_middle = column(df, 'bb_middle', 1.0)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_width_pct = np.where(bb_middle > 0, ((bb_upper - bb_lower) / bb_middle) * 100, 2.0)
+        
+        bear = change_7d < -5
+        moving = (change_24h > 4) | (change_5d > 8)
+        regimes = np.select(
+            [bear & (change_24h < 1.5) & (bb_width_pct < 3), bear,
+             moving & (bb_width_pct > 4), moving,
+             (change_24h < 1.5) & (bb_width_pct < 2), bb_width_pct > 5],
+            ['bear_ranging', 'volatile', 'volatile', 'trending', 'ranging', 'volatile'],
+            default='ranging')
+        return regimes.astype(object)
+    
+    def analyze_all_strategies_batch(self, df: pd.DataFrame,
+                                     row_inputs: Optional[Callable[[], List[Tuple[Dict, Dict]]]] = None
+                                     ) -> Dict[str, pd.DataFrame]:
+        """
+        Run every strategy over an analyze_batch() frame
+        
+        Strategies without analyze_batch(), or whose analyze_batch() returns None
+        (e.g. the LLM strategy with a live analyzer), are run through analyze()
+        row by row, with the same Bollinger mapping and error fallback as
+        analyze_all_strategies().
+        
+        Args:
+            df: One row per bar, columns as described in base_strategy
+            row_inputs: Optional callable returning the (market_data, technical_indicators)
+                        dicts for every row; defaults to batch_row_to_inputs()
+            
+        Returns:
+            Dict of strategy name -> DataFrame with action, confidence and position_size_multiplier
+        """
+        strategy_signals = {}
+        rows = None
+        
+        for name, strategy in self.strategies.items():
+            batch = strategy.analyze_batch(df) if hasattr(strategy, 'analyze_batch') else None
+            if batch is not None:
+                strategy_signals[name] = batch
+                continue
+            
+            if rows is None:
+                rows = row_inputs() if row_inputs else [batch_row_to_inputs(row) for _, row in df.iterrows()]
+            
+            actions, confidences, multipliers = [], [], []
+            for market_data, technical_indicators in rows:
+                mapped_indicators = technical_indicators.copy()
+                if 'bb_upper' in technical_indicators:
+                    mapped_indicators['bollinger'] = {
+                        'upper': technical_indicators.get('bb_upper', 0),
+                        'lower': technical_indicators.get('bb_lower', 0),
+                        'middle': technical_indicators.get('bb_middle', 0)
+                    }
+                try:
+                    signal = strategy.analyze(market_data, mapped_indicators, {})
+                except Exception as e:
+                    self.logger.error(f"Error in {name} strategy: {e}")
+                    signal = TradingSignal(action="HOLD", confidence=0, reasoning=f"Strategy error: {str(e)}")
+                actions.append(signal.action)
+                confidences.append(float(signal.confidence))
+                multipliers.append(float(signal.position_size_multiplier))
+            
+            strategy_signals[name] = pd.DataFrame({
+                'action': np.array(actions, dtype=object),
+                'confidence': np.array(confidences, dtype=np.float64),
+                'position_size_multiplier': np.array(multipliers, dtype=np.float64)
+            }, index=df.index)
+        
+        return strategy_signals
+    
+    def combine_strategy_signals_batch(self, strategy_signals: Dict[str, pd.DataFrame],
+                                       market_regimes: np.ndarray) -> pd.DataFrame:
+        """
+        Array version of _combine_strategy_signals_adaptive()
+        
+        Applies the regime priority order, adaptive thresholds and secondary
+        confirmation/veto adjustments with masks over all rows at once.
+        
+        Args:
+            strategy_signals: Dict of strategy name -> per-row action/confidence/position_size_multiplier
+            market_regimes: Regime name per row
+            
+        Returns:
+            DataFrame with action, confidence, position_size_multiplier, market_regime,
+            primary_strategy ('' where no strategy met its threshold) and reasoning
+        """
+        market_regimes = np.asarray(market_regimes, dtype=object)
+        n = len(market_regimes)
+        index = next(iter(strategy_signals.values())).index if strategy_signals else pd.RangeIndex(n)
+        
+        actions, confidences, multipliers = {}, {}, {}
+        for name, signals in strategy_signals.items():
+            action = signals['action'].to_numpy()
+            actions[name] = np.select([action == 'BUY', action == 'SELL'], [ACTION_BUY, ACTION_SELL], ACTION_HOLD)
+            confidences[name] = signals['confidence'].to_numpy(dtype=np.float64)
+            multipliers[name] = signals['position_size_multiplier'].to_numpy(dtype=np.float64)
+        
+        # Fallback for rows where no strategy qualifies: HOLD at average confidence
+        avg_confidence = np.zeros(n)
+        for name in strategy_signals:
+            avg_confidence = avg_confidence + confidences[name]
+        if strategy_signals:
+            avg_confidence = avg_confidence / len(strategy_signals)
+        
+        final_action = np.full(n, ACTION_HOLD)
+        final_confidence = avg_confidence
+        final_multiplier = np.ones(n)
+        primary_strategy = np.full(n, '', dtype=object)
+        decided = np.zeros(n, dtype=bool)
+        
+        for market_regime in pd.unique(market_regimes):
+            in_regime = market_regimes == market_regime
+            strategy_priority = self.regime_strategy_priority.get(
+                market_regime, ["llm_strategy", "trend_following", "mean_reversion", "momentum"])
+            secondary_strategies = [s for s in strategy_priority[1:3] if s in strategy_signals]
+            
+            for strategy_name in strategy_priority:
+                if strategy_name not in strategy_signals:
+                    continue
+                
+                action = actions[strategy_name]
+                confidence = confidences[strategy_name]
+                thresholds = self.adaptive_thresholds.get(market_regime, {}).get(strategy_name, {})
+                threshold = np.where(action == ACTION_SELL,
+                                     thresholds.get('sell', self.default_thresholds['sell']),
+                                     thresholds.get('buy', self.default_thresholds['buy']))
+                
+                confirmation_bonus = np.zeros(n)
+                veto_penalty = np.zeros(n)
+                for secondary_strategy in secondary_strategies:
+                    secondary_action = actions[secondary_strategy]
+                    agrees = secondary_action == action
+                    confirmation_bonus += np.where(agrees, 5, 0)
+                    veto_penalty += np.where(~agrees & (secondary_action != ACTION_HOLD)
+                                             & (confidences[secondary_strategy] > 60), 10, 0)
+                
+                adjusted = np.clip(confidence + confirmation_bonus - veto_penalty, 0, 95)
+                accept = in_regime & ~decided & (confidence >= threshold) & (adjusted >= threshold)
+                
+                final_action = np.where(accept, action, final_action)
+                final_confidence = np.where(accept, adjusted, final_confidence)
+                final_multiplier = np.where(accept, multipliers[strategy_name], final_multiplier)
+                primary_strategy[accept] = strategy_name
+                decided |= accept
+        
+        reasoning = np.where(
+            decided,
+            "Adaptive " + market_regimes + " market strategy: " + primary_strategy,
+            "No strategy meets adaptive thresholds in " + market_regimes + " market")
+        
+        return pd.DataFrame({
+            'action': ACTION_NAMES[final_action],
+            'confidence': final_confidence,
+            'position_size_multiplier': final_multiplier,
+            'market_regime': market_regimes,
+            'primary_strategy': primary_strategy,
+            'reasoning': reasoning
+        }, index=index)
+    
+    def get_combined_signal_batch(self, df: pd.DataFrame,
+                                  row_inputs: Optional[Callable[[], List[Tuple[Dict, Dict]]]] = None
+                                  ) -> pd.DataFrame:
+        """
+        Batch version of get_combined_signal() for backtests
+        
+        Produces the same action and confidence per row as calling
+        get_combined_signal() on each bar. Decisions are not recorded with
+        the performance tracker.
+        
+        Args:
+            df: One row per bar, columns as described in base_strategy
+            row_inputs: Optional per-row dicts for strategies without analyze_batch()
+            
+        Returns:
+            DataFrame as returned by combine_strategy_signals_batch()
+        """
+        strategy_signals = self.analyze_all_strategies_batch(df, row_inputs)
+        market_regimes = self.detect_market_regime_batch(df)
+        combined = self.combine_strategy_signals_batch(strategy_signals, market_regimes)
+        combined.index = df.index
+        
+        if len(market_regimes):
+            self.current_market_regime = market_regimes[-1]
+        
+        return combined
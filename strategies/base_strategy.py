@@ -6,6 +6,40 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import logging
+import numpy as np
+import pandas as pd
+
+# Columns of the frame accepted by analyze_batch(). Each row carries the same
+# inputs analyze() receives as dicts; NaN means the key is absent.
+BATCH_PRICE_CHANGE_COLUMNS = {'change_1h': '1h', 'change_4h': '4h', 'change_24h': '24h', 'change_5d': '5d',
+                              'change_7d': '7d'}
+BATCH_VOLUME_COLUMNS = {'volume_current': 'current', 'volume_average': 'average'}
+BATCH_INDICATOR_COLUMNS = ['current_price', 'rsi', 'macd', 'macd_signal', 'macd_histogram',
+                           'bb_upper', 'bb_lower', 'bb_middle']
+
+# Action codes used by batch analysis
+ACTION_HOLD, ACTION_BUY, ACTION_SELL = 0, 1, 2
+ACTION_NAMES = np.array(['HOLD', 'BUY', 'SELL'], dtype=object)
+
+
+def batch_row_to_inputs(row: pd.Series) -> Tuple[Dict, Dict]:
+    """
+    Build the (market_data, technical_indicators) dicts that analyze()
+    would receive for one row of an analyze_batch() input frame
+    """
+    def present(name):
+        return name in row.index and not pd.isna(row[name])
+    
+    market_data = {'price_changes': {key: float(row[col])
+                                     for col, key in BATCH_PRICE_CHANGE_COLUMNS.items() if present(col)}}
+    if present('price'):
+        market_data['price'] = float(row['price'])
+    volume = {key: float(row[col]) for col, key in BATCH_VOLUME_COLUMNS.items() if present(col)}
+    if volume:
+        market_data['volume'] = volume
+    
+    technical_indicators = {name: float(row[name]) for name in BATCH_INDICATOR_COLUMNS if present(name)}
+    return market_data, technical_indicators
 
 @dataclass
 class TradingSignal:
@@ -20,6 +54,10 @@ class TradingSignal:
 class BaseStrategy(ABC):
     """Base class for all trading strategies"""
     
+    # Strategies that block on network calls (LLM, news) are run on the
+    # StrategyManager worker pool with a deadline instead of inline
+    io_bound = False
+    
     def __init__(self, name: str, config):
         self.name = name
         self.config = config
@@ -58,6 +96,32 @@ class BaseStrategy(ABC):
         """
         pass
     
+    @staticmethod
+    def _batch_column(df: pd.DataFrame, name: str, default: float = 0.0) -> np.ndarray:
+        """Column of an analyze_batch() frame as float64, absent/NaN values replaced by default"""
+        if name not in df.columns:
+            return np.full(len(df), default, dtype=np.float64)
+        values = df[name].to_numpy(dtype=np.float64)
+        return np.where(np.isnan(values), default, values)
+    
+    @staticmethod
+    def _batch_result(index: pd.Index, action: np.ndarray, confidence: np.ndarray,
+                      position_size_multiplier: np.ndarray, error: np.ndarray = None) -> pd.DataFrame:
+        """
+        Assemble analyze_batch() output; rows flagged in `error` get the same
+        HOLD/0 confidence fallback analyze() returns when it raises
+        """
+        if error is not None and error.any():
+            action = np.where(error, ACTION_HOLD, action)
+            confidence = np.where(error, 0.0, confidence)
+            position_size_multiplier = np.where(error, 1.0, position_size_multiplier)
+        
+        return pd.DataFrame({
+            'action': ACTION_NAMES[action],
+            'confidence': confidence.astype(np.float64),
+            'position_size_multiplier': position_size_multiplier.astype(np.float64)
+        }, index=index)
+    
     def is_applicable(self, 
                      market_data: Dict,
                      portfolio: Dict) -> bool:
@@ -4,12 +4,16 @@ Enhanced for Phase 3 with news sentiment integration
 """
 
 import logging
-from typing import Dict
-from .base_strategy import BaseStrategy, TradingSignal
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from .base_strategy import BaseStrategy, TradingSignal, ACTION_HOLD, ACTION_BUY, ACTION_SELL
 
 class LLMStrategy(BaseStrategy):
     """Strategy that uses LLM analysis for trading decisions with Phase 3 enhancements"""
     
+    io_bound = True  # LLM and news sentiment calls take seconds
+    
     def __init__(self, config, llm_analyzer=None, news_sentiment_analyzer=None):
         super().__init__("llm_strategy", config)
         self.llm_analyzer = llm_analyzer
@@ -67,6 +71,49 @@ class LLMStrategy(BaseStrategy):
                 reasoning=f"Enhanced LLM analysis error: {str(e)}"
             )
     
+    def analyze_batch(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Analyze every row of a frame with one batch LLM call
+        
+        Only available when the LLM analyzer provides analyze_market_batch()
+        (e.g. the backtest simulator); otherwise returns None and callers fall
+        back to analyze() per row. News sentiment is fetched once per batch.
+        
+        Args:
+            df: One row per bar, columns as described in base_strategy
+            
+        Returns:
+            DataFrame with action, confidence and position_size_multiplier, or None
+        """
+        if not self.llm_analyzer:
+            n = len(df)
+            return self._batch_result(df.index, np.full(n, ACTION_HOLD), np.full(n, 50.0), np.ones(n))
+        
+        if not hasattr(self.llm_analyzer, 'analyze_market_batch'):
+            return None
+        llm_batch = self.llm_analyzer.analyze_market_batch(df)
+        if not isinstance(llm_batch, pd.DataFrame):
+            return None
+        
+        news_sentiment = self._get_news_sentiment({})
+        
+        decisions = llm_batch['decision'].astype(str).str.upper().to_numpy()
+        confidence = llm_batch['confidence'].to_numpy(dtype=np.float64)
+        
+        # Invalid actions become HOLD with 30% confidence, as in _convert_llm_result_with_sentiment
+        invalid = ~np.isin(decisions, ['BUY', 'SELL', 'HOLD'])
+        if invalid.any():
+            self.logger.warning(f"{int(invalid.sum())} invalid LLM actions in batch, defaulting to HOLD")
+        action = np.select([decisions == 'BUY', decisions == 'SELL'], [ACTION_BUY, ACTION_SELL], default=ACTION_HOLD)
+        confidence = np.where(invalid, 30.0, confidence)
+        
+        # Phase 3: Apply news sentiment adjustment
+        adjustments = np.array([self._calculate_sentiment_adjustment(name, news_sentiment)
+                                for name in ['HOLD', 'BUY', 'SELL']])
+        adjusted_confidence = np.clip(confidence + adjustments[action], 0, 100)
+        
+        return self._batch_result(df.index, action, adjusted_confidence, np.ones(len(df)))
+    
     def _get_news_sentiment(self, market_data: Dict) -> Dict:
         """Get news sentiment for the asset (Phase 3)"""
         
@@ -3,9 +3,10 @@ Mean Reversion Strategy
 Identifies oversold/overbought conditions and trades against the trend
 """
 
-from .base_strategy import BaseStrategy, TradingSignal
+from .base_strategy import BaseStrategy, TradingSignal, ACTION_HOLD, ACTION_BUY, ACTION_SELL
 from typing import Dict
 import numpy as np
+import pandas as pd
 
 class MeanReversionStrategy(BaseStrategy):
     """
@@ -96,6 +97,75 @@ class MeanReversionStrategy(BaseStrategy):
                 reasoning=f"Analysis error: {str(e)}"
             )
     
+    def analyze_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Array version of analyze() for a whole frame of inputs
+        
+        Args:
+            df: One row per analysis with the columns described in base_strategy
+                (price, rsi, bb_upper, bb_lower, bb_middle are used here)
+            
+        Returns:
+            DataFrame with action, confidence and position_size_multiplier columns
+        """
+        rsi = self._batch_column(df, 'rsi', 50.0)
+        price = self._batch_column(df, 'price', 0.0)
+        upper = self._batch_column(df, 'bb_upper', 0.0)
+        lower = self._batch_column(df, 'bb_lower', 0.0)
+        middle = self._batch_column(df, 'bb_middle', 0.0)
+        
+        # RSI signal (value: -2..2, strength)
+        rsi_value = np.select(
+            [rsi <= self.rsi_extreme_oversold, rsi <= self.rsi_oversold,
+             rsi >= self.rsi_extreme_overbought, rsi >= self.rsi_overbought],
+            [2.0, 1.0, -2.0, -1.0], 0.0)
+        rsi_strength = np.select(
+            [rsi <= self.rsi_extreme_oversold, rsi <= self.rsi_oversold,
+             rsi >= self.rsi_extreme_overbought, rsi >= self.rsi_overbought],
+            [0.9, 0.7, 0.9, 0.7], 0.2)
+        
+        # Bollinger signal; rows without a price or complete bands stay neutral at 0
+        has_bands = (price != 0) & (upper != 0) & (lower != 0) & (middle != 0)
+        band_width = upper - lower
+        error = has_bands & (band_width == 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            below_dev = (lower - price) / band_width
+            above_dev = (price - upper) / band_width
+            middle_dist = np.abs(price - middle) / band_width
+        below = has_bands & (price < lower)
+        above = has_bands & ~below & (price > upper)
+        inside = has_bands & ~below & ~above
+        
+        bb_value = np.select(
+            [below & (below_dev > self.bollinger_threshold), below,
+             above & (above_dev > self.bollinger_threshold), above],
+            [2.0, 1.0, -2.0, -1.0], 0.0)
+        bb_strength = np.select(
+            [below & (below_dev > self.bollinger_threshold), below,
+             above & (above_dev > self.bollinger_threshold), above, inside],
+            [np.minimum(0.9, 0.6 + below_dev * 2), 0.6,
+             np.minimum(0.9, 0.6 + above_dev * 2), 0.6, np.maximum(0.1, 0.4 - middle_dist)], 0.0)
+        
+        # Combine (RSI 60%, Bollinger 40%)
+        combined_value = (rsi_value * 0.6) + (bb_value * 0.4)
+        strength = (rsi_strength * 0.6) + (bb_strength * 0.4)
+        strong = (combined_value >= 1.5) | (combined_value <= -1.5)
+        is_buy = combined_value >= 0.5
+        is_sell = ~is_buy & (combined_value <= -0.5)
+        
+        # Decision
+        base_confidence = strength * 80
+        confidence = np.where(is_buy | is_sell, np.minimum(95, base_confidence + 15),
+                              np.maximum(20, base_confidence))
+        confidence = np.where(strong, np.minimum(95, confidence + 10), confidence)
+        action = np.select([is_buy, is_sell], [ACTION_BUY, ACTION_SELL], ACTION_HOLD)
+        
+        position_multiplier = np.select(
+            [strong, is_buy | is_sell],
+            [np.minimum(1.5, 0.8 + strength * 0.7), np.minimum(1.2, 0.6 + strength * 0.6)], 0.5)
+        
+        return self._batch_result(df.index, action, confidence, position_multiplier, error)
+    
     def _analyze_rsi_reversion(self, rsi: float) -> Dict:
         """Analyze RSI for mean reversion signals"""
         
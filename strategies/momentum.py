@@ -3,9 +3,12 @@ Momentum Strategy
 Identifies and trades with strong price momentum and breakouts
 """
 
-from .base_strategy import BaseStrategy, TradingSignal
+from .base_strategy import (
+    BaseStrategy, TradingSignal, ACTION_HOLD, ACTION_BUY, ACTION_SELL, BATCH_PRICE_CHANGE_COLUMNS
+)
 from typing import Dict
 import numpy as np
+import pandas as pd
 
 class MomentumStrategy(BaseStrategy):
     """
@@ -103,6 +106,88 @@ class MomentumStrategy(BaseStrategy):
                 reasoning=f"Analysis error: {str(e)}"
             )
     
+    def analyze_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Array version of analyze() for a whole frame of inputs
+        
+        MACD only contributes to analyze() when passed as a dict, which the
+        flat batch columns cannot express, so it is ignored here as well.
+        
+        Args:
+            df: One row per analysis with the columns described in base_strategy
+                (change_*, volume_current, volume_average and rsi are used here)
+            
+        Returns:
+            DataFrame with action, confidence and position_size_multiplier columns
+        """
+        n = len(df)
+        rsi = self._batch_column(df, 'rsi', 50.0)
+        
+        # Price momentum; an empty price_changes dict gives no direction
+        change_columns = [c for c in BATCH_PRICE_CHANGE_COLUMNS if c in df.columns]
+        has_changes = df[change_columns].notna().any(axis=1).to_numpy() if change_columns else np.zeros(n, dtype=bool)
+        weighted = ((self._batch_column(df, 'change_1h') / 100 * 0.5)
+                    + (self._batch_column(df, 'change_4h') / 100 * 0.3)
+                    + (self._batch_column(df, 'change_24h') / 100 * 0.2))
+        weighted = np.where(has_changes, weighted, 0.0)
+        abs_momentum = np.abs(weighted)
+        price_strength = np.select(
+            [abs_momentum >= self.strong_momentum_threshold, abs_momentum >= self.momentum_threshold],
+            [np.minimum(0.9, 0.6 + (abs_momentum - self.strong_momentum_threshold) * 10),
+             np.minimum(0.7, 0.4 + (abs_momentum - self.momentum_threshold) * 10)],
+            abs_momentum * 10)
+        price_score = np.sign(weighted) * price_strength
+        
+        # Volume momentum only amplifies price momentum when high
+        has_volume = np.zeros(n, dtype=bool)
+        for column in ('volume_current', 'volume_average'):
+            if column in df.columns:
+                has_volume |= df[column].notna().to_numpy()
+        current_volume = self._batch_column(df, 'volume_current')
+        avg_volume = self._batch_column(df, 'volume_average')
+        has_ratio = has_volume & (avg_volume != 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = current_volume / avg_volume
+        volume_multiplier = np.select(
+            [has_ratio & (volume_ratio >= 2.0), has_ratio & (volume_ratio >= self.volume_multiplier_threshold)],
+            [1.0 + (np.minimum(0.9, 0.6 + (volume_ratio - 2.0) * 0.1) - 0.4),
+             1.0 + ((0.6 + (volume_ratio - self.volume_multiplier_threshold) * 0.2) - 0.4)],
+            1.0)
+        
+        # Technical momentum from RSI
+        rsi_momentum = np.select(
+            [(rsi >= 50) & (rsi <= 80), (rsi >= 20) & (rsi <= 50)],
+            [np.minimum(0.8, (rsi - 50) / 30 * 0.8), -np.minimum(0.8, (50 - rsi) / 30 * 0.8)],
+            0.0)
+        technical_strength = np.minimum(0.9, np.abs(rsi_momentum))
+        technical_score = np.select([rsi_momentum > 0.3, rsi_momentum < -0.3],
+                                    [technical_strength, -technical_strength], 0.0)
+        
+        # Combine
+        combined_score = (price_score * 0.4 * volume_multiplier) + (technical_score * 0.3)
+        strength = np.minimum(0.95, np.abs(combined_score))
+        strong = (combined_score > 0.4) | (combined_score < -0.4)
+        bullish = combined_score > 0.2
+        bearish = combined_score < -0.2
+        
+        # Decision
+        base_confidence = strength * 70 + 20
+        bonus = np.where(strong, 15, 10)
+        buy = bullish & ~(rsi > 85)
+        sell = bearish & ~(rsi < 15)
+        blocked = (bullish & (rsi > 85)) | (bearish & (rsi < 15))
+        confidence = np.select(
+            [buy | sell, blocked],
+            [np.minimum(95, base_confidence + bonus), base_confidence * 0.6],
+            np.maximum(25, base_confidence * 0.7))
+        action = np.select([buy, sell], [ACTION_BUY, ACTION_SELL], ACTION_HOLD)
+        
+        position_multiplier = np.select(
+            [strong, bullish | bearish],
+            [np.minimum(1.8, 1.0 + strength * 0.8), np.minimum(1.4, 0.8 + strength * 0.6)], 0.6)
+        
+        return self._batch_result(df.index, action, confidence, position_multiplier)
+    
     def _analyze_price_momentum(self, price_changes: Dict) -> Dict:
         """Analyze price momentum across timeframes"""
         
@@ -4,12 +4,20 @@ Coordinates multiple trading strategies and selects the best signals
 """
 
 import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import Dict, List, Optional
 from .base_strategy import BaseStrategy, TradingSignal
 from .trend_following import TrendFollowingStrategy
 from .mean_reversion import MeanReversionStrategy
 from .momentum import MomentumStrategy
 from .performance_tracker import HybridPerformanceTracker
+from utils.monitoring.latency_metrics import measure, timed
+
+# Defaults for I/O-bound strategies (overridable via config
+# STRATEGY_TIMEOUT_SECONDS, STRATEGY_TIMEOUTS and STRATEGY_WORKERS)
+DEFAULT_STRATEGY_TIMEOUT = 20.0  # seconds
+DEFAULT_STRATEGY_WORKERS = 4
 
 class StrategyManager:
     """
@@ -130,11 +138,36 @@ class StrategyManager:
                 self.logger.info(f"  LLM accuracy: {comp['llm_accuracy']:.1%}, Rule-based avg: {comp['rule_based_avg_accuracy']:.1%}")
                 self.logger.info(f"  LLM advantage: {comp['llm_advantage']:+.1%}")
         
+        # Concurrent evaluation: I/O-bound strategies run on a bounded worker pool
+        self._strategy_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_strategies: Dict[str, Future] = {}
+        self.strategy_timeouts: Dict[str, int] = {}
+        
+    def close(self):
+        """Stop the strategy worker pool, abandoning calls still in flight"""
+        if self._strategy_executor is not None:
+            self._strategy_executor.shutdown(wait=False, cancel_futures=True)
+            self._strategy_executor = None
+        self._pending_strategies.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     def analyze_all_strategies(self, 
                              market_data: Dict,
                              technical_indicators: Dict,
                              portfolio: Dict) -> Dict[str, TradingSignal]:
-        """Run analysis on all strategies"""
+        """
+        Run analysis on all strategies
+        
+        I/O-bound strategies are submitted to the worker pool first and the
+        rule-based ones run inline meanwhile, so the cycle takes as long as
+        the slowest strategy instead of the sum. A strategy that misses its
+        deadline is left out of the result and counted in strategy_timeouts.
+        """
         
         # Map Bollinger Band data to expected format for strategies
         mapped_indicators = technical_indicators.copy()
@@ -145,26 +178,102 @@ class StrategyManager:
                 'middle': technical_indicators.get('bb_middle', 0)
             }
         
+        # Start I/O-bound strategies first so they overlap with the rule-based ones
+        submitted = {}
+        for name, strategy in self.strategies.items():
+            if strategy.io_bound:
+                deadline = time.monotonic() + self._get_strategy_timeout(name)
+                future = self._submit_strategy(name, strategy, market_data, mapped_indicators, portfolio)
+                if future is not None:
+                    submitted[name] = (future, deadline)
+        
         strategy_signals = {}
         
         for name, strategy in self.strategies.items():
+            if not strategy.io_bound:
+                strategy_signals[name] = self._run_strategy(name, strategy, market_data,
+                                                            mapped_indicators, portfolio)
+        
+        for name, (future, deadline) in submitted.items():
             try:
-                signal = strategy.analyze(market_data, mapped_indicators, portfolio)
-                strategy_signals[name] = signal
-                
-                self.logger.debug(f"{name} strategy: {signal.action} "
-                                f"(confidence: {signal.confidence:.1f}%)")
-                
-            except Exception as e:
-                self.logger.error(f"Error in {name} strategy: {e}")
-                strategy_signals[name] = TradingSignal(
-                    action="HOLD",
-                    confidence=0,
-                    reasoning=f"Strategy error: {str(e)}"
-                )
+                strategy_signals[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                # Keep the future so the next cycle does not start a second call
+                self._pending_strategies[name] = future
+                self._record_strategy_timeout(name, "missed its deadline")
         
         return strategy_signals
     
+    def _run_strategy(self, 
+                     name: str,
+                     strategy: BaseStrategy,
+                     market_data: Dict,
+                     technical_indicators: Dict,
+                     portfolio: Dict) -> TradingSignal:
+        """Run one strategy, turning errors into a zero-confidence HOLD"""
+        try:
+            with measure(f"strategy.{name}.analyze"):
+                signal = strategy.analyze(market_data, technical_indicators, portfolio)
+            
+            self.logger.debug(f"{name} strategy: {signal.action} "
+                            f"(confidence: {signal.confidence:.1f}%)")
+            return signal
+            
+        except Exception as e:
+            self.logger.error(f"Error in {name} strategy: {e}")
+            return TradingSignal(
+                action="HOLD",
+                confidence=0,
+                reasoning=f"Strategy error: {str(e)}"
+            )
+    
+    def _submit_strategy(self, 
+                        name: str,
+                        strategy: BaseStrategy,
+                        market_data: Dict,
+                        technical_indicators: Dict,
+                        portfolio: Dict) -> Optional[Future]:
+        """
+        Submit an I/O-bound strategy to the worker pool
+        
+        Returns:
+            The future, or None if the call from a previous cycle is still running
+        """
+        previous = self._pending_strategies.get(name)
+        if previous is not None:
+            if not previous.done():
+                self._record_strategy_timeout(name, "still running from a previous cycle")
+                return None
+            del self._pending_strategies[name]
+        
+        if self._strategy_executor is None:
+            workers = getattr(self.config, 'STRATEGY_WORKERS', None)
+            if not isinstance(workers, int) or workers < 1:
+                workers = DEFAULT_STRATEGY_WORKERS
+            self._strategy_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="strategy")
+        
+        return self._strategy_executor.submit(self._run_strategy, name, strategy, market_data,
+                                              technical_indicators, portfolio)
+    
+    def _get_strategy_timeout(self, name: str) -> float:
+        """Deadline in seconds for an I/O-bound strategy"""
+        timeouts = getattr(self.config, 'STRATEGY_TIMEOUTS', None)
+        if isinstance(timeouts, dict) and isinstance(timeouts.get(name), (int, float)):
+            return float(timeouts[name])
+        
+        timeout = getattr(self.config, 'STRATEGY_TIMEOUT_SECONDS', None)
+        if isinstance(timeout, (int, float)) and not isinstance(timeout, bool):
+            return float(timeout)
+        return DEFAULT_STRATEGY_TIMEOUT
+    
+    def _record_strategy_timeout(self, name: str, reason: str):
+        """Count a strategy left out of this cycle's signals"""
+        self.strategy_timeouts[name] = self.strategy_timeouts.get(name, 0) + 1
+        
+        self.logger.warning(f"⏱️ {name} strategy {reason} - combining without it "
+                          f"({self.strategy_timeouts[name]} timeouts so far)")
+    
+    @timed('strategy_manager.get_combined_signal')
     def get_combined_signal(self, 
                           market_data: Dict,
                           technical_indicators: Dict,
@@ -683,7 +792,8 @@ class StrategyManager:
                     'bear': strategy.get_market_regime_suitability('bear'),
                     'sideways': strategy.get_market_regime_suitability('sideways')
                 },
-                'current_weight': self.strategy_weights.get(name, 0)
+                'current_weight': self.strategy_weights.get(name, 0),
+                'timeouts': self.strategy_timeouts.get(name, 0)
             }
         
         return performance
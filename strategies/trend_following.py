@@ -3,9 +3,10 @@ Trend Following Strategy
 Identifies and follows strong market trends using multiple timeframes
 """
 
-from .base_strategy import BaseStrategy, TradingSignal
+from .base_strategy import BaseStrategy, TradingSignal, ACTION_HOLD, ACTION_BUY, ACTION_SELL
 from typing import Dict, List
 import numpy as np
+import pandas as pd
 
 class TrendFollowingStrategy(BaseStrategy):
     """
@@ -116,6 +117,82 @@ class TrendFollowingStrategy(BaseStrategy):
                 reasoning=f"Analysis error: {str(e)}"
             )
     
+    def analyze_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Array version of analyze() for a whole frame of inputs
+        
+        Args:
+            df: One row per analysis with the columns described in base_strategy
+                (price, change_24h, change_5d, rsi, macd_histogram, current_price
+                and the Bollinger Band columns are used here)
+            
+        Returns:
+            DataFrame with action, confidence and position_size_multiplier columns
+        """
+        rsi = self._batch_column(df, 'rsi', 50.0)
+        histogram = self._batch_column(df, 'macd_histogram', 0.0)
+        indicator_price = self._batch_column(df, 'current_price', 0.0)
+        market_price = self._batch_column(df, 'price', 0.0)
+        bb_upper = self._batch_column(df, 'bb_upper', 0.0)
+        bb_lower = self._batch_column(df, 'bb_lower', 0.0)
+        bb_middle = self._batch_column(df, 'bb_middle', 0.0)
+        change_24h = self._batch_column(df, 'change_24h', 0.0)
+        change_5d = self._batch_column(df, 'change_5d', 0.0)
+        
+        # Trend strength: mean of MACD, RSI and (when available) band position factors
+        macd_factor = np.select([np.abs(histogram) > 0.5, np.abs(histogram) > 0.2], [0.8, 0.6], 0.3)
+        rsi_factor = np.select([(rsi > 60) | (rsi < 40), (rsi > 55) | (rsi < 45)], [0.7, 0.5], 0.2)
+        has_band_position = (indicator_price != 0) & (bb_upper != 0) & (bb_lower != 0)
+        error = has_band_position & (bb_upper == bb_lower)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            band_position = (indicator_price - bb_lower) / (bb_upper - bb_lower)
+        band_factor = np.select([(band_position > 0.8) | (band_position < 0.2),
+                                 (band_position > 0.7) | (band_position < 0.3)], [0.8, 0.6], 0.4)
+        trend_strength = np.where(has_band_position,
+                                  (macd_factor + rsi_factor + band_factor) / 3,
+                                  (macd_factor + rsi_factor) / 2)
+        
+        # Trend direction: mean of price-change, RSI, MACD and price-vs-middle votes
+        price_vote = np.select(
+            [(change_24h > 2) & (change_5d > 5), (change_24h > 1) & (change_5d > 2),
+             (change_24h < -2) & (change_5d < -5), (change_24h < -1) & (change_5d < -2)],
+            [2, 1, -2, -1], 0)
+        price_vote_count = np.where(np.abs(price_vote) == 2, 2, 1)
+        rsi_vote = np.select([rsi > 60, rsi < 40], [1, -1], 0)
+        macd_vote = np.select([histogram > 1.0, histogram < -1.0], [1, -1], 0)
+        current_price = np.where(market_price != 0, market_price, indicator_price)
+        has_middle = (current_price != 0) & (bb_middle != 0)
+        middle_vote = np.select([current_price > bb_middle * 1.01, current_price < bb_middle * 0.99], [1, -1], 0)
+        
+        vote_sum = price_vote + rsi_vote + macd_vote + np.where(has_middle, middle_vote, 0)
+        vote_count = price_vote_count + 2 + has_middle.astype(int)
+        avg_signal = vote_sum / vote_count
+        up = avg_signal > 0.3
+        down = avg_signal < -0.3
+        
+        # Base confidence
+        alignment = (np.where(up, (rsi > 40) & (rsi < 70), np.where(down, (rsi > 30) & (rsi < 60), False)).astype(int)
+                     + np.where(up, histogram > 0, np.where(down, histogram < 0, False)).astype(int))
+        base_confidence = trend_strength * 60
+        base_confidence = base_confidence + np.where(up | down, 20, 0)
+        base_confidence = base_confidence + alignment * 5
+        base_confidence = np.minimum(95, np.maximum(20, base_confidence))
+        
+        # Decision
+        strong_up = up & (trend_strength > self.trend_strength_threshold)
+        strong_down = down & (trend_strength > self.trend_strength_threshold)
+        buy = strong_up & (rsi < 70)
+        sell = strong_down & (rsi > 30)
+        confidence = np.select(
+            [buy | sell, strong_up | strong_down],
+            [np.minimum(95, base_confidence + 10), base_confidence * 0.7],
+            np.maximum(30, base_confidence * 0.5))
+        action = np.select([buy, sell], [ACTION_BUY, ACTION_SELL], ACTION_HOLD)
+        
+        position_multiplier = np.minimum(1.5, 0.5 + trend_strength)
+        
+        return self._batch_result(df.index, action, confidence, position_multiplier, error)
+    
     def _calculate_trend_strength(self, indicators: Dict) -> float:
         """Calculate trend strength (0-1)"""
         
@@ -19,11 +19,14 @@ import logging
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, Any
 
+import numpy as np
+import pandas as pd
+
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
-from strategies.base_strategy import TradingSignal
+from strategies.base_strategy import TradingSignal, batch_row_to_inputs
 
 @pytest.fixture
 def mock_config():
@@ -821,5 +824,90 @@ class TestMarketRegimeIntegration:
             # Verify bear market is more conservative
             assert bear_threshold > ranging_threshold, "Bear market should have higher threshold than ranging"
 
+class TestBatchCombination:
+    """Test the array-based regime detection and signal combination"""
+    
+    @staticmethod
+    def _manager(mock_config, mock_analyzers):
+        with patch('strategies.adaptive_strategy_manager.StrategyManager.__init__'):
+            manager = AdaptiveStrategyManager(mock_config, **mock_analyzers)
+        manager.strategies = {}
+        manager.performance_tracker = Mock()
+        manager.logger.disabled = True
+        return manager
+    
+    def test_batch_regime_detection_matches_scalar(self, mock_config, mock_analyzers):
+        """Test detect_market_regime_batch agrees with detect_market_regime_enhanced on every row"""
+        manager = self._manager(mock_config, mock_analyzers)
+        rng = np.random.default_rng(11)
+        rows = 2000
+        middle = rng.uniform(50, 150, rows)
+        width = rng.uniform(0, 0.08, rows) * middle
+        df = pd.DataFrame({
+            'change_24h': rng.normal(0, 4, rows),
+            'change_5d': rng.normal(0, 8, rows),
+            'change_7d': rng.normal(-3, 5, rows),
+            'bb_upper': middle + width / 2,
+            'bb_lower': middle - width / 2,
+            'bb_middle': np.where(rng.random(rows) < 0.02, 0.0, middle),
+        }).mask(rng.random((rows, 6)) < 0.05)
+        
+        regimes = manager.detect_market_regime_batch(df)
+        
+        for i, row in df.iterrows():
+            market_data, technical_indicators = batch_row_to_inputs(row)
+            assert regimes[i] == manager.detect_market_regime_enhanced(technical_indicators, market_data)
+        assert set(regimes) >= {'trending', 'ranging', 'volatile', 'bear_ranging'}
+    
+    def test_batch_combination_matches_scalar(self, mock_config, mock_analyzers):
+        """Test combine_strategy_signals_batch reproduces the hierarchical decision per row"""
+        manager = self._manager(mock_config, mock_analyzers)
+        rng = np.random.default_rng(5)
+        rows = 3000
+        names = ['trend_following', 'mean_reversion', 'momentum', 'llm_strategy']
+        strategy_signals = {
+            name: pd.DataFrame({
+                'action': rng.choice(['BUY', 'SELL', 'HOLD'], rows).astype(object),
+                'confidence': rng.uniform(0, 100, rows).round(1),
+                'position_size_multiplier': rng.uniform(0.5, 1.5, rows),
+            }) for name in names
+        }
+        regimes = rng.choice(['trending', 'ranging', 'volatile', 'bear_ranging'], rows).astype(object)
+        
+        combined = manager.combine_strategy_signals_batch(strategy_signals, regimes)
+        
+        for i in range(rows):
+            signals = {name: TradingSignal(df.at[i, 'action'], df.at[i, 'confidence'], '',
+                                           df.at[i, 'position_size_multiplier'])
+                       for name, df in strategy_signals.items()}
+            expected = manager._combine_strategy_signals_adaptive(signals, {}, regimes[i])
+            assert combined.at[i, 'action'] == expected.action
+            assert combined.at[i, 'confidence'] == pytest.approx(expected.confidence)
+            assert combined.at[i, 'position_size_multiplier'] == pytest.approx(expected.position_size_multiplier)
+            if combined.at[i, 'primary_strategy']:
+                assert f": {combined.at[i, 'primary_strategy']} (" in expected.reasoning
+            else:
+                assert expected.reasoning.startswith('No strategy meets')
+    
+    def test_strategies_without_batch_api_run_per_row(self, mock_config, mock_analyzers):
+        """Test strategies lacking analyze_batch() are evaluated through analyze()"""
+        manager = self._manager(mock_config, mock_analyzers)
+        llm_strategy = Mock(spec=['analyze'])
+        llm_strategy.analyze.side_effect = [TradingSignal('BUY', 80, 'AI buy', 1.3),
+                                            ValueError('boom')]
+        manager.strategies = {'llm_strategy': llm_strategy}
+        df = pd.DataFrame({'price': [100.0, 101.0], 'change_7d': [-8.0, -8.0],
+                           'bb_upper': [101.0, 101.0], 'bb_lower': [99.0, 99.0], 'bb_middle': [100.0, 100.0]})
+        
+        combined = manager.get_combined_signal_batch(df)
+        
+        assert llm_strategy.analyze.call_count == 2
+        assert 'bollinger' in llm_strategy.analyze.call_args_list[0].args[1]
+        assert list(combined['market_regime']) == ['bear_ranging', 'bear_ranging']
+        assert list(combined['action']) == ['BUY', 'HOLD']
+        assert combined['confidence'].tolist() == [80.0, 0.0]
+        assert combined['primary_strategy'].tolist() == ['llm_strategy', '']
+        assert manager.current_market_regime == 'bear_ranging'
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Unit tests for the product analysis pipeline
+
+Tests concurrent per-product analysis, the shared API budget, failed and
+late products, and the hand-off to the OpportunityManager.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import Mock
+
+from utils.trading.analysis_pipeline import ProductAnalysisPipeline
+from utils.trading.api_budget import ApiBudget
+
+PRODUCTS = [f"COIN{i}-EUR" for i in range(20)]
+
+
+def fake_fetch(product_id):
+    time.sleep(0.05)
+    return {'product_id': product_id, 'price': 100.0}
+
+
+def fake_analyze(product_id, data):
+    time.sleep(0.02)
+    return {'action': 'BUY', 'confidence': 75, 'product_id': data['product_id']}
+
+
+def analyze_pid(product_id, data):
+    return {'product_id': product_id, 'pid': os.getpid()}
+
+
+class TestApiBudget:
+    """Test the shared token bucket."""
+
+    def test_rate_is_respected_across_threads(self):
+        """Test concurrent callers together stay within burst + rate * elapsed."""
+        budget = ApiBudget(rate=100, burst=5)
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=budget.acquire, args=(1,)) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.14  # 15 requests beyond the burst at 100/s
+        assert budget.waited > 0
+
+
+class TestProductAnalysisPipeline:
+    """Test concurrent analysis of many products."""
+
+    def test_products_are_analysed_concurrently(self):
+        """Test 20 products finish in a fraction of the sequential time and stream out as they complete."""
+        completed = []
+        with ProductAnalysisPipeline(fake_fetch, fake_analyze, budget=ApiBudget(rate=1000, burst=100),
+                                     max_concurrent_fetches=10, analysis_workers=4) as pipeline:
+            pipeline.run(PRODUCTS[:4])  # Start the worker processes outside the timing
+            start = time.monotonic()
+            analyses = pipeline.run(PRODUCTS, on_result=lambda product_id, _: completed.append(product_id))
+            elapsed = time.monotonic() - start
+
+        assert set(analyses) == set(PRODUCTS)
+        assert analyses['COIN3-EUR']['product_id'] == 'COIN3-EUR'
+        assert sorted(completed) == sorted(PRODUCTS)
+        assert elapsed < 20 * 0.07 / 3
+
+    def test_analysis_runs_in_worker_processes(self):
+        """Test CPU-bound analysis runs outside this process, and on threads when asked to."""
+        with ProductAnalysisPipeline(fake_fetch, analyze_pid, analysis_workers=2) as pipeline:
+            analyses = pipeline.run(PRODUCTS[:4])
+
+        pids = {analysis['pid'] for analysis in analyses.values()}
+        assert len(analyses) == 4 and os.getpid() not in pids
+
+        with ProductAnalysisPipeline(fake_fetch, analyze_pid, analysis_processes=False) as pipeline:
+            analyses = pipeline.run(PRODUCTS[:4])
+
+        assert {a['pid'] for a in analyses.values()} == {os.getpid()}
+
+    def test_budget_is_charged_per_product(self):
+        """Test a budget passed in is charged requests_per_product for every fetch."""
+        budget = ApiBudget(rate=50, burst=1)
+        with ProductAnalysisPipeline(fake_fetch, fake_analyze, budget=budget, requests_per_product=2,
+                                     analysis_processes=False) as pipeline:
+            pipeline.run(PRODUCTS[:5])
+
+        assert budget.waited >= 0.15  # 10 requests against a burst of 1 at 50/s
+
+    def test_async_fetch_is_awaited(self):
+        """Test coroutine fetch functions run on the event loop."""
+        async def fetch(product_id):
+            await asyncio.sleep(0.01)
+            return {'product_id': product_id}
+
+        with ProductAnalysisPipeline(fetch, fake_analyze) as pipeline:
+            analyses = pipeline.run(PRODUCTS[:3])
+
+        assert set(analyses) == set(PRODUCTS[:3])
+
+    def test_failed_and_late_products_are_left_out(self):
+        """Test errors are recorded and a hung product does not hold up the cycle."""
+        release = threading.Event()
+
+        def fetch(product_id):
+            if product_id == 'BAD-EUR':
+                raise ConnectionError('timeout')
+            if product_id == 'SLOW-EUR':
+                release.wait(5)
+            return fake_fetch(product_id)
+
+        with ProductAnalysisPipeline(fetch, fake_analyze, cycle_timeout=0.5) as pipeline:
+            start = time.monotonic()
+            analyses = pipeline.run(['BTC-EUR', 'BAD-EUR', 'SLOW-EUR'])
+            elapsed = time.monotonic() - start
+            release.set()
+
+        assert set(analyses) == {'BTC-EUR'}
+        assert pipeline.last_errors == {'BAD-EUR': 'timeout'}
+        assert pipeline.last_timed_out == ['SLOW-EUR']
+        assert elapsed < 1.0
+
+    def test_run_cycle_ranks_and_allocates(self):
+        """Test completed analyses are scored, ranked and passed on for allocation."""
+        opportunity_manager = Mock()
+        opportunity_manager.score_opportunity.side_effect = lambda product_id, analysis: {'product_id': product_id}
+        opportunity_manager.order_opportunities.return_value = [{'product_id': 'BTC-EUR'}]
+        opportunity_manager.allocate_trading_capital.return_value = {'BTC-EUR': 100.0}
+
+        with ProductAnalysisPipeline(fake_fetch, fake_analyze) as pipeline:
+            ranked, allocations = pipeline.run_cycle(['BTC-EUR', 'ETH-EUR'], opportunity_manager,
+                                                     available_eur=500.0, portfolio={'EUR': {'amount': 500.0}})
+
+        opportunities = opportunity_manager.order_opportunities.call_args[0][0]
+        assert sorted(o['product_id'] for o in opportunities) == ['BTC-EUR', 'ETH-EUR']
+        opportunity_manager.allocate_trading_capital.assert_called_once_with(
+            ranked, 500.0, {'EUR': {'amount': 500.0}})
+        assert allocations == {'BTC-EUR': 100.0}
+
+    def test_run_cycle_scores_before_the_slowest_product(self):
+        """Test a finished product is scored while a slower one is still fetching."""
+        scored = threading.Event()
+
+        def fetch(product_id):
+            if product_id == 'SLOW-EUR':
+                assert scored.wait(5), 'BTC-EUR was not scored while SLOW-EUR was in flight'
+            return {'product_id': product_id}
+
+        def score(product_id, analysis):
+            scored.set()
+            return {'product_id': product_id}
+
+        opportunity_manager = Mock()
+        opportunity_manager.score_opportunity.side_effect = score
+
+        with ProductAnalysisPipeline(fetch, fake_analyze) as pipeline:
+            pipeline.run_cycle(['BTC-EUR', 'SLOW-EUR'], opportunity_manager, available_eur=500.0)
+
+        assert pipeline.last_errors == {}
+        assert [c.args[0] for c in opportunity_manager.score_opportunity.call_args_list] == ['BTC-EUR', 'SLOW-EUR']
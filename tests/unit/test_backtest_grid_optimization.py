@@ -0,0 +1,79 @@
+"""
+Unit tests for grid parameter optimization in BacktestEngine
+
+Tests that evaluating all parameter combinations as columns of one
+VectorBT portfolio gives the same results as one backtest per combination.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from utils.backtest.backtest_engine import BacktestEngine
+
+
+def make_rsi_data(rows=600, seed=0):
+    """Create hourly closes with a random RSI column and integer market regimes."""
+    rng = np.random.default_rng(seed)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows))),
+                      index=pd.date_range('2024-01-01', periods=rows, freq='1h'))
+    return pd.DataFrame({'close': close, 'rsi': rng.uniform(0, 100, rows),
+                         'market_regime': rng.integers(0, 3, rows)})
+
+
+def rsi_signals(data, rsi_buy, rsi_sell):
+    """RSI threshold strategy; rsi_buy < 0 exercises the error and misaligned paths."""
+    if rsi_buy == -1:
+        raise ValueError('invalid threshold')
+    signals = pd.DataFrame({'buy': data['rsi'] < rsi_buy, 'sell': data['rsi'] > rsi_sell}, index=data.index)
+    return signals.iloc[50:] if rsi_buy == -2 else signals
+
+
+PARAM_GRID = {'rsi_buy': [-2, -1, 0, 20, 40, 90], 'rsi_sell': [10, 60, 80, 101]}
+
+
+def assert_same_results(expected, actual):
+    expected = expected.sort_values(['rsi_buy', 'rsi_sell']).reset_index(drop=True)
+    actual = actual.sort_values(['rsi_buy', 'rsi_sell']).reset_index(drop=True)
+    assert list(actual.columns) == list(expected.columns)
+    for column in expected.columns:
+        if pd.api.types.is_numeric_dtype(expected[column]):
+            np.testing.assert_allclose(actual[column].astype(float), expected[column].astype(float),
+                                       rtol=1e-9, err_msg=column)
+        else:
+            assert actual[column].tolist() == expected[column].tolist()
+
+
+@pytest.fixture(scope='module')
+def loop_results():
+    engine = BacktestEngine()
+    engine.use_grid_optimization = False
+    return engine.run_parameter_optimization(make_rsi_data(), rsi_signals, PARAM_GRID, 'TEST')
+
+
+class TestGridOptimization:
+    """Test the broadcasted grid against the per-combination loop."""
+
+    def test_grid_matches_loop(self, loop_results):
+        """Test every metric matches, including regime metrics and fallback combinations."""
+        results = BacktestEngine().run_parameter_optimization(make_rsi_data(), rsi_signals, PARAM_GRID, 'TEST')
+
+        assert len(results) == 20  # the 4 failing combinations are skipped
+        assert results['sortino_ratio'].is_monotonic_decreasing
+        assert_same_results(loop_results, results)
+        assert (loop_results['total_trades'] > 0).any()
+
+    def test_chunks_match_single_portfolio(self, loop_results):
+        """Test splitting the columns into chunks does not change results."""
+        results = BacktestEngine().run_parameter_optimization(make_rsi_data(), rsi_signals, PARAM_GRID, 'TEST',
+                                                              chunk_size=3)
+
+        assert_same_results(loop_results, results)
+
+    def test_fees_and_profit_factor_reported(self, loop_results):
+        """Test fees and trade statistics come from the portfolio records."""
+        traded = loop_results[loop_results['total_trades'] > 1].iloc[0]
+
+        assert traded['fees_paid'] > 0
+        assert traded['winning_trades'] + traded['losing_trades'] > 0
+        assert traded['avg_trade_duration_hours'] >= 1
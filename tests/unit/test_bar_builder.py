@@ -0,0 +1,99 @@
+"""
+Unit tests for the local OHLCV bar builder
+
+Tests bar aggregation against a pandas resample, gap filling, bar-close
+events, contiguous array views over the ring buffer and aggTrade parsing.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bar_builder import FIELDS, BarBuilder, BarSeries
+
+T0 = 1_700_000_100_000  # ms, on a 5m boundary
+
+
+def random_trades(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    times = T0 + np.cumsum(rng.integers(0, 400, n))
+    prices = 50_000 + np.cumsum(rng.normal(0, 2, n))
+    qtys = rng.exponential(0.05, n)
+    return times, prices, qtys
+
+
+class TestBarSeries:
+    """Test aggregation into one timeframe."""
+
+    def test_bars_match_pandas_resample(self):
+        """Test OHLCV and VWAP of closed 1m bars equal a pandas resample of the trades."""
+        times, prices, qtys = random_trades()
+        builder = BarBuilder(fill_gaps=False)
+        for t, p, q in zip(times, prices, qtys):
+            builder.on_trade(float(p), float(q), int(t))
+
+        trades = pd.DataFrame({'price': prices, 'qty': qtys, 'pv': prices * qtys},
+                              index=pd.to_datetime(times, unit='ms'))
+        grouped = trades.resample('1min')
+        expected = pd.DataFrame({
+            'open': grouped['price'].first(), 'high': grouped['price'].max(),
+            'low': grouped['price'].min(), 'close': grouped['price'].last(),
+            'volume': grouped['qty'].sum(), 'trades': grouped['price'].count(),
+        }).dropna().iloc[:-1]  # the last minute is still open
+        expected['vwap'] = (grouped['pv'].sum() / grouped['qty'].sum()).loc[expected.index]
+
+        bars = builder['1m'].view()
+        assert bars.shape == (len(FIELDS), len(expected))
+        np.testing.assert_array_equal(bars[FIELDS.index('start')], expected.index.as_unit('ms').asi8)
+        for field in ('open', 'high', 'low', 'close', 'volume', 'vwap', 'trades'):
+            np.testing.assert_allclose(builder['1m'].array(field), expected[field].to_numpy(), rtol=1e-12)
+        assert builder['1m'].current().close == prices[-1]
+
+    def test_gaps_are_filled_with_flat_bars(self):
+        """Test intervals without trades become zero-volume bars at the last close."""
+        series = BarSeries('1s', 1_000, maxlen=10)
+        series.on_trade(100.0, 1.0, T0)
+        closed = series.on_trade(101.0, 2.0, T0 + 3_500)
+
+        assert [bar.start for bar in closed] == [T0, T0 + 1_000, T0 + 2_000]
+        assert [bar.volume for bar in closed] == [1.0, 0.0, 0.0]
+        assert [bar.close for bar in closed] == [100.0, 100.0, 100.0]
+
+    def test_ring_buffer_views_stay_contiguous(self):
+        """Test views hold the newest bars in order after the buffer wraps, without copying."""
+        series = BarSeries('1s', 1_000, maxlen=5)
+        for i in range(13):
+            series.on_trade(float(i), 1.0, T0 + i * 1_000)
+
+        closes = series.array('close')
+        assert list(closes) == [7.0, 8.0, 9.0, 10.0, 11.0]
+        assert list(series.array('close', n=2)) == [10.0, 11.0]
+        assert closes.base is not None and not closes.flags.writeable
+
+    def test_late_trades_are_ignored(self):
+        """Test a trade for an already closed bar does not change it."""
+        series = BarSeries('1s', 1_000, maxlen=5)
+        series.on_trade(100.0, 1.0, T0 + 1_000)
+        series.on_trade(101.0, 1.0, T0 + 2_000)
+
+        assert series.on_trade(50.0, 1.0, T0) == []
+        assert series.late_trades == 1 and series.array('low')[-1] == 100.0
+
+
+class TestBarBuilder:
+    """Test the multi-timeframe builder."""
+
+    def test_bar_close_events_and_agg_trade(self):
+        """Test listeners get every closed bar and aggTrade messages are parsed."""
+        events = []
+        builder = BarBuilder()
+        builder.subscribe(events.append)
+
+        builder.on_agg_trade({'e': 'aggTrade', 'p': '50000.0', 'q': '0.5', 'T': T0})
+        builder.on_agg_trade({'e': 'aggTrade', 'p': '50010.0', 'q': '0.25', 'T': T0 + 60_000})
+
+        assert [(bar.timeframe, bar.start) for bar in events if bar.timeframe != '1s'] == [('1m', T0)]
+        assert sum(1 for bar in events if bar.timeframe == '1s') == 60
+        assert builder['5m'].current().volume == pytest.approx(0.75)
+        assert builder['5m'].current().vwap == pytest.approx((50000 * 0.5 + 50010 * 0.25) / 0.75)
+        assert builder.trades == 2
@@ -0,0 +1,131 @@
+"""
+Unit tests for the benchmark harness
+
+Tests timing statistics, baseline round trips, regression detection and a
+small real run of the benchmark cases on synthetic data.
+"""
+
+import pytest
+import numpy as np
+
+from benchmarks.cases import default_cases
+from benchmarks.harness import (
+    BenchmarkCase, compare_results, load_results, result_key, run_benchmarks, run_case, save_results,
+    summarize, time_callable
+)
+from benchmarks.synthetic import load_bars, make_ohlcv
+
+
+def timing(p50, error=None):
+    return {'p50': p50, 'min': p50, 'error': error}
+
+
+class TestTiming:
+    """Test timing and summary statistics."""
+
+    def test_summarize_percentiles(self):
+        """Test percentiles and spread of a known sample."""
+        stats = summarize([float(i) for i in range(1, 101)])
+
+        assert stats['min'] == 1 and stats['max'] == 100
+        assert stats['p50'] == pytest.approx(50.5)
+        assert stats['p90'] == pytest.approx(90.1)
+        assert stats['mean'] == pytest.approx(50.5)
+
+    def test_warmup_runs_are_not_timed(self):
+        """Test warm-up calls happen before the timed repeats."""
+        calls = []
+        samples = time_callable(lambda: calls.append(1), repeats=4, warmup=2)
+
+        assert len(calls) == 6
+        assert len(samples) == 4 and all(sample >= 0 for sample in samples)
+
+    def test_setup_per_run_builds_fresh_inputs(self):
+        """Test cases that grow their input get an untimed setup before every run."""
+        stores = []
+
+        def setup(size):
+            store = list(range(size))
+            stores.append(store)
+            return lambda: store.append(0)
+
+        result = run_case(BenchmarkCase('append', setup, (10,), setup_per_run=True), 10, repeats=3, warmup=1)
+
+        assert result.error is None and len(result.samples) == 3
+        assert [len(store) for store in stores] == [11, 11, 11, 11]
+
+    def test_failed_case_is_recorded(self):
+        """Test a failing setup produces an errored result instead of raising."""
+        def setup(size):
+            raise ImportError('missing dependency')
+
+        results = run_benchmarks([BenchmarkCase('broken', setup, (10, 20)),
+                                  BenchmarkCase('ok', lambda size: lambda: sum(range(size)), (10, 20))],
+                                 sizes=[20], repeats=2)
+
+        assert [result.key for result in results] == ['broken[20]', 'ok[20]']
+        assert results[0].error == 'ImportError: missing dependency'
+        assert results[1].error is None and len(results[1].samples) == 2
+
+
+class TestBaselines:
+    """Test stored baselines and regression checks."""
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test results are stored keyed by name and size."""
+        result = run_case(BenchmarkCase('sum', lambda size: lambda: sum(range(size)), (100,)), 100, repeats=3)
+        path = save_results([result], str(tmp_path / 'baselines' / 'baseline.json'), label='test')
+
+        loaded = load_results(str(path))
+
+        assert list(loaded) == [result_key('sum', 100)]
+        assert loaded['sum[100]']['p50'] == result.p50
+        assert loaded['sum[100]']['samples'] == result.samples
+
+    def test_compare_flags_regressions(self):
+        """Test statuses for slower, faster, unchanged, new, missing and failed cases."""
+        baseline = {'slow[1]': timing(1.0), 'fast[1]': timing(1.0), 'same[1]': timing(1.0),
+                    'gone[1]': timing(1.0), 'broken[1]': timing(1.0)}
+        current = {'slow[1]': timing(1.2), 'fast[1]': timing(0.5), 'same[1]': timing(1.05),
+                   'added[1]': timing(1.0), 'broken[1]': timing(np.nan, error='ImportError')}
+
+        statuses = {comparison.key: comparison.status
+                    for comparison in compare_results(baseline, current, threshold=0.10)}
+
+        assert statuses == {'slow[1]': 'regression', 'fast[1]': 'improvement', 'same[1]': 'ok',
+                            'added[1]': 'new', 'gone[1]': 'missing', 'broken[1]': 'error'}
+
+    def test_threshold_and_statistic(self):
+        """Test the threshold and the compared statistic are configurable."""
+        baseline = {'case[1]': {'p50': 1.0, 'min': 1.0}}
+        current = {'case[1]': {'p50': 1.2, 'min': 1.0}}
+
+        assert compare_results(baseline, current, threshold=0.25)[0].status == 'ok'
+        assert compare_results(baseline, current, statistic='min')[0].status == 'ok'
+
+
+class TestSyntheticCases:
+    """Test synthetic inputs and a small run of the real cases."""
+
+    def test_synthetic_bars_are_deterministic_and_cached(self, tmp_path):
+        """Test generated bars repeat per seed and are read back from the cache."""
+        first = load_bars(500, seed=3, cache_dir=str(tmp_path))
+        second = load_bars(500, seed=3, cache_dir=str(tmp_path))
+
+        assert (tmp_path / 'market_bars_500_3_indicators.parquet').exists()
+        assert first.equals(second)
+        assert not first[['rsi_14', 'bb_upper_20', 'macd_signal']].isna().any().any()
+        assert (first['high'] >= first[['open', 'close']].max(axis=1)).all()
+        assert make_ohlcv(100, seed=1).equals(make_ohlcv(100, seed=1))
+
+    def test_cases_run_on_small_inputs(self, tmp_path, monkeypatch):
+        """Test the importable cases run at their smallest size."""
+        monkeypatch.chdir(tmp_path)
+        cases = [case for case in default_cases()
+                 if case.name.startswith(('vectorizer.momentum', 'market_regime', 'json_store',
+                                          'performance_tracker'))]
+
+        results = run_benchmarks(cases, sizes=[1_000], repeats=1, warmup=0)
+
+        assert len(results) == 5
+        assert all(result.error is None for result in results), [result.error for result in results]
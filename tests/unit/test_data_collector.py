@@ -25,7 +25,7 @@ from pathlib import Path
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from data_collector import DataCollector
+from data_collector import DataCollector, decode_candles
 
 @pytest.fixture
 def mock_coinbase_client():
@@ -188,6 +188,61 @@ class TestHistoricalDataRetrieval:
         # Should handle gracefully and return empty DataFrame
         assert isinstance(result, pd.DataFrame)
         assert len(result) == 0
+    
+    def test_get_historical_data_applies_quality_gate(self, mock_coinbase_client):
+        """Test bad candles are dropped or fixed before they reach the strategies"""
+        hour = 3600
+        mock_coinbase_client.get_market_data.return_value = [
+            {'start': 1640995200, 'low': 100, 'high': 110, 'open': 105, 'close': 108, 'volume': 10},
+            {'start': 1640995200 + hour, 'low': 100, 'high': 104, 'open': 103, 'close': 106, 'volume': 10},
+            {'start': 1640995200 + hour, 'low': 101, 'high': 109, 'open': 103, 'close': 107, 'volume': 12},
+            {'start': 1640995200 + 2 * hour, 'low': 0, 'high': 0, 'open': 0, 'close': 0, 'volume': 5},
+            {'start': 1640995200 + 4 * hour, 'low': 104, 'high': 111, 'open': 107, 'close': 110, 'volume': -3}
+        ]
+        
+        collector = DataCollector(mock_coinbase_client)
+        result = collector.get_historical_data('BTC-EUR', 'ONE_HOUR', 7)
+        
+        # Duplicate keeps the last candle, zero prices are dropped, the hole is not back-filled
+        assert list(result['close']) == [108, 107, 110]
+        assert result.index[-1] == pd.Timestamp('2022-01-01 04:00:00')
+        assert (result['high'] >= result[['open', 'close']].max(axis=1)).all()
+        assert (result['volume'] >= 0).all()
+        mock_coinbase_client.get_market_data.assert_called_once()
+    
+    def test_get_historical_data_attaches_quality_reports(self, mock_coinbase_client):
+        """Test each closed candle is checked once by the live monitor across polls"""
+        hour = 3600
+        candles = [{'start': 1640995200 + i * hour, 'low': 100, 'high': 110, 'open': 105,
+                    'close': 108, 'volume': 10} for i in range(4)]
+        mock_coinbase_client.get_market_data.return_value = candles[:3]
+        
+        collector = DataCollector(mock_coinbase_client)
+        first = collector.get_historical_data('BTC-EUR', 'ONE_HOUR', 7)
+        
+        mock_coinbase_client.get_market_data.return_value = candles[1:]
+        monitor = collector.live_quality_monitors['BTC-EUR_ONE_HOUR']
+        with patch.object(monitor, 'update', wraps=monitor.update) as update:
+            second = collector.get_historical_data('BTC-EUR', 'ONE_HOUR', 7)
+        
+        assert first.attrs['quality'].passed
+        assert first.attrs['live_quality'].total_rows == 3
+        assert update.call_count == 1
+        assert second.attrs['live_quality'].total_rows == 4
+        assert second.attrs['live_quality'].passed
+    
+    def test_live_candles_skip_the_open_candle(self, mock_coinbase_client):
+        """Test the still-open candle is not checked until it has closed"""
+        now = pd.Timestamp.now(tz='UTC').tz_localize(None).floor('h')
+        index = pd.DatetimeIndex([now - pd.Timedelta(hours=1), now], name='time')
+        df = pd.DataFrame({'open': [1.0, 1.0], 'high': [1.0, 1.0], 'low': [1.0, 1.0],
+                           'close': [1.0, 1.0], 'volume': [1.0, 1.0]}, index=index)
+        
+        collector = DataCollector(mock_coinbase_client)
+        report = collector.ingest_live_candles(df, 'BTC-EUR', 'ONE_HOUR')
+        
+        assert report.total_rows == 1
+        assert collector._live_quality_last['BTC-EUR_ONE_HOUR'] == index[0]
 
 class TestMarketDataCollection:
     """Test current market data collection"""
@@ -581,6 +636,151 @@ class TestDataProcessing:
         # Should handle gracefully
         assert isinstance(result, pd.DataFrame)
 
+    def test_decode_candles_sorts_descending_response(self, sample_candle_data):
+        """Test that newest-first candles come back in ascending time order"""
+        df, invalid_rows = decode_candles(list(reversed(sample_candle_data)))
+        
+        assert invalid_rows == 0
+        assert df.index.name == 'time'
+        assert df.index.is_monotonic_increasing
+        assert list(df.columns) == ['low', 'high', 'open', 'close', 'volume']
+        assert df['close'].tolist() == [45800, 46500, 47200]
+    
+    def test_decode_candles_counts_invalid_rows(self, sample_candle_data):
+        """Test that unparseable rows are dropped and counted"""
+        candles = [dict(c) for c in sample_candle_data]
+        candles[1]['close'] = None
+        candles.append({'start': 0, 'low': 1, 'high': 1, 'open': 1, 'close': 1, 'volume': 1})
+        
+        df, invalid_rows = decode_candles(candles)
+        
+        assert invalid_rows == 2
+        assert len(df) == 2
+    
+    def test_decode_candles_string_fields(self):
+        """Test decoding of SDK-style string fields"""
+        candles = [
+            {'start': str(1640995200 + i * 60), 'low': '1.0', 'high': '2.0',
+             'open': '1.5', 'close': '1.75', 'volume': '10'}
+            for i in range(1000)
+        ]
+        
+        df, invalid_rows = decode_candles(candles)
+        
+        assert invalid_rows == 0
+        assert len(df) == 1000
+        assert df['close'].dtype == 'float64'
+        assert df.index[0] == pd.Timestamp('2022-01-01 00:00:00')
+
+class TestIncrementalSync:
+    """Test watermark-based incremental sync"""
+    
+    @staticmethod
+    def _candles(start, periods):
+        index = pd.date_range(start, periods=periods, freq='h', name='time')
+        return pd.DataFrame({'low': 1.0, 'high': 2.0, 'open': 1.5, 'close': 1.5, 'volume': 1.0}, index=index)
+    
+    def test_sync_fetches_after_watermark_and_skips_unchanged(self, mock_coinbase_client, temp_cache_dir):
+        """Test second sync only fetches new candles and uploads only changed partitions"""
+        collector = DataCollector(mock_coinbase_client)
+        collector.gcs_client = None
+        collector.local_cache_dir = Path(temp_cache_dir)
+        
+        first = self._candles('2024-01-31 20:00', 6)  # spans January and February
+        uploads = []
+        
+        with patch.object(collector, 'upload_to_gcs', side_effect=lambda df, path: uploads.append(path) or True), \
+             patch.object(collector, 'fetch_bulk_historical_data', return_value=first) as mock_fetch:
+            result = collector.sync_historical_data(['BTC-USD'], 'ONE_HOUR')
+            
+            assert result['success'] is True
+            assert result['new_rows'] == 6
+            assert len(uploads) == 2
+            
+            # Nothing new: no fetch window change, no uploads
+            mock_fetch.return_value = first.iloc[[-1]]
+            uploads.clear()
+            result = collector.sync_historical_data(['BTC-USD'], 'ONE_HOUR')
+            
+            assert result['new_rows'] == 0
+            assert uploads == []
+            assert mock_fetch.call_args.kwargs['start_date'] == datetime(2024, 2, 1, 2)
+            
+            # New candles only touch the February partition
+            mock_fetch.return_value = self._candles('2024-02-01 02:00', 3)
+            result = collector.sync_historical_data(['BTC-USD'], 'ONE_HOUR')
+            
+            assert result['new_rows'] == 3
+            assert uploads == ['historical/BTC-USD/ONE_HOUR/2024/02/data.parquet']
+        
+        manifest = collector._load_sync_manifest()
+        assert manifest['BTC-USD|ONE_HOUR']['watermark'] == '2024-02-01T04:00:00'
+        merged = pd.read_parquet(collector.local_cache_dir / 'historical_BTC-USD_ONE_HOUR_2024_02_data.parquet')
+        assert len(merged) == 5
+    
+    def test_sync_repairs_candles_before_storing(self, mock_coinbase_client, temp_cache_dir):
+        """Test stored partitions are on a regular grid with consistent OHLC"""
+        collector = DataCollector(mock_coinbase_client)
+        collector.gcs_client = None
+        collector.local_cache_dir = Path(temp_cache_dir)
+        
+        candles = self._candles('2024-03-01 00:00', 5).drop(pd.Timestamp('2024-03-01 02:00'))
+        candles.loc[pd.Timestamp('2024-03-01 03:00'), 'high'] = 1.0  # below open/close
+        uploaded = {}
+        
+        with patch.object(collector, 'upload_to_gcs', side_effect=lambda df, path: uploaded.update({path: df}) or True), \
+             patch.object(collector, 'fetch_bulk_historical_data', return_value=candles):
+            result = collector.sync_historical_data(['BTC-USD'], 'ONE_HOUR')
+        
+        stored = uploaded['historical/BTC-USD/ONE_HOUR/2024/03/data.parquet']
+        assert result['new_rows'] == 5
+        assert len(stored) == 5
+        assert stored.loc['2024-03-01 02:00', 'volume'] == 0.0
+        assert stored.loc['2024-03-01 03:00', 'high'] == 1.5
+    
+    def test_sync_stores_only_closed_candles(self, mock_coinbase_client, temp_cache_dir):
+        """Test the still-open candle is neither stored nor covered by the watermark"""
+        collector = DataCollector(mock_coinbase_client)
+        collector.gcs_client = None
+        collector.local_cache_dir = Path(temp_cache_dir)
+        uploaded = {}
+        
+        # At 04:30 the 04:00 candle is still open
+        with patch.object(collector, 'upload_to_gcs', side_effect=lambda df, path: uploaded.update({path: df}) or True), \
+             patch.object(collector, 'fetch_bulk_historical_data',
+                          return_value=self._candles('2024-03-01 00:00', 5)) as mock_fetch:
+            result = collector._sync_product('BTC-USD', 'ONE_HOUR', {}, datetime(2024, 3, 1),
+                                             datetime(2024, 3, 1, 4, 30))
+        
+        stored = uploaded['historical/BTC-USD/ONE_HOUR/2024/03/data.parquet']
+        assert stored.index[-1] == pd.Timestamp('2024-03-01 03:00')
+        assert result['entry']['watermark'] == '2024-03-01T03:00:00'
+        assert mock_fetch.call_args.kwargs['end_date'] == datetime(2024, 3, 1, 4)
+        
+        # The next run starts at the open candle, which is then closed
+        with patch.object(collector, 'fetch_bulk_historical_data', return_value=pd.DataFrame()) as mock_fetch:
+            collector._sync_product('BTC-USD', 'ONE_HOUR', result['entry'], datetime(2024, 3, 1),
+                                    datetime(2024, 3, 1, 5, 30))
+        
+        assert mock_fetch.call_args.kwargs['start_date'] == datetime(2024, 3, 1, 4)
+    
+    def test_sync_merges_partition_missing_from_manifest(self, mock_coinbase_client, temp_cache_dir):
+        """Test an existing month object is merged even when the manifest does not list it"""
+        collector = DataCollector(mock_coinbase_client)
+        collector.gcs_client = None
+        collector.local_cache_dir = Path(temp_cache_dir)
+        existing = self._candles('2024-03-01 00:00', 24)
+        existing.to_parquet(collector.local_cache_dir / 'historical_BTC-USD_ONE_HOUR_2024_03_data.parquet')
+        uploaded = {}
+        
+        with patch.object(collector, 'upload_to_gcs', side_effect=lambda df, path: uploaded.update({path: df}) or True), \
+             patch.object(collector, 'fetch_bulk_historical_data', return_value=self._candles('2024-03-02 00:00', 3)):
+            collector._sync_product('BTC-USD', 'ONE_HOUR', {}, datetime(2024, 3, 2), datetime(2024, 3, 2, 6))
+        
+        stored = uploaded['historical/BTC-USD/ONE_HOUR/2024/03/data.parquet']
+        assert len(stored) == 27
+        assert stored.index[0] == pd.Timestamp('2024-03-01 00:00')
+
 
 class TestCaching:
     """Test local caching mechanisms"""
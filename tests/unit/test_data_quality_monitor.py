@@ -0,0 +1,178 @@
+"""
+Unit tests for DataQualityMonitor - candle validation, repair and live checks
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from utils.data_quality_monitor import (
+    DataQualityMonitor, DataQualityError, QualityFlag, validate_data_quality
+)
+
+
+def make_candles(periods=60, freq='1min', start='2024-01-01'):
+    """Create clean, continuous OHLCV candles."""
+    index = pd.date_range(start, periods=periods, freq=freq, name='time')
+    close = 100 + np.arange(periods, dtype=float) * 0.1
+    return pd.DataFrame({
+        'open': close - 0.05,
+        'high': close + 0.2,
+        'low': close - 0.2,
+        'close': close,
+        'volume': np.full(periods, 10.0),
+    }, index=index)
+
+
+class TestBulkValidation:
+    """Test vectorized validation of candle blocks."""
+
+    def test_clean_data_passes(self):
+        """Test clean candles produce a passing report."""
+        report = DataQualityMonitor().validate_candles(make_candles())
+
+        assert report.passed is True
+        assert report.quality_score == 100.0
+        assert report.total_rows == 60
+        assert report.issues == []
+
+    def test_detects_all_issue_types(self):
+        """Test gaps, duplicates, stale rows, spikes, zero volume and bad OHLC are flagged."""
+        df = make_candles(20)
+        df = df.drop(df.index[5:8])                          # gap of 3 bars
+        df.iloc[10, df.columns.get_loc('close')] *= 1.5      # spike (and high < close)
+        df.iloc[12, df.columns.get_loc('volume')] = 0        # zero volume
+        df = pd.concat([df, df.iloc[[-1]], df.iloc[[3]]])    # duplicate + out-of-order row
+
+        monitor = DataQualityMonitor()
+        flags, missing = monitor.compute_flags(df, pd.Timedelta(minutes=1))
+        report = monitor.validate_candles(df, pd.Timedelta(minutes=1))
+
+        assert report.gaps == 1
+        assert report.missing_bars == 3
+        assert missing.sum() == 3
+        assert report.duplicates == 1
+        assert report.stale == 1
+        assert report.spikes >= 1
+        assert report.zero_volume == 1
+        assert report.ohlc_invalid == 1
+        assert flags[10] & QualityFlag.OHLC_INVALID
+        assert report.passed is False
+
+    def test_empty_frame_fails(self):
+        """Test empty input is reported as failing."""
+        report = DataQualityMonitor().validate_candles(pd.DataFrame())
+
+        assert report.passed is False
+        assert report.quality_score == 0.0
+
+
+class TestRepair:
+    """Test repairing candles onto a regular grid."""
+
+    def test_forward_fills_missing_bars(self):
+        """Test missing bars become flat zero-volume candles."""
+        df = make_candles(10)
+        df = df.drop(df.index[4:6])
+
+        repaired, report = DataQualityMonitor().repair_candles(df, pd.Timedelta(minutes=1))
+
+        assert len(repaired) == 10
+        assert report.filled_bars == 2
+        filled = repaired.iloc[4]
+        assert filled['close'] == df['close'].iloc[3]
+        assert filled['open'] == filled['high'] == filled['low'] == filled['close']
+        assert filled['volume'] == 0
+
+    def test_refetches_missing_bars_first(self):
+        """Test missing ranges are re-fetched once per contiguous hole."""
+        full = make_candles(12)
+        df = full.drop(full.index[[2, 3, 8]])
+        calls = []
+
+        def refetch(start, end):
+            calls.append((start, end))
+            return full.loc[start:end]
+
+        repaired, report = DataQualityMonitor().repair_candles(df, pd.Timedelta(minutes=1), refetch=refetch)
+
+        assert len(calls) == 2
+        assert report.refetched_bars == 3
+        assert report.filled_bars == 0
+        pd.testing.assert_frame_equal(repaired, full, check_freq=False)
+
+    def test_dedupes_and_fixes_ohlc(self):
+        """Test duplicates keep the last candle and high/low bracket open/close."""
+        df = make_candles(5)
+        df.iloc[2, df.columns.get_loc('high')] = df['close'].iloc[2] - 1
+        dup = df.iloc[[1]].copy()
+        dup['close'] = 999.0
+        dup['high'] = 1000.0
+        df = pd.concat([df, dup])
+
+        repaired, _ = DataQualityMonitor(spike_threshold=100).repair_candles(df, pd.Timedelta(minutes=1))
+
+        assert len(repaired) == 5
+        assert repaired['close'].iloc[1] == 999.0
+        assert (repaired['high'] >= repaired[['open', 'close']].max(axis=1)).all()
+
+
+class TestLiveValidation:
+    """Test incremental per-candle checks."""
+
+    def test_live_matches_bulk(self):
+        """Test update() flags the same candles as the bulk check."""
+        df = make_candles(30)
+        df = df.drop(df.index[10:12])
+        df.iloc[15, df.columns.get_loc('volume')] = 0
+        df.iloc[20, df.columns.get_loc('close')] *= 1.3
+        df.iloc[20, df.columns.get_loc('high')] = df['close'].iloc[20]
+
+        monitor = DataQualityMonitor()
+        bulk_flags, _ = monitor.compute_flags(df, pd.Timedelta(minutes=1))
+
+        monitor.reset_live_state(pd.Timedelta(minutes=1))
+        live_flags = [int(monitor.update(ts, r.open, r.high, r.low, r.close, r.volume))
+                      for ts, r in zip(df.index, df.itertuples())]
+
+        assert live_flags == bulk_flags.tolist()
+        live = monitor.live_report()
+        bulk = monitor.validate_candles(df, pd.Timedelta(minutes=1))
+        assert live.to_dict() == bulk.to_dict()
+
+    def test_duplicate_and_stale_candles(self):
+        """Test repeated and older timestamps are flagged without moving state."""
+        monitor = DataQualityMonitor()
+        monitor.update(1_700_000_000, 1, 2, 0.5, 1.5, 1)
+        monitor.update(1_700_000_060, 1, 2, 0.5, 1.5, 1)
+
+        assert monitor.update(1_700_000_060, 1, 2, 0.5, 1.5, 1) & QualityFlag.DUPLICATE
+        assert monitor.update(1_700_000_000, 1, 2, 0.5, 1.5, 1) & QualityFlag.STALE
+        assert monitor.update(1_700_000_120, 1, 2, 0.5, 1.5, 1) == QualityFlag.OK
+
+
+class TestSnapshotValidation:
+    """Test validate_all and the decorator."""
+
+    def test_validate_all_rejects_bad_market_data(self):
+        """Test negative prices and NaN changes are reported."""
+        monitor = DataQualityMonitor()
+        is_valid, errors = monitor.validate_all(
+            {'price': -100, 'price_changes': {'1h': float('nan')}},
+            {'rsi': 50},
+            {'EUR': {'amount': 100.0}}
+        )
+
+        assert is_valid is False
+        assert len(errors['market_data']) == 2
+        assert 'portfolio' not in errors
+
+    def test_decorator_raises_on_invalid_data(self):
+        """Test the decorator blocks calls with invalid data."""
+        @validate_data_quality()
+        def analyze(market_data, technical_indicators, portfolio):
+            return 'analyzed'
+
+        assert analyze({'price': 100.0}, {'rsi': 50}, {}) == 'analyzed'
+        with pytest.raises(DataQualityError):
+            analyze({'price': 100.0}, {'rsi': 150}, {})
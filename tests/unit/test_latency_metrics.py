@@ -0,0 +1,129 @@
+"""
+Unit tests for the hot-path latency metrics
+
+Tests histogram bucketing and percentiles, the timed/measure instrumentation
+on and off, and the JSON and Prometheus exports.
+"""
+
+import json
+import pytest
+import numpy as np
+
+from utils.monitoring import latency_metrics
+from utils.monitoring.latency_metrics import (
+    BUCKET_COUNT, HIGHEST_TRACKABLE_NS, LatencyHistogram, _bucket_bounds, _bucket_index, measure, timed
+)
+
+
+@pytest.fixture
+def registry():
+    latency_metrics.registry.reset()
+    enabled = latency_metrics.registry.enabled
+    latency_metrics.configure(True)
+    yield latency_metrics.registry
+    latency_metrics.configure(enabled)
+    latency_metrics.registry.reset()
+
+
+class TestHistogram:
+    """Test the log-linear histogram."""
+
+    def test_buckets_are_contiguous_and_precise(self):
+        """Test every bucket's bounds map back to it with under 1.6% width."""
+        previous_high = -1
+        for index in range(BUCKET_COUNT):
+            low, high = _bucket_bounds(index)
+            assert low == previous_high + 1
+            assert _bucket_index(low) == index and _bucket_index(high) == index
+            assert high - low <= max(low, 1) / 64
+            previous_high = high
+        assert previous_high == HIGHEST_TRACKABLE_NS
+
+    def test_percentiles_match_numpy(self):
+        """Test percentiles of a lognormal sample are within bucket precision."""
+        values = np.random.default_rng(0).lognormal(mean=13, sigma=1.5, size=50_000).astype(np.int64)
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(int(value))
+
+        for percentile in (50, 95, 99, 99.9):
+            expected = np.percentile(values, percentile, method='inverted_cdf')
+            assert histogram.percentile(percentile) == pytest.approx(expected, rel=0.02)
+        assert histogram.percentile(100) == values.max()
+        assert histogram.count == len(values) and histogram.total == values.sum()
+
+    def test_merge_and_clamp(self):
+        """Test merging adds samples and oversized values are clamped."""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(1_000)
+        second.record(5_000, error=True)
+        second.record(HIGHEST_TRACKABLE_NS * 10)
+
+        first.merge(second)
+
+        assert first.count == 3 and first.errors == 1
+        assert first.min == 1_000 and first.max == HIGHEST_TRACKABLE_NS
+        assert first.percentile(50) == pytest.approx(5_000, rel=0.016)
+
+
+class TestInstrumentation:
+    """Test the decorator and context manager."""
+
+    def test_timed_records_calls_and_errors(self, registry):
+        """Test each call is recorded and exceptions count as errors."""
+        @timed('test.stage')
+        def stage(fail=False):
+            if fail:
+                raise ValueError('boom')
+            return 42
+
+        assert stage() == 42
+        with pytest.raises(ValueError):
+            stage(fail=True)
+
+        histogram = registry.histogram('test.stage')
+        assert histogram.count == 2 and histogram.errors == 1
+        assert stage.__name__ == 'stage'
+
+    def test_measure_block(self, registry):
+        """Test a measured block is recorded under its stage."""
+        with measure('test.block'):
+            sum(range(1000))
+
+        assert registry.stages() == ['test.block']
+        assert registry.histogram('test.block').max > 0
+
+    def test_disabled_records_nothing(self, registry):
+        """Test nothing is recorded while metrics are disabled."""
+        latency_metrics.configure(False)
+
+        timed('test.off')(lambda: None)()
+        with measure('test.off'):
+            pass
+
+        assert registry.stages() == []
+
+
+class TestExport:
+    """Test the JSON and Prometheus exports."""
+
+    def test_snapshot_and_prometheus(self, registry, tmp_path):
+        """Test both exports carry counts, errors and percentiles per stage."""
+        for value in (1_000_000, 2_000_000, 3_000_000):
+            registry.record('coinbase.get_market_data', value)
+        registry.record('llm.call_genai', 1_500_000_000, error=True)
+
+        paths = registry.export(str(tmp_path / 'latency'))
+        snapshot = json.loads(open(paths['json']).read())
+        prometheus = open(paths['prometheus']).read()
+
+        market = snapshot['stages']['coinbase.get_market_data']
+        assert market['count'] == 3 and market['errors'] == 0
+        assert market['p50_ms'] == pytest.approx(2.0, rel=0.02)
+        assert market['max_ms'] == pytest.approx(3.0)
+        assert snapshot['stages']['llm.call_genai']['errors'] == 1
+
+        assert '# TYPE trading_stage_latency_seconds summary' in prometheus
+        assert 'trading_stage_latency_seconds_count{stage="coinbase.get_market_data"} 3' in prometheus
+        assert 'trading_stage_latency_seconds{stage="llm.call_genai",quantile="0.99"} 1.5' in prometheus
+        assert 'trading_stage_errors_total{stage="llm.call_genai"} 1' in prometheus
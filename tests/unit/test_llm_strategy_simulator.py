@@ -0,0 +1,159 @@
+"""
+Unit tests for the batch LLM strategy simulator
+
+Tests that simulate_batch() applies the same rules as analyze_market(),
+that its counter-based randomness does not depend on chunking, and that
+LLMStrategy.analyze_batch() uses the batch API when the analyzer has one.
+"""
+
+import logging
+import random
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock
+
+import utils.backtest.llm_strategy_simulator as llm_simulator_module
+from utils.backtest.llm_strategy_simulator import (
+    LLMStrategySimulator, counter_uniform, RNG_STREAM_CONFIDENCE
+)
+from strategies.base_strategy import batch_row_to_inputs
+from strategies.llm_strategy import LLMStrategy
+
+
+def make_llm_frame(rows=1500, seed=1):
+    """Create random analyze_batch() inputs covering every RSI/MACD/BB/trend branch."""
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(50, 150, rows)
+    middle = price * rng.uniform(0.95, 1.05, rows)
+    width = np.abs(rng.normal(0, 0.03, rows)) * middle
+    df = pd.DataFrame({
+        'price': price,
+        'current_price': price,
+        'change_24h': rng.normal(0, 4, rows),
+        'change_5d': rng.normal(0, 8, rows),
+        'rsi': rng.uniform(0, 100, rows),
+        'macd': rng.normal(0, 150, rows),
+        'macd_signal': rng.normal(0, 150, rows),
+        'bb_upper': middle + width,
+        'bb_lower': middle - width,
+        'bb_middle': middle,
+        'bb_width': rng.uniform(0, 8, rows),
+    })
+    return df.mask(rng.random(df.shape) < 0.1)
+
+
+@pytest.fixture(autouse=True)
+def quiet_simulator_logs():
+    llm_simulator_module.logger.disabled = True
+    yield
+    llm_simulator_module.logger.disabled = False
+
+
+class TestSimulateBatch:
+    """Test simulate_batch() against the per-row simulation."""
+
+    @pytest.mark.parametrize('trading_style', ['day_trading', 'swing_trading', 'long_term'])
+    def test_matches_analyze_market(self, trading_style):
+        """Test analyze_market() row by row equals simulate_batch() on the same frame."""
+        simulator = LLMStrategySimulator(trading_style=trading_style, seed=7)
+        df = make_llm_frame()
+
+        batch = simulator.simulate_batch(df)
+
+        for i, row in df.iterrows():
+            market_data, technical_indicators = batch_row_to_inputs(row)
+            if not pd.isna(row['bb_width']):
+                technical_indicators['bb_width'] = float(row['bb_width'])
+            expected = simulator.analyze_market(market_data, technical_indicators, row=i)
+
+            assert batch.at[i, 'decision'] == expected['decision']
+            assert batch.at[i, 'confidence'] == pytest.approx(expected['confidence'])
+            assert batch.at[i, 'risk_assessment'] == expected['risk_assessment']
+            assert batch.at[i, 'trend'] == expected['market_conditions']['trend']
+        assert set(batch['decision']) == {'BUY', 'SELL', 'HOLD'}
+
+    def test_analyze_market_ignores_global_random_state(self):
+        """Test serial calls number rows from 0 and match an explicit row, whatever the global RNG does."""
+        df = make_llm_frame(rows=20)
+        batch = LLMStrategySimulator(seed=9).simulate_batch(df)
+        inputs = []
+        for _, row in df.iterrows():
+            market_data, technical_indicators = batch_row_to_inputs(row)
+            if not pd.isna(row['bb_width']):
+                technical_indicators['bb_width'] = float(row['bb_width'])
+            inputs.append((market_data, technical_indicators))
+
+        simulator = LLMStrategySimulator(seed=9)
+        serial = []
+        for market_data, technical_indicators in inputs:
+            random.seed(len(serial))
+            serial.append(simulator.analyze_market(market_data, technical_indicators))
+        single = LLMStrategySimulator(seed=9).analyze_market(*inputs[12], row=12)
+
+        assert [result['confidence'] for result in serial] == pytest.approx(list(batch['confidence']))
+        assert single == serial[12]
+        assert serial[12]['reasoning'] == simulator.batch_reasoning(df, batch, [12])[0]
+
+    def test_chunks_match_serial_run(self):
+        """Test chunks simulated with their row_offset reproduce the full run."""
+        simulator = LLMStrategySimulator(seed=3)
+        df = make_llm_frame(rows=1000)
+
+        full = simulator.simulate_batch(df)
+        chunks = pd.concat([LLMStrategySimulator(seed=3).simulate_batch(df.iloc[start:start + 300], row_offset=start)
+                            for start in range(0, len(df), 300)])
+
+        pd.testing.assert_frame_equal(full, chunks)
+        assert not full['confidence'].equals(LLMStrategySimulator(seed=4).simulate_batch(df)['confidence'])
+
+    def test_batch_reasoning_is_deterministic(self):
+        """Test reasoning is generated per requested row and repeats for the same seed."""
+        simulator = LLMStrategySimulator(seed=5)
+        df = make_llm_frame(rows=50)
+        batch = simulator.simulate_batch(df)
+
+        reasoning = simulator.batch_reasoning(df, batch, [3, 10])
+
+        assert len(reasoning) == 2
+        assert all(2 <= len(reasons) <= 4 for reasons in reasoning)
+        assert reasoning == LLMStrategySimulator(seed=5).batch_reasoning(df, batch, [3, 10])
+
+    def test_counter_uniform_range(self):
+        """Test draws are in [0, 1) and streams are independent."""
+        draws = counter_uniform(42, np.arange(100000), RNG_STREAM_CONFIDENCE)
+
+        assert draws.min() >= 0.0 and draws.max() < 1.0
+        assert abs(draws.mean() - 0.5) < 0.01
+        assert not np.array_equal(draws[:100], counter_uniform(42, np.arange(100), RNG_STREAM_CONFIDENCE + 1))
+
+
+class TestLLMStrategyBatch:
+    """Test LLMStrategy.analyze_batch()."""
+
+    @staticmethod
+    def _strategy(llm_analyzer):
+        strategy = LLMStrategy(Mock(), llm_analyzer=llm_analyzer)
+        strategy.logger = logging.getLogger('test_llm_strategy_batch')
+        strategy.logger.disabled = True
+        return strategy
+
+    def test_uses_analyzer_batch_api(self):
+        """Test batch decisions are converted like analyze() with neutral news."""
+        analyzer = Mock(spec=['analyze_market', 'analyze_market_batch'])
+        analyzer.analyze_market_batch.return_value = pd.DataFrame(
+            {'decision': ['BUY', 'sell', 'MAYBE'], 'confidence': [72.5, 150.0, 90.0]})
+        df = pd.DataFrame({'price': [1.0, 2.0, 3.0]})
+
+        result = self._strategy(analyzer).analyze_batch(df)
+
+        assert list(result['action']) == ['BUY', 'SELL', 'HOLD']
+        assert list(result['confidence']) == [72.5, 100.0, 30.0]
+        assert list(result['position_size_multiplier']) == [1.0, 1.0, 1.0]
+
+    def test_returns_none_without_batch_api(self):
+        """Test analyzers without analyze_market_batch() fall back to per-row analysis."""
+        analyzer = Mock(spec=['analyze_market'])
+
+        assert self._strategy(analyzer).analyze_batch(pd.DataFrame({'price': [1.0]})) is None
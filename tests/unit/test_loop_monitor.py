@@ -0,0 +1,86 @@
+"""
+Unit tests for the event-loop lag monitor
+
+Tests lag measurement, slow-callback attribution, overload hysteresis and
+deferral of non-critical work while the loop is behind.
+"""
+
+import asyncio
+import time
+import pytest
+
+from loop_monitor import LoopMonitor
+
+
+class TestLagDetection:
+    """Test lag measurement and slow-callback attribution."""
+
+    def test_blocking_call_is_detected_and_attributed(self):
+        """Test a blocking coroutine raises the lag and is named as the slow callback."""
+        events = []
+
+        async def blocking_write():
+            time.sleep(0.15)
+
+        async def main():
+            monitor = LoopMonitor(threshold=0.1, interval=0.01, slow_callback=0.05,
+                                  on_overload=lambda lag, top: events.append(('overload', top)),
+                                  on_recover=lambda lag: events.append(('recover', lag)))
+            monitor.start()
+            await asyncio.sleep(0.05)
+            await blocking_write()
+            await asyncio.sleep(0.1)
+            monitor.stop()
+            return monitor
+
+        original_run = asyncio.Handle._run
+        monitor = asyncio.run(main())
+
+        assert asyncio.Handle._run is original_run
+        assert monitor.max_lag >= 0.1
+        assert [kind for kind, _ in events] == ['overload', 'recover']
+        assert [name.rsplit('.', 1)[-1] for name, _ in events[0][1]] == ['main']
+        assert monitor.stats()['max_ms'] >= 100 and not monitor.overloaded
+
+    def test_hysteresis(self):
+        """Test the monitor stays overloaded until lag drops below half the threshold."""
+        monitor = LoopMonitor(threshold=0.1)
+
+        monitor.record_lag(0.12)
+        monitor.record_lag(0.07)
+        assert monitor.overloaded
+        monitor.record_lag(0.04)
+        assert not monitor.overloaded
+        assert monitor.percentile(50) == pytest.approx(0.07)
+
+
+class TestLoadShedding:
+    """Test deferral of non-critical work."""
+
+    def test_work_is_deferred_until_recovery(self):
+        """Test deferred alerts run in order once the loop is healthy and failures are counted."""
+        sent = []
+
+        async def alert(message):
+            if message == 'broken':
+                raise RuntimeError('telegram down')
+            sent.append(message)
+
+        async def main():
+            monitor = LoopMonitor(threshold=0.1)
+            await monitor.run_or_defer(alert, 'now')
+            monitor.record_lag(0.5)
+            await monitor.run_or_defer(alert, 'stop loss')
+            await monitor.run_or_defer(alert, 'broken')
+            await monitor.run_or_defer(alert, 'daily')
+            assert await monitor.flush_deferred() == 0
+            deferred = list(sent)
+            monitor.record_lag(0.0)
+            ran = await monitor.flush_deferred()
+            return monitor, deferred, ran
+
+        monitor, deferred, ran = asyncio.run(main())
+
+        assert deferred == ['now']
+        assert ran == 3 and sent == ['now', 'stop loss', 'daily']
+        assert monitor.shed_count == 3 and monitor.deferred_errors == 1
@@ -0,0 +1,115 @@
+"""
+Unit tests for MarketRegimeAnalyzer
+
+Tests the array-based regime classification against the scalar decision
+tree and the transition/duration analysis built from the regime codes.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from utils.backtest.market_regime_analyzer import (
+    MarketRegimeAnalyzer, REGIME_LABELS, REGIME_TRENDING, REGIME_RANGING, REGIME_VOLATILE
+)
+
+
+def classify(thresholds, change_24h, change_5d, bb_width):
+    """Scalar regime decision tree (AdaptiveStrategyManager.detect_market_regime_enhanced)."""
+    if abs(change_24h) > thresholds['trending_price_change_24h'] or \
+       abs(change_5d) > thresholds['trending_price_change_5d']:
+        return 'volatile' if bb_width > thresholds['volatile_bb_width'] else 'trending'
+    if abs(change_24h) < thresholds['ranging_price_change_24h'] and bb_width < thresholds['ranging_bb_width']:
+        return 'ranging'
+    if bb_width > thresholds['extreme_volatile_bb_width']:
+        return 'volatile'
+    return 'ranging'
+
+
+def make_regime_data(rows=2000, seed=11):
+    """Create hourly closes with Bollinger Bands whose width varies over time."""
+    rng = np.random.default_rng(seed)
+    volatility = np.repeat(rng.uniform(0.002, 0.03, rows // 100 + 1), 100)[:rows]
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, volatility))),
+                      index=pd.date_range('2024-01-01', periods=rows, freq='1h'))
+    middle, std = close.rolling(20).mean(), close.rolling(20).std()
+    return pd.DataFrame({'close': close, 'bb_upper_20': middle + 2 * std,
+                         'bb_lower_20': middle - 2 * std, 'bb_middle_20': middle})
+
+
+@pytest.fixture
+def analyzer():
+    return MarketRegimeAnalyzer()
+
+
+class TestRegimeDetection:
+    """Test vectorized regime classification."""
+
+    def test_matches_scalar_decision_tree(self, analyzer):
+        """Test every period gets the same regime as the per-row logic."""
+        data = make_regime_data()
+        changes = analyzer._calculate_price_changes(data)
+        bb_width = analyzer._calculate_bb_width_percentage(data)
+
+        regimes = analyzer.detect_market_regimes(data)
+
+        expected = [classify(analyzer.regime_thresholds, changes['24h'].iloc[i],
+                             changes['5d'].iloc[i], bb_width.iloc[i]) for i in range(len(data))]
+        assert regimes.tolist() == expected
+        assert set(regimes) == set(REGIME_LABELS)
+        assert regimes.index.equals(data.index)
+
+    def test_codes_are_int8(self, analyzer):
+        """Test regime codes index into REGIME_LABELS."""
+        data = make_regime_data(rows=300)
+
+        codes = analyzer.detect_market_regime_codes(data)
+
+        assert codes.dtype == np.int8
+        assert [REGIME_LABELS[c] for c in codes] == analyzer.detect_market_regimes(data).tolist()
+        assert (REGIME_TRENDING, REGIME_RANGING, REGIME_VOLATILE) == (0, 1, 2)
+
+    def test_missing_bands_default_width(self, analyzer):
+        """Test flat prices without bands are ranging (default 2% width is not < 2%)."""
+        data = pd.DataFrame({'close': np.full(50, 100.0)})
+
+        assert (analyzer.detect_market_regimes(data) == 'ranging').all()
+
+
+class TestRegimeTransitions:
+    """Test transition counts, matrix and durations."""
+
+    def test_transition_counts_and_durations(self, analyzer):
+        """Test transitions are counted in first-seen order with run-length durations."""
+        regimes = pd.Series(['ranging', 'ranging', 'trending', 'trending', 'trending',
+                             'ranging', 'volatile', 'ranging', 'trending'])
+
+        result = analyzer._analyze_regime_transitions(regimes)
+
+        assert result['total_transitions'] == 5
+        assert result['transition_frequency'] == pytest.approx(5 / 9)
+        assert list(result['transition_types'].items()) == [
+            ('ranging_to_trending', 2), ('trending_to_ranging', 1),
+            ('ranging_to_volatile', 1), ('volatile_to_ranging', 1)
+        ]
+        assert result['transition_matrix']['ranging']['trending'] == 2
+        assert result['transition_matrix']['ranging']['ranging'] == 0
+        assert result['average_durations'] == {'ranging': pytest.approx(4 / 3), 'trending': 2.0, 'volatile': 1.0}
+
+    def test_empty_series(self, analyzer):
+        """Test an empty series has no transitions."""
+        result = analyzer._analyze_regime_transitions(pd.Series([], dtype=str))
+
+        assert result['total_transitions'] == 0
+        assert result['transition_frequency'] == 0
+        assert result['transition_types'] == {}
+
+    def test_single_period(self, analyzer):
+        """Test a single period is one run with no transitions."""
+        result = analyzer._analyze_regime_transitions(pd.Series(['trending']))
+
+        assert result['total_transitions'] == 0
+        assert result['transition_frequency'] == 0
+        assert result['transition_types'] == {}
+        assert result['transition_matrix'] == {'trending': {'trending': 0}}
+        assert result['average_durations'] == {'trending': 1.0}
@@ -0,0 +1,130 @@
+"""
+Unit tests for tick-to-order latency tracing
+
+Tests price event timestamps, the per-order breakdown, trace propagation
+through asyncio tasks and the rolling window read by the dashboard.
+"""
+
+import asyncio
+import time
+import pytest
+
+from order_latency import (
+    COMPONENTS, LatencyTracker, OrderTrace, PriceEvent, current_trace, load_latency, tracing
+)
+
+
+def make_event(network_in=0.02, age=0.0):
+    now = time.time()
+    return PriceEvent(symbol='BTCUSDT', price=50000.0, event_time=now - age - network_in,
+                      recv_time=now - age, recv_mono=time.monotonic() - age)
+
+
+class TestPriceEvent:
+    """Test price events built from ticker messages."""
+
+    def test_from_ticker(self):
+        """Test the exchange event time and receive time are captured."""
+        event_ms = int(time.time() * 1000) - 50
+        event = PriceEvent.from_ticker('BTCUSDT', {'c': '50123.5', 'E': event_ms})
+
+        assert event.price == 50123.5
+        assert event.event_time == event_ms / 1000
+        assert 0.04 < event.network_in < 1.0
+
+    def test_missing_event_time(self):
+        """Test a message without an event time reports zero network latency."""
+        event = PriceEvent.from_ticker('BTCUSDT', {'c': '1'})
+
+        assert event.network_in == 0
+
+    def test_from_book_ticker(self):
+        """Test bookTicker events price at the best bid and keep the ask."""
+        event = PriceEvent.from_book_ticker('BTCUSDT', {'u': 1, 's': 'BTCUSDT', 'b': '50100.0',
+                                                        'B': '1.2', 'a': '50100.5', 'A': '0.4'})
+
+        assert (event.price, event.ask) == (50100.0, 50100.5)
+        assert event.network_in == 0
+
+
+class TestOrderTrace:
+    """Test the per-order latency breakdown."""
+
+    def test_breakdown_sums_to_total(self):
+        """Test the components add up to the tick-to-ack latency."""
+        event = make_event(network_in=0.02, age=0.01)
+        trace = OrderTrace(event, 'STOP_LOSS', decision_start=event.recv_mono + 0.001)
+        trace.decision_end = trace.decision_start + 0.002
+        trace.task_start = trace.decision_end + 0.003
+        trace.rate_limit_wait = 0.004
+        trace.rest_round_trip = 0.05
+        trace.ack = trace.task_start + 0.06
+        trace.acknowledged({'orderId': 42, 'side': 'SELL'})
+
+        b = trace.breakdown()
+
+        assert b['network_in_ms'] == pytest.approx(20, abs=1e-3)
+        assert b['queueing_ms'] == pytest.approx(4, abs=1e-3)
+        assert b['decision_ms'] == pytest.approx(2, abs=1e-3)
+        assert b['preparation_ms'] == pytest.approx(6, abs=1e-3)
+        assert b['rest_round_trip_ms'] == pytest.approx(50, abs=1e-3)
+        assert b['total_ms'] == pytest.approx(sum(b[f"{name}_ms"] for name in COMPONENTS), abs=1e-2)
+        assert (b['order_id'], b['side'], b['reason']) == ('42', 'SELL', 'STOP_LOSS')
+
+    def test_trace_follows_its_task(self):
+        """Test each order task sees only its own trace and the ack is marked on exit."""
+        async def place(trace, delay):
+            with tracing(trace):
+                await asyncio.sleep(delay)
+                current_trace().rest_round_trip += delay
+            return current_trace()
+
+        async def main():
+            first = OrderTrace(make_event(), 'A', time.monotonic()).decided()
+            second = OrderTrace(make_event(), 'B', time.monotonic()).decided()
+            leftovers = await asyncio.gather(place(first, 0.02), place(second, 0.01))
+            return first, second, leftovers
+
+        first, second, leftovers = asyncio.run(main())
+
+        assert leftovers == [None, None]
+        assert first.rest_round_trip == 0.02 and second.rest_round_trip == 0.01
+        assert first.ack >= first.task_start + 0.02 and second.ack > 0
+
+    def test_no_trace_is_a_no_op(self):
+        """Test untraced orders (panic, dashboard) leave no active trace."""
+        with tracing(None) as trace:
+            assert trace is None and current_trace() is None
+
+
+class TestLatencyTracker:
+    """Test the rolling window and its snapshot."""
+
+    def test_window_percentiles_and_reload(self, tmp_path):
+        """Test the window is bounded, percentiles are nearest-rank and the file is reloaded."""
+        path = tmp_path / 'latency.json'
+        tracker = LatencyTracker(window=100, path=path)
+        for i in range(1, 151):
+            trace = OrderTrace(make_event(), 'TP', time.monotonic()).decided()
+            trace.rest_round_trip = i / 1000
+            trace.acknowledged()
+            tracker.record(trace)
+        tracker.save()
+
+        stats = tracker.percentiles()
+        assert len(tracker.orders) == 100
+        assert stats['rest_round_trip']['p50'] == 100.0
+        assert stats['rest_round_trip']['p99'] == 149.0
+        assert stats['rest_round_trip']['max'] == 150.0
+
+        saved = load_latency(path)
+        assert saved['count'] == 100 and saved['percentiles'] == stats
+        assert LatencyTracker(window=50, path=path).orders == tracker.orders[-50:]
+
+    def test_missing_or_corrupt_file(self, tmp_path):
+        """Test the dashboard gets an empty snapshot when there is nothing to read."""
+        corrupt = tmp_path / 'latency.json'
+        corrupt.write_text('{not json')
+
+        assert load_latency(tmp_path / 'missing.json') == {}
+        assert load_latency(corrupt) == {}
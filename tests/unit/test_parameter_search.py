@@ -0,0 +1,210 @@
+"""
+Unit tests for sample-efficient parameter search
+
+Tests the random, successive-halving, Hyperband and TPE searchers on a
+cheap synthetic objective, and the BacktestEngine and StrategyBacktestSuite integrations against
+the exhaustive grid optimization.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import load_bars
+from utils.backtest.backtest_engine import BacktestEngine
+from utils.backtest.backtest_integration import StrategyBacktestSuite
+from utils.backtest.parameter_search import (
+    GridSearch, Hyperband, RandomSearch, SuccessiveHalving, TPESearch, budget_window, create_search
+)
+
+
+PARAM_GRID = {'fast': list(range(2, 32, 2)), 'slow': list(range(20, 220, 10)), 'mode': ['a', 'b', 'c']}
+
+
+def objective(params):
+    """Smooth objective peaking at fast=12, slow=120, mode='b'."""
+    score = -((params['fast'] - 12) / 10) ** 2 - ((params['slow'] - 120) / 100) ** 2
+    return score + (0.5 if params['mode'] == 'b' else 0.0)
+
+
+def make_evaluator(calls=None):
+    """Evaluator whose short-budget scores are a noisy version of the full-window score."""
+    def evaluate(params_list, budget):
+        if calls is not None:
+            calls.append((len(params_list), budget))
+        return [{'sortino_ratio': objective(params) + (1 - budget) * 0.1 * np.sin(params['slow']),
+                 'total_return': 1.0} for params in params_list]
+    return evaluate
+
+
+def grid_rank(score):
+    """Fraction of grid combinations scoring strictly better than `score`."""
+    scores = [objective(dict(zip(PARAM_GRID, values)))
+              for values in pd.MultiIndex.from_product(PARAM_GRID.values())]
+    return np.mean(np.array(scores) > score + 1e-12)
+
+
+class TestSearchers:
+    """Test searcher bookkeeping and search quality."""
+
+    def test_grid_search_evaluates_everything(self):
+        """Test the grid searcher covers every combination at full budget in batches."""
+        calls = []
+        search = GridSearch(PARAM_GRID, batch_size=250)
+        search.run(make_evaluator(calls))
+
+        assert len(search.history) == search.grid_size == 900
+        assert [size for size, _ in calls] == [250, 250, 250, 150]
+        assert grid_rank(search.best_trial().score) == 0
+
+    def test_random_search_is_seeded_and_distinct(self):
+        """Test random search samples distinct combinations reproducibly."""
+        first = RandomSearch(PARAM_GRID, seed=3, n_trials=40)
+        second = RandomSearch(PARAM_GRID, seed=3, n_trials=40)
+        first.run(make_evaluator())
+        second.run(make_evaluator())
+
+        params = [tuple(trial.params.values()) for trial in first.history]
+        assert len(set(params)) == 40
+        assert params == [tuple(trial.params.values()) for trial in second.history]
+
+    def test_successive_halving_promotes_best(self):
+        """Test rungs shrink by eta while the window grows to the full budget."""
+        calls = []
+        search = SuccessiveHalving(PARAM_GRID, n_candidates=27, eta=3, min_budget=1 / 9)
+        search.run(make_evaluator(calls))
+
+        assert [size for size, _ in calls] == [27, 9, 3]
+        assert [budget for _, budget in calls] == pytest.approx([1 / 9, 1 / 3, 1.0])
+        assert [trial.rung for trial in search.history][-1] == 2
+
+        first_rung = sorted(search.history[:27], key=lambda trial: trial.score, reverse=True)
+        promoted = {tuple(trial.params.values()) for trial in search.history[27:36]}
+        assert promoted == {tuple(trial.params.values()) for trial in first_rung[:9]}
+
+    def test_hyperband_runs_every_bracket(self):
+        """Test Hyperband ends each bracket at full budget without repeating candidates."""
+        search = Hyperband(PARAM_GRID, eta=3, min_budget=1 / 9)
+        search.run(make_evaluator())
+
+        full = [trial for trial in search.history if trial.budget >= 1.0]
+        first_rung = [trial for trial in search.history if trial.rung == 0]
+        assert len({tuple(trial.params.values()) for trial in first_rung}) == len(first_rung)
+        assert len(full) >= 3
+        assert len(search.results_frame()) == len(full)
+
+    def test_tpe_finds_near_optimum(self):
+        """Test TPE lands in the top few percent of the grid with a fraction of the trials."""
+        ranks = []
+        for seed in range(3):
+            search = TPESearch(PARAM_GRID, seed=seed, n_trials=60, n_startup=15, batch_size=5)
+            search.run(make_evaluator())
+            ranks.append(grid_rank(search.best_trial().score))
+
+        assert len(search.history) == 60
+        assert max(ranks) < 0.05
+
+    def test_failed_trials_are_recorded(self):
+        """Test failed evaluations stay in the history with -inf score and are left out of results."""
+        search = RandomSearch(PARAM_GRID, n_trials=10)
+        search.run(lambda params_list, budget: [None if params['mode'] == 'a' else {'sortino_ratio': 1.0}
+                                                for params in params_list])
+
+        failed = [trial for trial in search.history if trial.params['mode'] == 'a']
+        assert failed and all(trial.score == -np.inf for trial in failed)
+        assert len(search.results_frame()) == 10 - len(failed)
+        assert len(search.history_frame()) == 10
+
+    def test_create_search(self):
+        """Test searchers are created by name and unknown names are rejected."""
+        assert isinstance(create_search('tpe', PARAM_GRID, n_trials=5), TPESearch)
+        with pytest.raises(ValueError):
+            create_search('annealing', PARAM_GRID)
+
+
+def make_rsi_data(rows=600, seed=0):
+    """Create hourly closes with a random RSI column."""
+    rng = np.random.default_rng(seed)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows))),
+                      index=pd.date_range('2024-01-01', periods=rows, freq='1h'))
+    return pd.DataFrame({'close': close, 'rsi': rng.uniform(0, 100, rows)})
+
+
+def rsi_signals(data, rsi_buy, rsi_sell):
+    return pd.DataFrame({'buy': data['rsi'] < rsi_buy, 'sell': data['rsi'] > rsi_sell}, index=data.index)
+
+
+RSI_GRID = {'rsi_buy': [10, 20, 30, 40], 'rsi_sell': [60, 70, 80]}
+
+
+class TestEngineParameterSearch:
+    """Test BacktestEngine.run_parameter_search."""
+
+    def test_grid_search_matches_grid_optimization(self):
+        """Test an exhaustive search returns the run_parameter_optimization() results."""
+        data = make_rsi_data()
+        expected = BacktestEngine().run_parameter_optimization(data, rsi_signals, RSI_GRID, 'TEST')
+        results = BacktestEngine().run_parameter_search(data, rsi_signals, GridSearch(RSI_GRID), 'TEST')
+
+        key = ['rsi_buy', 'rsi_sell']
+        expected = expected.sort_values(key).reset_index(drop=True)
+        results = results.sort_values(key).reset_index(drop=True)
+        pd.testing.assert_series_equal(results['sortino_ratio'], expected['sortino_ratio'])
+        pd.testing.assert_series_equal(results['total_trades'], expected['total_trades'])
+
+    def test_short_budgets_use_recent_window(self):
+        """Test short-budget trials are backtested on the trailing part of the data."""
+        data = make_rsi_data()
+        windows = []
+
+        def recording_signals(window, rsi_buy, rsi_sell):
+            windows.append((window.index[0], len(window)))
+            return rsi_signals(window, rsi_buy, rsi_sell)
+
+        search = SuccessiveHalving(RSI_GRID, n_candidates=9, eta=3, min_budget=1 / 3)
+        results = BacktestEngine().run_parameter_search(data, recording_signals, search, 'TEST')
+
+        assert len(results) == 3
+        assert len(budget_window(data, 1 / 3)) == 200
+        assert {length for _, length in windows} == {200, 600}
+        assert all(start == data.index[-length] for start, length in windows)
+
+
+class TestSuiteParameterSearch:
+    """Test StrategyBacktestSuite.optimize_strategy_parameters(search=...)."""
+
+    def test_grid_search_matches_grid_optimization(self, tmp_path):
+        """Test an exhaustive search returns the grid loop's results and records its trials."""
+        data = load_bars(1_000, seed=2, cache_dir=None)
+        grid = {'lookback': [10, 20], 'threshold': [1, 2]}
+        suite = StrategyBacktestSuite(results_dir=str(tmp_path))
+
+        expected = suite.optimize_strategy_parameters(data, 'momentum', grid, 'TEST')
+        results = suite.optimize_strategy_parameters(data, 'momentum', grid, 'TEST', search=GridSearch(grid))
+
+        key = ['lookback', 'threshold']
+        expected = expected.sort_values(key).reset_index(drop=True)
+        results = results.sort_values(key).reset_index(drop=True)
+        assert len(results) == 4
+        pd.testing.assert_series_equal(results['total_return'], expected['total_return'])
+        assert suite.optimization_results['TEST_momentum']['search']['method'] == 'GridSearch'
+
+    def test_short_budgets_use_recent_window(self, tmp_path, monkeypatch):
+        """Test short-budget trials generate signals on the trailing part of the data."""
+        data = load_bars(900, seed=2, cache_dir=None)
+        grid = {'lookback': list(range(5, 50, 5))}
+        suite = StrategyBacktestSuite(results_dir=str(tmp_path))
+        windows = []
+        generate = suite._generate_strategy_signals_with_params
+
+        def recording_generate(window, strategy_name, params, product_id):
+            windows.append((window.index[0], len(window)))
+            return generate(window, strategy_name, params, product_id)
+
+        monkeypatch.setattr(suite, '_generate_strategy_signals_with_params', recording_generate)
+        search = SuccessiveHalving(grid, metric='total_return', n_candidates=9, eta=3, min_budget=1 / 3)
+        results = suite.optimize_strategy_parameters(data, 'momentum', grid, 'TEST', 'total_return', search)
+
+        assert len(results) == 3
+        assert {length for _, length in windows} == {300, 900}
+        assert all(start == data.index[-length] for start, length in windows)
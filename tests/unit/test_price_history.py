@@ -0,0 +1,86 @@
+"""
+Unit tests for the 1-minute price history
+
+Tests kline preloading, live ticks, gap filling and the local store used to
+warm-start the bot after a restart.
+"""
+
+from price_history import MINUTE_MS, PriceHistory
+
+NOW = 1_700_000_000.0
+NOW_MINUTE = int(NOW // 60) * MINUTE_MS
+
+
+def klines(start_minute, count, price=100.0):
+    return [[start_minute + i * MINUTE_MS, '0', '0', '0', str(price + i), str(1.0 + i), 0]
+            for i in range(count)]
+
+
+class TestPriceHistory:
+    """Test the minute buffer."""
+
+    def test_preload_and_live_ticks(self):
+        """Test klines fill the buffer and ticks update or open the current minute."""
+        history = PriceHistory('BTCUSDT', path='unused.json')
+        history.load_klines(klines(NOW_MINUTE - 59 * MINUTE_MS, 60))
+
+        assert len(history) == 60 and history.ready
+        assert history.closes[-1] == 159.0 and history.volumes[-1] == 60.0
+
+        history.on_tick(200.0, NOW + 1)
+        history.on_tick(201.0, NOW + 61)
+
+        assert len(history) == 61
+        assert history.closes[-2:] == [200.0, 201.0]
+        assert history.volumes[-2:] == [60.0, 0.0]
+
+    def test_gaps_are_filled_so_positions_are_minutes(self):
+        """Test minutes without data repeat the last close and overlapping klines are replaced."""
+        history = PriceHistory('BTCUSDT', path='unused.json')
+        history.load_klines(klines(NOW_MINUTE, 1))
+
+        history.on_tick(110.0, NOW + 5 * 60)
+        history.load_klines([[NOW_MINUTE + 2 * MINUTE_MS, '0', '0', '0', '105', '3', 0]])
+
+        assert history.closes == [100.0, 100.0, 105.0, 100.0, 100.0, 110.0]
+        assert history.volumes[2] == 3.0
+        assert history.last_minute == NOW_MINUTE + 5 * MINUTE_MS
+
+    def test_window_is_bounded(self):
+        """Test only the newest maxlen minutes are kept."""
+        history = PriceHistory('BTCUSDT', maxlen=100, path='unused.json')
+        history.load_klines(klines(NOW_MINUTE - 149 * MINUTE_MS, 150))
+
+        assert len(history) == 100 and history.closes[0] == 150.0
+        assert not PriceHistory('BTCUSDT', path='unused.json').ready
+
+
+class TestWarmStart:
+    """Test the local store and the REST gap to fetch."""
+
+    def test_fetch_start(self):
+        """Test an empty buffer asks for the full window and a loaded one only for the gap."""
+        history = PriceHistory('BTCUSDT', maxlen=1500, path='unused.json')
+
+        assert history.fetch_start(NOW) == NOW_MINUTE - 1499 * MINUTE_MS
+
+        history.load_klines(klines(NOW_MINUTE - 10 * MINUTE_MS, 5))
+        assert history.fetch_start(NOW) == NOW_MINUTE - 6 * MINUTE_MS
+
+    def test_store_round_trip(self, tmp_path):
+        """Test a restart reloads the store, dropping minutes outside the window."""
+        path = tmp_path / 'klines.json'
+        history = PriceHistory('BTCUSDT', maxlen=100, path=path)
+        history.load_klines(klines(NOW_MINUTE - 99 * MINUTE_MS, 100))
+        assert history.needs_save()
+        history.save()
+        assert not history.needs_save()
+
+        restarted = PriceHistory('BTCUSDT', maxlen=100, path=path)
+        loaded = restarted.load_store(now=NOW + 30 * 60)
+
+        assert loaded == 70
+        assert restarted.closes == history.closes[30:]
+        assert not restarted.needs_save()
+        assert PriceHistory('ETHUSDT', path=path).load_store(now=NOW) == 0
+        assert PriceHistory('BTCUSDT', path=tmp_path / 'missing.json').load_store() == 0
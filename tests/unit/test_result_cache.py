@@ -0,0 +1,139 @@
+"""
+Unit tests for the backtest result cache
+
+Tests key construction, LRU eviction, invalidation and that repeated
+BacktestEngine/ComprehensiveBacktestSuite runs are answered from the cache.
+"""
+
+import os
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from utils.backtest.backtest_engine import BacktestEngine
+from utils.backtest.result_cache import BacktestResultCache, frame_fingerprint
+
+
+def make_data(rows=400, seed=0):
+    """Create hourly OHLCV data."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    return pd.DataFrame({'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close,
+                         'volume': rng.uniform(1, 10, rows)},
+                        index=pd.date_range('2024-01-01', periods=rows, freq='1h'))
+
+
+def make_signals(data, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'buy': rng.random(len(data)) < 0.05, 'sell': rng.random(len(data)) < 0.05},
+                        index=data.index)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return BacktestResultCache(str(tmp_path), salt='test')
+
+
+class TestCacheKeys:
+    """Test the content-addressed keys."""
+
+    def test_fingerprint_tracks_content(self):
+        """Test equal frames share a fingerprint and any value, index or column change alters it."""
+        data = make_data()
+        changed = data.copy()
+        changed.iloc[-1, 3] += 1e-9
+
+        assert frame_fingerprint(data) == frame_fingerprint(data.copy())
+        assert frame_fingerprint(changed) != frame_fingerprint(data)
+        assert frame_fingerprint(data.shift(freq='1h')) != frame_fingerprint(data)
+        assert frame_fingerprint(data.rename(columns={'volume': 'vol'})) != frame_fingerprint(data)
+        assert frame_fingerprint(data.assign(name='BTC')) != frame_fingerprint(data.assign(name='ETH'))
+
+    def test_key_covers_strategy_params_settings_and_salt(self, cache, tmp_path):
+        """Test every key component changes the key."""
+        data = make_data()
+        key = cache.make_key(data, 'momentum', {'lookback': 10}, {'fees': 0.006})
+
+        assert key.startswith('momentum-')
+        assert key == cache.make_key(data, 'momentum', {'lookback': 10}, {'fees': 0.006})
+        assert key != cache.make_key(data, 'mean_reversion', {'lookback': 10}, {'fees': 0.006})
+        assert key != cache.make_key(data, 'momentum', {'lookback': 12}, {'fees': 0.006})
+        assert key != cache.make_key(data, 'momentum', {'lookback': 10}, {'fees': 0.004})
+        assert key != BacktestResultCache(str(tmp_path), salt='v2').make_key(
+            data, 'momentum', {'lookback': 10}, {'fees': 0.006})
+
+
+class TestCacheStorage:
+    """Test storage, eviction and invalidation."""
+
+    def test_round_trip_with_arrays(self, cache):
+        """Test metrics and arrays come back unchanged."""
+        equity = np.linspace(1, 2, 100)
+        cache.put('momentum-abc', {'total_return': 12.5}, {'equity': equity})
+
+        entry = cache.get('momentum-abc')
+
+        assert entry.result == {'total_return': 12.5}
+        np.testing.assert_array_equal(entry.arrays['equity'], equity)
+        assert cache.get('momentum-missing') is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used entries are evicted first."""
+        cache = BacktestResultCache(str(tmp_path), max_size_mb=0.25, salt='test')
+        payload = {'equity': np.zeros(10_000)}  # ~80 KB per entry
+        for i, key in enumerate(['s-a', 's-b', 's-c']):
+            cache.put(key, {}, payload)
+            os.utime(cache._path(key), (i, i))
+        assert cache.get('s-a') is not None  # a becomes the most recently used
+
+        cache.put('s-d', {}, payload)
+
+        assert cache.get('s-b') is None
+        assert all(cache.get(key) is not None for key in ['s-a', 's-c', 's-d'])
+
+    def test_invalidation(self, cache):
+        """Test single-key, per-strategy and full invalidation."""
+        for key in ['momentum-a', 'momentum-b', 'mean_reversion-a']:
+            cache.put(key, {'key': key})
+
+        assert cache.invalidate('momentum-a') is True
+        assert cache.invalidate('momentum-a') is False
+        assert cache.invalidate_strategy('momentum') == 1
+        assert cache.get('mean_reversion-a') is not None
+        assert cache.clear() == 1
+        assert cache.stats()['entries'] == 0
+
+
+class TestEngineCaching:
+    """Test BacktestEngine.run_backtest() reuses cached results."""
+
+    def test_repeat_run_served_from_cache(self, cache, monkeypatch):
+        """Test a repeat run returns identical metrics without building a portfolio."""
+        data = make_data()
+        signals = make_signals(data)
+        engine = BacktestEngine(result_cache=cache)
+        first = engine.run_backtest(data, signals, 'BTC-USD')
+
+        monkeypatch.setattr(engine, '_create_portfolio', lambda *args: pytest.fail('portfolio rebuilt'))
+        second = engine.run_backtest(data, signals, 'BTC-USD')
+
+        assert second.keys() == first.keys()
+        assert all(second[k] == first[k] or (pd.isna(second[k]) and pd.isna(first[k]))
+                   for k in first if np.isscalar(first[k]))
+        entry = cache.get(cache.make_key(data, 'backtest', {'product_id': 'BTC-USD'},
+                                         engine._cache_settings(), signals))
+        assert len(entry.arrays['equity']) == len(data)
+        assert len(entry.arrays['trades']) == first['total_trades']
+
+    def test_settings_change_misses(self, cache):
+        """Test different fees are not answered from the cache."""
+        data = make_data()
+        signals = make_signals(data)
+        BacktestEngine(result_cache=cache).run_backtest(data, signals, 'BTC-USD')
+
+        BacktestEngine(fees=0.001, result_cache=cache).run_backtest(data, signals, 'BTC-USD')
+
+        assert cache.stats()['entries'] == 2
+        assert cache.hits == 0
@@ -0,0 +1,127 @@
+"""
+Unit tests for the array-state risk simulator
+
+Tests that the compiled trade-size functions reproduce CapitalManager
+and that simulate_risk carries portfolio state between signals.
+"""
+
+import logging
+
+import pytest
+import numpy as np
+from unittest.mock import Mock
+
+from utils.backtest.risk_simulator import (
+    RiskDecision, RiskLimits, safe_buy_size, safe_sell_size, simulate_risk
+)
+from utils.trading.capital_manager import CapitalManager
+
+
+@pytest.fixture
+def capital_manager():
+    """CapitalManager with default limits and quiet logging."""
+    config = Mock(spec=['MIN_TRADE_AMOUNT'])
+    config.MIN_TRADE_AMOUNT = 30.0
+    manager = CapitalManager(config)
+    manager.logger = logging.getLogger('test_risk_simulator')
+    manager.logger.disabled = True
+    return manager
+
+
+@pytest.fixture
+def limits(capital_manager):
+    """Limits snapshot of the default CapitalManager."""
+    return RiskLimits.from_capital_manager(capital_manager, 'BTC')
+
+
+def limit_args(limits):
+    return (limits.daily_trade_limit_reached, limits.daily_volume,
+            limits.max_daily_trading_volume, limits.cooldown_active, limits.min_trade_amount)
+
+
+class TestSafeTradeSizes:
+    """Test the pure trade-size functions against CapitalManager."""
+
+    def test_matches_capital_manager(self, capital_manager, limits):
+        """Test BUY and SELL sizes agree on random portfolios."""
+        rng = np.random.default_rng(3)
+
+        for _ in range(2000):
+            eur = float(rng.uniform(0, 5000))
+            amount = float(rng.uniform(0, 0.1))
+            price = float(rng.uniform(1000, 60000))
+            total = eur + amount * price
+            original = float(rng.uniform(0, 2000))
+            portfolio = {
+                'EUR': {'amount': eur},
+                'BTC': {'amount': amount, 'last_price_eur': price},
+                'portfolio_value_eur': {'amount': total}
+            }
+
+            expected_buy, _ = capital_manager.calculate_safe_trade_size('BUY', 'BTC', portfolio, original)
+            expected_sell, _ = capital_manager.calculate_safe_trade_size('SELL', 'BTC', portfolio, original)
+
+            buy = safe_buy_size(eur, amount * price, total, original, limits.min_eur_reserve,
+                                limits.max_eur_usage_per_trade, limits.max_position_size_percent,
+                                limits.rebalance_trigger_eur_percent, limits.max_crypto_allocation,
+                                *limit_args(limits))
+            sell = safe_sell_size(amount * price, total, original, limits.min_position_size_eur,
+                                  *limit_args(limits))
+
+            assert buy == pytest.approx(expected_buy)
+            assert sell == pytest.approx(expected_sell)
+
+    def test_limits_snapshot_reads_daily_state(self, capital_manager):
+        """Test today's trade count and volume are captured."""
+        capital_manager.max_trades_per_day = 1
+        capital_manager.record_trade('BTC', 500.0, 10000.0)
+
+        limits = RiskLimits.from_capital_manager(capital_manager, 'BTC')
+
+        assert limits.daily_trade_limit_reached is True
+        assert limits.daily_volume == 500.0
+        assert limits.cooldown_active is True
+
+
+class TestSimulateRisk:
+    """Test the compiled buy/sell event loop."""
+
+    def test_approved_buy_then_sell_updates_state(self, limits):
+        """Test cash, crypto and value move with approved trades only."""
+        prices = np.array([100.0, 100.0, 110.0, 120.0])
+        buy = np.array([True, False, False, False])
+        sell = np.array([False, False, False, True])
+
+        result = simulate_risk(prices, buy, sell, np.full(4, 60.0), np.ones(4), 10000.0, limits)
+
+        assert result['risk_code'].dtype == np.int8
+        assert result['risk_code'].tolist() == [RiskDecision.APPROVED, RiskDecision.NONE,
+                                                RiskDecision.NONE, RiskDecision.APPROVED]
+        bought = 10000.0 * (0.10 + 0.60 * 0.15)
+        assert result['trade_value'][0] == pytest.approx(bought)
+        assert result['position_size'][0] == pytest.approx(bought / 10000.0)
+        assert result['crypto'][1] == pytest.approx(bought / 100.0)
+        assert result['portfolio_value'][2] == result['portfolio_value'][1]  # only revalued on trades
+        assert result['crypto'][3] < result['crypto'][2]
+        assert result['cash'][3] > result['cash'][2]
+
+    def test_sell_without_position_is_blocked(self, limits):
+        """Test SELL with no crypto is blocked and BUY wins when both flags are set."""
+        prices = np.array([100.0, 100.0])
+        buy = np.array([False, True])
+        sell = np.array([True, True])
+
+        result = simulate_risk(prices, buy, sell, np.full(2, 50.0), np.ones(2), 10000.0, limits)
+
+        assert result['risk_code'].tolist() == [RiskDecision.BLOCKED, RiskDecision.APPROVED]
+        assert result['crypto'][1] > 0
+
+    def test_reserve_blocks_buys(self, limits):
+        """Test buys stop once cash is at the minimum reserve."""
+        prices = np.full(3, 100.0)
+
+        result = simulate_risk(prices, np.ones(3, dtype=bool), np.zeros(3, dtype=bool),
+                               np.full(3, 90.0), np.ones(3), limits.min_eur_reserve, limits)
+
+        assert (result['risk_code'] == RiskDecision.BLOCKED).all()
+        assert result['cash'][-1] == limits.min_eur_reserve
@@ -0,0 +1,126 @@
+"""
+Unit tests for the shared-memory data plane
+
+Tests round-tripping frames through shared memory, zero-copy attachment
+from worker processes and reference-counted cleanup.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from utils.backtest.shared_data import (
+    SharedDataPlane, attach_frame, dataset_key, detach_frame
+)
+
+
+def make_ohlcv(rows=500, tz=None):
+    """Create an hourly OHLCV frame with float, int and bool columns."""
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 1, rows))
+    return pd.DataFrame({
+        'close': close,
+        'volume': rng.integers(0, 1000, rows),
+        'rsi': np.where(rng.random(rows) < 0.1, np.nan, rng.uniform(0, 100, rows)),
+        'above_sma': close > 100
+    }, index=pd.date_range('2024-01-01', periods=rows, freq='1h', tz=tz, name='timestamp'))
+
+
+def column_sum(handle):
+    frame = attach_frame(handle)
+    return float(frame['close'].sum()), int(frame['volume'].sum()), str(frame.index.dtype)
+
+
+def segment_exists(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+class TestSharedDataPlane:
+    """Test publishing and attaching frames."""
+
+    @pytest.mark.parametrize('tz', [None, 'UTC'])
+    def test_round_trip(self, tz):
+        """Test the attached frame equals the original, including dtypes and index."""
+        df = make_ohlcv(tz=tz)
+
+        with SharedDataPlane() as plane:
+            handle = plane.publish(dataset_key('BTC-USD', 'hour', 180), df)
+            frame = plane.frame('BTC-USD_hour_180d')
+
+            pd.testing.assert_frame_equal(frame, df, check_freq=False)
+            assert not frame['close'].to_numpy().flags.writeable
+            assert handle.nbytes >= df.memory_usage().sum()
+
+    def test_workers_see_shared_data(self):
+        """Test worker processes attach to the same data through the small handle."""
+        df = make_ohlcv()
+
+        with SharedDataPlane() as plane:
+            handle = plane.publish('BTC-USD', df)
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(column_sum, [handle] * 4))
+
+        assert results == [(float(df['close'].sum()), int(df['volume'].sum()), str(df.index.dtype))] * 4
+
+    def test_attach_is_zero_copy(self):
+        """Test attached frames are views: writes to the segment show through."""
+        with SharedDataPlane() as plane:
+            handle = plane.publish('BTC-USD', make_ohlcv())
+            frame = attach_frame(handle)
+            assert frame is attach_frame(handle)
+
+            segment = shared_memory.SharedMemory(name=handle.shm_name)
+            close = np.ndarray((handle.rows,), dtype=np.float64, buffer=segment.buf,
+                               offset=handle.columns[0].offset)
+            close[0] = 42.0
+
+            assert frame['close'].iloc[0] == 42.0
+            del close, frame
+            segment.close()
+            detach_frame(handle)
+
+    def test_unsupported_columns_rejected(self):
+        """Test object columns raise ValueError."""
+        df = make_ohlcv().assign(product_id='BTC-USD')
+
+        with SharedDataPlane() as plane, pytest.raises(ValueError):
+            plane.publish('BTC-USD', df)
+
+
+class TestReferenceCounting:
+    """Test segments are unlinked when the last reference is released."""
+
+    def test_release_unlinks_last_reference(self):
+        """Test publish/acquire share a segment that outlives all but the last release."""
+        plane = SharedDataPlane()
+        handle = plane.publish('BTC-USD', make_ohlcv())
+        assert plane.publish('BTC-USD', make_ohlcv(rows=10)) is handle
+        assert plane.acquire('BTC-USD') is handle
+
+        plane.release('BTC-USD')
+        plane.release('BTC-USD')
+        assert segment_exists(handle.shm_name)
+
+        plane.release('BTC-USD')
+        assert 'BTC-USD' not in plane
+        assert not segment_exists(handle.shm_name)
+
+    def test_close_unlinks_everything(self, tmp_path):
+        """Test close() removes every segment, including Parquet-loaded ones."""
+        path = tmp_path / 'ETH-USD_hour_180d.parquet'
+        make_ohlcv().to_parquet(path)
+
+        plane = SharedDataPlane()
+        handles = [plane.publish('BTC-USD', make_ohlcv()), plane.load_parquet('ETH-USD', path)]
+        assert plane.load_parquet('ETH-USD', path) is handles[1]
+        plane.close()
+
+        assert len(plane) == 0
+        assert not any(segment_exists(handle.shm_name) for handle in handles)
@@ -0,0 +1,125 @@
+"""
+Unit tests for batch strategy analysis
+
+Tests that analyze_batch() on the rule-based strategies reproduces
+analyze() row for row, and that the backtest adapters produce the same
+signals on the batch and row-by-row paths.
+"""
+
+import logging
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from strategies.mean_reversion import MeanReversionStrategy
+from strategies.momentum import MomentumStrategy
+from strategies.trend_following import TrendFollowingStrategy
+from strategies.base_strategy import batch_row_to_inputs
+from config import Config
+
+STRATEGY_CLASSES = [MeanReversionStrategy, MomentumStrategy, TrendFollowingStrategy]
+
+
+def make_batch_frame(rows=1500, seed=7):
+    """Create random analyze_batch() inputs with NaNs and degenerate bands."""
+    rng = np.random.default_rng(seed)
+    price = rng.uniform(50, 150, rows)
+    middle = price * rng.uniform(0.95, 1.05, rows)
+    width = np.abs(rng.normal(0, 0.05, rows)) * middle
+    width[::50] = 0.0  # upper == lower
+    df = pd.DataFrame({
+        'price': price,
+        'current_price': price,
+        'change_1h': rng.normal(0, 2, rows),
+        'change_4h': rng.normal(0, 4, rows),
+        'change_24h': rng.normal(0, 6, rows),
+        'change_5d': rng.normal(0, 10, rows),
+        'volume_current': rng.uniform(0, 3000, rows),
+        'volume_average': rng.uniform(1, 1500, rows),
+        'rsi': rng.uniform(0, 100, rows),
+        'macd': rng.normal(0, 1, rows),
+        'macd_signal': rng.normal(0, 1, rows),
+        'macd_histogram': rng.normal(0, 0.5, rows),
+        'bb_upper': middle + width,
+        'bb_lower': middle - width,
+        'bb_middle': middle,
+    })
+    holes = rng.random(df.shape) < 0.1
+    return df.mask(holes)
+
+
+def make_indicator_data(rows=400, seed=3):
+    """Create hourly OHLCV candles with the indicator columns the adapters read."""
+    rng = np.random.default_rng(seed)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, rows))),
+                      index=pd.date_range('2024-01-01', periods=rows, freq='1h'))
+    df = pd.DataFrame({'open': close * 1.001, 'high': close * 1.01, 'low': close * 0.99,
+                       'close': close, 'volume': rng.uniform(0, 1000, rows)})
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14).mean()
+    loss = (-delta.clip(upper=0)).rolling(14).mean()
+    df['rsi_14'] = 100 - 100 / (1 + gain / loss)
+    df['macd'] = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+    df['macd_signal'] = df['macd'].ewm(span=9).mean()
+    df['macd_histogram'] = df['macd'] - df['macd_signal']
+    middle, std = close.rolling(20).mean(), close.rolling(20).std()
+    df['bb_upper_20'], df['bb_lower_20'], df['bb_middle_20'] = middle + 2 * std, middle - 2 * std, middle
+    df.iloc[50:60, df.columns.get_loc('volume')] = np.nan
+    return df
+
+
+class TestAnalyzeBatch:
+    """Test analyze_batch() against the per-row analyze()."""
+
+    @pytest.mark.parametrize('strategy_class', STRATEGY_CLASSES)
+    def test_matches_analyze_row_for_row(self, strategy_class):
+        """Test action, confidence and position size match analyze() on every row."""
+        strategy = strategy_class(Config())
+        strategy.logger = logging.getLogger('test_batch_analysis')
+        strategy.logger.disabled = True
+        df = make_batch_frame()
+
+        batch = strategy.analyze_batch(df)
+
+        assert list(batch.index) == list(df.index)
+        for i, row in df.iterrows():
+            market_data, technical_indicators = batch_row_to_inputs(row)
+            signal = strategy.analyze(market_data, technical_indicators, {})
+            assert batch.at[i, 'action'] == signal.action
+            assert batch.at[i, 'confidence'] == pytest.approx(signal.confidence)
+            assert batch.at[i, 'position_size_multiplier'] == pytest.approx(signal.position_size_multiplier)
+
+    @pytest.mark.parametrize('strategy_class', STRATEGY_CLASSES)
+    def test_empty_frame(self, strategy_class):
+        """Test an empty frame returns an empty result with the output columns."""
+        batch = strategy_class(Config()).analyze_batch(pd.DataFrame())
+
+        assert len(batch) == 0
+        assert list(batch.columns) == ['action', 'confidence', 'position_size_multiplier']
+
+
+class TestAdapterBatchPath:
+    """Test the backtest adapters pick up analyze_batch()."""
+
+    @pytest.mark.parametrize('adapter_path', [
+        'utils.backtest.strategy_vectorizer.VectorizedStrategyAdapter',
+        'utils.backtest.enhanced_strategy_vectorizer.EnhancedVectorizedStrategyAdapter',
+    ])
+    def test_batch_signals_match_row_signals(self, adapter_path):
+        """Test buy/sell/confidence are identical on both paths for every strategy."""
+        module_name, class_name = adapter_path.rsplit('.', 1)
+        adapter = getattr(__import__(module_name, fromlist=[class_name]), class_name)()
+        data = make_indicator_data()
+
+        for strategy_name in adapter.live_strategies:
+            adapter.use_batch_analysis = True
+            batch = adapter.vectorize_strategy(strategy_name, data)
+            adapter.use_batch_analysis = False
+            rows = adapter.vectorize_strategy(strategy_name, data)
+
+            for column in ['buy', 'sell']:
+                assert batch[column].astype(bool).tolist() == rows[column].astype(bool).tolist()
+            np.testing.assert_allclose(batch['confidence'].astype(float), rows['confidence'].astype(float))
+            np.testing.assert_allclose(batch['position_size_multiplier'].astype(float),
+                                       rows['position_size_multiplier'].astype(float))
@@ -13,6 +13,7 @@ Tests the strategy manager that coordinates multiple trading strategies:
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import logging
+import threading
 
 # Import the strategy manager and related classes
 from strategies.strategy_manager import StrategyManager
@@ -337,6 +338,99 @@ class TestStrategyAnalysis:
         assert signals['momentum'].confidence >= 0
 
 
+class BlockingStrategy:
+    """I/O-bound stand-in that signals when it starts and waits on an event."""
+
+    io_bound = True
+
+    def __init__(self, release=None):
+        self.release = release
+        self.started = threading.Event()
+        self.calls = 0
+
+    def analyze(self, market_data, technical_indicators, portfolio):
+        self.calls += 1
+        self.started.set()
+        if self.release is not None:
+            self.release.wait(5)
+        return TradingSignal(action="BUY", confidence=80, reasoning="slow source")
+
+
+class TestConcurrentStrategyAnalysis:
+    """Test I/O-bound strategies on the worker pool with deadlines."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = Config()
+        self.manager = StrategyManager(self.config)
+        self.market_data = {"price": 50000.0}
+        self.technical_indicators = {'rsi': 60, 'current_price': 50000.0}
+
+    def teardown_method(self):
+        """Stop the strategy worker pool."""
+        self.manager.close()
+
+    def test_io_strategy_overlaps_rule_based(self):
+        """Test the I/O-bound strategy is already running while the rule-based ones run inline."""
+        release = threading.Event()
+        slow = BlockingStrategy(release=release)
+        self.manager.strategies['llm_strategy'] = slow
+        rule_based = self.manager.strategies['momentum'].analyze
+        overlapped = []
+
+        def rule_based_during_io(*args):
+            overlapped.append(slow.started.wait(5))
+            release.set()
+            return rule_based(*args)
+
+        self.manager.strategies['momentum'].analyze = rule_based_during_io
+
+        signals = self.manager.analyze_all_strategies(self.market_data, self.technical_indicators, {})
+
+        assert overlapped == [True]
+        assert len(signals) == 4
+        assert signals['llm_strategy'].action == "BUY"
+
+    def test_deadline_miss_is_recorded_and_skipped(self):
+        """Test a late strategy is left out, not resubmitted while running, and used again once done."""
+        release = threading.Event()
+        slow = BlockingStrategy(release=release)
+        self.manager.strategies['llm_strategy'] = slow
+        self.manager.config = Mock(STRATEGY_TIMEOUTS={'llm_strategy': 0.05}, MIN_STRATEGIES_AGREEING=1)
+
+        first = self.manager.analyze_all_strategies(self.market_data, self.technical_indicators, {})
+        second = self.manager.analyze_all_strategies(self.market_data, self.technical_indicators, {})
+
+        assert 'llm_strategy' not in first and 'llm_strategy' not in second
+        assert slow.calls == 1
+        assert self.manager.strategy_timeouts == {'llm_strategy': 2}
+
+        release.set()
+        self.manager._pending_strategies['llm_strategy'].result(timeout=5)
+        third = self.manager.analyze_all_strategies(self.market_data, self.technical_indicators, {})
+
+        assert third['llm_strategy'].action == "BUY"
+        assert slow.calls == 2
+
+    def test_close_shuts_down_the_worker_pool(self):
+        """Test close() stops the pool without waiting and a later cycle starts a new one."""
+        executor = Mock()
+        self.manager._strategy_executor = executor
+        self.manager._pending_strategies['llm_strategy'] = Mock()
+
+        self.manager.close()
+
+        executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+        assert self.manager._strategy_executor is None
+        assert self.manager._pending_strategies == {}
+
+        self.manager.strategies['llm_strategy'] = BlockingStrategy()
+        signals = self.manager.analyze_all_strategies(self.market_data, self.technical_indicators, {})
+
+        assert signals['llm_strategy'].action == "BUY"
+        assert self.manager._strategy_executor is not None
+
+
 class TestSignalCombination:
     """Test combination of multiple strategy signals."""
     
@@ -0,0 +1,132 @@
+"""
+Unit tests for out-of-core streaming backtests
+
+Tests that chunked backtests reproduce the in-memory run_backtest() metrics
+(including trades and drawdowns open across chunk boundaries), and that
+partitioned Parquet history is streamed in order with indicator warm-up.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from utils.backtest.backtest_engine import BacktestEngine
+from utils.backtest.backtest_suite import ComprehensiveBacktestSuite
+from utils.backtest.streaming import iter_parquet_chunks, partition_files, warmup_chunks
+
+
+def make_market(rows=3000, seed=0):
+    """Create hourly closes with a regime column and sparse random signals."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=rows, freq='1h')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    data = pd.DataFrame({'close': close, 'volume': rng.uniform(1, 10, rows),
+                         'market_regime': rng.integers(0, 3, rows)}, index=index)
+    signals = pd.DataFrame({'buy': rng.random(rows) < 0.01, 'sell': rng.random(rows) < 0.01}, index=index)
+    return data, signals
+
+
+def split(frame, chunk_rows):
+    return [frame.iloc[start:start + chunk_rows] for start in range(0, len(frame), chunk_rows)]
+
+
+def assert_same_results(streamed, expected):
+    assert set(streamed) == set(expected)
+    for key, value in expected.items():
+        if isinstance(value, str):
+            assert streamed[key] == value, key
+        else:
+            assert np.isclose(float(streamed[key]), float(value), rtol=1e-9, equal_nan=True), key
+
+
+class TestStreamingEngine:
+    """Test BacktestEngine.run_backtest_streaming against run_backtest."""
+
+    @pytest.mark.parametrize('chunk_rows', [41, 500, 3000])
+    def test_matches_in_memory_backtest(self, chunk_rows):
+        """Test every metric equals the in-memory result for any chunk size."""
+        data, signals = make_market()
+        engine = BacktestEngine()
+
+        expected = engine.run_backtest(data, signals, 'TEST')
+        streamed = engine.run_backtest_streaming(zip(split(data, chunk_rows), split(signals, chunk_rows)), 'TEST')
+
+        assert expected['total_trades'] > 10
+        assert_same_results(streamed, expected)
+
+    def test_trade_open_across_many_chunks(self):
+        """Test a position held through several chunks and still open at the end."""
+        data, signals = make_market(rows=1200, seed=1)
+        signals[:] = False
+        signals.iloc[100, 0] = True   # closed trade spanning chunks
+        signals.iloc[700, 1] = True
+        signals.iloc[900, 0] = True   # still open at the end
+
+        engine = BacktestEngine()
+        expected = engine.run_backtest(data, signals, 'TEST')
+        streamed = engine.run_backtest_streaming(zip(split(data, 50), split(signals, 50)), 'TEST')
+
+        assert expected['total_trades'] == 2
+        assert_same_results(streamed, expected)
+
+    def test_empty_stream(self):
+        """Test a stream without rows returns the empty results."""
+        result = BacktestEngine().run_backtest_streaming(iter([]), 'TEST')
+        assert result['error'] == 'Backtest failed'
+
+
+class TestParquetChunks:
+    """Test streaming partitioned Parquet history."""
+
+    def test_partitions_streamed_in_order(self, tmp_path):
+        """Test monthly partitions are found in time order and re-chunked without overlap."""
+        data, _ = make_market(rows=24 * 90)
+        data.index.name = 'timestamp'
+        for (year, month), frame in data.groupby([data.index.year, data.index.month]):
+            # Overlap the previous partition by a day, as re-collected months do
+            frame = data[(data.index >= frame.index[0] - pd.Timedelta(days=1)) & (data.index <= frame.index[-1])]
+            frame.to_parquet(tmp_path / f"historical_BTC-USD_ONE_HOUR_{year}_{month:02d}_data.parquet")
+        (tmp_path / "historical_ETH-USD_ONE_HOUR_2024_01_data.parquet").write_bytes(b'')
+
+        paths = partition_files('BTC-USD', 'ONE_HOUR', cache_dir=tmp_path)
+        chunks = list(iter_parquet_chunks(paths, chunk_rows=500, columns=['close']))
+
+        assert [path.name[-20:-13] for path in paths] == ['2024_01', '2024_02', '2024_03']
+        assert [len(chunk) for chunk in chunks[:-1]] == [500] * (len(chunks) - 1)
+        assert list(chunks[0].columns) == ['close']
+        pd.testing.assert_frame_equal(pd.concat(chunks), data[['close']], check_freq=False)
+
+    def test_warmup_rows_prepended(self):
+        """Test each chunk is extended with the tail of the previous one."""
+        data, _ = make_market(rows=100)
+
+        frames = list(warmup_chunks(split(data, 30), warmup_rows=10))
+
+        assert [len(frame) for frame, _ in frames] == [30, 40, 40, 20]
+        assert frames[1][0].index[0] == data.index[20]
+        assert [start for _, start in frames] == list(data.index[[0, 30, 60, 90]])
+
+
+class ThresholdVectorizer:
+    """Signals from a 24-bar rolling mean, so they depend on the last 24 rows."""
+
+    def vectorize_strategy(self, strategy_name, data, product_id):
+        mean = data['close'].rolling(24).mean()
+        return pd.DataFrame({'buy': data['close'] < mean * 0.98, 'sell': data['close'] > mean * 1.02},
+                            index=data.index)
+
+
+class TestStreamingSuite:
+    """Test ComprehensiveBacktestSuite.run_single_strategy_streaming."""
+
+    def test_matches_single_strategy(self, tmp_path):
+        """Test warm-up rows make chunked signals and results equal the full-history run."""
+        data, _ = make_market(rows=2000, seed=2)
+        suite = ComprehensiveBacktestSuite(results_dir=str(tmp_path))
+        suite.strategy_vectorizer = ThresholdVectorizer()
+
+        expected = suite.run_single_strategy(data, 'rolling')
+        streamed = suite.run_single_strategy_streaming(split(data, 300), 'rolling', warmup_rows=30)
+
+        assert expected['total_trades'] > 5
+        assert_same_results(streamed, expected)
@@ -0,0 +1,95 @@
+"""
+Unit tests for the synthetic regime-switching market generator
+
+Tests determinism, regime labels, volatility clustering, injected gaps and
+spikes as seen by the data-quality monitor, and round trips through the
+partitioned Parquet layout read by the streaming backtests.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.backtest.market_regime_analyzer import REGIME_LABELS
+from utils.backtest.streaming import iter_parquet_chunks, partition_files
+from utils.backtest.synthetic_market import SyntheticMarketGenerator, granularity_delta
+from utils.data_quality_monitor import DataQualityMonitor, QualityFlag
+
+
+def flag_count(df, flag):
+    flags, _ = DataQualityMonitor().compute_flags(df, pd.Timedelta(minutes=1))
+    return int(((flags & flag) > 0).sum())
+
+
+class TestGeneration:
+    """Test the generated bars."""
+
+    def test_seed_determinism_and_prefix(self):
+        """Test equal seeds give equal bars and a shorter run is a prefix of a longer one."""
+        generator = SyntheticMarketGenerator(seed=7, block_rows=20_000, gap_rate=0)
+
+        full = generator.generate(50_000)
+        again = SyntheticMarketGenerator(seed=7, block_rows=20_000, gap_rate=0).generate(50_000)
+        short = generator.generate(30_000)
+        other = SyntheticMarketGenerator(seed=8, block_rows=20_000, gap_rate=0).generate(50_000)
+
+        pd.testing.assert_frame_equal(full, again)
+        pd.testing.assert_frame_equal(short, full.iloc[:30_000])
+        assert not np.allclose(full['close'], other['close'])
+
+    def test_bars_are_valid_ohlcv(self):
+        """Test prices bracket correctly, opens continue closes and regimes use the analyzer labels."""
+        df = SyntheticMarketGenerator(seed=1, gap_rate=0, spike_rate=0).generate(200_000)
+
+        assert len(df) == 200_000
+        assert df.index.is_monotonic_increasing and (df.index.to_series().diff().dropna() == pd.Timedelta('1min')).all()
+        assert (df['high'] >= df[['open', 'close']].max(axis=1)).all()
+        assert (df['low'] <= df[['open', 'close']].min(axis=1)).all()
+        assert (df['volume'] > 0).all()
+        np.testing.assert_allclose(df['open'].to_numpy()[1:], df['close'].to_numpy()[:-1])
+        assert list(df['regime'].cat.categories) == list(REGIME_LABELS)
+        assert set(df['regime'].unique()) == set(REGIME_LABELS)
+        assert flag_count(df, QualityFlag.OHLC_INVALID | QualityFlag.GAP | QualityFlag.SPIKE) == 0
+
+    def test_regimes_and_volatility_clustering(self):
+        """Test volatile episodes are the most volatile and absolute returns are autocorrelated."""
+        df = SyntheticMarketGenerator(seed=3, granularity='ONE_HOUR', gap_rate=0, spike_rate=0).generate(40_000)
+        returns = np.log(df['close']).diff()
+
+        volatility = returns.groupby(df['regime'], observed=True).std()
+        assert volatility['volatile'] > 2 * volatility['trending']
+        assert volatility['trending'] > volatility['ranging']
+        assert returns.abs().autocorr(1) > 0.2
+
+    def test_gaps_and_spikes_are_flagged(self):
+        """Test injected gaps and spikes show up in the data-quality flags."""
+        df = SyntheticMarketGenerator(seed=4, gap_rate=5e-4, spike_rate=1e-4).generate(200_000)
+
+        assert 0 < 200_000 - len(df)
+        assert flag_count(df, QualityFlag.GAP) > 50
+        assert flag_count(df, QualityFlag.SPIKE) >= 20
+        assert flag_count(df, QualityFlag.OHLC_INVALID) == 0
+
+    def test_granularities(self):
+        """Test Coinbase granularity names and pandas frequencies are both accepted."""
+        assert granularity_delta('FIFTEEN_MINUTE') == pd.Timedelta(minutes=15)
+        assert granularity_delta('4h') == pd.Timedelta(hours=4)
+
+        daily = SyntheticMarketGenerator(granularity='ONE_DAY', start='2021-01-01', gap_rate=0).generate(365)
+        assert daily.index[-1] == pd.Timestamp('2021-12-31')
+
+
+class TestPartitions:
+    """Test streaming bars into partitioned Parquet."""
+
+    def test_partitions_round_trip(self, tmp_path):
+        """Test monthly partitions are readable by the streaming chunk reader."""
+        generator = SyntheticMarketGenerator(seed=5, start='2024-01-20', block_rows=30_000)
+
+        paths = generator.write_partitions('SYN-USD', 100_000, cache_dir=tmp_path)
+        chunks = list(iter_parquet_chunks(partition_files('SYN-USD', 'ONE_MINUTE', cache_dir=tmp_path),
+                                          chunk_rows=25_000))
+
+        assert [path.name for path in paths] == [
+            f"historical_SYN-USD_ONE_MINUTE_2024_{month:02d}_data.parquet" for month in (1, 2, 3)
+        ]
+        pd.testing.assert_frame_equal(pd.concat(chunks), generator.generate(100_000), check_freq=False)
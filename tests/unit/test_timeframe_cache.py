@@ -0,0 +1,122 @@
+"""
+Unit tests for the multi-timeframe cache
+
+Tests that cascading resampling matches resampling the base data directly
+and that bars and indicators are built once per (product, interval).
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from utils.backtest.timeframe_cache import OHLCV_AGGREGATION, TimeframeCache, bar_minutes, resample_ohlcv
+
+
+def make_minute_bars(rows=3 * 24 * 60, seed=0):
+    """Create minute OHLCV bars with a few missing stretches."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+    df = pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.0005, rows)),
+        'high': close * 1.001,
+        'low': close * 0.999,
+        'close': close,
+        'volume': rng.uniform(1, 10, rows)
+    }, index=pd.date_range('2024-01-01 00:07', periods=rows, freq='1min'))
+    return df.drop(df.index[500:700]).drop(df.index[2000:2003])
+
+
+class TestResampleOhlcv:
+    """Test one-pass resampling to several intervals."""
+
+    def test_cascade_matches_direct_resample(self):
+        """Test every interval equals a direct resample of the base bars."""
+        base = make_minute_bars()
+        intervals = [5, 15, 30, 60, 90, 120, 240]
+
+        frames = resample_ohlcv(base, intervals)
+
+        assert bar_minutes(base) == 1
+        for interval in intervals:
+            expected = base.resample(f"{interval}min").agg(OHLCV_AGGREGATION).dropna()
+            pd.testing.assert_frame_equal(frames[interval], expected, check_freq=False)
+
+    def test_base_and_finer_intervals_return_base(self):
+        """Test the base interval (and anything finer) returns the base bars unchanged."""
+        hourly = make_minute_bars().resample('60min').agg(OHLCV_AGGREGATION).dropna()
+
+        frames = resample_ohlcv(hourly, [15, 60, 120])
+
+        assert frames[60] is hourly
+        assert frames[15] is hourly
+        pd.testing.assert_frame_equal(frames[120], hourly.resample('120min').agg(OHLCV_AGGREGATION).dropna(),
+                                      check_freq=False)
+
+
+class TestTimeframeCache:
+    """Test building and reusing (product, interval) frames."""
+
+    @pytest.fixture
+    def calls(self):
+        return {'loads': [], 'indicators': []}
+
+    @pytest.fixture
+    def make_cache(self, calls, tmp_path):
+        def loader(product_id):
+            calls['loads'].append(product_id)
+            return make_minute_bars(seed=len(product_id))
+
+        def add_indicators(bars, product_id):
+            calls['indicators'].append((product_id, len(bars)))
+            return bars.assign(sma=bars['close'].rolling(3).mean())
+
+        return lambda: TimeframeCache(loader, add_indicators, cache_dir=str(tmp_path / 'timeframes'))
+
+    def test_frames_built_once(self, make_cache, calls):
+        """Test each product is loaded once and each interval gets indicators once."""
+        cache = make_cache()
+
+        frames = cache.prepare(['BTC-USD', 'ETH-USD'], [15, 60])
+        cache.get('BTC-USD', 60)
+
+        assert sorted(frames) == [('BTC-USD', 15), ('BTC-USD', 60), ('ETH-USD', 15), ('ETH-USD', 60)]
+        assert calls['loads'] == ['BTC-USD', 'ETH-USD']
+        assert len(calls['indicators']) == 4
+        assert 'sma' in frames[('ETH-USD', 15)].columns
+
+    def test_new_interval_only_builds_new_frames(self, make_cache, calls):
+        """Test adding an interval computes indicators only for that interval."""
+        cache = make_cache()
+        cache.prepare(['BTC-USD'], [15, 60])
+
+        cache.prepare(['BTC-USD'], [15, 60, 240])
+
+        assert calls['loads'] == ['BTC-USD']
+        assert [count for _, count in calls['indicators']][-1] == len(cache.get('BTC-USD', 240))
+        assert cache.resample_passes == 2
+        assert cache.indicator_runs == 3
+
+    def test_frames_reused_from_disk(self, make_cache, calls):
+        """Test a new cache reads frames of the same base data from disk."""
+        first = make_cache()
+        first.prepare(['BTC-USD'], [15, 60])
+
+        second = make_cache()
+        frame = second.get('BTC-USD', 60)
+
+        assert second.disk_hits == 1
+        assert second.indicator_runs == 0
+        pd.testing.assert_frame_equal(frame, first.get('BTC-USD', 60), check_freq=False)
+
+    def test_failed_product_is_skipped(self, tmp_path):
+        """Test a product whose data cannot be loaded does not stop the others."""
+        def loader(product_id):
+            if product_id == 'BAD-USD':
+                raise IOError('missing file')
+            return make_minute_bars()
+
+        cache = TimeframeCache(loader)
+        frames = cache.prepare(['BAD-USD', 'BTC-USD'], [30])
+
+        assert list(frames) == [('BTC-USD', 30)]
+        assert cache.get('BAD-USD', 30).empty
@@ -0,0 +1,125 @@
+"""
+Unit tests for the walk-forward process pool
+
+Tests that folds run across worker processes give the same, identically
+ordered results as the serial walk-forward analysis.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import load_bars
+from utils.backtest.backtest_integration import StrategyBacktestSuite
+from utils.backtest.backtest_suite import ComprehensiveBacktestSuite
+from utils.backtest.walk_forward_pool import WalkForwardJob, run_walk_forward_jobs
+
+
+class FoldStubSuite(ComprehensiveBacktestSuite):
+    """Suite with cheap, data-dependent optimization and testing (defined at module level to pickle)."""
+
+    def optimize_strategy_parameters(self, data_with_indicators, strategy_name, param_grid,
+                                     product_id="BTC-USD", optimization_metric="sortino_ratio"):
+        drift = data_with_indicators['close'].pct_change().mean()
+        rows = [{**dict(zip(param_grid, values)), 'sortino_ratio': drift * sum(values)}
+                for values in zip(*param_grid.values())]
+        return pd.DataFrame(rows).sort_values('sortino_ratio', ascending=False)
+
+    def run_single_strategy(self, data_with_indicators, strategy_name, product_id="BTC-USD"):
+        close = data_with_indicators['close']
+        returns = close.pct_change().dropna()
+        if strategy_name == 'failing':
+            raise ValueError('strategy error')
+        return {
+            'total_return': (close.iloc[-1] / close.iloc[0] - 1) * 100,
+            'sharpe_ratio': returns.mean() / returns.std(),
+            'max_drawdown': ((close / close.cummax()) - 1).min() * 100,
+            'win_rate': (returns > 0).mean() * 100,
+            'total_trades': len(returns)
+        }
+
+
+def make_hourly_data(days=60, seed=0):
+    """Create hourly closes spanning the given number of days."""
+    rng = np.random.default_rng(seed)
+    rows = days * 24
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    return pd.DataFrame({'close': close}, index=pd.date_range('2024-01-01', periods=rows, freq='1h'))
+
+
+PARAM_GRID = {'fast': [5, 10, 20], 'slow': [30, 50, 40]}
+
+
+def strip_timestamps(result):
+    return {key: value for key, value in result.items() if key != 'timestamp'}
+
+
+@pytest.fixture
+def suite(tmp_path):
+    return FoldStubSuite(results_dir=str(tmp_path))
+
+
+@pytest.fixture
+def datasets():
+    return {'BTC-USD': make_hourly_data(seed=1), 'ETH-USD': make_hourly_data(seed=2),
+            'SHORT-USD': make_hourly_data(days=10, seed=3)}
+
+
+def make_jobs():
+    return [WalkForwardJob(product, strategy, PARAM_GRID, product, 20, 7, 7)
+            for strategy in ['momentum', 'failing'] for product in ['BTC-USD', 'ETH-USD', 'SHORT-USD']]
+
+
+class TestRunWalkForwardJobs:
+    """Test fold-level parallelism across analyses."""
+
+    def test_parallel_matches_serial(self, suite, datasets):
+        """Test every job's result matches the serial run, in job and period order."""
+        jobs = make_jobs()
+
+        serial = run_walk_forward_jobs(suite, datasets, jobs, max_workers=1)
+        parallel = run_walk_forward_jobs(suite, datasets, jobs, max_workers=3)
+
+        assert [strip_timestamps(result) for result in parallel] == [strip_timestamps(result) for result in serial]
+        assert [result.get('product_id') for result in serial[:2]] == ['BTC-USD', 'ETH-USD']
+        assert [period['period_id'] for period in serial[0]['periods']] == list(range(len(serial[0]['periods'])))
+
+    def test_insufficient_data_and_failed_folds(self, suite, datasets):
+        """Test short datasets and jobs whose folds all fail report errors."""
+        results = run_walk_forward_jobs(suite, datasets, make_jobs(), max_workers=2)
+
+        assert results[2] == {'error': 'Insufficient data for walk-forward analysis'}
+        assert results[3] == {'error': 'No successful walk-forward periods'}
+
+    def test_suite_method_matches_serial(self, suite, datasets):
+        """Test run_walk_forward_analysis(max_workers=...) uses the pool with the same output."""
+        data = datasets['BTC-USD']
+
+        serial = suite.run_walk_forward_analysis(data, 'momentum', PARAM_GRID, 'BTC-USD', 20, 7, 7)
+        parallel = suite.run_walk_forward_analysis(data, 'momentum', PARAM_GRID, 'BTC-USD', 20, 7, 7,
+                                                   max_workers=2)
+
+        assert len(serial['periods']) == 5
+        assert strip_timestamps(parallel) == strip_timestamps(serial)
+        assert list(suite.results_dir.glob('walkforward_BTC-USD_momentum_walkforward_*.json'))
+
+
+class TestStrategyBacktestSuiteWalkForward:
+    """Test the strategy suite's walk-forward analysis on vectorized signals end to end."""
+
+    def test_walk_forward_runs_serial_and_pooled(self, tmp_path):
+        """Test every fold optimizes, generates test signals and backtests, serially and in the pool."""
+        data = load_bars(60 * 24, seed=1, cache_dir=None)
+        suite = StrategyBacktestSuite(results_dir=str(tmp_path))
+        param_grid = {'lookback': [10, 20]}
+
+        serial = suite.run_walk_forward_analysis(data, 'momentum', param_grid, 'BTC-USD', 20, 7, 7)
+        parallel = suite.run_walk_forward_analysis(data, 'momentum', param_grid, 'BTC-USD', 20, 7, 7,
+                                                   max_workers=2)
+
+        assert 'error' not in serial
+        assert [period['period_id'] for period in serial['periods']] == list(range(5))
+        assert all('total_return' in period['test_performance'] for period in serial['periods'])
+        assert [period['test_performance']['total_return'] for period in parallel['periods']] == \
+            [period['test_performance']['total_return'] for period in serial['periods']]
+        assert list(tmp_path.glob('walkforward_BTC-USD_momentum_walkforward_*.json'))
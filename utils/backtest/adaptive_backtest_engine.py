@@ -20,6 +20,7 @@ sys.path.append('.')
 
 from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
 from utils.backtest.backtest_engine import BacktestEngine
+from utils.backtest.risk_simulator import RiskDecision, RiskLimits, simulate_risk
 from utils.trading.capital_manager import CapitalManager
 from config import Config
 
@@ -99,6 +100,15 @@ class AdaptiveBacktestEngine(BacktestEngine):
                             'simulated': True
                         }
             
+                def analyze_market_batch(self, df):
+                    """Simulate LLM decisions for a whole analyze_batch() frame"""
+                    sim_batch = self.simulator.simulate_batch(df)
+                    return pd.DataFrame({
+                        'decision': sim_batch['decision'],
+                        'confidence': sim_batch['confidence'],
+                        'risk_assessment': sim_batch['risk_assessment'].str.upper()
+                    }, index=df.index)
+            
             # Mock other analyzers that aren't needed for backtesting
             mock_news_analyzer = Mock()
             mock_news_analyzer.get_market_sentiment.return_value = {
@@ -143,6 +153,12 @@ class AdaptiveBacktestEngine(BacktestEngine):
         self.decision_log = []
         self.regime_log = []
         
+        # Combine strategy signals for all rows at once; False forces per-row get_combined_signal()
+        self.use_batch_signals = True
+        
+        # Simulate risk management on arrays; False forces the per-row CapitalManager loop
+        self.use_risk_kernel = True
+        
         logger.info(f"🚀 AdaptiveBacktestEngine initialized with ${initial_capital:,.2f} capital")
     
     def run_adaptive_backtest(self, data: pd.DataFrame, product_id: str = "BTC-EUR") -> Dict[str, Any]:
@@ -206,60 +222,88 @@ class AdaptiveBacktestEngine(BacktestEngine):
             signals_df['primary_strategy'] = ""
             signals_df['position_multiplier'] = 1.0
             
-            # Process each row using the actual AdaptiveStrategyManager
-            for i, (timestamp, row) in enumerate(data.iterrows()):
-                try:
-                    # Prepare market data (same format as live bot)
-                    market_data = self._prepare_market_data_for_adaptive(row, product_id, i, data)
+            if self.use_batch_signals:
+                # Array path: same decisions as get_combined_signal() per row;
+                # strategies without analyze_batch() get the per-row dicts below
+                def row_inputs():
+                    return [(self._prepare_market_data_for_adaptive(row, product_id, i, data),
+                             self._prepare_technical_indicators_for_adaptive(row))
+                            for i, (_, row) in enumerate(data.iterrows())]
+                
+                combined = self.adaptive_manager.get_combined_signal_batch(
+                    self._prepare_batch_inputs_for_adaptive(data), row_inputs
+                )
+                combined['primary_strategy'] = combined['primary_strategy'].replace('', 'adaptive')
+                
+                signals_df['buy'] = (combined['action'] == 'BUY').to_numpy()
+                signals_df['sell'] = (combined['action'] == 'SELL').to_numpy()
+                signals_df['confidence'] = combined['confidence'].to_numpy()
+                signals_df['reasoning'] = combined['reasoning'].to_numpy()
+                signals_df['market_regime'] = combined['market_regime'].to_numpy()
+                signals_df['primary_strategy'] = combined['primary_strategy'].to_numpy()
+                signals_df['position_multiplier'] = combined['position_size_multiplier'].to_numpy()
+                
+                decisions = combined[['action', 'confidence', 'market_regime', 'primary_strategy', 'reasoning']].copy()
+                decisions.insert(0, 'timestamp', data.index)
+                self.decision_log.extend(decisions.to_dict('records'))
+                self.regime_log.extend(
+                    pd.DataFrame({'timestamp': data.index, 'regime': combined['market_regime'].to_numpy()}).to_dict('records')
+                )
+            else:
+                # Process each row using the actual AdaptiveStrategyManager
+                for i, (timestamp, row) in enumerate(data.iterrows()):
+                    try:
+                        # Prepare market data (same format as live bot)
+                        market_data = self._prepare_market_data_for_adaptive(row, product_id, i, data)
                     
-                    # Prepare technical indicators (same format as live bot)
-                    technical_indicators = self._prepare_technical_indicators_for_adaptive(row)
+                        # Prepare technical indicators (same format as live bot)
+                        technical_indicators = self._prepare_technical_indicators_for_adaptive(row)
                     
-                    # Get decision from AdaptiveStrategyManager (SAME AS LIVE BOT)
-                    signal = self.adaptive_manager.get_combined_signal(
-                        market_data, technical_indicators, {}
-                    )
+                        # Get decision from AdaptiveStrategyManager (SAME AS LIVE BOT)
+                        signal = self.adaptive_manager.get_combined_signal(
+                            market_data, technical_indicators, {}
+                        )
                     
-                    # Extract market regime and primary strategy
-                    market_regime = getattr(self.adaptive_manager, 'current_market_regime', 'ranging')
-                    primary_strategy = self._extract_primary_strategy_from_reasoning(signal.reasoning)
+                        # Extract market regime and primary strategy
+                        market_regime = getattr(self.adaptive_manager, 'current_market_regime', 'ranging')
+                        primary_strategy = self._extract_primary_strategy_from_reasoning(signal.reasoning)
                     
-                    # Store signal data
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
-                    signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
-                    signals_df.loc[timestamp, 'position_multiplier'] = float(getattr(signal, 'position_size_multiplier', 1.0))
+                        # Store signal data
+                        signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                        signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                        signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                        signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                        signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
+                        signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
+                        signals_df.loc[timestamp, 'position_multiplier'] = float(getattr(signal, 'position_size_multiplier', 1.0))
                     
-                    # Log decision for analysis
-                    self.decision_log.append({
-                        'timestamp': timestamp,
-                        'action': signal.action,
-                        'confidence': signal.confidence,
-                        'market_regime': market_regime,
-                        'primary_strategy': primary_strategy,
-                        'reasoning': signal.reasoning
-                    })
+                        # Log decision for analysis
+                        self.decision_log.append({
+                            'timestamp': timestamp,
+                            'action': signal.action,
+                            'confidence': signal.confidence,
+                            'market_regime': market_regime,
+                            'primary_strategy': primary_strategy,
+                            'reasoning': signal.reasoning
+                        })
                     
-                    # Log regime for analysis
-                    self.regime_log.append({
-                        'timestamp': timestamp,
-                        'regime': market_regime
-                    })
+                        # Log regime for analysis
+                        self.regime_log.append({
+                            'timestamp': timestamp,
+                            'regime': market_regime
+                        })
                     
-                except Exception as e:
-                    logger.warning(f"Error processing row {i}: {e}")
-                    # Set safe defaults
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 0.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'market_regime'] = "ranging"
-                    signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
-                    signals_df.loc[timestamp, 'position_multiplier'] = 1.0
-                    continue
+                    except Exception as e:
+                        logger.warning(f"Error processing row {i}: {e}")
+                        # Set safe defaults
+                        signals_df.loc[timestamp, 'buy'] = False
+                        signals_df.loc[timestamp, 'sell'] = False
+                        signals_df.loc[timestamp, 'confidence'] = 0.0
+                        signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                        signals_df.loc[timestamp, 'market_regime'] = "ranging"
+                        signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
+                        signals_df.loc[timestamp, 'position_multiplier'] = 1.0
+                        continue
             
             # Log signal statistics
             buy_count = signals_df['buy'].sum()
@@ -365,6 +409,47 @@ class AdaptiveBacktestEngine(BacktestEngine):
             logger.warning(f"Error preparing technical indicators: {e}")
             return {'current_price': 50000.0}
     
+    def _prepare_batch_inputs_for_adaptive(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the analyze_batch() input frame for all rows at once, following the
+        same rules as _prepare_market_data_for_adaptive/_prepare_technical_indicators_for_adaptive
+        """
+        n = len(data)
+        positions = np.arange(n)
+        close = pd.to_numeric(data['close'], errors='coerce').to_numpy(dtype=np.float64)
+        
+        # Price changes (0.0 until enough history); a zero reference price
+        # falls back to the same defaults as the per-row error path
+        changes = {}
+        failed = np.zeros(n, dtype=bool)
+        for lag, name in [(1, 'change_1h'), (24, 'change_24h'), (120, 'change_5d')]:
+            previous = np.full(n, np.nan)
+            if lag < n:
+                previous[lag:] = close[:-lag]
+            has_history = positions >= lag
+            failed |= has_history & (previous == 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                changes[name] = np.where(has_history, ((close - previous) / previous) * 100, 0.0)
+        
+        inputs = pd.DataFrame({'price': np.where(failed, 50000.0, close), 'current_price': close}, index=data.index)
+        for name, values in changes.items():
+            inputs[name] = np.where(failed, 0.0, values)
+        
+        # Indicators used by the strategies and regime detection
+        indicator_mapping = {
+            'rsi_14': 'rsi',
+            'bb_upper_20': 'bb_upper',
+            'bb_lower_20': 'bb_lower',
+            'bb_middle_20': 'bb_middle',
+            'macd': 'macd',
+            'macd_signal': 'macd_signal'
+        }
+        for col_name, indicator_name in indicator_mapping.items():
+            if col_name in data.columns:
+                inputs[indicator_name] = pd.to_numeric(data[col_name], errors='coerce').to_numpy(dtype=np.float64)
+        
+        return inputs
+    
     def _extract_primary_strategy_from_reasoning(self, reasoning: str) -> str:
         """Extract the primary strategy name from reasoning text"""
         try:
@@ -397,101 +482,136 @@ class AdaptiveBacktestEngine(BacktestEngine):
             risk_adjusted['original_action'] = 'HOLD'
             risk_adjusted['risk_adjustment'] = ''
             risk_adjusted['position_size'] = 0.0
-            
-            # Simulate portfolio state for risk management
-            current_portfolio_value = self.initial_capital
-            current_eur_balance = self.initial_capital
-            current_crypto_balance = 0.0
+            risk_adjusted['risk_code'] = np.zeros(len(risk_adjusted), dtype=np.int8)
             
             asset = product_id.split('-')[0]  # Extract BTC, ETH, etc.
             
-            for i, (timestamp, row) in enumerate(risk_adjusted.iterrows()):
-                try:
-                    if not (row['buy'] or row['sell']):
-                        continue  # Skip HOLD signals
+            if self.use_risk_kernel:
+                # Array-state simulation with the same CapitalManager limits
+                buy = risk_adjusted['buy'].to_numpy(dtype=bool)
+                sell = risk_adjusted['sell'].to_numpy(dtype=bool)
+                if 'position_multiplier' in risk_adjusted.columns:
+                    multipliers = risk_adjusted['position_multiplier'].to_numpy(dtype=np.float64)
+                else:
+                    multipliers = np.ones(len(risk_adjusted))
+                
+                simulation = simulate_risk(
+                    data['close'].reindex(risk_adjusted.index).to_numpy(dtype=np.float64),
+                    buy, sell,
+                    risk_adjusted['confidence'].to_numpy(dtype=np.float64),
+                    multipliers,
+                    self.initial_capital,
+                    RiskLimits.from_capital_manager(self.capital_manager, asset)
+                )
+                
+                codes = simulation['risk_code']
+                rejected = (codes == RiskDecision.BLOCKED) | (codes == RiskDecision.TOO_SMALL)
+                risk_adjusted['original_action'] = np.where(buy, 'BUY', np.where(sell, 'SELL', 'HOLD'))
+                risk_adjusted['buy'] = buy & ~rejected
+                risk_adjusted['sell'] = sell & ~(rejected & ~buy)
+                risk_adjusted['risk_code'] = codes
+                risk_adjusted['position_size'] = simulation['position_size']
+                risk_adjusted['trade_value'] = simulation['trade_value']
+            else:
+                # Simulate portfolio state for risk management
+                current_portfolio_value = self.initial_capital
+                current_eur_balance = self.initial_capital
+                current_crypto_balance = 0.0
+                min_trade_amount = float(getattr(self.config, 'MIN_TRADE_AMOUNT', 30.0))
+            
+                for i, (timestamp, row) in enumerate(risk_adjusted.iterrows()):
+                    try:
+                        if not (row['buy'] or row['sell']):
+                            continue  # Skip HOLD signals
                     
-                    current_price = float(data.loc[timestamp, 'close'])
-                    confidence = row['confidence']
-                    action = 'BUY' if row['buy'] else 'SELL'
+                        current_price = float(data.loc[timestamp, 'close'])
+                        confidence = row['confidence']
+                        action = 'BUY' if row['buy'] else 'SELL'
                     
-                    # Store original action
-                    risk_adjusted.loc[timestamp, 'original_action'] = action
+                        # Store original action
+                        risk_adjusted.loc[timestamp, 'original_action'] = action
                     
-                    # Simulate portfolio state
-                    portfolio = {
-                        'EUR': {'amount': current_eur_balance},
-                        asset: {'amount': current_crypto_balance},
-                        'portfolio_value_eur': {'amount': current_portfolio_value}
-                    }
+                        # Simulate portfolio state
+                        portfolio = {
+                            'EUR': {'amount': current_eur_balance},
+                            asset: {'amount': current_crypto_balance, 'last_price_eur': current_price},
+                            'portfolio_value_eur': {'amount': current_portfolio_value}
+                        }
                     
-                    if action == 'BUY':
-                        # Calculate trade size using same logic as live bot
-                        base_trade_percentage = 0.10 + (confidence / 100.0 * 0.15)  # 10% to 25%
-                        position_multiplier = row.get('position_multiplier', 1.0)
-                        original_trade_size = current_eur_balance * base_trade_percentage * position_multiplier
+                        if action == 'BUY':
+                            # Calculate trade size using same logic as live bot
+                            base_trade_percentage = 0.10 + (confidence / 100.0 * 0.15)  # 10% to 25%
+                            position_multiplier = row.get('position_multiplier', 1.0)
+                            original_trade_size = current_eur_balance * base_trade_percentage * position_multiplier
                         
-                        # Apply capital management
-                        safe_trade_size, capital_reason = self.capital_manager.calculate_safe_trade_size(
-                            "BUY", asset, portfolio, original_trade_size
-                        )
+                            # Apply capital management
+                            safe_trade_size, capital_reason = self.capital_manager.calculate_safe_trade_size(
+                                "BUY", asset, portfolio, original_trade_size
+                            )
                         
-                        if safe_trade_size <= 0:
-                            # Risk management blocked the trade
-                            risk_adjusted.loc[timestamp, 'buy'] = False
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Blocked: {capital_reason}'
-                            risk_adjusted.loc[timestamp, 'position_size'] = 0.0
-                        elif safe_trade_size < self.config.MIN_TRADE_AMOUNT:
-                            # Trade size too small
-                            risk_adjusted.loc[timestamp, 'buy'] = False
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Too small: €{safe_trade_size:.2f} < €{self.config.MIN_TRADE_AMOUNT}'
-                            risk_adjusted.loc[timestamp, 'position_size'] = 0.0
-                        else:
-                            # Trade approved
-                            risk_adjusted.loc[timestamp, 'position_size'] = safe_trade_size / current_portfolio_value
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Approved: €{safe_trade_size:.2f}'
+                            if safe_trade_size <= 0:
+                                # Risk management blocked the trade
+                                risk_adjusted.loc[timestamp, 'buy'] = False
+                                risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Blocked: {capital_reason}'
+                                risk_adjusted.loc[timestamp, 'risk_code'] = RiskDecision.BLOCKED
+                                risk_adjusted.loc[timestamp, 'position_size'] = 0.0
+                            elif safe_trade_size < min_trade_amount:
+                                # Trade size too small
+                                risk_adjusted.loc[timestamp, 'buy'] = False
+                                risk_adjusted.loc[timestamp, 'risk_code'] = RiskDecision.TOO_SMALL
+                                risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Too small: €{safe_trade_size:.2f} < €{min_trade_amount}'
+                                risk_adjusted.loc[timestamp, 'position_size'] = 0.0
+                            else:
+                                # Trade approved
+                                risk_adjusted.loc[timestamp, 'position_size'] = safe_trade_size / current_portfolio_value
+                                risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Approved: €{safe_trade_size:.2f}'
+                                risk_adjusted.loc[timestamp, 'risk_code'] = RiskDecision.APPROVED
                             
-                            # Update simulated portfolio
-                            crypto_amount = safe_trade_size / current_price
-                            current_eur_balance -= safe_trade_size
-                            current_crypto_balance += crypto_amount
-                            current_portfolio_value = current_eur_balance + (current_crypto_balance * current_price)
+                                # Update simulated portfolio
+                                crypto_amount = safe_trade_size / current_price
+                                current_eur_balance -= safe_trade_size
+                                current_crypto_balance += crypto_amount
+                                current_portfolio_value = current_eur_balance + (current_crypto_balance * current_price)
                     
-                    elif action == 'SELL':
-                        # Calculate sell amount
-                        base_trade_percentage = 0.10 + (confidence / 100.0 * 0.15)
-                        position_multiplier = row.get('position_multiplier', 1.0)
-                        max_crypto_amount = current_crypto_balance * base_trade_percentage * position_multiplier
-                        original_trade_value = max_crypto_amount * current_price
+                        elif action == 'SELL':
+                            # Calculate sell amount
+                            base_trade_percentage = 0.10 + (confidence / 100.0 * 0.15)
+                            position_multiplier = row.get('position_multiplier', 1.0)
+                            max_crypto_amount = current_crypto_balance * base_trade_percentage * position_multiplier
+                            original_trade_value = max_crypto_amount * current_price
                         
-                        # Apply capital management
-                        safe_trade_value, capital_reason = self.capital_manager.calculate_safe_trade_size(
-                            "SELL", asset, portfolio, original_trade_value
-                        )
+                            # Apply capital management
+                            safe_trade_value, capital_reason = self.capital_manager.calculate_safe_trade_size(
+                                "SELL", asset, portfolio, original_trade_value
+                            )
                         
-                        if safe_trade_value <= 0:
-                            # Risk management blocked the trade
-                            risk_adjusted.loc[timestamp, 'sell'] = False
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Blocked: {capital_reason}'
-                            risk_adjusted.loc[timestamp, 'position_size'] = 0.0
-                        elif safe_trade_value < self.config.MIN_TRADE_AMOUNT:
-                            # Trade size too small
-                            risk_adjusted.loc[timestamp, 'sell'] = False
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Too small: €{safe_trade_value:.2f} < €{self.config.MIN_TRADE_AMOUNT}'
-                            risk_adjusted.loc[timestamp, 'position_size'] = 0.0
-                        else:
-                            # Trade approved
-                            crypto_amount = safe_trade_value / current_price
-                            risk_adjusted.loc[timestamp, 'position_size'] = safe_trade_value / current_portfolio_value
-                            risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Approved: €{safe_trade_value:.2f}'
+                            if safe_trade_value <= 0:
+                                # Risk management blocked the trade
+                                risk_adjusted.loc[timestamp, 'sell'] = False
+                                risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Blocked: {capital_reason}'
+                                risk_adjusted.loc[timestamp, 'risk_code'] = RiskDecision.BLOCKED
+                                risk_adjusted.loc[timestamp, 'position_size'] = 0.0
+                            elif safe_trade_value < min_trade_amount:
+                                # Trade size too small
+                                risk_adjusted.loc[timestamp, 'sell'] = False
+                                risk_adjusted.loc[timestamp, 'risk_code'] = RiskDecision.TOO_SMALL
+                                risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Too small: €{safe_trade_value:.2f} < €{min_trade_amount}'
+                                risk_adjusted.loc[timestamp, 'position_size'] = 0.0
+                            else:
+                                # Trade approved
+                                crypto_amount = safe_trade_value / current_price
+                                risk_adjusted.loc[timestamp, 'position_size'] = safe_trade_value / current_portfolio_value
+                                risk_adjusted.loc[timestamp, 'risk_adjustment'] = f'Approved: €{safe_trade_value:.2f}'
+                                risk_adjusted.loc[timestamp, 'risk_code'] = RiskDecision.APPROVED
                             
-                            # Update simulated portfolio
-                            current_crypto_balance -= crypto_amount
-                            current_eur_balance += safe_trade_value
-                            current_portfolio_value = current_eur_balance + (current_crypto_balance * current_price)
+                                # Update simulated portfolio
+                                current_crypto_balance -= crypto_amount
+                                current_eur_balance += safe_trade_value
+                                current_portfolio_value = current_eur_balance + (current_crypto_balance * current_price)
                 
-                except Exception as e:
-                    logger.warning(f"Error applying risk management to row {i}: {e}")
-                    continue
+                    except Exception as e:
+                        logger.warning(f"Error applying risk management to row {i}: {e}")
+                        continue
             
             # Log risk management statistics
             original_buys = signals_df['buy'].sum()
@@ -622,7 +742,19 @@ class AdaptiveBacktestEngine(BacktestEngine):
             risk_analysis = {}
             
             # Count risk adjustments
-            if 'risk_adjustment' in signals_df.columns:
+            if 'risk_code' in signals_df.columns:
+                codes = signals_df['risk_code'].to_numpy()
+                blocked_trades = (codes == RiskDecision.BLOCKED).sum()
+                approved_trades = (codes == RiskDecision.APPROVED).sum()
+                too_small_trades = (codes == RiskDecision.TOO_SMALL).sum()
+                
+                risk_analysis.update({
+                    'blocked_trades': int(blocked_trades),
+                    'approved_trades': int(approved_trades),
+                    'too_small_trades': int(too_small_trades),
+                    'risk_management_active': bool(blocked_trades > 0 or too_small_trades > 0)
+                })
+            elif 'risk_adjustment' in signals_df.columns:
                 blocked_trades = signals_df['risk_adjustment'].str.contains('Blocked', na=False).sum()
                 approved_trades = signals_df['risk_adjustment'].str.contains('Approved', na=False).sum()
                 too_small_trades = signals_df['risk_adjustment'].str.contains('Too small', na=False).sum()
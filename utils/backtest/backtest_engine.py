@@ -9,22 +9,31 @@ market conditions and constraints.
 import pandas as pd
 import numpy as np
 import vectorbt as vbt
-from typing import Dict, Any, Optional, List, Tuple
+from vectorbt.portfolio.enums import TradeStatus
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta
 import warnings
 
+from .parameter_search import ParameterSearch, budget_window
+from .result_cache import BacktestResultCache
+from .shared_data import SharedDataPlane, SharedFrameHandle, attach_frame
+from .streaming import StreamingMetrics
+
 # Suppress VectorBT warnings for cleaner output
 warnings.filterwarnings('ignore', category=UserWarning, module='vectorbt')
 
 logger = logging.getLogger(__name__)
 
+# Largest entry matrix (rows x parameter combinations) simulated in one portfolio
+GRID_MAX_CELLS = 20_000_000
+
 class BacktestEngine:
     """Comprehensive backtesting engine using VectorBT"""
     
     def __init__(self, initial_capital: float = 10000.0, fees: float = 0.006, 
-                 slippage: float = 0.0005):
+                 slippage: float = 0.0005, result_cache: Optional[BacktestResultCache] = None):
         """
         Initialize the backtest engine
         
@@ -32,15 +41,20 @@ class BacktestEngine:
             initial_capital: Starting capital in USD
             fees: Trading fees as decimal (0.006 = 0.6%)
             slippage: Slippage as decimal (0.0005 = 0.05%)
+            result_cache: Optional cache that answers repeated run_backtest() calls
         """
         self.initial_capital = initial_capital
         self.fees = fees
         self.slippage = slippage
+        self.result_cache = result_cache
         
         # Capital management constraints (from existing bot)
         self.min_eur_reserve = 50.0  # Minimum EUR reserve
         self.max_position_size_percent = 0.35  # Maximum 35% position size
         
+        # Evaluate optimization grids as one multi-column portfolio; False runs one backtest per combination
+        self.use_grid_optimization = True
+        
         logger.info(f"Backtest engine initialized: ${initial_capital:,.2f} capital, {fees*100:.2f}% fees")
     
     def run_backtest(self, data: pd.DataFrame, signals: pd.DataFrame, 
@@ -63,6 +77,15 @@ class BacktestEngine:
                 logger.error("Empty data or signals provided")
                 return self._empty_results()
             
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.make_key(data, 'backtest', {'product_id': product_id},
+                                                       self._cache_settings(), signals)
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Backtest for {product_id} served from result cache")
+                    return cached.result
+            
             # Align data and signals
             aligned_data, aligned_signals = self._align_data_signals(data, signals)
             
@@ -93,6 +116,9 @@ class BacktestEngine:
             if 'market_regime' in aligned_data.columns:
                 results.update(self._analyze_by_regime(portfolio, aligned_data))
             
+            if cache_key is not None:
+                self.result_cache.put(cache_key, results, self._portfolio_arrays(portfolio))
+            
             logger.info(f"Backtest completed: {results['total_return']:.2f}% return, {results['sharpe_ratio']:.2f} Sharpe")
             return results
             
@@ -100,6 +126,86 @@ class BacktestEngine:
             logger.error(f"Error in backtest: {e}")
             return self._empty_results()
     
+    def run_backtest_streaming(self, chunks: Iterable[Tuple[pd.DataFrame, pd.DataFrame]],
+                               product_id: str = "unknown") -> Dict[str, Any]:
+        """
+        Run a backtest over time-ordered (data, signals) chunks without holding the full history
+        
+        Each chunk is simulated starting from the cash left by the previous
+        ones. A trade still open at the end of a chunk is not committed: the
+        rows from its entry onwards are simulated again with the next chunk,
+        so every position is opened and closed within one simulation and the
+        results equal run_backtest() on the concatenated chunks. Memory is
+        bounded by the chunk size plus the rows of a trade open across a
+        chunk boundary.
+        
+        Args:
+            chunks: Iterable of (OHLCV data, buy/sell signals) in time order,
+                e.g. built from streaming.iter_parquet_chunks()
+            product_id: Product identifier for reporting
+            
+        Returns:
+            Dictionary with the run_backtest() result keys
+        """
+        try:
+            logger.info(f"Running streaming backtest for {product_id}")
+            
+            aligned_chunks = (self._align_data_signals(data, signals) for data, signals in chunks
+                              if not data.empty and not signals.empty)
+            aligned_chunks = ((data, signals) for data, signals in aligned_chunks if not data.empty)
+            
+            metrics = StreamingMetrics()
+            cash = self.initial_capital
+            pending_data = pending_signals = None
+            chunk_count = 0
+            
+            current = next(aligned_chunks, None)
+            while current is not None:
+                following = next(aligned_chunks, None)
+                is_last = following is None
+                data, signals = current
+                
+                if pending_data is not None and len(pending_data):
+                    data = pd.concat([pending_data, data])
+                    signals = pd.concat([pending_signals, signals])
+                
+                position_sizes = self._calculate_position_sizes(data, signals)
+                portfolio = self._create_portfolio(data, signals, position_sizes, init_cash=cash)
+                
+                if portfolio is None:
+                    logger.error(f"Failed to create portfolio for chunk {chunk_count}")
+                    return self._empty_results()
+                
+                # Defer an open trade (and everything after its entry) to the next chunk
+                committed = len(data)
+                if not is_last:
+                    trades = portfolio.trades.records_arr
+                    open_trades = trades[trades['status'] == TradeStatus.Open]
+                    if len(open_trades) > 0:
+                        committed = int(open_trades['entry_idx'].min())
+                
+                metrics.update(portfolio, data, committed, is_last)
+                if committed > 0:
+                    cash = float(portfolio.cash().iloc[committed - 1])
+                pending_data = data.iloc[committed:]
+                pending_signals = signals.iloc[committed:]
+                
+                chunk_count += 1
+                current = following
+            
+            if metrics.rows == 0:
+                logger.error("Empty data or signals provided")
+                return self._empty_results()
+            
+            results = metrics.results(product_id, self.initial_capital)
+            logger.info(f"Streaming backtest completed over {chunk_count} chunks ({metrics.rows} rows): "
+                        f"{results['total_return']:.2f}% return, {results['sharpe_ratio']:.2f} Sharpe")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error in streaming backtest: {e}")
+            return self._empty_results()
+    
     def _align_data_signals(self, data: pd.DataFrame, signals: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Align data and signals by index"""
         try:
@@ -164,8 +270,8 @@ class BacktestEngine:
             return pd.Series(index=data.index, data=0.0)
     
     def _create_portfolio(self, data: pd.DataFrame, signals: pd.DataFrame, 
-                         position_sizes: pd.Series) -> Optional[vbt.Portfolio]:
-        """Create VectorBT portfolio from signals"""
+                         position_sizes: pd.Series, init_cash: Optional[float] = None) -> Optional[vbt.Portfolio]:
+        """Create VectorBT portfolio from signals (starting from init_cash, default initial_capital)"""
         try:
             # Use close prices for execution
             close_prices = data['close']
@@ -186,7 +292,7 @@ class BacktestEngine:
                 size=position_sizes,
                 size_type='percent',  # Position size as percentage of capital
                 fees=self.fees,
-                init_cash=self.initial_capital,
+                init_cash=self.initial_capital if init_cash is None else init_cash,
                 freq='1H'  # Assuming hourly data
             )
             
@@ -226,7 +332,7 @@ class BacktestEngine:
             
             # Fees calculation
             try:
-                fees_paid = portfolio.trades.fees.sum() if hasattr(portfolio.trades, 'fees') else 0
+                fees_paid = portfolio.orders.fees.sum()
             except:
                 fees_paid = 0
             
@@ -322,8 +428,8 @@ class BacktestEngine:
                     if hasattr(avg_duration, 'total_seconds'):
                         avg_duration_hours = avg_duration.total_seconds() / 3600
                     else:
-                        # Assume it's already in hours or convert from numpy timedelta
-                        avg_duration_hours = float(avg_duration) / 3600000000000  # nanoseconds to hours
+                        # Duration in bars
+                        avg_duration_hours = float(avg_duration) * self._bar_hours(portfolio)
                 else:
                     avg_duration_hours = 0
             except:
@@ -331,8 +437,9 @@ class BacktestEngine:
             
             # Profit factor (gross profit / gross loss)
             try:
-                winning_trades = trade_returns[trade_returns > 0]
-                losing_trades = trade_returns[trade_returns < 0]
+                trade_return_values = trade_returns.values
+                winning_trades = trade_return_values[trade_return_values > 0]
+                losing_trades = trade_return_values[trade_return_values < 0]
                 
                 gross_profit = winning_trades.sum() if len(winning_trades) > 0 else 0
                 gross_loss = abs(losing_trades.sum()) if len(losing_trades) > 0 else 0
@@ -384,8 +491,8 @@ class BacktestEngine:
                 if hasattr(max_dd_duration, 'total_seconds'):
                     max_dd_duration_hours = max_dd_duration.total_seconds() / 3600
                 else:
-                    # Handle numpy timedelta
-                    max_dd_duration_hours = float(max_dd_duration) / 3600000000000  # nanoseconds to hours
+                    # Duration in bars
+                    max_dd_duration_hours = float(max_dd_duration) * self._bar_hours(portfolio)
             except:
                 max_dd_duration_hours = 0
             
@@ -436,6 +543,12 @@ class BacktestEngine:
             logger.error(f"Error analyzing by regime: {e}")
             return {}
     
+    @staticmethod
+    def _bar_hours(portfolio: vbt.Portfolio) -> float:
+        """Length of one bar in hours (VectorBT reports durations in bars)"""
+        freq = portfolio.wrapper.freq
+        return freq / pd.Timedelta(hours=1) if freq is not None else 1.0
+    
     def _empty_results(self) -> Dict[str, Any]:
         """Return empty results structure"""
         return {
@@ -456,15 +569,23 @@ class BacktestEngine:
     def run_parameter_optimization(self, data: pd.DataFrame, 
                                  strategy_func: callable,
                                  param_grid: Dict[str, List],
-                                 product_id: str = "unknown") -> pd.DataFrame:
+                                 product_id: str = "unknown",
+                                 chunk_size: Optional[int] = None,
+                                 max_workers: int = 1) -> pd.DataFrame:
         """
         Run parameter optimization using grid search
         
+        With use_grid_optimization enabled, the signals of every combination
+        become one column of an entry/exit matrix and all columns are simulated
+        in a single broadcasted VectorBT portfolio (per chunk of columns).
+        
         Args:
             data: Historical data with indicators
             strategy_func: Function that takes (data, **params) and returns signals DataFrame
             param_grid: Dictionary of parameter names and values to test
             product_id: Product identifier
+            chunk_size: Columns per portfolio (default: as many as fit GRID_MAX_CELLS)
+            max_workers: Processes used to evaluate chunks (1 = in-process)
             
         Returns:
             DataFrame with optimization results
@@ -480,29 +601,33 @@ class BacktestEngine:
             
             logger.info(f"Testing {len(param_combinations)} parameter combinations")
             
-            results = []
-            
-            for i, param_combo in enumerate(param_combinations):
-                try:
-                    # Create parameter dictionary
-                    params = dict(zip(param_names, param_combo))
-                    
-                    # Generate signals with these parameters
-                    signals = strategy_func(data, **params)
-                    
-                    # Run backtest
-                    backtest_result = self.run_backtest(data, signals, f"{product_id}_opt_{i}")
-                    
-                    # Add parameters to result
-                    result = {**params, **backtest_result}
-                    results.append(result)
-                    
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"Completed {i + 1}/{len(param_combinations)} optimizations")
+            if self.use_grid_optimization and isinstance(data.index, pd.DatetimeIndex) and not data.empty:
+                results = self._run_grid_optimization(data, strategy_func, param_names, param_combinations,
+                                                      product_id, chunk_size, max_workers)
+            else:
+                results = []
                 
-                except Exception as e:
-                    logger.warning(f"Error in optimization {i}: {e}")
-                    continue
+                for i, param_combo in enumerate(param_combinations):
+                    try:
+                        # Create parameter dictionary
+                        params = dict(zip(param_names, param_combo))
+                        
+                        # Generate signals with these parameters
+                        signals = strategy_func(data, **params)
+                        
+                        # Run backtest
+                        backtest_result = self.run_backtest(data, signals, f"{product_id}_opt_{i}")
+                        
+                        # Add parameters to result
+                        result = {**params, **backtest_result}
+                        results.append(result)
+                        
+                        if (i + 1) % 10 == 0:
+                            logger.info(f"Completed {i + 1}/{len(param_combinations)} optimizations")
+                    
+                    except Exception as e:
+                        logger.warning(f"Error in optimization {i}: {e}")
+                        continue
             
             results_df = pd.DataFrame(results)
             
@@ -516,6 +641,289 @@ class BacktestEngine:
         except Exception as e:
             logger.error(f"Error in parameter optimization: {e}")
             return pd.DataFrame()
+    
+    def run_parameter_search(self, data: pd.DataFrame, strategy_func: callable, search: ParameterSearch,
+                             product_id: str = "unknown", chunk_size: Optional[int] = None,
+                             max_workers: int = 1) -> pd.DataFrame:
+        """
+        Run parameter optimization with a sample-efficient search instead of the full grid
+        
+        Each batch proposed by the search is evaluated like a grid optimization
+        (one broadcasted portfolio per chunk), on the most recent fraction of
+        `data` given by the trial budget.
+        
+        Args:
+            data: Historical data with indicators
+            strategy_func: Function that takes (data, **params) and returns signals DataFrame
+            search: ParameterSearch over the parameter grid (e.g. TPESearch, Hyperband)
+            product_id: Product identifier
+            chunk_size: Columns per portfolio (default: as many as fit GRID_MAX_CELLS)
+            max_workers: Processes used to evaluate chunks (1 = in-process)
+            
+        Returns:
+            DataFrame with full-window results sorted by the search metric, in the
+            format of run_parameter_optimization(); search.history holds every trial
+        """
+        try:
+            logger.info(f"Starting {type(search).__name__} parameter search for {product_id} "
+                        f"({search.grid_size} combinations in grid)")
+            
+            search.run(lambda params_list, budget: self._evaluate_param_batch(
+                budget_window(data, budget), strategy_func, params_list, product_id, chunk_size, max_workers
+            ))
+            results_df = search.results_frame()
+            
+            if not results_df.empty:
+                logger.info(f"Search complete after {len(search.history)} trials. "
+                            f"Best {search.metric}: {results_df.iloc[0][search.metric]:.3f}")
+            
+            return results_df
+            
+        except Exception as e:
+            logger.error(f"Error in parameter search: {e}")
+            return pd.DataFrame()
+    
+    def _evaluate_param_batch(self, data: pd.DataFrame, strategy_func: callable,
+                              params_list: List[Dict[str, Any]], product_id: str,
+                              chunk_size: Optional[int], max_workers: int) -> List[Optional[Dict[str, Any]]]:
+        """Backtest a batch of parameter dicts; failed combinations map to None"""
+        param_names = list(params_list[0].keys())
+        param_combinations = [tuple(params[name] for name in param_names) for params in params_list]
+        
+        if self.use_grid_optimization and isinstance(data.index, pd.DatetimeIndex) and not data.empty:
+            results = self._run_grid_optimization(data, strategy_func, param_names, param_combinations,
+                                                  product_id, chunk_size, max_workers)
+        else:
+            results = []
+            for i, params in enumerate(params_list):
+                try:
+                    signals = strategy_func(data, **params)
+                    results.append({**params, **self.run_backtest(data, signals, f"{product_id}_opt_{i}")})
+                except Exception as e:
+                    logger.warning(f"Error in optimization {i}: {e}")
+        
+        by_params = {tuple(result[name] for name in param_names): result for result in results}
+        return [by_params.get(combination) for combination in param_combinations]
+    
+    def _run_grid_optimization(self, data: pd.DataFrame, strategy_func: callable, param_names: List[str],
+                               param_combinations: List[Tuple], product_id: str,
+                               chunk_size: Optional[int], max_workers: int) -> List[Dict[str, Any]]:
+        """
+        Evaluate all parameter combinations as columns of broadcasted portfolios
+        
+        Combinations whose signals are not indexed like `data` are run through
+        run_backtest() individually so their alignment matches the loop.
+        
+        Returns:
+            List of result dicts in combination order
+        """
+        results = {}
+        grid_params = []
+        entry_columns = []
+        exit_columns = []
+        
+        for i, param_combo in enumerate(param_combinations):
+            params = dict(zip(param_names, param_combo))
+            try:
+                signals = strategy_func(data, **params)
+                
+                if signals.empty or not signals.index.equals(data.index):
+                    results[i] = {**params, **self.run_backtest(data, signals, f"{product_id}_opt_{i}")}
+                    continue
+                
+                entry_columns.append(signals['buy'].astype(bool).to_numpy() if 'buy' in signals.columns
+                                     else np.zeros(len(data), dtype=bool))
+                exit_columns.append(signals['sell'].astype(bool).to_numpy() if 'sell' in signals.columns
+                                    else np.zeros(len(data), dtype=bool))
+                grid_params.append((i, params))
+            
+            except Exception as e:
+                logger.warning(f"Error in optimization {i}: {e}")
+                continue
+        
+        if grid_params:
+            entries = np.column_stack(entry_columns)
+            exits = np.column_stack(exit_columns)
+            chunk_size = chunk_size or max(1, GRID_MAX_CELLS // len(data))
+            chunks = [(start, min(start + chunk_size, entries.shape[1]))
+                      for start in range(0, entries.shape[1], chunk_size)]
+            
+            logger.info(f"Evaluating {entries.shape[1]} signal columns in {len(chunks)} portfolio chunk(s)")
+            
+            if max_workers > 1 and len(chunks) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                settings = self._grid_settings()
+                with SharedDataPlane() as plane:
+                    # Workers attach to one shared copy instead of unpickling the data per chunk
+                    try:
+                        shared_data = plane.publish(f"{product_id}_grid", data)
+                    except ValueError:
+                        shared_data = data
+                    with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                        metrics = list(executor.map(
+                            _evaluate_grid_chunk,
+                            [settings] * len(chunks),
+                            [shared_data] * len(chunks),
+                            [entries[:, a:b] for a, b in chunks],
+                            [exits[:, a:b] for a, b in chunks]
+                        ))
+            else:
+                metrics = [self._evaluate_signal_grid(data, entries[:, a:b], exits[:, a:b]) for a, b in chunks]
+            
+            metrics = pd.concat(metrics, ignore_index=True)
+            for (i, params), metric_row in zip(grid_params, metrics.to_dict('records')):
+                results[i] = {**params, 'product_id': f"{product_id}_opt_{i}", **metric_row}
+        
+        return [results[i] for i in sorted(results)]
+    
+    def _cache_settings(self) -> Dict[str, float]:
+        """Engine settings that change backtest results (part of the result cache key)"""
+        return {**self._grid_settings(), 'min_eur_reserve': self.min_eur_reserve}
+    
+    def _portfolio_arrays(self, portfolio: vbt.Portfolio) -> Dict[str, np.ndarray]:
+        """Equity curve and trade records stored alongside cached metrics"""
+        try:
+            value = portfolio.value()
+            return {
+                'equity_index': value.index.to_numpy(),
+                'equity': value.to_numpy(),
+                'trades': portfolio.trades.records_arr
+            }
+        except Exception as e:
+            logger.warning(f"Could not extract portfolio arrays for cache: {e}")
+            return {}
+    
+    def _grid_settings(self) -> Dict[str, float]:
+        """Settings needed to rebuild this engine's portfolios in a worker process"""
+        return {
+            'initial_capital': self.initial_capital,
+            'fees': self.fees,
+            'slippage': self.slippage,
+            'max_position_size_percent': self.max_position_size_percent
+        }
+    
+    def _evaluate_signal_grid(self, data: pd.DataFrame, entries: np.ndarray,
+                              exits: np.ndarray) -> pd.DataFrame:
+        """
+        Simulate a matrix of entry/exit columns in one VectorBT portfolio
+        
+        Args:
+            data: OHLCV data shared by all columns
+            entries: Boolean (rows x columns) BUY matrix
+            exits: Boolean (rows x columns) SELL matrix
+            
+        Returns:
+            DataFrame with one row of run_backtest() metrics per column
+        """
+        columns = pd.RangeIndex(entries.shape[1])
+        entries = pd.DataFrame(entries, index=data.index, columns=columns)
+        exits = pd.DataFrame(exits, index=data.index, columns=columns)
+        
+        portfolio = vbt.Portfolio.from_signals(
+            close=data['close'],
+            entries=entries,
+            exits=exits,
+            size=self.max_position_size_percent,
+            size_type='percent',
+            fees=self.fees,
+            init_cash=self.initial_capital,
+            freq='1H'
+        )
+        
+        return self._calculate_grid_metrics(portfolio, data)
+    
+    def _calculate_grid_metrics(self, portfolio: vbt.Portfolio, data: pd.DataFrame) -> pd.DataFrame:
+        """Column-wise version of _calculate_metrics, _analyze_trades and _analyze_drawdowns"""
+        n_columns = portfolio.wrapper.shape_2d[1]
+        bar_hours = self._bar_hours(portfolio)
+        
+        def per_column(values, fill=0.0):
+            return pd.Series(values).reindex(range(n_columns)).fillna(fill).to_numpy()
+        
+        def record_sums(mapped, mask):
+            return np.bincount(mapped.col_arr, weights=np.where(mask, mapped.values, 0.0), minlength=n_columns)
+        
+        # Time-based metrics
+        start_date = data.index.min()
+        end_date = data.index.max()
+        duration_days = (end_date - start_date).days
+        
+        total_return = portfolio.total_return().to_numpy() * 100
+        with np.errstate(invalid='ignore', over='ignore'):
+            annual_return = ((1 + total_return/100) ** (365/duration_days) - 1) * 100 if duration_days > 0 \
+                else np.zeros(n_columns)
+        
+        trades = portfolio.trades
+        total_trades = trades.count().to_numpy()
+        has_trades = total_trades > 0
+        trade_returns = trades.returns
+        
+        winning = trade_returns.values > 0
+        losing = trade_returns.values < 0
+        gross_profit = record_sums(trade_returns, winning)
+        gross_loss = np.abs(record_sums(trade_returns, losing))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, np.inf)
+        
+        drawdowns = portfolio.drawdowns
+        drawdown_periods = drawdowns.count().to_numpy()
+        has_drawdowns = drawdown_periods > 0
+        
+        metrics = pd.DataFrame({
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'duration_days': duration_days,
+            'initial_capital': self.initial_capital,
+            'final_value': portfolio.value().iloc[-1].to_numpy(),
+            'total_return': total_return,
+            'annual_return': annual_return,
+            'sharpe_ratio': portfolio.sharpe_ratio().to_numpy(),
+            'sortino_ratio': portfolio.sortino_ratio().to_numpy(),
+            'max_drawdown': portfolio.max_drawdown().to_numpy() * 100,
+            'total_trades': total_trades,
+            'win_rate': np.where(has_trades, per_column(trades.win_rate()) * 100, 0),
+            'fees_paid': per_column(portfolio.orders.fees.sum()),
+            'gross_exposure': portfolio.gross_exposure().mean().to_numpy(),
+            'net_exposure': portfolio.net_exposure().mean().to_numpy(),
+            'avg_trade_return': np.where(has_trades, per_column(trade_returns.mean()) * 100, 0),
+            'best_trade': np.where(has_trades, per_column(trade_returns.max()) * 100, 0),
+            'worst_trade': np.where(has_trades, per_column(trade_returns.min()) * 100, 0),
+            'avg_trade_duration_hours': np.where(has_trades, per_column(trades.duration.mean()) * bar_hours, 0),
+            'profit_factor': np.where(has_trades, profit_factor, 0),
+            'winning_trades': np.bincount(trade_returns.col_arr[winning], minlength=n_columns),
+            'losing_trades': np.bincount(trade_returns.col_arr[losing], minlength=n_columns),
+            'max_drawdown_duration_hours': np.where(has_drawdowns, per_column(drawdowns.duration.max()) * bar_hours, 0),
+            'avg_drawdown': np.where(has_drawdowns, per_column(drawdowns.drawdown.mean()) * 100, 0),
+            'drawdown_periods': drawdown_periods
+        })
+        
+        # Add regime analysis if available
+        if 'market_regime' in data.columns:
+            returns = portfolio.returns()
+            regimes = data['market_regime']
+            regime_names = {0: 'ranging', 1: 'trending', 2: 'volatile'}
+            
+            for regime_id, regime_name in regime_names.items():
+                regime_mask = (regimes == regime_id).to_numpy()
+                if regime_mask.sum() > 0:
+                    regime_returns = returns[regime_mask]
+                    regime_std = regime_returns.std().to_numpy()
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        regime_sharpe = regime_returns.mean().to_numpy() / regime_std * np.sqrt(252)
+                    metrics[f'{regime_name}_return'] = regime_returns.sum().to_numpy() * 100
+                    metrics[f'{regime_name}_sharpe'] = np.where(regime_std > 0, regime_sharpe, 0)
+                    metrics[f'{regime_name}_periods'] = regime_mask.sum()
+        
+        return metrics
+
+def _evaluate_grid_chunk(settings: Dict[str, float], data, entries: np.ndarray,
+                         exits: np.ndarray) -> pd.DataFrame:
+    """Process-pool entry point for BacktestEngine._evaluate_signal_grid (data may be a SharedFrameHandle)"""
+    if isinstance(data, SharedFrameHandle):
+        data = attach_frame(data)
+    engine = BacktestEngine(settings['initial_capital'], settings['fees'], settings['slippage'])
+    engine.max_position_size_percent = settings['max_position_size_percent']
+    return engine._evaluate_signal_grid(data, entries, exits)
 
 # Convenience function for quick backtesting
 def quick_backtest(data: pd.DataFrame, buy_signals: pd.Series, sell_signals: pd.Series,
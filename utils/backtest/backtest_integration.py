@@ -17,8 +17,9 @@ import json
 from itertools import product
 
 from .backtest_engine import BacktestEngine
+from .parameter_search import ParameterSearch, budget_window
+from .walk_forward_pool import WalkForwardJob, run_walk_forward_jobs
 from .strategy_vectorizer import VectorizedStrategyAdapter, vectorize_all_strategies_for_backtest
-from .indicator_factory import calculate_indicators
 
 logger = logging.getLogger(__name__)
 
@@ -147,7 +148,8 @@ class StrategyBacktestSuite:
     def optimize_strategy_parameters(self, data_with_indicators: pd.DataFrame,
                                    strategy_name: str, param_grid: Dict[str, List],
                                    product_id: str = "BTC-USD",
-                                   optimization_metric: str = "sortino_ratio") -> pd.DataFrame:
+                                   optimization_metric: str = "sortino_ratio",
+                                   search: Optional[ParameterSearch] = None) -> pd.DataFrame:
         """
         Optimize parameters for a specific strategy
         
@@ -157,6 +159,8 @@ class StrategyBacktestSuite:
             param_grid: Dictionary of parameter names and values to test
             product_id: Trading pair identifier
             optimization_metric: Metric to optimize for
+            search: Optional ParameterSearch (random, Hyperband, TPE, ...) used
+                    instead of testing every combination
             
         Returns:
             DataFrame with optimization results sorted by metric
@@ -172,41 +176,45 @@ class StrategyBacktestSuite:
             
             logger.info(f"Testing {len(param_combinations)} parameter combinations")
             
-            results = []
-            
-            for i, param_combo in enumerate(param_combinations):
-                try:
-                    # Create parameter dictionary
-                    params = dict(zip(param_names, param_combo))
-                    
-                    # Generate signals with these parameters
-                    signals_df = self._generate_strategy_signals_with_params(
-                        data_with_indicators, strategy_name, params, product_id
-                    )
-                    
-                    if signals_df is None or signals_df.empty:
-                        logger.warning(f"No signals generated for params {params}")
+            if search is not None:
+                results = self._search_parameter_results(data_with_indicators, strategy_name, product_id,
+                                                         optimization_metric, search)
+            else:
+                results = []
+
+                for i, param_combo in enumerate(param_combinations):
+                    try:
+                        # Create parameter dictionary
+                        params = dict(zip(param_names, param_combo))
+
+                        # Generate signals with these parameters
+                        signals_df = self._generate_strategy_signals_with_params(
+                            data_with_indicators, strategy_name, params, product_id
+                        )
+
+                        if signals_df is None or signals_df.empty:
+                            logger.warning(f"No signals generated for params {params}")
+                            continue
+
+                        # Run backtest
+                        backtest_result = self.backtest_engine.run_backtest(
+                            data_with_indicators, signals_df, f"{product_id}-{strategy_name}-opt-{i}"
+                        )
+
+                        # Add parameters to result
+                        result = {**params, **backtest_result}
+                        result['param_combination_id'] = i
+                        results.append(result)
+
+                        if (i + 1) % 10 == 0:
+                            logger.info(f"Completed {i + 1}/{len(param_combinations)} optimizations")
+                            if results:
+                                best_so_far = max(results, key=lambda x: x.get(optimization_metric, -999))
+                                logger.info(f"Best {optimization_metric} so far: {best_so_far.get(optimization_metric, 0):.3f}")
+
+                    except Exception as e:
+                        logger.warning(f"Error in optimization {i} with params {params}: {e}")
                         continue
-                    
-                    # Run backtest
-                    backtest_result = self.backtest_engine.run_backtest(
-                        data_with_indicators, signals_df, f"{product_id}-{strategy_name}-opt-{i}"
-                    )
-                    
-                    # Add parameters to result
-                    result = {**params, **backtest_result}
-                    result['param_combination_id'] = i
-                    results.append(result)
-                    
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"Completed {i + 1}/{len(param_combinations)} optimizations")
-                        if results:
-                            best_so_far = max(results, key=lambda x: x.get(optimization_metric, -999))
-                            logger.info(f"Best {optimization_metric} so far: {best_so_far.get(optimization_metric, 0):.3f}")
-                
-                except Exception as e:
-                    logger.warning(f"Error in optimization {i} with params {params}: {e}")
-                    continue
             
             if not results:
                 logger.error("No successful optimization runs")
@@ -229,6 +237,12 @@ class StrategyBacktestSuite:
                 'best_performance': results_df.iloc[0][optimization_metric]
             }
             
+            if search is not None:
+                self.optimization_results[optimization_key]['search'] = {
+                    'method': type(search).__name__,
+                    'trials': search.history_frame().to_dict('records')
+                }
+            
             # Save optimization results
             self._save_optimization_results(optimization_key, self.optimization_results[optimization_key])
             
@@ -242,12 +256,48 @@ class StrategyBacktestSuite:
             logger.error(f"Error in parameter optimization: {e}")
             return pd.DataFrame()
     
+    def _search_parameter_results(self, data_with_indicators: pd.DataFrame, strategy_name: str,
+                                  product_id: str, optimization_metric: str,
+                                  search: ParameterSearch) -> List[Dict[str, Any]]:
+        """
+        Evaluate the combinations proposed by a parameter search
+        
+        Short-budget trials run on the most recent part of the data.
+        
+        Returns:
+            Full-window results with parameters, like the grid loop
+        """
+        search.metric = optimization_metric
+        
+        def evaluate(params_list: List[Dict[str, Any]], budget: float) -> List[Optional[Dict[str, Any]]]:
+            window = budget_window(data_with_indicators, budget)
+            results = []
+            for params in params_list:
+                try:
+                    signals_df = self._generate_strategy_signals_with_params(window, strategy_name, params, product_id)
+                    if signals_df is None or signals_df.empty:
+                        results.append(None)
+                        continue
+                    backtest_result = self.backtest_engine.run_backtest(
+                        window, signals_df, f"{product_id}-{strategy_name}-search-{len(search.history) + len(results)}"
+                    )
+                    results.append({**params, **backtest_result})
+                except Exception as e:
+                    logger.warning(f"Error in parameter search with params {params}: {e}")
+                    results.append(None)
+            return results
+        
+        search.run(evaluate)
+        return [{**trial.result, 'param_combination_id': trial.trial_id}
+                for trial in search.history if trial.budget >= 1.0 and trial.result]
+    
     def run_walk_forward_analysis(self, data_with_indicators: pd.DataFrame,
                                 strategy_name: str, param_grid: Dict[str, List],
                                 product_id: str = "BTC-USD",
                                 train_period_days: int = 180,
                                 test_period_days: int = 30,
-                                step_days: int = 30) -> Dict[str, Any]:
+                                step_days: int = 30,
+                                max_workers: int = 1) -> Dict[str, Any]:
         """
         Run walk-forward analysis to test parameter stability
         
@@ -259,6 +309,7 @@ class StrategyBacktestSuite:
             train_period_days: Days for training/optimization period
             test_period_days: Days for out-of-sample testing
             step_days: Days to step forward between tests
+            max_workers: Processes used to run folds in parallel (1 = serial)
             
         Returns:
             Dictionary with walk-forward analysis results
@@ -267,120 +318,138 @@ class StrategyBacktestSuite:
             logger.info(f"Starting walk-forward analysis for {strategy_name}")
             logger.info(f"Train: {train_period_days}d, Test: {test_period_days}d, Step: {step_days}d")
             
-            # Calculate periods
-            total_days = (data_with_indicators.index.max() - data_with_indicators.index.min()).days
-            min_required_days = train_period_days + test_period_days
+            job = WalkForwardJob(product_id, strategy_name, param_grid, product_id,
+                                 train_period_days, test_period_days, step_days)
+            return run_walk_forward_jobs(self, {product_id: data_with_indicators}, [job], max_workers)[0]
             
-            if total_days < min_required_days:
-                logger.error(f"Insufficient data: {total_days} days available, {min_required_days} required")
-                return {'error': 'Insufficient data for walk-forward analysis'}
+        except Exception as e:
+            logger.error(f"Error in walk-forward analysis: {e}")
+            return {'error': str(e)}
+    
+    def _plan_walk_forward_periods(self, data_with_indicators: pd.DataFrame, train_period_days: int,
+                                   test_period_days: int, step_days: int) -> Optional[List[Tuple]]:
+        """Walk-forward periods for a dataset, or None if it is too short"""
+        # Calculate periods
+        total_days = (data_with_indicators.index.max() - data_with_indicators.index.min()).days
+        min_required_days = train_period_days + test_period_days
+        
+        if total_days < min_required_days:
+            logger.error(f"Insufficient data: {total_days} days available, {min_required_days} required")
+            return None
+        
+        # Generate walk-forward periods
+        periods = self._generate_walk_forward_periods(
+            data_with_indicators.index, train_period_days, test_period_days, step_days
+        )
+        
+        logger.info(f"Generated {len(periods)} walk-forward periods")
+        return periods
+    
+    def _run_walk_forward_period(self, data_with_indicators: pd.DataFrame, i: int, period: Tuple,
+                                 strategy_name: str, param_grid: Dict[str, List],
+                                 product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Optimize on one training window and test on the window after it
+        
+        Returns:
+            Period result, or None if the period was skipped
+        """
+        train_start, train_end, test_start, test_end = period
+        try:
+            logger.info(f"Period {i+1}: Train {train_start.date()} to {train_end.date()}, "
+                      f"Test {test_start.date()} to {test_end.date()}")
             
-            # Generate walk-forward periods
-            periods = self._generate_walk_forward_periods(
-                data_with_indicators.index, train_period_days, test_period_days, step_days
+            # Split data
+            train_data = data_with_indicators.loc[train_start:train_end]
+            test_data = data_with_indicators.loc[test_start:test_end]
+
+            if len(train_data) < 50 or len(test_data) < 10:
+                logger.warning(f"Insufficient data in period {i+1}, skipping")
+                return None
+
+            # Optimize on training data
+            optimization_results = self.optimize_strategy_parameters(
+                train_data, strategy_name, param_grid, 
+                f"{product_id}_wf_train_{i}", "sortino_ratio"
             )
-            
-            logger.info(f"Generated {len(periods)} walk-forward periods")
-            
-            results = []
-            
-            for i, (train_start, train_end, test_start, test_end) in enumerate(periods):
-                try:
-                    logger.info(f"Period {i+1}/{len(periods)}: Train {train_start.date()} to {train_end.date()}, "
-                              f"Test {test_start.date()} to {test_end.date()}")
-                    
-                    # Split data
-                    train_data = data_with_indicators.loc[train_start:train_end]
-                    test_data = data_with_indicators.loc[test_start:test_end]
-                    
-                    if len(train_data) < 50 or len(test_data) < 10:
-                        logger.warning(f"Insufficient data in period {i+1}, skipping")
-                        continue
-                    
-                    # Optimize on training data
-                    optimization_results = self.optimize_strategy_parameters(
-                        train_data, strategy_name, param_grid, 
-                        f"{product_id}_wf_train_{i}", "sortino_ratio"
-                    )
-                    
-                    if optimization_results.empty:
-                        logger.warning(f"No optimization results for period {i+1}")
-                        continue
-                    
-                    # Get best parameters
-                    best_params = optimization_results.iloc[0][list(param_grid.keys())].to_dict()
-                    
-                    # Test on out-of-sample data
-                    test_signals = self._generate_strategy_signals_with_params(
-                        test_data, strategy_name, best_params, f"{product_id}_wf_test_{i}"
-                    )
-                    
-                    if test_signals is None or test_signals.empty:
-                        logger.warning(f"No test signals for period {i+1}")
-                        continue
-                    
-                    # Run backtest on test data
-                    test_result = self.backtest_engine.run_backtest(
-                        test_data, test_signals, f"{product_id}_wf_test_{i}"
-                    )
-                    
-                    # Store period result
-                    period_result = {
-                        'period_id': i,
-                        'train_start': train_start.isoformat(),
-                        'train_end': train_end.isoformat(),
-                        'test_start': test_start.isoformat(),
-                        'test_end': test_end.isoformat(),
-                        'train_days': len(train_data),
-                        'test_days': len(test_data),
-                        'best_params': best_params,
-                        'train_performance': optimization_results.iloc[0]['sortino_ratio'],
-                        'test_performance': test_result
-                    }
-                    
-                    results.append(period_result)
-                    
-                    logger.info(f"  Period {i+1} complete: Train Sortino {period_result['train_performance']:.3f}, "
-                              f"Test Return {test_result['total_return']:.2f}%")
-                
-                except Exception as e:
-                    logger.error(f"Error in walk-forward period {i+1}: {e}")
-                    continue
-            
-            if not results:
-                logger.error("No successful walk-forward periods")
-                return {'error': 'No successful walk-forward periods'}
-            
-            # Analyze walk-forward results
-            wf_analysis = self._analyze_walk_forward_results(results)
-            
-            walk_forward_results = {
-                'timestamp': datetime.now().isoformat(),
-                'strategy_name': strategy_name,
-                'product_id': product_id,
-                'param_grid': param_grid,
-                'periods': results,
-                'analysis': wf_analysis,
-                'settings': {
-                    'train_period_days': train_period_days,
-                    'test_period_days': test_period_days,
-                    'step_days': step_days
-                }
+
+            if optimization_results.empty:
+                logger.warning(f"No optimization results for period {i+1}")
+                return None
+
+            # Get best parameters
+            best_params = optimization_results.iloc[0][list(param_grid.keys())].to_dict()
+
+            # Test on out-of-sample data
+            test_signals = self._generate_strategy_signals_with_params(
+                test_data, strategy_name, best_params, f"{product_id}_wf_test_{i}"
+            )
+
+            if test_signals is None or test_signals.empty:
+                logger.warning(f"No test signals for period {i+1}")
+                return None
+
+            # Run backtest on test data
+            test_result = self.backtest_engine.run_backtest(
+                test_data, test_signals, f"{product_id}_wf_test_{i}"
+            )
+
+            # Store period result
+            period_result = {
+                'period_id': i,
+                'train_start': train_start.isoformat(),
+                'train_end': train_end.isoformat(),
+                'test_start': test_start.isoformat(),
+                'test_end': test_end.isoformat(),
+                'train_days': len(train_data),
+                'test_days': len(test_data),
+                'best_params': best_params,
+                'train_performance': optimization_results.iloc[0]['sortino_ratio'],
+                'test_performance': test_result
             }
             
-            # Save walk-forward results
-            wf_key = f"{product_id}_{strategy_name}_walkforward"
-            self._save_walk_forward_results(wf_key, walk_forward_results)
-            
-            logger.info(f"Walk-forward analysis completed for {strategy_name}")
-            logger.info(f"Average test return: {wf_analysis['avg_test_return']:.2f}%")
-            logger.info(f"Parameter stability: {wf_analysis['parameter_stability']:.2f}")
-            
-            return walk_forward_results
-            
+            logger.info(f"  Period {i+1} complete: Train Sortino {period_result['train_performance']:.3f}, "
+                      f"Test Return {test_result['total_return']:.2f}%")
+            return period_result
+        
         except Exception as e:
-            logger.error(f"Error in walk-forward analysis: {e}")
-            return {'error': str(e)}
+            logger.error(f"Error in walk-forward period {i+1}: {e}")
+            return None
+    
+    def _finalize_walk_forward(self, results: List[Dict], strategy_name: str, param_grid: Dict[str, List],
+                               product_id: str, train_period_days: int, test_period_days: int,
+                               step_days: int) -> Dict[str, Any]:
+        """Analyze and save the period results of a walk-forward analysis"""
+        if not results:
+            logger.error("No successful walk-forward periods")
+            return {'error': 'No successful walk-forward periods'}
+        
+        # Analyze walk-forward results
+        wf_analysis = self._analyze_walk_forward_results(results)
+        
+        walk_forward_results = {
+            'timestamp': datetime.now().isoformat(),
+            'strategy_name': strategy_name,
+            'product_id': product_id,
+            'param_grid': param_grid,
+            'periods': results,
+            'analysis': wf_analysis,
+            'settings': {
+                'train_period_days': train_period_days,
+                'test_period_days': test_period_days,
+                'step_days': step_days
+            }
+        }
+        
+        # Save walk-forward results
+        wf_key = f"{product_id}_{strategy_name}_walkforward"
+        self._save_walk_forward_results(wf_key, walk_forward_results)
+        
+        logger.info(f"Walk-forward analysis completed for {strategy_name}")
+        logger.info(f"Average test return: {wf_analysis['avg_test_return']:.2f}%")
+        logger.info(f"Parameter stability: {wf_analysis['parameter_stability']:.2f}")
+        
+        return walk_forward_results
     
     def _generate_strategy_signals_with_params(self, data: pd.DataFrame, strategy_name: str,
                                              params: Dict[str, Any], product_id: str) -> Optional[pd.DataFrame]:
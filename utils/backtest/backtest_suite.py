@@ -9,13 +9,17 @@ with parameter optimization and performance analysis capabilities.
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
 from itertools import product
 
 from .backtest_engine import BacktestEngine
+from .parameter_search import ParameterSearch, budget_window
+from .result_cache import BacktestResultCache
+from .streaming import warmup_chunks
+from .walk_forward_pool import WalkForwardJob, run_walk_forward_jobs
 from .strategy_vectorizer import VectorizedStrategyAdapter, vectorize_all_strategies_for_backtest
 
 logger = logging.getLogger(__name__)
@@ -31,16 +35,18 @@ class ComprehensiveBacktestSuite:
     """
     
     def __init__(self, initial_capital: float = 10000.0, fees: float = 0.006, 
-                 slippage: float = 0.0005, results_dir: str = "./data/backtest_results"):
-        """Initialize the backtest suite"""
+                 slippage: float = 0.0005, results_dir: str = "./data/backtest_results",
+                 result_cache: Optional[BacktestResultCache] = None):
+        """Initialize the backtest suite (result_cache reuses results of identical earlier runs)"""
         self.initial_capital = initial_capital
         self.fees = fees
         self.slippage = slippage
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.result_cache = result_cache
         
         # Initialize components
-        self.backtest_engine = BacktestEngine(initial_capital, fees, slippage)
+        self.backtest_engine = BacktestEngine(initial_capital, fees, slippage, result_cache=result_cache)
         self.strategy_vectorizer = VectorizedStrategyAdapter()
         
         # Results storage
@@ -146,6 +152,17 @@ class ComprehensiveBacktestSuite:
         try:
             logger.info(f"Running single strategy backtest: {strategy_name} for {product_id}")
             
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = self.result_cache.make_key(
+                    data_with_indicators, strategy_name, {'product_id': product_id},
+                    self.backtest_engine._cache_settings()
+                )
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Single strategy backtest for {strategy_name} served from result cache")
+                    return cached.result
+            
             # Vectorize strategy
             if strategy_name == 'adaptive':
                 signals_df = self.strategy_vectorizer.vectorize_adaptive_strategy(
@@ -170,6 +187,9 @@ class ComprehensiveBacktestSuite:
             result['buy_signals'] = signals_df['buy'].sum()
             result['sell_signals'] = signals_df['sell'].sum()
             
+            if cache_key is not None and 'error' not in result:
+                self.result_cache.put(cache_key, result)
+            
             logger.info(f"Single strategy backtest completed: {result['total_return']:.2f}% return")
             return result
             
@@ -177,6 +197,71 @@ class ComprehensiveBacktestSuite:
             logger.error(f"Error in single strategy backtest: {e}")
             return {'error': str(e)}
     
+    def run_single_strategy_streaming(self, chunks: Iterable[pd.DataFrame], strategy_name: str,
+                                      product_id: str = "BTC-USD",
+                                      indicator_func: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                                      warmup_rows: int = 500) -> Dict[str, Any]:
+        """
+        Run backtest for a single strategy over time-ordered data chunks
+        
+        Each chunk gets the last warmup_rows rows of the previous one
+        prepended before indicators and signals are computed, and the
+        warm-up rows are dropped again before backtesting. Results equal
+        run_single_strategy() on the full history when indicators and
+        signals depend on at most warmup_rows bars of history.
+        
+        Args:
+            chunks: OHLCV (or indicator) DataFrames in time order, e.g.
+                streaming.iter_parquet_chunks(streaming.partition_files(...))
+            strategy_name: Name of strategy to backtest
+            product_id: Trading pair identifier
+            indicator_func: Optional function adding indicators to a chunk
+            warmup_rows: Rows of history carried into each chunk
+            
+        Returns:
+            Dictionary with backtest results
+        """
+        try:
+            logger.info(f"Running streaming strategy backtest: {strategy_name} for {product_id}")
+            counts = {'buy': 0, 'sell': 0}
+            
+            def signal_chunks():
+                for frame, chunk_start in warmup_chunks(chunks, warmup_rows):
+                    if indicator_func is not None:
+                        frame = indicator_func(frame)
+                    
+                    if strategy_name == 'adaptive':
+                        signals_df = self.strategy_vectorizer.vectorize_adaptive_strategy(frame, product_id)
+                    else:
+                        signals_df = self.strategy_vectorizer.vectorize_strategy(strategy_name, frame, product_id)
+                    
+                    if signals_df is None or signals_df.empty:
+                        continue
+                    
+                    frame = frame[frame.index >= chunk_start]
+                    signals_df = signals_df[signals_df.index >= chunk_start]
+                    counts['buy'] += signals_df['buy'].sum()
+                    counts['sell'] += signals_df['sell'].sum()
+                    yield frame, signals_df
+            
+            result = self.backtest_engine.run_backtest_streaming(signal_chunks(), f"{product_id}-{strategy_name}")
+            
+            if counts['buy'] + counts['sell'] == 0 and 'error' in result:
+                return {'error': f'No signals generated for {strategy_name}'}
+            
+            # Add metadata
+            result['strategy_name'] = strategy_name
+            result['signal_count'] = counts['buy'] + counts['sell']
+            result['buy_signals'] = counts['buy']
+            result['sell_signals'] = counts['sell']
+            
+            logger.info(f"Streaming strategy backtest completed: {result['total_return']:.2f}% return")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error in streaming strategy backtest: {e}")
+            return {'error': str(e)}
+    
     def _generate_comparative_analysis(self, results: Dict[str, Any], product_id: str) -> Dict[str, Any]:
         """Generate comparative analysis across strategies"""
         try:
@@ -330,7 +415,8 @@ class ComprehensiveBacktestSuite:
     def optimize_strategy_parameters(self, data_with_indicators: pd.DataFrame,
                                    strategy_name: str, param_grid: Dict[str, List],
                                    product_id: str = "BTC-USD",
-                                   optimization_metric: str = "sortino_ratio") -> pd.DataFrame:
+                                   optimization_metric: str = "sortino_ratio",
+                                   search: Optional[ParameterSearch] = None) -> pd.DataFrame:
         """
         Optimize parameters for a specific strategy
         
@@ -340,6 +426,8 @@ class ComprehensiveBacktestSuite:
             param_grid: Dictionary of parameter names and values to test
             product_id: Trading pair identifier
             optimization_metric: Metric to optimize for
+            search: Optional ParameterSearch (random, Hyperband, TPE, ...) used
+                    instead of testing every combination
             
         Returns:
             DataFrame with optimization results sorted by metric
@@ -355,35 +443,39 @@ class ComprehensiveBacktestSuite:
             
             logger.info(f"Testing {len(param_combinations)} parameter combinations")
             
-            results = []
-            
-            for i, param_combo in enumerate(param_combinations):
-                try:
-                    # Create parameter dictionary
-                    params = dict(zip(param_names, param_combo))
-                    
-                    # For now, we'll use the default strategy implementation
-                    # In a full implementation, this would modify strategy parameters
-                    result = self.run_single_strategy(data_with_indicators, strategy_name, product_id)
-                    
-                    if 'error' in result:
-                        logger.warning(f"Error in optimization {i} with params {params}: {result['error']}")
+            if search is not None:
+                results = self._search_parameter_results(data_with_indicators, strategy_name, product_id,
+                                                         optimization_metric, search)
+            else:
+                results = []
+
+                for i, param_combo in enumerate(param_combinations):
+                    try:
+                        # Create parameter dictionary
+                        params = dict(zip(param_names, param_combo))
+
+                        # For now, we'll use the default strategy implementation
+                        # In a full implementation, this would modify strategy parameters
+                        result = self.run_single_strategy(data_with_indicators, strategy_name, product_id)
+
+                        if 'error' in result:
+                            logger.warning(f"Error in optimization {i} with params {params}: {result['error']}")
+                            continue
+
+                        # Add parameters to result
+                        result_with_params = {**params, **result}
+                        result_with_params['param_combination_id'] = i
+                        results.append(result_with_params)
+
+                        if (i + 1) % 5 == 0:
+                            logger.info(f"Completed {i + 1}/{len(param_combinations)} optimizations")
+                            if results:
+                                best_so_far = max(results, key=lambda x: x.get(optimization_metric, -999))
+                                logger.info(f"Best {optimization_metric} so far: {best_so_far.get(optimization_metric, 0):.3f}")
+
+                    except Exception as e:
+                        logger.warning(f"Error in optimization {i} with params {params}: {e}")
                         continue
-                    
-                    # Add parameters to result
-                    result_with_params = {**params, **result}
-                    result_with_params['param_combination_id'] = i
-                    results.append(result_with_params)
-                    
-                    if (i + 1) % 5 == 0:
-                        logger.info(f"Completed {i + 1}/{len(param_combinations)} optimizations")
-                        if results:
-                            best_so_far = max(results, key=lambda x: x.get(optimization_metric, -999))
-                            logger.info(f"Best {optimization_metric} so far: {best_so_far.get(optimization_metric, 0):.3f}")
-                
-                except Exception as e:
-                    logger.warning(f"Error in optimization {i} with params {params}: {e}")
-                    continue
             
             if not results:
                 logger.error("No successful optimization runs")
@@ -406,6 +498,12 @@ class ComprehensiveBacktestSuite:
                 'best_performance': results_df.iloc[0][optimization_metric]
             }
             
+            if search is not None:
+                self.optimization_results[optimization_key]['search'] = {
+                    'method': type(search).__name__,
+                    'trials': search.history_frame().to_dict('records')
+                }
+            
             # Save optimization results
             self._save_optimization_results(optimization_key, self.optimization_results[optimization_key])
             
@@ -419,12 +517,38 @@ class ComprehensiveBacktestSuite:
             logger.error(f"Error in parameter optimization: {e}")
             return pd.DataFrame()
     
+    def _search_parameter_results(self, data_with_indicators: pd.DataFrame, strategy_name: str,
+                                  product_id: str, optimization_metric: str,
+                                  search: ParameterSearch) -> List[Dict[str, Any]]:
+        """
+        Evaluate the combinations proposed by a parameter search
+        
+        Short-budget trials run on the most recent part of the data.
+        
+        Returns:
+            Full-window results with parameters, like the grid loop
+        """
+        search.metric = optimization_metric
+        
+        def evaluate(params_list: List[Dict[str, Any]], budget: float) -> List[Optional[Dict[str, Any]]]:
+            window = budget_window(data_with_indicators, budget)
+            results = []
+            for params in params_list:
+                result = self.run_single_strategy(window, strategy_name, product_id)
+                results.append(None if 'error' in result else {**params, **result})
+            return results
+        
+        search.run(evaluate)
+        return [{**trial.result, 'param_combination_id': trial.trial_id}
+                for trial in search.history if trial.budget >= 1.0 and trial.result]
+    
     def run_walk_forward_analysis(self, data_with_indicators: pd.DataFrame,
                                 strategy_name: str, param_grid: Dict[str, List],
                                 product_id: str = "BTC-USD",
                                 train_period_days: int = 180,
                                 test_period_days: int = 30,
-                                step_days: int = 30) -> Dict[str, Any]:
+                                step_days: int = 30,
+                                max_workers: int = 1) -> Dict[str, Any]:
         """
         Run walk-forward analysis to test parameter stability
         
@@ -436,6 +560,7 @@ class ComprehensiveBacktestSuite:
             train_period_days: Days for training/optimization period
             test_period_days: Days for out-of-sample testing
             step_days: Days to step forward between tests
+            max_workers: Processes used to run folds in parallel (1 = serial)
             
         Returns:
             Dictionary with walk-forward analysis results
@@ -444,113 +569,131 @@ class ComprehensiveBacktestSuite:
             logger.info(f"Starting walk-forward analysis for {strategy_name}")
             logger.info(f"Train: {train_period_days}d, Test: {test_period_days}d, Step: {step_days}d")
             
-            # Calculate periods
-            total_days = (data_with_indicators.index.max() - data_with_indicators.index.min()).days
-            min_required_days = train_period_days + test_period_days
+            job = WalkForwardJob(product_id, strategy_name, param_grid, product_id,
+                                 train_period_days, test_period_days, step_days)
+            return run_walk_forward_jobs(self, {product_id: data_with_indicators}, [job], max_workers)[0]
             
-            if total_days < min_required_days:
-                logger.error(f"Insufficient data: {total_days} days available, {min_required_days} required")
-                return {'error': 'Insufficient data for walk-forward analysis'}
+        except Exception as e:
+            logger.error(f"Error in walk-forward analysis: {e}")
+            return {'error': str(e)}
+    
+    def _plan_walk_forward_periods(self, data_with_indicators: pd.DataFrame, train_period_days: int,
+                                   test_period_days: int, step_days: int) -> Optional[List[Tuple]]:
+        """Walk-forward periods for a dataset, or None if it is too short"""
+        # Calculate periods
+        total_days = (data_with_indicators.index.max() - data_with_indicators.index.min()).days
+        min_required_days = train_period_days + test_period_days
+        
+        if total_days < min_required_days:
+            logger.error(f"Insufficient data: {total_days} days available, {min_required_days} required")
+            return None
+        
+        # Generate walk-forward periods
+        periods = self._generate_walk_forward_periods(
+            data_with_indicators.index, train_period_days, test_period_days, step_days
+        )
+        
+        logger.info(f"Generated {len(periods)} walk-forward periods")
+        return periods
+    
+    def _run_walk_forward_period(self, data_with_indicators: pd.DataFrame, i: int, period: Tuple,
+                                 strategy_name: str, param_grid: Dict[str, List],
+                                 product_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Optimize on one training window and test on the window after it
+        
+        Returns:
+            Period result, or None if the period was skipped
+        """
+        train_start, train_end, test_start, test_end = period
+        try:
+            logger.info(f"Period {i+1}: Train {train_start.date()} to {train_end.date()}, "
+                      f"Test {test_start.date()} to {test_end.date()}")
             
-            # Generate walk-forward periods
-            periods = self._generate_walk_forward_periods(
-                data_with_indicators.index, train_period_days, test_period_days, step_days
+            # Split data
+            train_data = data_with_indicators.loc[train_start:train_end]
+            test_data = data_with_indicators.loc[test_start:test_end]
+
+            if len(train_data) < 50 or len(test_data) < 10:
+                logger.warning(f"Insufficient data in period {i+1}, skipping")
+                return None
+
+            # Optimize on training data
+            optimization_results = self.optimize_strategy_parameters(
+                train_data, strategy_name, param_grid, 
+                f"{product_id}_wf_train_{i}", "sortino_ratio"
             )
-            
-            logger.info(f"Generated {len(periods)} walk-forward periods")
-            
-            results = []
-            
-            for i, (train_start, train_end, test_start, test_end) in enumerate(periods):
-                try:
-                    logger.info(f"Period {i+1}/{len(periods)}: Train {train_start.date()} to {train_end.date()}, "
-                              f"Test {test_start.date()} to {test_end.date()}")
-                    
-                    # Split data
-                    train_data = data_with_indicators.loc[train_start:train_end]
-                    test_data = data_with_indicators.loc[test_start:test_end]
-                    
-                    if len(train_data) < 50 or len(test_data) < 10:
-                        logger.warning(f"Insufficient data in period {i+1}, skipping")
-                        continue
-                    
-                    # Optimize on training data
-                    optimization_results = self.optimize_strategy_parameters(
-                        train_data, strategy_name, param_grid, 
-                        f"{product_id}_wf_train_{i}", "sortino_ratio"
-                    )
-                    
-                    if optimization_results.empty:
-                        logger.warning(f"No optimization results for period {i+1}")
-                        continue
-                    
-                    # Get best parameters
-                    best_params = optimization_results.iloc[0][list(param_grid.keys())].to_dict()
-                    
-                    # Test on out-of-sample data (using default strategy for now)
-                    test_result = self.run_single_strategy(test_data, strategy_name, f"{product_id}_wf_test_{i}")
-                    
-                    if 'error' in test_result:
-                        logger.warning(f"No test results for period {i+1}: {test_result['error']}")
-                        continue
-                    
-                    # Store period result
-                    period_result = {
-                        'period_id': i,
-                        'train_start': train_start.isoformat(),
-                        'train_end': train_end.isoformat(),
-                        'test_start': test_start.isoformat(),
-                        'test_end': test_end.isoformat(),
-                        'train_days': len(train_data),
-                        'test_days': len(test_data),
-                        'best_params': best_params,
-                        'train_performance': optimization_results.iloc[0]['sortino_ratio'],
-                        'test_performance': test_result
-                    }
-                    
-                    results.append(period_result)
-                    
-                    logger.info(f"  Period {i+1} complete: Train Sortino {period_result['train_performance']:.3f}, "
-                              f"Test Return {test_result['total_return']:.2f}%")
-                
-                except Exception as e:
-                    logger.error(f"Error in walk-forward period {i+1}: {e}")
-                    continue
-            
-            if not results:
-                logger.error("No successful walk-forward periods")
-                return {'error': 'No successful walk-forward periods'}
-            
-            # Analyze walk-forward results
-            wf_analysis = self._analyze_walk_forward_results(results)
-            
-            walk_forward_results = {
-                'timestamp': datetime.now().isoformat(),
-                'strategy_name': strategy_name,
-                'product_id': product_id,
-                'param_grid': param_grid,
-                'periods': results,
-                'analysis': wf_analysis,
-                'settings': {
-                    'train_period_days': train_period_days,
-                    'test_period_days': test_period_days,
-                    'step_days': step_days
-                }
+
+            if optimization_results.empty:
+                logger.warning(f"No optimization results for period {i+1}")
+                return None
+
+            # Get best parameters
+            best_params = optimization_results.iloc[0][list(param_grid.keys())].to_dict()
+
+            # Test on out-of-sample data (using default strategy for now)
+            test_result = self.run_single_strategy(test_data, strategy_name, f"{product_id}_wf_test_{i}")
+
+            if 'error' in test_result:
+                logger.warning(f"No test results for period {i+1}: {test_result['error']}")
+                return None
+
+            # Store period result
+            period_result = {
+                'period_id': i,
+                'train_start': train_start.isoformat(),
+                'train_end': train_end.isoformat(),
+                'test_start': test_start.isoformat(),
+                'test_end': test_end.isoformat(),
+                'train_days': len(train_data),
+                'test_days': len(test_data),
+                'best_params': best_params,
+                'train_performance': optimization_results.iloc[0]['sortino_ratio'],
+                'test_performance': test_result
             }
             
-            # Save walk-forward results
-            wf_key = f"{product_id}_{strategy_name}_walkforward"
-            self._save_walk_forward_results(wf_key, walk_forward_results)
-            
-            logger.info(f"Walk-forward analysis completed for {strategy_name}")
-            logger.info(f"Average test return: {wf_analysis['avg_test_return']:.2f}%")
-            logger.info(f"Parameter stability: {wf_analysis['parameter_stability']:.2f}")
-            
-            return walk_forward_results
-            
+            logger.info(f"  Period {i+1} complete: Train Sortino {period_result['train_performance']:.3f}, "
+                      f"Test Return {test_result['total_return']:.2f}%")
+            return period_result
+        
         except Exception as e:
-            logger.error(f"Error in walk-forward analysis: {e}")
-            return {'error': str(e)}
+            logger.error(f"Error in walk-forward period {i+1}: {e}")
+            return None
+    
+    def _finalize_walk_forward(self, results: List[Dict], strategy_name: str, param_grid: Dict[str, List],
+                               product_id: str, train_period_days: int, test_period_days: int,
+                               step_days: int) -> Dict[str, Any]:
+        """Analyze and save the period results of a walk-forward analysis"""
+        if not results:
+            logger.error("No successful walk-forward periods")
+            return {'error': 'No successful walk-forward periods'}
+        
+        # Analyze walk-forward results
+        wf_analysis = self._analyze_walk_forward_results(results)
+        
+        walk_forward_results = {
+            'timestamp': datetime.now().isoformat(),
+            'strategy_name': strategy_name,
+            'product_id': product_id,
+            'param_grid': param_grid,
+            'periods': results,
+            'analysis': wf_analysis,
+            'settings': {
+                'train_period_days': train_period_days,
+                'test_period_days': test_period_days,
+                'step_days': step_days
+            }
+        }
+        
+        # Save walk-forward results
+        wf_key = f"{product_id}_{strategy_name}_walkforward"
+        self._save_walk_forward_results(wf_key, walk_forward_results)
+        
+        logger.info(f"Walk-forward analysis completed for {strategy_name}")
+        logger.info(f"Average test return: {wf_analysis['avg_test_return']:.2f}%")
+        logger.info(f"Parameter stability: {wf_analysis['parameter_stability']:.2f}")
+        
+        return walk_forward_results
     
     def _generate_walk_forward_periods(self, index: pd.DatetimeIndex, 
                                      train_days: int, test_days: int, step_days: int) -> List[Tuple]:
@@ -21,6 +21,7 @@ from strategies.mean_reversion import MeanReversionStrategy
 from strategies.momentum import MomentumStrategy
 from strategies.trend_following import TrendFollowingStrategy
 from strategies.adaptive_strategy_manager import AdaptiveStrategyManager
+from strategies.base_strategy import BATCH_INDICATOR_COLUMNS
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +57,10 @@ class EnhancedVectorizedStrategyAdapter:
         
         # Cache for vectorized results
         self._signal_cache = {}
-        
+
+        # Use analyze_batch()/get_combined_signal_batch() when available; False forces the row-by-row path
+        self.use_batch_analysis = True
+
         logger.info("Enhanced Vectorized Strategy Adapter initialized")
         logger.info(f"Available strategies: {list(self.live_strategies.keys())}")
         logger.info(f"Optimized thresholds: {self.optimized_thresholds}")
@@ -162,34 +166,43 @@ class EnhancedVectorizedStrategyAdapter:
             signals_df['position_size_multiplier'] = 1.0
             signals_df['market_filter_passed'] = market_filter
             
-            # Process each row
-            for i, (timestamp, row) in enumerate(data_clean.iterrows()):
-                try:
-                    # Prepare market data for this timestamp
-                    market_data = self._prepare_market_data(row, product_id, i, data_clean)
-                    
-                    # Prepare technical indicators for this timestamp
-                    technical_indicators = self._prepare_technical_indicators(row)
-                    
-                    # Get signal from live strategy
-                    signal = strategy.analyze(market_data, technical_indicators, {})
-                    
-                    # Store raw signal first
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
+            if self.use_batch_analysis and hasattr(strategy, 'analyze_batch'):
+                # Native array path: same decisions as analyze() without per-row dicts
+                batch = strategy.analyze_batch(self._prepare_batch_inputs(data_clean))
+                signals_df['buy'] = (batch['action'] == 'BUY').to_numpy()
+                signals_df['sell'] = (batch['action'] == 'SELL').to_numpy()
+                signals_df['confidence'] = batch['confidence'].to_numpy()
+                signals_df['reasoning'] = (f"{strategy.name} batch signal: " + batch['action']).to_numpy()
+                signals_df['position_size_multiplier'] = batch['position_size_multiplier'].to_numpy()
+            else:
+                # Process each row
+                for i, (timestamp, row) in enumerate(data_clean.iterrows()):
+                    try:
+                        # Prepare market data for this timestamp
+                        market_data = self._prepare_market_data(row, product_id, i, data_clean)
+
+                        # Prepare technical indicators for this timestamp
+                        technical_indicators = self._prepare_technical_indicators(row)
+
+                        # Get signal from live strategy
+                        signal = strategy.analyze(market_data, technical_indicators, {})
+
+                        # Store raw signal first
+                        signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                        signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                        signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                        signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
                     
-                except Exception as e:
-                    logger.warning(f"Error processing row {i} for {strategy_name}: {e}")
-                    # Set safe default values for this row
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 50.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
-                    continue
+                    except Exception as e:
+                        logger.warning(f"Error processing row {i} for {strategy_name}: {e}")
+                        # Set safe default values for this row
+                        signals_df.loc[timestamp, 'buy'] = False
+                        signals_df.loc[timestamp, 'sell'] = False
+                        signals_df.loc[timestamp, 'confidence'] = 50.0
+                        signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
+                        continue
             
             # Apply confidence thresholds
             signals_df = self._apply_confidence_threshold(signals_df, strategy_name)
@@ -249,40 +262,53 @@ class EnhancedVectorizedStrategyAdapter:
             signals_df['primary_strategy'] = ""
             signals_df['market_filter_passed'] = market_filter
             
-            # Process each row
-            for i, (timestamp, row) in enumerate(data_clean.iterrows()):
-                try:
-                    # Prepare data for adaptive manager
-                    market_data = self._prepare_market_data(row, product_id, i, data_clean)
-                    technical_indicators = self._prepare_technical_indicators(row)
-                    
-                    # Get combined signal from adaptive manager
-                    signal = adaptive_manager.get_combined_signal(market_data, technical_indicators, {})
-                    
-                    # Extract market regime and primary strategy info
-                    market_regime = getattr(adaptive_manager, 'current_market_regime', 'ranging')
-                    primary_strategy = self._extract_primary_strategy(signal.reasoning)
-                    
-                    # Store results with safe conversion
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
-                    signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
-                    signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
+            if self.use_batch_analysis:
+                # Array path: same decisions as get_combined_signal() without per-row dicts
+                combined = adaptive_manager.get_combined_signal_batch(self._prepare_batch_inputs(data_clean))
+                signals_df['buy'] = (combined['action'] == 'BUY').to_numpy()
+                signals_df['sell'] = (combined['action'] == 'SELL').to_numpy()
+                signals_df['confidence'] = combined['confidence'].to_numpy()
+                signals_df['reasoning'] = combined['reasoning'].to_numpy()
+                signals_df['position_size_multiplier'] = combined['position_size_multiplier'].to_numpy()
+                signals_df['market_regime'] = combined['market_regime'].to_numpy()
+                signals_df['primary_strategy'] = combined['primary_strategy'].replace('', 'unknown').to_numpy()
+            else:
+                # Process each row
+                for i, (timestamp, row) in enumerate(data_clean.iterrows()):
+                    try:
+                        # Prepare data for adaptive manager
+                        market_data = self._prepare_market_data(row, product_id, i, data_clean)
+                        technical_indicators = self._prepare_technical_indicators(row)
+
+                        # Get combined signal from adaptive manager
+                        signal = adaptive_manager.get_combined_signal(market_data, technical_indicators, {})
+
+                        # Extract market regime and primary strategy info
+                        market_regime = getattr(adaptive_manager, 'current_market_regime', 'ranging')
+                        primary_strategy = self._extract_primary_strategy(signal.reasoning)
+
+                        # Store results with safe conversion
+                        signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                        signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                        signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                        signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
+                        signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
+                        signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
                     
-                except Exception as e:
-                    logger.warning(f"Error processing adaptive strategy row {i}: {e}")
-                    # Set safe defaults
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 50.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
-                    signals_df.loc[timestamp, 'market_regime'] = "ranging"
-                    signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
-                    continue
+                    except Exception as e:
+                        logger.warning(f"Error processing adaptive strategy row {i}: {e}")
+                        # Set safe defaults
+                        signals_df.loc[timestamp, 'buy'] = False
+                        signals_df.loc[timestamp, 'sell'] = False
+                        signals_df.loc[timestamp, 'confidence'] = 50.0
+                        signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
+                        signals_df.loc[timestamp, 'market_regime'] = "ranging"
+                        signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
+                        continue
+            
+            adaptive_manager.close()
             
             # Apply confidence thresholds for adaptive strategy
             signals_df = self._apply_confidence_threshold(signals_df, 'adaptive')
@@ -406,7 +432,54 @@ class EnhancedVectorizedStrategyAdapter:
         except Exception as e:
             logger.warning(f"Error preparing technical indicators: {e}")
             return {}
-    
+
+    def _prepare_batch_inputs(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the analyze_batch() input frame for all rows at once, following
+        the same rules as _prepare_market_data/_prepare_technical_indicators
+        """
+        n = len(data)
+        positions = np.arange(n)
+        current_price = pd.to_numeric(data['close'], errors='coerce').to_numpy(dtype=np.float64)
+
+        # Price changes (0.0 until enough history); a zero reference price
+        # falls back to the same defaults _prepare_market_data uses on error
+        changes = {}
+        failed = np.zeros(n, dtype=bool)
+        for lag, name in [(1, 'change_1h'), (24, 'change_24h'), (120, 'change_5d')]:
+            previous = np.full(n, np.nan)
+            if lag < n:
+                previous[lag:] = current_price[:-lag]
+            has_history = positions >= lag
+            failed |= has_history & (previous == 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                changes[name] = np.where(has_history, (current_price - previous) / previous * 100, 0.0)
+
+        inputs = pd.DataFrame({'price': np.where(failed, 50000.0, current_price)}, index=data.index)
+        for name, values in changes.items():
+            inputs[name] = np.where(failed, 0.0, values)
+
+        # Indicators: mapped columns first, then any other numeric column by
+        # its own name, with non-NaN values overriding earlier ones
+        column_mapping = {
+            'rsi_14': 'rsi',
+            'bb_upper_20': 'bb_upper',
+            'bb_lower_20': 'bb_lower',
+            'bb_middle_20': 'bb_middle',
+            'macd': 'macd',
+            'macd_signal': 'macd_signal'
+        }
+        sources = [(col, name) for col, name in column_mapping.items() if col in data.columns]
+        sources += [(col, col) for col in data.columns
+                    if col in BATCH_INDICATOR_COLUMNS and col not in column_mapping]
+        for col, name in sources:
+            values = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=np.float64)
+            if name in inputs.columns:
+                values = np.where(np.isnan(values), inputs[name].to_numpy(), values)
+            inputs[name] = values
+
+        return inputs
+
     def _extract_primary_strategy(self, reasoning: str) -> str:
         """Extract primary strategy name from reasoning text"""
         try:
@@ -16,6 +16,52 @@ import random
 
 logger = logging.getLogger(__name__)
 
+# Random streams of the counter-based generator (per-row draws are keyed on seed, row and stream)
+RNG_STREAM_CONFIDENCE = 1
+RNG_STREAM_REASONING = 2
+RNG_STREAM_VOLUME = 3
+
+_UINT64_MASK = 0xFFFFFFFFFFFFFFFF
+
+# Label lookup tables for simulate_batch() codes
+_DECISION_LABELS = np.array(['HOLD', 'BUY', 'SELL'], dtype=object)
+_LEVEL_LABELS = np.array(['low', 'medium', 'high'], dtype=object)
+_TREND_LABELS = np.array(['sideways', 'bullish', 'bearish'], dtype=object)
+_VOLATILITY_LABELS = np.array(['low', 'moderate', 'high'], dtype=object)
+
+
+def counter_hash(seed: int, counters: np.ndarray, stream: int) -> np.ndarray:
+    """
+    Stateless 64-bit hash of (seed, counter, stream) using the splitmix64 finalizer
+    
+    Args:
+        seed: Simulation seed
+        counters: Integer counters (e.g. absolute row positions)
+        stream: Stream id so independent draws for the same row do not collide
+        
+    Returns:
+        uint64 array with one hash per counter
+    """
+    with np.errstate(over='ignore'):
+        x = np.asarray(counters, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        x = x + np.uint64((seed * 0xD1B54A32D192ED03 + stream * 0x8CB92BA72F3D8DD7) & _UINT64_MASK)
+        x ^= x >> np.uint64(30)
+        x *= np.uint64(0xBF58476D1CE4E5B9)
+        x ^= x >> np.uint64(27)
+        x *= np.uint64(0x94D049BB133111EB)
+        x ^= x >> np.uint64(31)
+    return x
+
+
+def counter_uniform(seed: int, counters: np.ndarray, stream: int) -> np.ndarray:
+    """
+    Uniform [0, 1) draws keyed on (seed, counter, stream)
+    
+    Each draw depends only on its key, so results are identical whether rows
+    are simulated serially, in chunks or in separate worker processes.
+    """
+    return (counter_hash(seed, counters, stream) >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
 class LLMStrategySimulator:
     """
     Simulates LLM trading decisions for backtesting without API calls.
@@ -33,8 +79,8 @@ class LLMStrategySimulator:
             seed: Random seed for consistent simulation results
         """
         self.trading_style = trading_style
-        random.seed(seed)
-        np.random.seed(seed)
+        self.seed = seed
+        self._next_row = 0  # Row counter used when analyze_market() is called without one
         
         # LLM-like decision patterns based on trading style
         self.style_patterns = {
@@ -97,18 +143,26 @@ class LLMStrategySimulator:
         logger.info(f"🤖 LLM Strategy Simulator initialized for {trading_style}")
     
     def analyze_market(self, market_data: Dict, technical_indicators: Dict, 
-                      additional_context: Dict = None) -> Dict[str, Any]:
+                      additional_context: Dict = None, row: Optional[int] = None) -> Dict[str, Any]:
         """
         Simulate LLM market analysis based on technical indicators
         
+        Random draws are keyed on (seed, row), like simulate_batch(), so calling
+        this row by row gives the same result as one batch over the same frame.
+        
         Args:
             market_data: Market data dictionary
             technical_indicators: Technical indicators dictionary
             additional_context: Additional context (unused in simulation)
+            row: Absolute row position (default: one past the previous call)
             
         Returns:
             Dictionary with simulated LLM analysis results
         """
+        if row is None:
+            row = self._next_row
+        self._next_row = row + 1
+        
         try:
             # Extract key data
             current_price = float(market_data.get('current_price', market_data.get('price', 50000)))
@@ -118,11 +172,11 @@ class LLMStrategySimulator:
             technical_analysis = self._analyze_technical_indicators(technical_indicators)
             
             # Determine market conditions
-            market_conditions = self._assess_market_conditions(market_data, technical_indicators)
+            market_conditions = self._assess_market_conditions(market_data, technical_indicators, row)
             
             # Generate trading decision
             decision_data = self._generate_trading_decision(
-                technical_analysis, market_conditions, current_price
+                technical_analysis, market_conditions, current_price, row
             )
             
             # Create LLM-style response
@@ -151,6 +205,163 @@ class LLMStrategySimulator:
             logger.error(f"Error in LLM simulation: {e}")
             return self._get_fallback_response()
     
+    def simulate_batch(self, df: pd.DataFrame, row_offset: int = 0) -> pd.DataFrame:
+        """
+        Simulate LLM decisions for every row of a frame at once
+        
+        Applies the same rules as analyze_market() with NumPy. The confidence
+        noise comes from a counter-based generator keyed on (seed, row_offset +
+        row position) instead of the shared global RNG, so a chunk simulated with
+        its row_offset gives the same rows as a full serial run.
+        
+        Args:
+            df: Frame in the analyze_batch() layout (rsi, macd, macd_signal, bb_upper,
+                bb_lower, bb_middle, current_price, change_24h, change_5d and optionally
+                bb_width); NaN or missing columns use the analyze_market() defaults
+            row_offset: Absolute position of the first row
+            
+        Returns:
+            DataFrame with decision, confidence, risk_assessment, trend, volatility,
+            bullish_score and bearish_score; reasoning is available via batch_reasoning()
+        """
+        n = len(df)
+        
+        def column(name, default):
+            if name not in df.columns:
+                return np.full(n, default, dtype=np.float64)
+            values = pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=np.float64)
+            return np.where(np.isnan(values), default, values)
+        
+        def strength(strong):
+            return np.where(strong, 1.0, 0.6)
+        
+        bullish_score = np.zeros(n)
+        bearish_score = np.zeros(n)
+        
+        # RSI contribution
+        rsi = column('rsi', 50.0)
+        rsi_oversold = rsi < 45
+        rsi_overbought = ~rsi_oversold & (rsi > 55)
+        bullish_score += np.where(rsi_oversold, self.pattern['rsi_weight'] * strength(rsi < 30), 0.0)
+        bearish_score += np.where(rsi_overbought, self.pattern['rsi_weight'] * strength(rsi > 70), 0.0)
+        
+        # MACD contribution
+        macd = column('macd', 0.0)
+        macd_signal = column('macd_signal', 0.0)
+        macd_histogram = macd - macd_signal
+        macd_strength = strength(np.abs(macd_histogram) > 100)
+        bullish_score += np.where((macd_histogram > 0) & (macd > macd_signal), self.pattern['macd_weight'] * macd_strength, 0.0)
+        bearish_score += np.where((macd_histogram < 0) & (macd < macd_signal), self.pattern['macd_weight'] * macd_strength, 0.0)
+        
+        # Bollinger Bands signal
+        bb_upper = column('bb_upper', 0.0)
+        bb_lower = column('bb_lower', 0.0)
+        bb_middle = column('bb_middle', 0.0)
+        current_price = column('current_price', np.nan)
+        current_price = np.where(np.isnan(current_price), bb_middle, current_price)
+        bands_valid = (bb_middle > 0) & (bb_upper > bb_lower)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bb_position = (current_price - bb_lower) / (bb_upper - bb_lower)
+            bb_band_width = ((bb_upper - bb_lower) / bb_middle) * 100
+        breakout_upper = bands_valid & (bb_position > 0.8)
+        breakout_lower = bands_valid & ~breakout_upper & (bb_position < 0.2)
+        squeeze = bands_valid & ~breakout_upper & ~breakout_lower & (bb_band_width < 2)
+        
+        # Market conditions
+        change_24h = column('change_24h', 0.0)
+        change_5d = column('change_5d', 0.0)
+        trend_bullish = (change_24h > 2) & (change_5d > 5)
+        trend_bearish = ~trend_bullish & (change_24h < -2) & (change_5d < -5)
+        
+        bb_width = column('bb_width', 3.0)
+        volatility_high = bb_width > 5
+        volatility_low = bb_width <= 3
+        
+        # Bollinger Bands contribution (squeeze follows the trend)
+        bb_weight = self.pattern['bb_weight']
+        bullish_score += np.where(breakout_lower, bb_weight * 0.8, np.where(squeeze & trend_bullish, bb_weight * 0.4, 0.0))
+        bearish_score += np.where(breakout_upper, bb_weight * 0.8, np.where(squeeze & trend_bearish, bb_weight * 0.4, 0.0))
+        
+        # Market conditions adjustment
+        bullish_score += np.where(trend_bullish, 0.2, 0.0)
+        bearish_score += np.where(trend_bearish, 0.2, 0.0)
+        
+        # Volatility adjustment (based on trading style preference)
+        volatility_multiplier = np.select(
+            [volatility_high, volatility_low],
+            [self.pattern['volatility_preference'], 1.0 - self.pattern['volatility_preference'] * 0.5],
+            default=1.0
+        )
+        bullish_score *= volatility_multiplier
+        bearish_score *= volatility_multiplier
+        
+        # Determine action and confidence
+        score_diff = np.abs(bullish_score - bearish_score)
+        buy = (bullish_score > bearish_score) & (score_diff > 0.3)
+        sell = (bearish_score > bullish_score) & (score_diff > 0.3)
+        base_confidence = np.where(buy | sell,
+                                   np.minimum(85, self.pattern['confidence_base'] + (score_diff * 30)),
+                                   np.maximum(20, 50 - (score_diff * 20)))
+        
+        # Seeded per-row noise to simulate LLM variability
+        rows = np.arange(row_offset, row_offset + n)
+        confidence_noise = -5 + 10 * counter_uniform(self.seed, rows, RNG_STREAM_CONFIDENCE)
+        final_confidence = np.clip(base_confidence + confidence_noise, 0, 100)
+        
+        # Assess risk
+        sideways = ~trend_bullish & ~trend_bearish
+        risk_score = (np.select([volatility_high, volatility_low], [2, -1], default=0)
+                      + sideways.astype(int)
+                      + np.select([final_confidence < 50, final_confidence > 75], [2, -1], default=0))
+        
+        decision_code = np.where(buy, 1, np.where(sell, 2, 0))
+        risk_code = np.where(risk_score >= 3, 2, np.where(risk_score <= 0, 0, 1))
+        trend_code = np.where(trend_bullish, 1, np.where(trend_bearish, 2, 0))
+        volatility_code = np.where(volatility_high, 2, np.where(volatility_low, 0, 1))
+        
+        return pd.DataFrame({
+            'decision': _DECISION_LABELS[decision_code],
+            'confidence': np.round(final_confidence, 1),
+            'risk_assessment': _LEVEL_LABELS[risk_code],
+            'trend': _TREND_LABELS[trend_code],
+            'volatility': _VOLATILITY_LABELS[volatility_code],
+            'bullish_score': np.round(bullish_score, 2),
+            'bearish_score': np.round(bearish_score, 2)
+        }, index=df.index)
+    
+    def batch_reasoning(self, df: pd.DataFrame, batch: pd.DataFrame,
+                        positions: Optional[List[int]] = None, row_offset: int = 0) -> List[List[str]]:
+        """
+        Generate reasoning text for selected rows of a simulate_batch() result
+        
+        Args:
+            df: Frame passed to simulate_batch()
+            batch: Result of simulate_batch(df, row_offset)
+            positions: Row positions to explain (default: all rows)
+            row_offset: Same row_offset as used for simulate_batch()
+            
+        Returns:
+            List of reasoning lists, one per requested position
+        """
+        from strategies.base_strategy import batch_row_to_inputs
+        
+        if positions is None:
+            positions = range(len(df))
+        
+        reasoning = []
+        for position in positions:
+            row = df.iloc[position]
+            _, indicators = batch_row_to_inputs(row)
+            technical_analysis = self._analyze_technical_indicators(indicators)
+            market_conditions = {
+                'trend': batch['trend'].iloc[position],
+                'volatility': batch['volatility'].iloc[position]
+            }
+            key = counter_hash(self.seed, np.array([row_offset + position]), RNG_STREAM_REASONING)[0]
+            reasoning.append(self._generate_reasoning(batch['decision'].iloc[position], technical_analysis,
+                                                      market_conditions, rng=random.Random(int(key))))
+        return reasoning
+    
     def _analyze_technical_indicators(self, indicators: Dict) -> Dict[str, Any]:
         """Analyze technical indicators with LLM-like logic"""
         try:
@@ -247,7 +458,11 @@ class LLMStrategySimulator:
             logger.error(f"Error analyzing technical indicators: {e}")
             return self._get_default_technical_analysis()
     
-    def _assess_market_conditions(self, market_data: Dict, indicators: Dict) -> Dict[str, Any]:
+    def _row_uniform(self, row: int, stream: int) -> float:
+        """Single counter-based [0, 1) draw for a row"""
+        return float(counter_uniform(self.seed, np.array([row]), stream)[0])
+    
+    def _assess_market_conditions(self, market_data: Dict, indicators: Dict, row: int = 0) -> Dict[str, Any]:
         """Assess overall market conditions"""
         try:
             # Price changes
@@ -276,7 +491,7 @@ class LLMStrategySimulator:
                 volatility = "moderate"
             
             # Volume assessment (simulated)
-            volume_factor = random.uniform(0.8, 1.2)  # Simulate volume variation
+            volume_factor = 0.8 + 0.4 * self._row_uniform(row, RNG_STREAM_VOLUME)  # Simulate volume variation
             if volume_factor > 1.1:
                 volume = "above_average"
             elif volume_factor < 0.9:
@@ -303,7 +518,7 @@ class LLMStrategySimulator:
             }
     
     def _generate_trading_decision(self, technical_analysis: Dict, 
-                                 market_conditions: Dict, current_price: float) -> Dict[str, Any]:
+                                 market_conditions: Dict, current_price: float, row: int = 0) -> Dict[str, Any]:
         """Generate trading decision based on analysis"""
         try:
             # Calculate weighted scores
@@ -373,11 +588,13 @@ class LLMStrategySimulator:
                 base_confidence = max(20, 50 - (score_diff * 20))
             
             # Add some randomness to simulate LLM variability
-            confidence_noise = random.uniform(-5, 5)
+            confidence_noise = -5 + 10 * self._row_uniform(row, RNG_STREAM_CONFIDENCE)
             final_confidence = max(0, min(100, base_confidence + confidence_noise))
             
-            # Generate reasoning
-            reasoning = self._generate_reasoning(action, technical_analysis, market_conditions)
+            # Generate reasoning (same per-row generator as batch_reasoning())
+            key = counter_hash(self.seed, np.array([row]), RNG_STREAM_REASONING)[0]
+            reasoning = self._generate_reasoning(action, technical_analysis, market_conditions,
+                                                 rng=random.Random(int(key)))
             
             # Assess risk
             risk_assessment = self._assess_risk(market_conditions, final_confidence)
@@ -412,18 +629,19 @@ class LLMStrategySimulator:
             }
     
     def _generate_reasoning(self, action: str, technical_analysis: Dict, 
-                          market_conditions: Dict) -> List[str]:
-        """Generate LLM-style reasoning for the decision"""
+                          market_conditions: Dict, rng: random.Random = None) -> List[str]:
+        """Generate LLM-style reasoning for the decision (rng defaults to one seeded with self.seed)"""
         try:
             reasoning = []
+            rng = rng or random.Random(self.seed)
             
             # Base reasoning based on action
             if action == 'BUY':
-                base_reasons = random.sample(self.reasoning_templates['bullish'], 2)
+                base_reasons = rng.sample(self.reasoning_templates['bullish'], 2)
             elif action == 'SELL':
-                base_reasons = random.sample(self.reasoning_templates['bearish'], 2)
+                base_reasons = rng.sample(self.reasoning_templates['bearish'], 2)
             else:
-                base_reasons = random.sample(self.reasoning_templates['neutral'], 2)
+                base_reasons = rng.sample(self.reasoning_templates['neutral'], 2)
             
             reasoning.extend(base_reasons)
             
@@ -13,6 +13,11 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Regime codes used by detect_market_regime_codes() (index into REGIME_LABELS)
+REGIME_LABELS = ('trending', 'ranging', 'volatile')
+REGIME_TRENDING, REGIME_RANGING, REGIME_VOLATILE = 0, 1, 2
+REGIME_LABELS_ARRAY = np.array(REGIME_LABELS, dtype=object)
+
 class MarketRegimeAnalyzer:
     """
     Market regime analyzer that uses the same logic as AdaptiveStrategyManager
@@ -76,44 +81,12 @@ class MarketRegimeAnalyzer:
         try:
             logger.info(f"🔍 Detecting market regimes for {len(data)} periods...")
             
-            # Calculate price changes
-            price_changes = self._calculate_price_changes(data)
-            
-            # Calculate Bollinger Band width
-            bb_width_pct = self._calculate_bb_width_percentage(data)
-            
-            # Apply regime detection logic (same as AdaptiveStrategyManager)
-            regimes = pd.Series(index=data.index, dtype=str)
-            
-            for i, timestamp in enumerate(data.index):
-                try:
-                    change_24h = abs(price_changes.loc[timestamp, '24h'])
-                    change_5d = abs(price_changes.loc[timestamp, '5d'])
-                    bb_width = bb_width_pct.loc[timestamp]
-                    
-                    # Apply same logic as AdaptiveStrategyManager.detect_market_regime_enhanced
-                    if change_24h > self.regime_thresholds['trending_price_change_24h'] or \
-                       change_5d > self.regime_thresholds['trending_price_change_5d']:
-                        if bb_width > self.regime_thresholds['volatile_bb_width']:
-                            regime = "volatile"  # High movement + high volatility
-                        else:
-                            regime = "trending"  # High movement + low volatility = trend
-                    elif change_24h < self.regime_thresholds['ranging_price_change_24h'] and \
-                         bb_width < self.regime_thresholds['ranging_bb_width']:
-                        regime = "ranging"   # Low movement + low volatility = range
-                    elif bb_width > self.regime_thresholds['extreme_volatile_bb_width']:
-                        regime = "volatile"  # High volatility regardless of movement
-                    else:
-                        regime = "ranging"   # Default to ranging
-                    
-                    regimes.loc[timestamp] = regime
-                    
-                except Exception as e:
-                    logger.warning(f"Error detecting regime for timestamp {timestamp}: {e}")
-                    regimes.loc[timestamp] = "ranging"  # Safe default
+            codes = self.detect_market_regime_codes(data)
+            regimes = pd.Series(REGIME_LABELS_ARRAY[codes], index=data.index, dtype=str)
             
             # Log regime distribution
-            regime_counts = regimes.value_counts().to_dict()
+            counts = np.bincount(codes, minlength=len(REGIME_LABELS))
+            regime_counts = {REGIME_LABELS[c]: int(counts[c]) for c in np.argsort(-counts, kind='stable') if counts[c]}
             regime_percentages = {k: f"{v/len(regimes)*100:.1f}%" for k, v in regime_counts.items()}
             
             logger.info(f"🔍 Regime distribution: {regime_counts}")
@@ -126,6 +99,35 @@ class MarketRegimeAnalyzer:
             # Return all 'ranging' as safe default
             return pd.Series('ranging', index=data.index)
     
+    def detect_market_regime_codes(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Classify every period as an int8 regime code (index into REGIME_LABELS)
+        
+        Args:
+            data: DataFrame with OHLCV data and technical indicators
+            
+        Returns:
+            int8 array of REGIME_TRENDING / REGIME_RANGING / REGIME_VOLATILE codes
+        """
+        price_changes = self._calculate_price_changes(data)
+        change_24h = np.abs(price_changes['24h'].to_numpy(dtype=float))
+        change_5d = np.abs(price_changes['5d'].to_numpy(dtype=float))
+        bb_width = self._calculate_bb_width_percentage(data).to_numpy(dtype=float)
+        
+        # Same decision tree as AdaptiveStrategyManager.detect_market_regime_enhanced
+        moving = (change_24h > self.regime_thresholds['trending_price_change_24h']) | \
+                 (change_5d > self.regime_thresholds['trending_price_change_5d'])
+        conditions = [
+            moving & (bb_width > self.regime_thresholds['volatile_bb_width']),        # High movement + high volatility
+            moving,                                                                    # High movement + low volatility = trend
+            (change_24h < self.regime_thresholds['ranging_price_change_24h']) &
+            (bb_width < self.regime_thresholds['ranging_bb_width']),                   # Low movement + low volatility = range
+            bb_width > self.regime_thresholds['extreme_volatile_bb_width']             # High volatility regardless of movement
+        ]
+        choices = [REGIME_VOLATILE, REGIME_TRENDING, REGIME_RANGING, REGIME_VOLATILE]
+        
+        return np.select(conditions, choices, default=REGIME_RANGING).astype(np.int8)
+    
     def _calculate_price_changes(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate price changes for regime detection"""
         try:
@@ -324,19 +326,43 @@ class MarketRegimeAnalyzer:
     
     def _analyze_regime_transitions(self, regimes: pd.Series) -> Dict[str, Any]:
         """Analyze transitions between market regimes"""
+        if len(regimes) < 2:
+            # Zero or one period: no transitions, a single run at most
+            labels = [str(label) for label in pd.unique(regimes)]
+            return {
+                'total_transitions': 0,
+                'transition_frequency': 0,
+                'transition_types': {},
+                'transition_matrix': {label: {label: 0} for label in labels},
+                'average_durations': {label: 1.0 for label in labels}
+            }
+        
         try:
+            codes, labels = pd.factorize(regimes, use_na_sentinel=False)
+            labels = [str(label) for label in labels]
+            n_labels = len(labels)
+            
+            # Transitions are the positions where the code changes
+            change_positions = np.flatnonzero(np.diff(codes)) + 1
+            transition_count = len(change_positions)
+            pair_codes = codes[change_positions - 1] * n_labels + codes[change_positions]
+            matrix = np.bincount(pair_codes, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+            
+            # Report transition types in order of first occurrence
+            unique_pairs, first_seen = np.unique(pair_codes, return_index=True)
             transitions = {}
-            transition_count = 0
-            
-            # Count transitions
-            for i in range(1, len(regimes)):
-                prev_regime = regimes.iloc[i-1]
-                curr_regime = regimes.iloc[i]
-                
-                if prev_regime != curr_regime:
-                    transition_count += 1
-                    transition_key = f"{prev_regime}_to_{curr_regime}"
-                    transitions[transition_key] = transitions.get(transition_key, 0) + 1
+            for pair in unique_pairs[np.argsort(first_seen)]:
+                prev_code, curr_code = divmod(int(pair), n_labels)
+                transitions[f"{labels[prev_code]}_to_{labels[curr_code]}"] = int(matrix[prev_code, curr_code])
+            
+            # Regime durations from the run lengths between transitions
+            run_starts = np.concatenate(([0], change_positions))
+            run_lengths = np.diff(np.append(run_starts, len(codes)))
+            run_codes = codes[run_starts]
+            run_counts = np.bincount(run_codes, minlength=n_labels)
+            run_totals = np.bincount(run_codes, weights=run_lengths, minlength=n_labels)
+            average_durations = {labels[c]: float(run_totals[c] / run_counts[c])
+                                 for c in range(n_labels) if run_counts[c]}
             
             # Calculate transition frequency
             total_periods = len(regimes)
@@ -345,7 +371,10 @@ class MarketRegimeAnalyzer:
             return {
                 'total_transitions': transition_count,
                 'transition_frequency': transition_frequency,
-                'transition_types': transitions
+                'transition_types': transitions,
+                'transition_matrix': {labels[i]: {labels[j]: int(matrix[i, j]) for j in range(n_labels)}
+                                      for i in range(n_labels)},
+                'average_durations': average_durations
             }
             
         except Exception as e:
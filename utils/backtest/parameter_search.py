@@ -0,0 +1,362 @@
+"""
+Parameter Search - Sample-Efficient Alternatives to Exhaustive Grids
+
+Searchers propose batches of parameter combinations from a discrete grid
+and hand them to an evaluator, which backtests a whole batch at once (e.g.
+as columns of one VectorBT portfolio) on a fraction of the data window:
+
+    evaluate(params_list, budget) -> list of result dicts (None if failed)
+
+where budget is the fraction of the window to use (1.0 = full window).
+
+- GridSearch: every combination at full budget (the previous behaviour)
+- RandomSearch: a random subset of combinations
+- SuccessiveHalving / Hyperband: cheap short-window backtests prune
+  candidates before the survivors are run on the full window
+- TPESearch: Tree-structured Parzen Estimator over the discrete grid
+
+Every searcher keeps the full trial history in `history`.
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_ENUMERATION_LIMIT = 100_000  # Grids up to this size are sampled from an explicit index pool
+MIN_BUDGET_ROWS = 100               # Shortest window a budgeted backtest runs on
+
+Evaluator = Callable[[List[Dict[str, Any]], float], List[Optional[Dict[str, Any]]]]
+
+def budget_window(data: pd.DataFrame, budget: float, min_rows: int = MIN_BUDGET_ROWS) -> pd.DataFrame:
+    """Most recent `budget` fraction of a data window (at least min_rows rows)"""
+    if budget >= 1.0:
+        return data
+    return data.iloc[-max(min_rows, int(math.ceil(len(data) * budget))):]
+
+@dataclass
+class Trial:
+    """One evaluated parameter combination"""
+    trial_id: int
+    params: Dict[str, Any]
+    budget: float                 # Fraction of the data window evaluated
+    score: float                  # Optimization metric (-inf if the backtest failed)
+    result: Dict[str, Any] = field(default_factory=dict)
+    rung: int = 0                 # Successive-halving rung (0 for single-budget searches)
+
+class ParameterSearch(ABC):
+    """
+    Base class for searchers over a discrete parameter grid
+
+    Subclasses implement _search(), proposing batches through _evaluate().
+    """
+
+    def __init__(self, param_grid: Dict[str, List], metric: str = "sortino_ratio", seed: int = 0):
+        """
+        Initialize the searcher
+
+        Args:
+            param_grid: Dictionary of parameter names and values to search
+            metric: Result key to maximize
+            seed: Random seed (searches are deterministic for a given seed)
+        """
+        self.param_names = list(param_grid.keys())
+        self.param_values = [list(values) for values in param_grid.values()]
+        self.metric = metric
+        self.rng = np.random.default_rng(seed)
+        self.history: List[Trial] = []
+        self._evaluator: Optional[Evaluator] = None
+
+    @property
+    def grid_size(self) -> int:
+        """Number of combinations in the full grid"""
+        return math.prod(len(values) for values in self.param_values)
+
+    def run(self, evaluate: Evaluator) -> List[Trial]:
+        """
+        Run the search
+
+        Args:
+            evaluate: Callable backtesting a batch of parameter dicts at a budget
+
+        Returns:
+            Full trial history
+        """
+        self.history = []
+        self._evaluator = evaluate
+        try:
+            self._search()
+        finally:
+            self._evaluator = None
+
+        full = [trial for trial in self.history if trial.budget >= 1.0]
+        logger.info(f"{type(self).__name__}: {len(self.history)} trials ({len(full)} full-window) "
+                    f"over a grid of {self.grid_size} combinations")
+        return self.history
+
+    def best_trial(self) -> Optional[Trial]:
+        """Best full-budget trial"""
+        full = [trial for trial in self.history if trial.budget >= 1.0 and trial.result]
+        return max(full, key=lambda trial: trial.score) if full else None
+
+    def results_frame(self) -> pd.DataFrame:
+        """Full-budget results (params + metrics) sorted by the metric, like a grid optimization"""
+        rows = [{**trial.params, **trial.result} for trial in self.history
+                if trial.budget >= 1.0 and trial.result]
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows).sort_values(self.metric, ascending=False)
+
+    def history_frame(self) -> pd.DataFrame:
+        """Every trial with its budget, rung and score"""
+        return pd.DataFrame([{'trial_id': trial.trial_id, 'budget': trial.budget, 'rung': trial.rung,
+                              'score': trial.score, **trial.params} for trial in self.history])
+
+    @abstractmethod
+    def _search(self):
+        """Propose candidate batches through _evaluate() until the search is done"""
+
+    # ===== HELPERS =====
+
+    def _evaluate(self, candidates: Sequence[Dict[str, Any]], budget: float = 1.0, rung: int = 0) -> List[Trial]:
+        """Evaluate a batch and append it to the history"""
+        if not candidates:
+            return []
+        results = self._evaluator(list(candidates), budget)
+
+        trials = []
+        for params, result in zip(candidates, results):
+            score = self._score(result)
+            trial = Trial(len(self.history), dict(params), budget, score, result or {}, rung)
+            self.history.append(trial)
+            trials.append(trial)
+        return trials
+
+    def _score(self, result: Optional[Dict[str, Any]]) -> float:
+        if not result or 'error' in result:
+            return -np.inf
+        try:
+            score = float(result.get(self.metric, np.nan))
+        except (TypeError, ValueError):
+            return -np.inf
+        return score if np.isfinite(score) else -np.inf
+
+    def _params(self, flat_index: int) -> Dict[str, Any]:
+        """Decode a flat grid index (mixed radix) into a parameter dict"""
+        params = {}
+        for name, values in zip(reversed(self.param_names), reversed(self.param_values)):
+            flat_index, position = divmod(flat_index, len(values))
+            params[name] = values[position]
+        return {name: params[name] for name in self.param_names}
+
+    def _flat_index(self, params: Dict[str, Any]) -> int:
+        """Inverse of _params()"""
+        index = 0
+        for name, values in zip(self.param_names, self.param_values):
+            index = index * len(values) + values.index(params[name])
+        return index
+
+    def _sample(self, count: int, exclude: Optional[set] = None) -> List[Dict[str, Any]]:
+        """Sample distinct combinations (not in `exclude`, a set of flat indices)"""
+        exclude = exclude or set()
+        count = min(count, self.grid_size - len(exclude))
+        if count <= 0:
+            return []
+
+        if self.grid_size <= SAMPLE_ENUMERATION_LIMIT:
+            pool = np.setdiff1d(np.arange(self.grid_size), np.fromiter(exclude, dtype=np.int64, count=len(exclude)))
+            chosen = self.rng.choice(pool, size=count, replace=False)
+        else:
+            # Grid too large to enumerate; rejection-sample flat indices
+            chosen, seen = [], set(exclude)
+            while len(chosen) < count:
+                index = int(self.rng.integers(self.grid_size))
+                if index not in seen:
+                    seen.add(index)
+                    chosen.append(index)
+        return [self._params(int(index)) for index in chosen]
+
+class GridSearch(ParameterSearch):
+    """Exhaustive search of every combination at full budget"""
+
+    def __init__(self, param_grid: Dict[str, List], metric: str = "sortino_ratio", seed: int = 0,
+                 batch_size: Optional[int] = None):
+        super().__init__(param_grid, metric, seed)
+        self.batch_size = batch_size
+
+    def _search(self):
+        batch_size = self.batch_size or self.grid_size
+        for start in range(0, self.grid_size, batch_size):
+            self._evaluate([self._params(i) for i in range(start, min(start + batch_size, self.grid_size))])
+
+class RandomSearch(ParameterSearch):
+    """Random subset of the grid at full budget"""
+
+    def __init__(self, param_grid: Dict[str, List], metric: str = "sortino_ratio", seed: int = 0,
+                 n_trials: int = 20, batch_size: Optional[int] = None):
+        super().__init__(param_grid, metric, seed)
+        self.n_trials = n_trials
+        self.batch_size = batch_size
+
+    def _search(self):
+        candidates = self._sample(self.n_trials)
+        batch_size = self.batch_size or len(candidates)
+        for start in range(0, len(candidates), batch_size):
+            self._evaluate(candidates[start:start + batch_size])
+
+class SuccessiveHalving(ParameterSearch):
+    """
+    Successive halving: evaluate many candidates on a short window, keep the
+    best 1/eta at each rung and re-run them on an eta times longer window
+    until the survivors are evaluated on the full window
+    """
+
+    def __init__(self, param_grid: Dict[str, List], metric: str = "sortino_ratio", seed: int = 0,
+                 n_candidates: int = 27, eta: int = 3, min_budget: float = 1 / 9):
+        super().__init__(param_grid, metric, seed)
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_budget = min_budget
+
+    def _search(self):
+        self._halve(self._sample(self.n_candidates), self.min_budget)
+
+    def _halve(self, candidates: List[Dict[str, Any]], min_budget: float) -> List[Trial]:
+        """Run one successive-halving bracket; returns the full-budget trials"""
+        budget = min_budget
+        rung = 0
+        while True:
+            trials = self._evaluate(candidates, budget, rung)
+            if budget >= 1.0 or len(trials) <= 1:
+                if budget < 1.0:
+                    trials = self._evaluate(candidates, 1.0, rung + 1)
+                return trials
+
+            keep = max(1, len(trials) // self.eta)
+            ranked = sorted(trials, key=lambda trial: trial.score, reverse=True)
+            candidates = [trial.params for trial in ranked[:keep]]
+            budget = 1.0 if budget * self.eta > 1.0 - 1e-9 else budget * self.eta
+            rung += 1
+
+class Hyperband(SuccessiveHalving):
+    """
+    Hyperband: successive-halving brackets that trade the number of
+    candidates against how short the first window is
+    """
+
+    def __init__(self, param_grid: Dict[str, List], metric: str = "sortino_ratio", seed: int = 0,
+                 eta: int = 3, min_budget: float = 1 / 9):
+        super().__init__(param_grid, metric, seed, eta=eta, min_budget=min_budget)
+
+    def _search(self):
+        s_max = max(0, int(round(math.log(1 / self.min_budget, self.eta))))
+        evaluated = set()
+        for s in range(s_max, -1, -1):
+            n = int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+            candidates = self._sample(n, evaluated)
+            if not candidates:
+                break
+            evaluated.update(self._flat_index(params) for params in candidates)
+            self._halve(candidates, self.eta ** -s)
+
+class TPESearch(ParameterSearch):
+    """
+    Tree-structured Parzen Estimator over a discrete grid
+
+    After random start-up trials, the best `gamma` fraction of trials
+    defines a per-parameter categorical density l(x) and the rest g(x);
+    each batch takes the unseen candidates with the highest l(x)/g(x).
+    """
+
+    def __init__(self, param_grid: Dict[str, List], metric: str = "sortino_ratio", seed: int = 0,
+                 n_trials: int = 30, n_startup: int = 10, batch_size: int = 5, gamma: float = 0.25,
+                 n_ei_candidates: int = 64):
+        super().__init__(param_grid, metric, seed)
+        self.n_trials = n_trials
+        self.n_startup = n_startup
+        self.batch_size = batch_size
+        self.gamma = gamma
+        self.n_ei_candidates = n_ei_candidates
+
+    def _search(self):
+        n_trials = min(self.n_trials, self.grid_size)
+        seen = set()
+
+        startup = self._sample(min(self.n_startup, n_trials))
+        self._evaluate(startup)
+        seen.update(self._flat_index(params) for params in startup)
+
+        while len(self.history) < n_trials:
+            batch = self._propose(min(self.batch_size, n_trials - len(self.history)), seen)
+            if not batch:
+                break
+            self._evaluate(batch)
+            seen.update(self._flat_index(params) for params in batch)
+
+    def _propose(self, count: int, seen: set) -> List[Dict[str, Any]]:
+        """Candidates maximizing l(x)/g(x) that have not been evaluated yet"""
+        scores = np.array([trial.score for trial in self.history])
+        order = np.argsort(-scores, kind='stable')
+        n_good = max(1, int(math.ceil(self.gamma * len(order))))
+        good, bad = order[:n_good], order[n_good:]
+
+        # Per-parameter categorical densities with a uniform prior (Laplace smoothing)
+        good_probs, bad_probs = [], []
+        for name, values in zip(self.param_names, self.param_values):
+            positions = np.array([values.index(trial.params[name]) for trial in self.history])
+            good_counts = np.bincount(positions[good], minlength=len(values)) + 1.0
+            bad_counts = np.bincount(positions[bad], minlength=len(values)) + 1.0
+            good_probs.append(good_counts / good_counts.sum())
+            bad_probs.append(bad_counts / bad_counts.sum())
+
+        draws = np.column_stack([self.rng.choice(len(p), size=self.n_ei_candidates, p=p) for p in good_probs])
+        log_ratio = sum(np.log(good_probs[j][draws[:, j]]) - np.log(bad_probs[j][draws[:, j]])
+                        for j in range(len(self.param_names)))
+
+        proposals = []
+        proposed = set()
+        for row in draws[np.argsort(-log_ratio, kind='stable')]:
+            params = {name: values[position] for name, values, position
+                      in zip(self.param_names, self.param_values, row)}
+            index = self._flat_index(params)
+            if index not in seen and index not in proposed:
+                proposals.append(params)
+                proposed.add(index)
+                if len(proposals) == count:
+                    return proposals
+
+        # Densities concentrated on evaluated points; fill up at random
+        return proposals + self._sample(count - len(proposals), seen | proposed)
+
+SEARCHERS = {
+    'grid': GridSearch,
+    'random': RandomSearch,
+    'successive_halving': SuccessiveHalving,
+    'hyperband': Hyperband,
+    'tpe': TPESearch
+}
+
+def create_search(method: str, param_grid: Dict[str, List], metric: str = "sortino_ratio",
+                  seed: int = 0, **kwargs) -> ParameterSearch:
+    """
+    Create a searcher by name
+
+    Args:
+        method: One of SEARCHERS ('grid', 'random', 'successive_halving', 'hyperband', 'tpe')
+        param_grid: Dictionary of parameter names and values to search
+        metric: Result key to maximize
+        seed: Random seed
+        **kwargs: Searcher-specific options (n_trials, batch_size, eta, ...)
+
+    Returns:
+        ParameterSearch instance
+    """
+    if method not in SEARCHERS:
+        raise ValueError(f"Unknown search method '{method}', expected one of {sorted(SEARCHERS)}")
+    return SEARCHERS[method](param_grid, metric, seed, **kwargs)
@@ -0,0 +1,269 @@
+"""
+Risk Simulator - Array-State Capital Management for Backtesting
+
+This module replays CapitalManager's trade-size limits over a whole signal
+series. Portfolio state (EUR cash, crypto amount, portfolio value) lives in
+NumPy arrays and the buy/sell event loop is compiled with numba, so
+risk-adjusted backtests scale to millions of bars.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from datetime import datetime
+from enum import IntEnum
+from typing import Dict
+import logging
+
+from numba import njit
+
+logger = logging.getLogger(__name__)
+
+class RiskDecision(IntEnum):
+    """Outcome of risk management for one bar (stored as int8)"""
+    NONE = 0        # No BUY/SELL signal on this bar
+    APPROVED = 1
+    BLOCKED = 2     # CapitalManager returned a zero trade size
+    TOO_SMALL = 3   # Trade size below MIN_TRADE_AMOUNT
+
+# Signal codes accepted by simulate_risk()
+SIGNAL_NONE, SIGNAL_BUY, SIGNAL_SELL = 0, 1, 2
+
+@dataclass(frozen=True)
+class RiskLimits:
+    """CapitalManager settings and daily limit state, as plain numbers"""
+    min_eur_reserve: float
+    max_eur_usage_per_trade: float
+    max_position_size_percent: float
+    min_position_size_eur: float
+    rebalance_trigger_eur_percent: float
+    max_crypto_allocation: float
+    max_daily_trading_volume: float
+    min_trade_amount: float
+    daily_trade_limit_reached: bool = False
+    daily_volume: float = 0.0
+    cooldown_active: bool = False
+
+    @classmethod
+    def from_capital_manager(cls, capital_manager, asset: str) -> 'RiskLimits':
+        """
+        Snapshot a CapitalManager's limits and today's trade counters
+
+        Args:
+            capital_manager: CapitalManager instance
+            asset: Asset symbol used for the time-between-trades check
+
+        Returns:
+            RiskLimits instance
+        """
+        now = datetime.now()
+        today_state = capital_manager.daily_trades.get(now.date(), {"count": 0, "volume": 0.0})
+        last_trade = capital_manager.last_trade_time.get(f"{asset}_{now.date()}")
+        cooldown_active = (last_trade is not None and
+                           (now - last_trade).total_seconds() < capital_manager.min_time_between_trades * 60)
+
+        return cls(
+            min_eur_reserve=capital_manager.min_eur_reserve,
+            max_eur_usage_per_trade=capital_manager.max_eur_usage_per_trade,
+            max_position_size_percent=capital_manager.max_position_size_percent,
+            min_position_size_eur=capital_manager.min_position_size_eur,
+            rebalance_trigger_eur_percent=capital_manager.rebalance_trigger_eur_percent,
+            max_crypto_allocation=capital_manager.max_crypto_allocation,
+            max_daily_trading_volume=capital_manager.max_daily_trading_volume,
+            min_trade_amount=float(getattr(capital_manager.config, 'MIN_TRADE_AMOUNT', 30.0)),
+            daily_trade_limit_reached=today_state["count"] >= capital_manager.max_trades_per_day,
+            daily_volume=float(today_state["volume"]),
+            cooldown_active=bool(cooldown_active)
+        )
+
+# ===== COMPILED KERNELS =====
+
+@njit(cache=True)
+def _within_trading_limits(trade_size, total_value, trade_limit_reached, daily_volume,
+                           max_daily_volume, cooldown_active):
+    """CapitalManager._check_trading_limits on plain numbers"""
+    if trade_limit_reached:
+        return False
+    if daily_volume / total_value + trade_size / total_value > max_daily_volume:
+        return False
+    return not cooldown_active
+
+@njit(cache=True)
+def safe_buy_size(eur_balance, asset_value, total_value, original_trade_size,
+                  min_eur_reserve, max_eur_usage, max_position_pct, rebalance_trigger,
+                  max_crypto_allocation, trade_limit_reached, daily_volume, max_daily_volume,
+                  cooldown_active, min_trade_amount):
+    """
+    CapitalManager.calculate_safe_trade_size("BUY", ...) as a pure function
+
+    Returns:
+        Safe trade size in EUR (0.0 when the trade is blocked)
+    """
+    if total_value <= 0:
+        return 0.0
+
+    # Rebalancing needed -> no buys
+    eur_percent = eur_balance / total_value
+    if eur_percent < rebalance_trigger or (1 - eur_percent) > max_crypto_allocation:
+        return 0.0
+
+    if eur_balance <= min_eur_reserve:
+        return 0.0
+
+    max_trade_from_available = (eur_balance - min_eur_reserve) * max_eur_usage
+    potential_position_value = asset_value + min(original_trade_size, max_trade_from_available)
+    if potential_position_value / total_value > max_position_pct:
+        max_trade_from_position = max(0.0, (max_position_pct * total_value) - asset_value)
+        safe_size = min(max_trade_from_available, max_trade_from_position, original_trade_size)
+    else:
+        safe_size = min(max_trade_from_available, original_trade_size)
+
+    if not _within_trading_limits(safe_size, total_value, trade_limit_reached, daily_volume,
+                                  max_daily_volume, cooldown_active):
+        return 0.0
+    if safe_size < min_trade_amount:
+        return 0.0
+    return safe_size
+
+@njit(cache=True)
+def safe_sell_size(asset_value, total_value, original_trade_size, min_position_eur,
+                   trade_limit_reached, daily_volume, max_daily_volume, cooldown_active,
+                   min_trade_amount):
+    """
+    CapitalManager.calculate_safe_trade_size("SELL", ...) as a pure function
+
+    Returns:
+        Safe trade value in EUR (0.0 when the trade is blocked)
+    """
+    if total_value <= 0:
+        return 0.0
+
+    # Either sell everything or nothing rather than leave a small remainder
+    remaining_value_after_sell = asset_value - original_trade_size
+    if remaining_value_after_sell > 0 and remaining_value_after_sell < min_position_eur:
+        if asset_value >= min_trade_amount:
+            safe_size = asset_value
+        else:
+            return 0.0
+    else:
+        safe_size = min(original_trade_size, asset_value)
+
+    if not _within_trading_limits(safe_size, total_value, trade_limit_reached, daily_volume,
+                                  max_daily_volume, cooldown_active):
+        return 0.0
+    return safe_size
+
+@njit(cache=True)
+def _simulate_risk_kernel(prices, signals, confidences, multipliers, initial_capital,
+                          min_eur_reserve, max_eur_usage, max_position_pct, min_position_eur,
+                          rebalance_trigger, max_crypto_allocation, trade_limit_reached,
+                          daily_volume, max_daily_volume, cooldown_active, min_trade_amount):
+    """Step through buy/sell events carrying cash, crypto and portfolio value"""
+    n = len(prices)
+    codes = np.zeros(n, dtype=np.int8)
+    trade_values = np.zeros(n)
+    position_sizes = np.zeros(n)
+    cash_state = np.empty(n)
+    crypto_state = np.empty(n)
+    value_state = np.empty(n)
+
+    cash = initial_capital
+    crypto = 0.0
+    value = initial_capital
+
+    for i in range(n):
+        signal = signals[i]
+        price = prices[i]
+
+        if signal != 0 and price > 0:
+            trade_percentage = 0.10 + (confidences[i] / 100.0 * 0.15)  # 10% to 25%
+            asset_value = crypto * price
+
+            if signal == 1:
+                original_trade_size = cash * trade_percentage * multipliers[i]
+                safe_size = safe_buy_size(cash, asset_value, value, original_trade_size,
+                                          min_eur_reserve, max_eur_usage, max_position_pct,
+                                          rebalance_trigger, max_crypto_allocation, trade_limit_reached,
+                                          daily_volume, max_daily_volume, cooldown_active, min_trade_amount)
+            else:
+                original_trade_value = crypto * trade_percentage * multipliers[i] * price
+                safe_size = safe_sell_size(asset_value, value, original_trade_value, min_position_eur,
+                                           trade_limit_reached, daily_volume, max_daily_volume,
+                                           cooldown_active, min_trade_amount)
+
+            if safe_size <= 0:
+                codes[i] = 2
+            elif safe_size < min_trade_amount:
+                codes[i] = 3
+            else:
+                codes[i] = 1
+                trade_values[i] = safe_size
+                position_sizes[i] = safe_size / value
+                if signal == 1:
+                    cash -= safe_size
+                    crypto += safe_size / price
+                else:
+                    crypto -= safe_size / price
+                    cash += safe_size
+                value = cash + (crypto * price)
+
+        cash_state[i] = cash
+        crypto_state[i] = crypto
+        value_state[i] = value
+
+    return codes, trade_values, position_sizes, cash_state, crypto_state, value_state
+
+# ===== PUBLIC API =====
+
+def simulate_risk(prices: np.ndarray, buy: np.ndarray, sell: np.ndarray,
+                  confidence: np.ndarray, position_multiplier: np.ndarray,
+                  initial_capital: float, limits: RiskLimits) -> Dict[str, np.ndarray]:
+    """
+    Apply CapitalManager limits to a whole buy/sell signal series
+
+    Buy takes precedence when both flags are set, matching the per-row
+    risk management loop. Portfolio value is only revalued after trades.
+
+    Args:
+        prices: Close price per bar
+        buy: Boolean BUY signal per bar
+        sell: Boolean SELL signal per bar
+        confidence: Signal confidence (0-100) per bar
+        position_multiplier: Strategy position size multiplier per bar
+        initial_capital: Starting EUR balance
+        limits: CapitalManager settings snapshot
+
+    Returns:
+        Dict with risk_code (int8 RiskDecision), trade_value (EUR), position_size
+        (fraction of portfolio value), cash, crypto and portfolio_value arrays
+    """
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool)
+    signals = np.where(buy, SIGNAL_BUY, np.where(sell, SIGNAL_SELL, SIGNAL_NONE)).astype(np.int8)
+
+    codes, trade_values, position_sizes, cash, crypto, value = _simulate_risk_kernel(
+        np.ascontiguousarray(prices, dtype=np.float64),
+        signals,
+        np.ascontiguousarray(confidence, dtype=np.float64),
+        np.ascontiguousarray(position_multiplier, dtype=np.float64),
+        float(initial_capital),
+        limits.min_eur_reserve,
+        limits.max_eur_usage_per_trade,
+        limits.max_position_size_percent,
+        limits.min_position_size_eur,
+        limits.rebalance_trigger_eur_percent,
+        limits.max_crypto_allocation,
+        limits.daily_trade_limit_reached,
+        limits.daily_volume,
+        limits.max_daily_trading_volume,
+        limits.cooldown_active,
+        limits.min_trade_amount
+    )
+
+    return {
+        'risk_code': codes,
+        'trade_value': trade_values,
+        'position_size': position_sizes,
+        'cash': cash,
+        'crypto': crypto,
+        'portfolio_value': value
+    }
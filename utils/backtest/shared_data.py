@@ -0,0 +1,333 @@
+"""
+Shared Data Plane - Zero-Copy Datasets for Backtest Worker Processes
+
+Each (product, granularity, window) dataset is loaded once into a
+multiprocessing.shared_memory segment by the parent process. Workers
+receive a small SharedFrameHandle (pickled in a few hundred bytes) and
+attach to the segment as read-only NumPy/pandas views, so memory stays
+flat as workers are added and no DataFrame is pickled per task.
+
+Columns are laid out one after another in the segment, each contiguous
+and 64-byte aligned. Only numeric/bool columns and datetime or numeric
+indexes are supported, which covers OHLCV+indicator frames.
+"""
+
+import logging
+import sys
+import threading
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_ALIGNMENT = 64  # Bytes; keeps every column cache-line aligned
+
+@dataclass(frozen=True)
+class SharedColumn:
+    """Location of one column inside a shared segment"""
+    name: Any
+    dtype: str
+    offset: int
+
+@dataclass(frozen=True)
+class SharedFrameHandle:
+    """Picklable description of a DataFrame published to shared memory"""
+    key: str
+    shm_name: str
+    rows: int
+    index: SharedColumn
+    index_unit: Optional[str]      # Set for DatetimeIndex ('ns', 'us', ...)
+    index_tz: Optional[str]
+    columns: Tuple[SharedColumn, ...]
+    nbytes: int
+
+def dataset_key(product_id: str, granularity: str, days: int) -> str:
+    """Registry key for a historical dataset, matching data/historical file names"""
+    return f"{product_id}_{granularity}_{days}d"
+
+# ===== SEGMENT LAYOUT =====
+
+def _aligned(offset: int) -> int:
+    return -(-offset // SEGMENT_ALIGNMENT) * SEGMENT_ALIGNMENT
+
+def _index_values(index: pd.Index) -> Tuple[np.ndarray, Optional[str], Optional[str]]:
+    """Index as a plain NumPy array plus the unit/timezone needed to rebuild it"""
+    if isinstance(index, pd.DatetimeIndex):
+        tz = str(index.tz) if index.tz is not None else None
+        return np.asarray(index.asi8), index.unit, tz
+    if not pd.api.types.is_numeric_dtype(index.dtype):
+        raise ValueError(f"Unsupported index dtype for shared memory: {index.dtype}")
+    return np.asarray(index), None, None
+
+def _column_values(df: pd.DataFrame, name: Any) -> np.ndarray:
+    values = df[name].to_numpy()
+    if values.dtype.kind not in 'biuf':
+        raise ValueError(f"Unsupported dtype for shared memory column {name!r}: {df[name].dtype}")
+    return values
+
+def _view(buffer: memoryview, column: SharedColumn, rows: int) -> np.ndarray:
+    """Read-only NumPy view of one column in a segment"""
+    array = np.ndarray((rows,), dtype=np.dtype(column.dtype), buffer=buffer, offset=column.offset)
+    array.flags.writeable = False
+    return array
+
+def _frame_from_buffer(buffer: memoryview, handle: SharedFrameHandle) -> pd.DataFrame:
+    """Build a DataFrame whose index and columns are views into the segment"""
+    index_values = _view(buffer, handle.index, handle.rows)
+    if handle.index_unit is not None:
+        index = pd.DatetimeIndex(index_values.view(f"M8[{handle.index_unit}]"), name=handle.index.name, copy=False)
+        if handle.index_tz is not None:
+            index = index.tz_localize('UTC').tz_convert(handle.index_tz)
+    else:
+        index = pd.Index(index_values, name=handle.index.name, copy=False)
+
+    return pd.DataFrame({column.name: _view(buffer, column, handle.rows) for column in handle.columns},
+                        index=index, copy=False)
+
+_tracker_lock = threading.Lock()
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing segment without registering it with the resource tracker
+
+    Before Python 3.13 attaching registers the segment too, so the tracker
+    would unlink it (and warn) when the first worker exits.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+# ===== OWNER REGISTRY =====
+
+class SharedDataPlane:
+    """
+    Registry of datasets published to shared memory by the owning process
+
+    Every publish()/acquire() of a key takes a reference and every release()
+    drops one; the segment is unlinked when the last reference goes. close()
+    (or leaving the context manager) unlinks everything that is left.
+    """
+
+    def __init__(self):
+        """Initialize an empty data plane"""
+        self._segments: Dict[str, shared_memory.SharedMemory] = {}
+        self._handles: Dict[str, SharedFrameHandle] = {}
+        self._refcounts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'SharedDataPlane':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._handles
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    @property
+    def nbytes(self) -> int:
+        """Total bytes held in shared memory"""
+        return sum(handle.nbytes for handle in self._handles.values())
+
+    def publish(self, key: str, df: pd.DataFrame) -> SharedFrameHandle:
+        """
+        Copy a DataFrame into shared memory once
+
+        Publishing a key that already exists takes another reference to the
+        existing segment instead of copying again.
+
+        Args:
+            key: Dataset key, e.g. "BTC-USD_hour_180d"
+            df: Frame with numeric/bool columns and a datetime or numeric index
+
+        Returns:
+            Handle to pass to worker processes
+        """
+        with self._lock:
+            if key in self._handles:
+                self._refcounts[key] += 1
+                return self._handles[key]
+
+            index_values, index_unit, index_tz = _index_values(df.index)
+            arrays = [(name, _column_values(df, name)) for name in df.columns]
+
+            offset = 0
+            layout = []
+            for name, values in [(df.index.name, index_values)] + arrays:
+                offset = _aligned(offset)
+                layout.append((SharedColumn(name, values.dtype.str, offset), values))
+                offset += values.nbytes
+
+            segment = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+            for column, values in layout:
+                np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf, offset=column.offset)[:] = values
+
+            handle = SharedFrameHandle(
+                key=key,
+                shm_name=segment.name,
+                rows=len(df),
+                index=layout[0][0],
+                index_unit=index_unit,
+                index_tz=index_tz,
+                columns=tuple(column for column, _ in layout[1:]),
+                nbytes=offset
+            )
+            self._segments[key] = segment
+            self._handles[key] = handle
+            self._refcounts[key] = 1
+
+        logger.info(f"Published {key} to shared memory: {len(df)} rows x {len(df.columns)} columns "
+                    f"({offset / 1e6:.1f} MB)")
+        return handle
+
+    def load_parquet(self, key: str, path: Union[str, Path], columns: Optional[List[str]] = None) -> SharedFrameHandle:
+        """
+        Read a Parquet file into shared memory unless the key is already published
+
+        Args:
+            key: Dataset key
+            path: Parquet file path
+            columns: Optional subset of columns to read
+
+        Returns:
+            Handle to the shared dataset
+        """
+        if key in self:
+            return self.acquire(key)
+        return self.publish(key, pd.read_parquet(path, columns=columns))
+
+    def handle(self, key: str) -> SharedFrameHandle:
+        """Handle of a published dataset (raises KeyError if unknown)"""
+        return self._handles[key]
+
+    def handles(self) -> Dict[str, SharedFrameHandle]:
+        """Handles of all published datasets, by key"""
+        return dict(self._handles)
+
+    def frame(self, key: str) -> pd.DataFrame:
+        """Zero-copy, read-only view of a published dataset in this process"""
+        return _frame_from_buffer(self._segments[key].buf, self._handles[key])
+
+    def acquire(self, key: str) -> SharedFrameHandle:
+        """Take another reference to a published dataset"""
+        with self._lock:
+            self._refcounts[key] += 1
+            return self._handles[key]
+
+    def release(self, key: str):
+        """Drop a reference; the segment is unlinked when none are left"""
+        with self._lock:
+            self._refcounts[key] -= 1
+            if self._refcounts[key] > 0:
+                return
+            del self._refcounts[key]
+            del self._handles[key]
+            segment = self._segments.pop(key)
+        self._unlink(key, segment)
+
+    def close(self):
+        """Unlink every dataset regardless of outstanding references"""
+        with self._lock:
+            segments = list(self._segments.items())
+            self._segments.clear()
+            self._handles.clear()
+            self._refcounts.clear()
+        for key, segment in segments:
+            self._unlink(key, segment)
+
+    def _unlink(self, key: str, segment: shared_memory.SharedMemory):
+        segment.unlink()
+        try:
+            segment.close()
+        except BufferError:
+            # Views from frame() are still alive; the mapping goes away with them
+            pass
+        logger.debug(f"Released shared dataset {key}")
+
+def share_frames(plane: SharedDataPlane, frames: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Publish frames to a data plane for worker processes
+
+    Frames with unsupported columns are returned as-is, so workers get a
+    pickled copy instead of a handle.
+
+    Returns:
+        Dictionary of key to SharedFrameHandle (or DataFrame)
+    """
+    shared = {}
+    for key, frame in frames.items():
+        try:
+            shared[key] = plane.publish(key, frame)
+        except ValueError as e:
+            logger.warning(f"Dataset {key} not shared, workers get a pickled copy: {e}")
+            shared[key] = frame
+    return shared
+
+def resolve_frames(frames: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """Worker-side counterpart of share_frames(): attach handles, pass frames through"""
+    return {key: attach_frame(frame) if isinstance(frame, SharedFrameHandle) else frame
+            for key, frame in frames.items()}
+
+# ===== WORKER SIDE =====
+
+# Segments attached by this process, by shared memory name
+_attached: Dict[str, Tuple[shared_memory.SharedMemory, pd.DataFrame]] = {}
+
+def attach_frame(handle: SharedFrameHandle) -> pd.DataFrame:
+    """
+    Zero-copy, read-only DataFrame view of a published dataset
+
+    The segment stays mapped in this process (and the same frame is
+    returned for repeated calls) until detach_frame()/detach_all().
+
+    Args:
+        handle: Handle from SharedDataPlane.publish()
+
+    Returns:
+        DataFrame backed by shared memory
+    """
+    if handle.shm_name not in _attached:
+        segment = _open_segment(handle.shm_name)
+        _attached[handle.shm_name] = (segment, _frame_from_buffer(segment.buf, handle))
+    return _attached[handle.shm_name][1]
+
+def attach_frames(handles: Dict[str, SharedFrameHandle]) -> Dict[str, pd.DataFrame]:
+    """attach_frame() for a dict of handles"""
+    return {key: attach_frame(handle) for key, handle in handles.items()}
+
+def detach_frame(handle: SharedFrameHandle):
+    """Unmap a dataset from this process (views obtained earlier must not be used afterwards)"""
+    attached = _attached.pop(handle.shm_name, None)
+    if attached is None:
+        return
+    segment = attached[0]
+    del attached
+    try:
+        segment.close()
+    except BufferError:
+        logger.debug(f"Shared dataset {handle.key} still referenced; unmapped at process exit")
+
+def detach_all():
+    """Unmap every dataset attached by this process"""
+    segments = [segment for segment, _ in _attached.values()]
+    _attached.clear()
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            pass
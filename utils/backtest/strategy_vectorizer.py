@@ -51,7 +51,10 @@ class VectorizedStrategyAdapter:
         
         # Cache for vectorized results
         self._signal_cache = {}
-        
+
+        # Use analyze_batch()/get_combined_signal_batch() when available; False forces the row-by-row path
+        self.use_batch_analysis = True
+
         logger.info("FIXED Vectorized Strategy Adapter initialized")
         logger.info(f"Available strategies: {list(self.live_strategies.keys())}")
     
@@ -90,34 +93,43 @@ class VectorizedStrategyAdapter:
             signals_df['reasoning'] = ""
             signals_df['position_size_multiplier'] = 1.0
             
-            # Process each row (vectorized where possible)
-            for i, (timestamp, row) in enumerate(data_clean.iterrows()):
-                try:
-                    # FIXED: Prepare market data for this timestamp
-                    market_data = self._prepare_market_data(row, product_id, i, data_clean)
-                    
-                    # FIXED: Prepare technical indicators for this timestamp
-                    technical_indicators = self._prepare_technical_indicators(row)
-                    
-                    # Get signal from live strategy
-                    signal = strategy.analyze(market_data, technical_indicators, {})
-                    
-                    # Convert to vectorized format with safe conversion
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
+            if self.use_batch_analysis and hasattr(strategy, 'analyze_batch'):
+                # Native array path: same decisions as analyze() without per-row dicts
+                batch = strategy.analyze_batch(self._prepare_batch_inputs(data_clean))
+                signals_df['buy'] = (batch['action'] == 'BUY').to_numpy()
+                signals_df['sell'] = (batch['action'] == 'SELL').to_numpy()
+                signals_df['confidence'] = batch['confidence'].to_numpy()
+                signals_df['reasoning'] = (f"{strategy.name} batch signal: " + batch['action']).to_numpy()
+                signals_df['position_size_multiplier'] = batch['position_size_multiplier'].to_numpy()
+            else:
+                # Process each row (vectorized where possible)
+                for i, (timestamp, row) in enumerate(data_clean.iterrows()):
+                    try:
+                        # FIXED: Prepare market data for this timestamp
+                        market_data = self._prepare_market_data(row, product_id, i, data_clean)
+
+                        # FIXED: Prepare technical indicators for this timestamp
+                        technical_indicators = self._prepare_technical_indicators(row)
+
+                        # Get signal from live strategy
+                        signal = strategy.analyze(market_data, technical_indicators, {})
+
+                        # Convert to vectorized format with safe conversion
+                        signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                        signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                        signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                        signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
                     
-                except Exception as e:
-                    logger.warning(f"Error processing row {i} for {strategy_name}: {e}")
-                    # Set safe default values for this row
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 50.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
-                    continue
+                    except Exception as e:
+                        logger.warning(f"Error processing row {i} for {strategy_name}: {e}")
+                        # Set safe default values for this row
+                        signals_df.loc[timestamp, 'buy'] = False
+                        signals_df.loc[timestamp, 'sell'] = False
+                        signals_df.loc[timestamp, 'confidence'] = 50.0
+                        signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
+                        continue
             
             # Add metadata
             signals_df['strategy'] = strategy_name
@@ -164,40 +176,53 @@ class VectorizedStrategyAdapter:
             signals_df['market_regime'] = "ranging"
             signals_df['primary_strategy'] = ""
             
-            # Process each row
-            for i, (timestamp, row) in enumerate(data_clean.iterrows()):
-                try:
-                    # Prepare data for adaptive manager
-                    market_data = self._prepare_market_data(row, product_id, i, data_clean)
-                    technical_indicators = self._prepare_technical_indicators(row)
-                    
-                    # Get combined signal from adaptive manager
-                    signal = adaptive_manager.get_combined_signal(market_data, technical_indicators, {})
-                    
-                    # Extract market regime and primary strategy info
-                    market_regime = getattr(adaptive_manager, 'current_market_regime', 'ranging')
-                    primary_strategy = self._extract_primary_strategy(signal.reasoning)
-                    
-                    # Store results with safe conversion
-                    signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
-                    signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
-                    signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
-                    signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
-                    signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
-                    signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
+            if self.use_batch_analysis:
+                # Array path: same decisions as get_combined_signal() without per-row dicts
+                combined = adaptive_manager.get_combined_signal_batch(self._prepare_batch_inputs(data_clean))
+                signals_df['buy'] = (combined['action'] == 'BUY').to_numpy()
+                signals_df['sell'] = (combined['action'] == 'SELL').to_numpy()
+                signals_df['confidence'] = combined['confidence'].to_numpy()
+                signals_df['reasoning'] = combined['reasoning'].to_numpy()
+                signals_df['position_size_multiplier'] = combined['position_size_multiplier'].to_numpy()
+                signals_df['market_regime'] = combined['market_regime'].to_numpy()
+                signals_df['primary_strategy'] = combined['primary_strategy'].replace('', 'unknown').to_numpy()
+            else:
+                # Process each row
+                for i, (timestamp, row) in enumerate(data_clean.iterrows()):
+                    try:
+                        # Prepare data for adaptive manager
+                        market_data = self._prepare_market_data(row, product_id, i, data_clean)
+                        technical_indicators = self._prepare_technical_indicators(row)
+
+                        # Get combined signal from adaptive manager
+                        signal = adaptive_manager.get_combined_signal(market_data, technical_indicators, {})
+
+                        # Extract market regime and primary strategy info
+                        market_regime = getattr(adaptive_manager, 'current_market_regime', 'ranging')
+                        primary_strategy = self._extract_primary_strategy(signal.reasoning)
+
+                        # Store results with safe conversion
+                        signals_df.loc[timestamp, 'buy'] = (signal.action == 'BUY')
+                        signals_df.loc[timestamp, 'sell'] = (signal.action == 'SELL')
+                        signals_df.loc[timestamp, 'confidence'] = float(signal.confidence)
+                        signals_df.loc[timestamp, 'reasoning'] = str(signal.reasoning)
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = float(signal.position_size_multiplier)
+                        signals_df.loc[timestamp, 'market_regime'] = str(market_regime)
+                        signals_df.loc[timestamp, 'primary_strategy'] = str(primary_strategy)
                     
-                except Exception as e:
-                    logger.warning(f"Error processing adaptive strategy row {i}: {e}")
-                    # Set safe defaults
-                    signals_df.loc[timestamp, 'buy'] = False
-                    signals_df.loc[timestamp, 'sell'] = False
-                    signals_df.loc[timestamp, 'confidence'] = 50.0
-                    signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
-                    signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
-                    signals_df.loc[timestamp, 'market_regime'] = "ranging"
-                    signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
-                    continue
+                    except Exception as e:
+                        logger.warning(f"Error processing adaptive strategy row {i}: {e}")
+                        # Set safe defaults
+                        signals_df.loc[timestamp, 'buy'] = False
+                        signals_df.loc[timestamp, 'sell'] = False
+                        signals_df.loc[timestamp, 'confidence'] = 50.0
+                        signals_df.loc[timestamp, 'reasoning'] = f"Error: {str(e)}"
+                        signals_df.loc[timestamp, 'position_size_multiplier'] = 1.0
+                        signals_df.loc[timestamp, 'market_regime'] = "ranging"
+                        signals_df.loc[timestamp, 'primary_strategy'] = "unknown"
+                        continue
+            
+            adaptive_manager.close()
             
             # Add metadata
             signals_df['strategy'] = 'adaptive'
@@ -348,9 +373,74 @@ class VectorizedStrategyAdapter:
             indicators['sma_20'] = safe_float(row['sma_20'])
         if 'sma_50' in row:
             indicators['sma_50'] = safe_float(row['sma_50'])
-        
+
         return indicators
-    
+
+    def _prepare_batch_inputs(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the analyze_batch() input frame for all rows at once, following
+        the same rules as _prepare_market_data/_prepare_technical_indicators
+        """
+        n = len(data)
+        positions = np.arange(n)
+
+        def column(name, default=0.0):
+            values = pd.to_numeric(data[name], errors='coerce').to_numpy(dtype=np.float64)
+            return np.where(np.isnan(values), default, values)
+
+        # Current price: close, falling back to the first positive price column
+        current_price = column('close') if 'close' in data.columns else np.zeros(n)
+        resolved = current_price != 0
+        for price_col in ['close', 'open', 'high', 'low']:
+            if price_col in data.columns:
+                candidate = column(price_col)
+                current_price = np.where(resolved, current_price, candidate)
+                resolved |= candidate > 0
+
+        inputs = pd.DataFrame({'price': current_price, 'current_price': current_price}, index=data.index)
+
+        # Price changes over 1h/24h/5d of hourly bars
+        close = pd.to_numeric(data['close'], errors='coerce').to_numpy(dtype=np.float64)
+        for lag, name in [(1, 'change_1h'), (24, 'change_24h'), (120, 'change_5d')]:
+            previous = np.full(n, np.nan)
+            if lag < n:
+                previous[lag:] = close[:-lag]
+            previous = np.where(np.isnan(previous), current_price, previous)
+            valid = (current_price > 0) & (positions >= lag) & (previous > 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                inputs[name] = np.where(valid, (current_price - previous) / previous * 100, np.nan)
+
+        # Volume: current bar and 25-bar average once 24 bars of history exist
+        if 'volume' in data.columns:
+            current_volume = column('volume')
+            raw_volume = pd.to_numeric(data['volume'], errors='coerce').to_numpy(dtype=np.float64)
+            average_volume = current_volume.copy()
+            if n >= 25:
+                windows = np.lib.stride_tricks.sliding_window_view(raw_volume, 25)
+                counts = (~np.isnan(windows)).sum(axis=1)
+                sums = np.nansum(windows, axis=1)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    means = np.where(counts > 0, sums / counts, current_volume[24:])
+                average_volume[24:] = means
+        else:
+            current_volume = np.zeros(n)
+            average_volume = np.zeros(n)
+        inputs['volume_current'] = current_volume
+        inputs['volume_average'] = np.maximum(average_volume, 1.0)
+
+        # Indicators
+        if 'rsi_14' in data.columns:
+            inputs['rsi'] = column('rsi_14', 50.0)
+        for name in ['macd', 'macd_signal', 'macd_histogram']:
+            if name in data.columns:
+                inputs[name] = column(name)
+        if all(col in data.columns for col in ['bb_upper_20', 'bb_lower_20', 'bb_middle_20']):
+            inputs['bb_upper'] = column('bb_upper_20')
+            inputs['bb_lower'] = column('bb_lower_20')
+            inputs['bb_middle'] = column('bb_middle_20')
+
+        return inputs
+
     def _extract_primary_strategy(self, reasoning: str) -> str:
         """Extract primary strategy name from reasoning text"""
         
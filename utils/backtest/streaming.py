@@ -0,0 +1,419 @@
+"""
+Streaming Backtests - Out-of-Core Chunks over Partitioned History
+
+Multi-year 1-minute histories do not fit in memory once indicators are
+added. This module reads the partitioned historical dataset in
+time-ordered chunks, prepends indicator warm-up rows to each chunk, and
+accumulates the backtest metrics chunk by chunk, so peak memory is bounded
+by the chunk size instead of the history length.
+
+The accumulators keep only running sums, extremes and the state of the
+open drawdown; BacktestEngine.run_backtest_streaming() carries cash and
+open positions between chunks so the final metrics match run_backtest()
+on the concatenated history.
+"""
+
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import vectorbt as vbt
+from numba import njit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 250_000  # ~6 months of 1-minute bars
+
+REGIME_NAMES = {0: 'ranging', 1: 'trending', 2: 'volatile'}
+
+# ===== CHUNK SOURCES =====
+
+def partition_files(product_id: str, granularity: str = 'ONE_MINUTE',
+                    cache_dir: Union[str, Path] = "./data/cache") -> List[Path]:
+    """
+    Local monthly partitions of a product's history, oldest first
+
+    DataCollector caches GCS partitions historical/<product>/<granularity>/<year>/<month>/data.parquet
+    as historical_<product>_<granularity>_<year>_<month>_data.parquet.
+
+    Returns:
+        Paths sorted by (year, month)
+    """
+    pattern = re.compile(rf"historical_{re.escape(product_id)}_{re.escape(granularity)}_(\d{{4}})_(\d{{2}})_data\.parquet")
+    partitions = []
+    for path in Path(cache_dir).glob(f"historical_{product_id}_{granularity}_*_data.parquet"):
+        match = pattern.fullmatch(path.name)
+        if match:
+            partitions.append(((int(match.group(1)), int(match.group(2))), path))
+    return [path for _, path in sorted(partitions)]
+
+def iter_parquet_chunks(paths: Iterable[Union[str, Path]], chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                        columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Read time-ordered Parquet files as DataFrames of chunk_rows rows
+
+    Files are read batch by batch, so no more than about one chunk is held
+    at a time. Rows not after the last timestamp already yielded (overlap
+    between partitions) are dropped.
+
+    Args:
+        paths: Parquet files in time order
+        chunk_rows: Rows per yielded chunk (the last chunk may be shorter)
+        columns: Optional subset of columns to read
+
+    Yields:
+        DataFrames indexed by timestamp
+    """
+    buffer: List[pd.DataFrame] = []
+    buffered = 0
+    last_timestamp = None
+
+    for path in paths:
+        parquet_file = pq.ParquetFile(path)
+        read_columns = columns
+        if columns is not None:
+            pandas_metadata = parquet_file.schema_arrow.pandas_metadata or {}
+            index_columns = [c for c in pandas_metadata.get('index_columns', []) if isinstance(c, str)]
+            read_columns = list(columns) + [c for c in index_columns if c not in columns]
+
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=read_columns):
+            frame = pa.Table.from_batches([batch]).to_pandas()
+            if last_timestamp is not None:
+                frame = frame[frame.index > last_timestamp]
+            if frame.empty:
+                continue
+            last_timestamp = frame.index[-1]
+
+            buffer.append(frame)
+            buffered += len(frame)
+            while buffered >= chunk_rows:
+                combined = pd.concat(buffer) if len(buffer) > 1 else buffer[0]
+                yield combined.iloc[:chunk_rows]
+                rest = combined.iloc[chunk_rows:]
+                buffer = [rest] if len(rest) else []
+                buffered = len(rest)
+
+    if buffered:
+        yield pd.concat(buffer) if len(buffer) > 1 else buffer[0]
+
+def warmup_chunks(chunks: Iterable[pd.DataFrame], warmup_rows: int) -> Iterator[Tuple[pd.DataFrame, pd.Timestamp]]:
+    """
+    Prepend the last warmup_rows rows of the previous chunk to each chunk
+
+    Indicators computed on the extended frame match the full-history values
+    for every row of the chunk as long as they look back no more than
+    warmup_rows bars.
+
+    Yields:
+        (frame with warm-up rows, timestamp of the chunk's first own row)
+    """
+    tail = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        frame = pd.concat([tail, chunk]) if tail is not None and len(tail) else chunk
+        yield frame, chunk.index[0]
+        tail = frame.iloc[-warmup_rows:] if warmup_rows > 0 else None
+
+# ===== COMPILED KERNELS =====
+
+@njit(cache=True)
+def _drawdown_chunk(values, offset, is_last, state, stats):
+    """
+    vectorbt's get_drawdowns_nb over one chunk of portfolio values, carrying
+    the open drawdown in `state` and aggregating records into `stats`
+
+    state: [started, peak_idx, valley_idx, peak_val, valley_val]
+    stats: [count, max_duration, drawdown_sum]
+    """
+    started = state[0] > 0
+    peak_idx = state[1]
+    valley_idx = state[2]
+    peak_val = state[3]
+    valley_val = state[4]
+
+    n = values.shape[0]
+    for i in range(n):
+        cur_val = values[i]
+        if np.isnan(cur_val):
+            continue
+        global_idx = offset + i
+        store = False
+        active = False
+
+        if np.isnan(peak_val) or cur_val >= peak_val:
+            if not started:
+                peak_val = cur_val
+                peak_idx = global_idx
+            elif cur_val >= peak_val:
+                started = False
+                store = True
+        else:
+            if not started:
+                started = True
+                valley_val = cur_val
+                valley_idx = global_idx
+            elif cur_val < valley_val:
+                valley_val = cur_val
+                valley_idx = global_idx
+
+        if is_last and i == n - 1 and started:
+            started = False
+            store = True
+            active = True
+
+        if store:
+            # Recovered drawdowns end on the recovery bar; active ones include the last bar
+            duration = global_idx - (peak_idx + 1) + (1 if active else 0)
+            stats[0] += 1
+            stats[1] = max(stats[1], duration)
+            stats[2] += (valley_val - peak_val) / peak_val
+
+            peak_idx = global_idx
+            valley_idx = global_idx
+            peak_val = cur_val
+            valley_val = cur_val
+
+    state[0] = 1.0 if started else 0.0
+    state[1] = peak_idx
+    state[2] = valley_idx
+    state[3] = peak_val
+    state[4] = valley_val
+
+# ===== ACCUMULATORS =====
+
+class RunningMoments:
+    """Count, sum, mean and squared deviations of a stream (Chan et al. merge)"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray):
+        """Add the non-NaN values of an array"""
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if n == 0:
+            return
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+
+        total_count = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total_count
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total_count
+        self.count = total_count
+        self.total += values.sum()
+
+    def std(self, ddof: int = 1) -> float:
+        """Standard deviation (NaN when fewer than ddof + 1 values)"""
+        if self.count <= ddof:
+            return np.nan
+        return float(np.sqrt(self.m2 / (self.count - ddof)))
+
+class StreamingMetrics:
+    """Backtest metric accumulators fed one simulated portfolio chunk at a time"""
+
+    def __init__(self):
+        """Initialize empty accumulators"""
+        self.rows = 0
+        self.start_date = None
+        self.end_date = None
+        self.final_value = np.nan
+        self.ann_factor = np.nan
+        self.bar_hours = 1.0
+
+        self.returns = RunningMoments()
+        self.returns_length = 0
+        self.downside_sq_sum = 0.0
+        self.peak_value = -np.inf
+        self.max_drawdown = 0.0
+        self.gross_exposure = RunningMoments()
+        self.net_exposure = RunningMoments()
+        self.fees_paid = 0.0
+
+        self.trades = 0
+        self.winning_pnl = 0
+        self.trade_returns = RunningMoments()
+        self.best_trade = -np.inf
+        self.worst_trade = np.inf
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.trade_durations = RunningMoments()
+
+        self.drawdown_state = np.array([0.0, -1.0, -1.0, np.nan, np.nan])
+        self.drawdown_stats = np.zeros(3)
+
+        self.regimes: Dict[int, Tuple[int, RunningMoments]] = {}
+
+    def update(self, portfolio: vbt.Portfolio, data: pd.DataFrame, rows: int, is_last: bool):
+        """
+        Add the first `rows` bars of a simulated chunk
+
+        Args:
+            portfolio: Portfolio simulated over `data`
+            data: Aligned data of the chunk
+            rows: Bars that are final (the rest is simulated again with the next chunk)
+            is_last: True for the final chunk of the stream
+        """
+        if rows == 0:
+            return
+
+        index = data.index[:rows]
+        self.start_date = index[0] if self.start_date is None else self.start_date
+        self.end_date = index[-1]
+        self.ann_factor = portfolio.returns_acc.ann_factor
+        freq = portfolio.wrapper.freq
+        self.bar_hours = freq / pd.Timedelta(hours=1) if freq is not None else 1.0
+
+        values = portfolio.value().to_numpy()[:rows]
+        returns = portfolio.returns().to_numpy()[:rows]
+        self.final_value = values[-1]
+
+        # Returns: Sharpe/Sortino inputs
+        self.returns.update(returns)
+        self.returns_length += rows
+        downside = np.minimum(returns[~np.isnan(returns)], 0.0)
+        self.downside_sq_sum += (downside ** 2).sum()
+
+        # Drawdowns against the running peak carried from earlier chunks
+        running_peak = np.maximum.accumulate(np.concatenate([[self.peak_value], values]))[1:]
+        self.max_drawdown = min(self.max_drawdown, (values / running_peak - 1).min())
+        self.peak_value = running_peak[-1]
+        _drawdown_chunk(values, self.rows, is_last, self.drawdown_state, self.drawdown_stats)
+
+        self.gross_exposure.update(portfolio.gross_exposure().to_numpy()[:rows])
+        self.net_exposure.update(portfolio.net_exposure().to_numpy()[:rows])
+
+        orders = portfolio.orders.records_arr
+        self.fees_paid += orders['fees'][orders['idx'] < rows].sum()
+
+        trades = portfolio.trades
+        records = trades.records_arr
+        committed = records['entry_idx'] < rows
+        if committed.any():
+            trade_returns = records['return'][committed]
+            self.trades += int(committed.sum())
+            self.winning_pnl += int((records['pnl'][committed] > 0).sum())
+            self.trade_returns.update(trade_returns)
+            self.best_trade = max(self.best_trade, trade_returns.max())
+            self.worst_trade = min(self.worst_trade, trade_returns.min())
+            self.gross_profit += trade_returns[trade_returns > 0].sum()
+            self.gross_loss += abs(trade_returns[trade_returns < 0].sum())
+            self.winning_trades += int((trade_returns > 0).sum())
+            self.losing_trades += int((trade_returns < 0).sum())
+            self.trade_durations.update(trades.duration.values[committed].astype(float))
+
+        if 'market_regime' in data.columns:
+            regimes = data['market_regime'].to_numpy()[:rows]
+            for regime_id in REGIME_NAMES:
+                mask = regimes == regime_id
+                periods, moments = self.regimes.setdefault(regime_id, (0, RunningMoments()))
+                moments.update(returns[mask])
+                self.regimes[regime_id] = (periods + int(mask.sum()), moments)
+
+        self.rows += rows
+
+    def sharpe_ratio(self) -> float:
+        """vectorbt sharpe_ratio_1d_nb over all returns"""
+        if self.returns_length < 2:
+            return np.nan
+        std = self.returns.std()
+        if std == 0.0:
+            return np.inf
+        return self.returns.mean / std * np.sqrt(self.ann_factor)
+
+    def sortino_ratio(self) -> float:
+        """vectorbt sortino_ratio_1d_nb over all returns"""
+        if self.returns_length < 2:
+            return np.nan
+        downside_risk = np.sqrt(self.downside_sq_sum / self.returns.count) * np.sqrt(self.ann_factor)
+        if downside_risk == 0.0:
+            return np.inf
+        return self.returns.mean * self.ann_factor / downside_risk
+
+    def regime_performance(self) -> Dict[str, Any]:
+        """Per-regime return, Sharpe and bar count, like BacktestEngine._analyze_by_regime()"""
+        performance = {}
+        for regime_id, regime_name in REGIME_NAMES.items():
+            periods, moments = self.regimes.get(regime_id, (0, RunningMoments()))
+            if periods > 0:
+                std = moments.std()
+                performance[f'{regime_name}_return'] = moments.total * 100
+                performance[f'{regime_name}_sharpe'] = moments.mean / std * np.sqrt(252) if std > 0 else 0
+                performance[f'{regime_name}_periods'] = periods
+        return performance
+
+    def results(self, product_id: str, initial_capital: float) -> Dict[str, Any]:
+        """
+        Final metrics with the keys and formulas of BacktestEngine.run_backtest()
+
+        Args:
+            product_id: Product identifier for reporting
+            initial_capital: Starting capital of the stream
+
+        Returns:
+            Dictionary with comprehensive backtest results
+        """
+        total_return = (self.final_value / initial_capital - 1) * 100
+        duration_days = (self.end_date - self.start_date).days
+        annual_return = ((1 + total_return/100) ** (365/duration_days) - 1) * 100 if duration_days > 0 else 0
+
+        results = {
+            'product_id': product_id,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat(),
+            'duration_days': duration_days,
+            'initial_capital': initial_capital,
+            'final_value': self.final_value,
+            'total_return': total_return,
+            'annual_return': annual_return,
+            'sharpe_ratio': self.sharpe_ratio(),
+            'sortino_ratio': self.sortino_ratio(),
+            'max_drawdown': self.max_drawdown * 100,
+            'total_trades': self.trades,
+            'win_rate': self.winning_pnl / self.trades * 100 if self.trades > 0 else 0,
+            'fees_paid': self.fees_paid,
+            'gross_exposure': self.gross_exposure.mean if self.gross_exposure.count else np.nan,
+            'net_exposure': self.net_exposure.mean if self.net_exposure.count else np.nan
+        }
+
+        if self.trades > 0:
+            results.update({
+                'avg_trade_return': self.trade_returns.mean * 100,
+                'best_trade': self.best_trade * 100,
+                'worst_trade': self.worst_trade * 100,
+                'avg_trade_duration_hours': self.trade_durations.mean * self.bar_hours,
+                'profit_factor': self.gross_profit / self.gross_loss if self.gross_loss > 0 else float('inf'),
+                'winning_trades': self.winning_trades,
+                'losing_trades': self.losing_trades
+            })
+        else:
+            results.update({
+                'avg_trade_return': 0,
+                'best_trade': 0,
+                'worst_trade': 0,
+                'avg_trade_duration_hours': 0,
+                'profit_factor': 0,
+                'winning_trades': 0,
+                'losing_trades': 0
+            })
+
+        drawdown_count, max_duration, drawdown_sum = self.drawdown_stats
+        results.update({
+            'max_drawdown_duration_hours': max_duration * self.bar_hours if drawdown_count else 0,
+            'avg_drawdown': drawdown_sum / drawdown_count * 100 if drawdown_count else 0,
+            'drawdown_periods': int(drawdown_count)
+        })
+
+        results.update(self.regime_performance())
+        return results
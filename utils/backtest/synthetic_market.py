@@ -0,0 +1,357 @@
+"""
+Synthetic Market Data - Regime-Switching OHLCV for Offline Stress Runs
+
+Generates OHLCV bars at any granularity and length without exchange or
+GCS access:
+
+- Prices follow geometric Brownian motion whose drift and volatility
+  switch between trending, ranging and volatile episodes (labelled like
+  MarketRegimeAnalyzer); ranging episodes mean-revert to their opening price
+- Volatility clusters through a persistent log-volatility process
+- Gaps (missing bars) and single-bar spikes are injected at given rates,
+  so data-quality checks have something to find
+
+Bars are generated block by block (numpy draws plus one compiled loop)
+and can be streamed straight into the monthly Parquet partitions read by
+streaming.partition_files(). Every block draws from its own seeded
+streams, so output depends only on the seed and settings, and a shorter
+run is an exact prefix of a longer one.
+"""
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from numba import njit
+
+from .market_regime_analyzer import REGIME_LABELS, REGIME_RANGING, REGIME_TRENDING, REGIME_VOLATILE
+
+logger = logging.getLogger(__name__)
+
+# Coinbase granularity names accepted besides pandas frequency strings ('1min', '4h', ...)
+GRANULARITY_MINUTES = {
+    'ONE_MINUTE': 1,
+    'FIVE_MINUTE': 5,
+    'FIFTEEN_MINUTE': 15,
+    'ONE_HOUR': 60,
+    'SIX_HOUR': 360,
+    'ONE_DAY': 1440
+}
+
+BLOCK_ROWS = 1 << 20  # bars generated per block (part of the seed: changing it changes the output)
+EPISODE_BATCH = 1024  # regime episodes drawn per batch
+
+HOURS_PER_YEAR = 365 * 24
+
+# Independent random streams of a block
+_REGIMES, _SHOCKS, _VOLATILITY, _WICKS, _VOLUME, _GAPS, _SPIKES = range(7)
+
+@dataclass
+class RegimeSpec:
+    """Price dynamics of one market regime"""
+    annual_drift: float           # absolute drift per year; the sign is drawn per episode
+    annual_volatility: float
+    mean_duration_hours: float    # mean episode length (geometric)
+    mean_reversion_per_day: float = 0.0  # pull of log price towards the episode's opening price
+    volume_multiplier: float = 1.0
+
+DEFAULT_REGIMES = {
+    REGIME_TRENDING: RegimeSpec(annual_drift=10.0, annual_volatility=0.5, mean_duration_hours=96,
+                                volume_multiplier=1.2),
+    REGIME_RANGING: RegimeSpec(annual_drift=0.0, annual_volatility=0.3, mean_duration_hours=144,
+                               mean_reversion_per_day=0.5, volume_multiplier=0.8),
+    REGIME_VOLATILE: RegimeSpec(annual_drift=0.0, annual_volatility=1.2, mean_duration_hours=36,
+                                volume_multiplier=1.8)
+}
+
+def granularity_delta(granularity: str) -> pd.Timedelta:
+    """Bar spacing of a Coinbase granularity name or pandas frequency string"""
+    if granularity in GRANULARITY_MINUTES:
+        return pd.Timedelta(minutes=GRANULARITY_MINUTES[granularity])
+    return pd.Timedelta(granularity)
+
+# ===== COMPILED KERNELS =====
+
+@njit(cache=True)
+def _price_path(shocks, vol_shocks, drift, sigma, kappa, new_episode, persistence, state):
+    """
+    Log closes of one block
+
+    state: [log_price, log_volatility, episode_anchor], updated in place
+
+    Returns:
+        (log closes, per-bar volatility)
+    """
+    n = shocks.shape[0]
+    log_close = np.empty(n)
+    bar_sigma = np.empty(n)
+    log_price = state[0]
+    log_vol = state[1]
+    anchor = state[2]
+
+    for i in range(n):
+        if new_episode[i]:
+            anchor = log_price
+        log_vol = persistence * log_vol + vol_shocks[i]
+        s = sigma[i] * np.exp(log_vol)
+        log_price += drift[i] - 0.5 * s * s - kappa[i] * (log_price - anchor) + s * shocks[i]
+        log_close[i] = log_price
+        bar_sigma[i] = s
+
+    state[0] = log_price
+    state[1] = log_vol
+    state[2] = anchor
+    return log_close, bar_sigma
+
+# ===== GENERATOR =====
+
+class SyntheticMarketGenerator:
+    """Seed-deterministic regime-switching OHLCV generator"""
+
+    def __init__(self, seed: int = 0, granularity: str = 'ONE_MINUTE', start: str = '2020-01-01',
+                 start_price: float = 50000.0, regimes: Optional[Dict[int, RegimeSpec]] = None,
+                 volatility_half_life_hours: float = 12.0, volatility_dispersion: float = 0.35,
+                 gap_rate: float = 1e-4, mean_gap_bars: float = 10.0,
+                 spike_rate: float = 2e-5, spike_size: float = 0.25,
+                 base_volume: float = 50.0, block_rows: int = BLOCK_ROWS):
+        """
+        Initialize the generator
+
+        Args:
+            seed: Random seed
+            granularity: Coinbase granularity name (ONE_MINUTE, ONE_HOUR, ...) or pandas frequency
+            start: Timestamp of the first bar
+            start_price: Opening price
+            regimes: RegimeSpec per regime code (defaults to DEFAULT_REGIMES)
+            volatility_half_life_hours: Half-life of volatility shocks (volatility clustering)
+            volatility_dispersion: Stationary standard deviation of log volatility
+            gap_rate: Probability that a gap of missing bars starts at a bar
+            mean_gap_bars: Mean gap length in bars (geometric)
+            spike_rate: Probability of a single-bar spike at a bar
+            spike_size: Minimum spike move (moves are drawn between 1x and 2x this)
+            base_volume: Mean volume per hour of trading
+            block_rows: Bars generated per block
+        """
+        self.seed = seed
+        self.granularity = granularity
+        self.bar = granularity_delta(granularity)
+        self.start = pd.Timestamp(start)
+        self.start_price = start_price
+        self.regimes = regimes or DEFAULT_REGIMES
+        self.gap_rate = gap_rate
+        self.mean_gap_bars = max(mean_gap_bars, 1.0)
+        self.spike_rate = spike_rate
+        self.spike_size = spike_size
+        self.block_rows = block_rows
+
+        bar_hours = self.bar / pd.Timedelta(hours=1)
+        bar_years = bar_hours / HOURS_PER_YEAR
+        codes = range(len(REGIME_LABELS))
+        self._drift = np.array([self.regimes[c].annual_drift * bar_years for c in codes])
+        self._sigma = np.array([self.regimes[c].annual_volatility * np.sqrt(bar_years) for c in codes])
+        self._kappa = np.array([min(self.regimes[c].mean_reversion_per_day * bar_hours / 24, 1.0) for c in codes])
+        self._episode_p = np.array([min(1.0, bar_hours / self.regimes[c].mean_duration_hours) for c in codes])
+        self._volume = np.array([self.regimes[c].volume_multiplier * base_volume * bar_hours for c in codes])
+
+        self._persistence = 0.5 ** (bar_hours / volatility_half_life_hours)
+        self._vol_shock_scale = volatility_dispersion * np.sqrt(1 - self._persistence ** 2)
+        # Scale volatility so its mean level matches the regime volatility
+        self._sigma *= np.exp(-0.5 * volatility_dispersion ** 2)
+
+    def generate(self, rows: int) -> pd.DataFrame:
+        """
+        Generate bars in memory
+
+        Args:
+            rows: Bars to generate before gaps are removed
+
+        Returns:
+            DataFrame with open/high/low/close/volume and a regime label column
+        """
+        chunks = list(self.iter_chunks(rows))
+        return pd.concat(chunks) if chunks else self._empty_frame()
+
+    def iter_chunks(self, rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Generate bars block by block
+
+        Args:
+            rows: Bars to generate before gaps are removed
+
+        Yields:
+            DataFrames of up to block_rows bars, in time order
+        """
+        price_state = np.array([np.log(self.start_price), 0.0, np.log(self.start_price)])
+        regime_state = {'regime': REGIME_RANGING, 'remaining': 0, 'sign': 1.0}
+
+        for block, offset in enumerate(range(0, rows, self.block_rows)):
+            n = min(self.block_rows, rows - offset)
+            rngs = [np.random.default_rng([self.seed, block, stream]) for stream in range(7)]
+            yield self._generate_block(n, offset, rngs, price_state, regime_state)
+
+    def write_partitions(self, product_id: str, rows: int,
+                         cache_dir: Union[str, Path] = "./data/cache") -> List[Path]:
+        """
+        Stream bars into monthly Parquet partitions
+
+        Files are named like DataCollector's local partition cache
+        (historical_<product>_<granularity>_<year>_<month>_data.parquet), so
+        streaming.partition_files() and iter_parquet_chunks() read them back.
+        Only the current block is held in memory.
+
+        Returns:
+            Written partition paths in time order
+        """
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        paths: List[Path] = []
+        writer = None
+        month = None
+
+        try:
+            for chunk in self.iter_chunks(rows):
+                if chunk.empty:
+                    continue
+                table = pa.Table.from_pandas(chunk, preserve_index=True)
+                months = chunk.index.year * 12 + chunk.index.month - 1
+                starts = np.concatenate([[0], np.flatnonzero(np.diff(months)) + 1])
+                ends = np.append(starts[1:], len(chunk))
+                for start, end in zip(starts, ends):
+                    if months[start] != month:
+                        if writer is not None:
+                            writer.close()
+                        month = months[start]
+                        path = cache_dir / (f"historical_{product_id}_{self.granularity}_"
+                                            f"{month // 12}_{month % 12 + 1:02d}_data.parquet")
+                        writer = pq.ParquetWriter(path, table.schema, use_dictionary=['regime'])
+                        paths.append(path)
+                    writer.write_table(table.slice(start, end - start))
+        finally:
+            if writer is not None:
+                writer.close()
+
+        logger.info(f"Wrote {rows} synthetic {self.granularity} bars for {product_id} to {len(paths)} partitions")
+        return paths
+
+    def _generate_block(self, n: int, offset: int, rngs: List[np.random.Generator],
+                        price_state: np.ndarray, regime_state: Dict) -> pd.DataFrame:
+        """Bars [offset, offset + n) of the series"""
+        codes, signs, new_episode = self._regime_path(n, rngs[_REGIMES], regime_state)
+
+        shocks = rngs[_SHOCKS].standard_normal(n)
+        vol_shocks = rngs[_VOLATILITY].standard_normal(n) * self._vol_shock_scale
+        open_log = price_state[0]
+        log_close, bar_sigma = _price_path(shocks, vol_shocks, self._drift[codes] * signs, self._sigma[codes],
+                                           self._kappa[codes], new_episode, self._persistence, price_state)
+
+        close = np.exp(log_close)
+        open_ = np.empty(n)
+        open_[0] = np.exp(open_log)
+        open_[1:] = close[:-1]
+
+        # Wicks scale with the bar's volatility
+        wicks = np.abs(rngs[_WICKS].standard_normal((n, 2))) * bar_sigma[:, None]
+        high = np.maximum(open_, close) * np.exp(wicks[:, 0])
+        low = np.minimum(open_, close) * np.exp(-wicks[:, 1])
+
+        # Volume rises with the regime and the size of the move
+        move = np.abs(log_close - np.log(open_)) / bar_sigma
+        volume = self._volume[codes] * rngs[_VOLUME].lognormal(-0.125, 0.5, n) * (0.6 + 0.4 * move)
+
+        # Spikes: the close jumps for one bar, the next bar opens back on the path
+        if self.spike_rate > 0:
+            draws = rngs[_SPIKES].random(n)
+            spikes = draws < self.spike_rate
+            # Reuse the draw below spike_rate as a uniform for direction and size
+            uniform = draws[spikes] / self.spike_rate
+            direction = np.where(uniform < 0.5, 1.0, -1.0)
+            size = self.spike_size * (1 + (2 * uniform) % 1)
+            close[spikes] *= 1 + direction * np.minimum(size, 0.9)
+            high[spikes] = np.maximum(high[spikes], close[spikes])
+            low[spikes] = np.minimum(low[spikes], close[spikes])
+
+        index = pd.DatetimeIndex(
+            (self.start.value + (offset + np.arange(n, dtype=np.int64)) * self.bar.value).astype('datetime64[ns]'),
+            name='timestamp'
+        )
+        frame = pd.DataFrame({
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume,
+            'regime': pd.Categorical.from_codes(codes, categories=list(REGIME_LABELS))
+        }, index=index)
+
+        if self.gap_rate > 0:
+            frame = frame[~self._gap_mask(n, rngs[_GAPS])]
+        return frame
+
+    def _regime_path(self, n: int, rng: np.random.Generator, state: Dict):
+        """Regime code, drift sign and episode-start flag of every bar in a block"""
+        # The episode running at the end of the previous block continues first
+        carried = min(state['remaining'], n)
+        regimes, lengths, signs, fresh = [], [], [], []
+        if carried:
+            regimes.append(np.array([state['regime']]))
+            lengths.append(np.array([carried]))
+            signs.append(np.array([state['sign']]))
+            fresh.append(np.array([False]))
+        covered = carried
+        current = state['regime']
+
+        while covered < n:
+            # Switch to one of the other two regimes with equal probability
+            steps = 1 + rng.integers(0, 2, EPISODE_BATCH)
+            batch_regimes = (current + np.cumsum(steps)) % len(REGIME_LABELS)
+            batch_lengths = rng.geometric(self._episode_p[batch_regimes])
+            batch_signs = rng.choice([-1.0, 1.0], EPISODE_BATCH)
+
+            regimes.append(batch_regimes)
+            lengths.append(batch_lengths)
+            signs.append(batch_signs)
+            fresh.append(np.ones(EPISODE_BATCH, dtype=bool))
+            covered += batch_lengths.sum()
+            current = batch_regimes[-1]
+
+        regimes = np.concatenate(regimes)
+        lengths = np.concatenate(lengths)
+        signs = np.concatenate(signs)
+        fresh = np.concatenate(fresh)
+
+        # Cut at the block end and carry the rest of that episode to the next block
+        ends = np.cumsum(lengths)
+        last = int(np.searchsorted(ends, n))
+        state['remaining'] = int(ends[last] - n)
+        state['regime'] = int(regimes[last])
+        state['sign'] = float(signs[last])
+
+        starts = ends - lengths
+        new_episode = np.zeros(n, dtype=bool)
+        new_episode[starts[:last + 1][fresh[:last + 1]]] = True
+        return (np.repeat(regimes, lengths)[:n].astype(np.int64), np.repeat(signs, lengths)[:n], new_episode)
+
+    def _gap_mask(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        """Bars removed by gaps (a gap starting near the block end is cut there)"""
+        draws = rng.random(n)
+        starts = np.flatnonzero(draws < self.gap_rate)
+        # Reuse the draw below gap_rate as a uniform for the geometric gap length
+        uniform = draws[starts] / self.gap_rate
+        lengths = 1 + np.floor(np.log1p(-uniform) / np.log1p(-1 / self.mean_gap_bars)).astype(np.int64) \
+            if self.mean_gap_bars > 1 else np.ones(len(starts), dtype=np.int64)
+
+        marks = np.zeros(n + 1, dtype=np.int64)
+        np.add.at(marks, starts, 1)
+        np.add.at(marks, np.minimum(starts + lengths, n), -1)
+        return np.cumsum(marks[:n]) > 0
+
+    def _empty_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'open': [], 'high': [], 'low': [], 'close': [], 'volume': [],
+            'regime': pd.Categorical([], categories=list(REGIME_LABELS))
+        }, index=pd.DatetimeIndex([], name='timestamp'))
@@ -0,0 +1,200 @@
+"""
+Multi-Timeframe Cache - Resample Once, Compute Indicators Once
+
+Interval studies backtest the same (product, interval) bars with several
+strategies. Bars for every target interval are built from the finest base
+data in one cascading pass (each interval is aggregated from the coarsest
+already-built interval that divides it, not from the base data again), and
+indicators are computed once per (product, interval).
+
+Frames are kept in memory and, when a cache directory is given, as Parquet
+files keyed by a fingerprint of the base data, so adding an interval or a
+strategy to a study only computes what is new.
+"""
+
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .result_cache import frame_fingerprint
+
+logger = logging.getLogger(__name__)
+
+OHLCV_AGGREGATION = {
+    'open': 'first',
+    'high': 'max',
+    'low': 'min',
+    'close': 'last',
+    'volume': 'sum'
+}
+
+def bar_minutes(df: pd.DataFrame) -> int:
+    """Bar spacing of a frame in minutes (median spacing, so gaps are ignored)"""
+    if len(df) < 2:
+        return 0
+    return max(1, int(pd.Series(df.index).diff().median() / pd.Timedelta(minutes=1)))
+
+def resample_ohlcv(df: pd.DataFrame, intervals: Iterable[int],
+                   base_minutes: Optional[int] = None) -> Dict[int, pd.DataFrame]:
+    """
+    Resample OHLCV bars to several intervals in one cascading pass
+
+    Intervals equal to the base spacing return the base frame unchanged;
+    intervals finer than the base data cannot be built and also return
+    the base bars.
+
+    Args:
+        df: Base OHLCV frame with a DatetimeIndex
+        intervals: Target intervals in minutes
+        base_minutes: Bar spacing of df (inferred when omitted)
+
+    Returns:
+        Dictionary of interval minutes to OHLCV frame
+    """
+    base_minutes = base_minutes or bar_minutes(df)
+    built = {base_minutes: df}
+    frames = {}
+
+    for interval in sorted(set(intervals)):
+        if interval <= base_minutes:
+            if interval < base_minutes:
+                logger.warning(f"{interval}min bars requested from {base_minutes}min data; using base bars")
+            frames[interval] = df
+            continue
+
+        # Aggregate from the coarsest built interval whose bars nest inside this one
+        nested = [minutes for minutes in built if interval % minutes == 0]
+        source_minutes = max(nested) if nested else base_minutes
+        source = built[source_minutes]
+        columns = {column: how for column, how in OHLCV_AGGREGATION.items() if column in source.columns}
+
+        resampled = source.resample(f"{interval}min").agg(columns).dropna()
+        logger.info(f"Resampled {len(source)} {source_minutes}min bars to {len(resampled)} {interval}min bars")
+
+        built[interval] = resampled
+        frames[interval] = resampled
+
+    return frames
+
+class TimeframeCache:
+    """Resampled bars with indicators, computed once per (product, interval)"""
+
+    def __init__(self, loader: Callable[[str], pd.DataFrame],
+                 indicator_func: Optional[Callable[[pd.DataFrame, str], pd.DataFrame]] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Initialize the timeframe cache
+
+        Args:
+            loader: Returns the finest available base OHLCV data for a product
+            indicator_func: Adds indicators to a bar frame, called as (bars, product_id)
+            cache_dir: Optional directory for Parquet copies of the frames
+        """
+        self.loader = loader
+        self.indicator_func = indicator_func
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._base: Dict[str, pd.DataFrame] = {}
+        self._frames: Dict[Tuple[str, int], pd.DataFrame] = {}
+
+        self.resample_passes = 0
+        self.indicator_runs = 0
+        self.disk_hits = 0
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return key in self._frames
+
+    def get(self, product_id: str, interval_minutes: int) -> pd.DataFrame:
+        """
+        Bars with indicators for one product and interval
+
+        Returns:
+            DataFrame (empty if the base data could not be loaded)
+        """
+        self.prepare([product_id], [interval_minutes])
+        return self._frames.get((product_id, interval_minutes), pd.DataFrame())
+
+    def prepare(self, products: List[str], intervals: List[int]) -> Dict[Tuple[str, int], pd.DataFrame]:
+        """
+        Build every missing (product, interval) frame
+
+        Each product's base data is loaded once and resampled in a single
+        pass for all of its missing intervals.
+
+        Returns:
+            Dictionary of (product_id, interval_minutes) to frame, for the
+            requested combinations that could be built
+        """
+        for product_id in products:
+            missing = [interval for interval in intervals if (product_id, interval) not in self._frames]
+            if not missing:
+                continue
+
+            try:
+                self._build(product_id, missing)
+            except Exception as e:
+                logger.error(f"Error building {missing} minute bars for {product_id}: {e}")
+
+        return {(product_id, interval): self._frames[(product_id, interval)]
+                for product_id in products for interval in intervals
+                if (product_id, interval) in self._frames}
+
+    def _build(self, product_id: str, intervals: List[int]):
+        """Load, resample and add indicators for the given intervals of one product"""
+        base = self._load_base(product_id)
+        if base.empty:
+            return
+
+        fingerprint = frame_fingerprint(base)[:16]
+        intervals = [interval for interval in intervals if not self._load_frame(product_id, interval, fingerprint)]
+        if not intervals:
+            return
+
+        self.resample_passes += 1
+        for interval, bars in resample_ohlcv(base, intervals).items():
+            frame = bars
+            if self.indicator_func is not None:
+                frame = self.indicator_func(bars, product_id)
+                self.indicator_runs += 1
+            self._frames[(product_id, interval)] = frame
+            self._save_frame(product_id, interval, fingerprint, frame)
+
+    def clear(self):
+        """Drop the in-memory frames (Parquet copies are kept)"""
+        self._base.clear()
+        self._frames.clear()
+
+    def _load_base(self, product_id: str) -> pd.DataFrame:
+        if product_id not in self._base:
+            self._base[product_id] = self.loader(product_id)
+        return self._base[product_id]
+
+    def _path(self, product_id: str, interval_minutes: int, fingerprint: str) -> Path:
+        return self.cache_dir / f"{product_id}_{interval_minutes}min_{fingerprint}.parquet"
+
+    def _load_frame(self, product_id: str, interval_minutes: int, fingerprint: str) -> bool:
+        """Load a frame built by an earlier run; returns True on success"""
+        if self.cache_dir is None:
+            return False
+        path = self._path(product_id, interval_minutes, fingerprint)
+        if not path.exists():
+            return False
+        try:
+            self._frames[(product_id, interval_minutes)] = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable timeframe cache file {path}: {e}")
+            return False
+        self.disk_hits += 1
+        return True
+
+    def _save_frame(self, product_id: str, interval_minutes: int, fingerprint: str, frame: pd.DataFrame):
+        if self.cache_dir is None:
+            return
+        try:
+            frame.to_parquet(self._path(product_id, interval_minutes, fingerprint))
+        except Exception as e:
+            logger.warning(f"Could not cache {product_id} {interval_minutes}min frame: {e}")
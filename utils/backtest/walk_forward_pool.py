@@ -0,0 +1,135 @@
+"""
+Walk-Forward Process Pool
+
+Runs the train/test folds of one or many walk-forward analyses (e.g. every
+strategy x product of the monthly stability job) across a process pool.
+
+The read-only OHLCV+indicator frames are published once to the shared data
+plane and every worker attaches to them as zero-copy views, so tasks only
+carry fold bounds and data is never pickled per fold. Fold results are
+reassembled in period order, so the output is identical to the serial run
+regardless of completion order.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .shared_data import SharedDataPlane, resolve_frames, share_frames
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class WalkForwardJob:
+    """One walk-forward analysis: a strategy and parameter grid over one dataset"""
+    data_key: str                  # Key into the datasets dict
+    strategy_name: str
+    param_grid: Dict[str, List]
+    product_id: str
+    train_period_days: int = 180
+    test_period_days: int = 30
+    step_days: int = 30
+
+# Per-process state set by _init_worker()
+_worker_state: Dict[str, Any] = {}
+
+def _init_worker(suite_class: type, suite_settings: Dict[str, Any], datasets: Dict[str, Any]):
+    """Build this worker's backtest suite and attach to the shared datasets"""
+    _worker_state['suite'] = suite_class(**suite_settings)
+    _worker_state['datasets'] = resolve_frames(datasets)
+
+def _run_fold(job: WalkForwardJob, period_id: int, period: Tuple) -> Optional[Dict[str, Any]]:
+    """Process-pool entry point: run one train/test fold"""
+    return _worker_state['suite']._run_walk_forward_period(
+        _worker_state['datasets'][job.data_key], period_id, period,
+        job.strategy_name, job.param_grid, job.product_id
+    )
+
+def _suite_settings(suite) -> Dict[str, Any]:
+    """Constructor arguments that rebuild a backtest suite in a worker process"""
+    settings = {
+        'initial_capital': suite.initial_capital,
+        'fees': suite.fees,
+        'slippage': suite.slippage,
+        'results_dir': str(suite.results_dir)
+    }
+    if getattr(suite, 'result_cache', None) is not None:
+        settings['result_cache'] = suite.result_cache
+    return settings
+
+def run_walk_forward_jobs(suite, datasets: Dict[str, pd.DataFrame], jobs: List[WalkForwardJob],
+                          max_workers: int = 1) -> List[Dict[str, Any]]:
+    """
+    Run walk-forward analyses with fold-level parallelism
+
+    All folds of all jobs are submitted to a single pool, so the wall time is
+    bounded by the slowest fold rather than the sum of all of them.
+
+    Args:
+        suite: ComprehensiveBacktestSuite or StrategyBacktestSuite (used for
+               planning/aggregation; workers build their own copy)
+        datasets: Read-only data frames with indicators, by key
+        jobs: Walk-forward analyses to run
+        max_workers: Worker processes (1 = run folds in this process)
+
+    Returns:
+        One run_walk_forward_analysis()-style result dict per job, in job order
+    """
+    plans = [suite._plan_walk_forward_periods(datasets[job.data_key], job.train_period_days,
+                                              job.test_period_days, job.step_days)
+             for job in jobs]
+    tasks = [(job_id, period_id, period)
+             for job_id, periods in enumerate(plans) if periods
+             for period_id, period in enumerate(periods)]
+
+    logger.info(f"Running {len(tasks)} walk-forward folds for {len(jobs)} analyses with {max_workers} worker(s)")
+
+    fold_results = {}
+
+    def report(done, job_id, period_id):
+        job = jobs[job_id]
+        logger.info(f"Fold {done}/{len(tasks)} complete: {job.strategy_name} on {job.product_id}, "
+                    f"period {period_id + 1}/{len(plans[job_id])}")
+
+    if max_workers > 1 and len(tasks) > 1:
+        used_keys = {jobs[job_id].data_key for job_id, _, _ in tasks}
+        with SharedDataPlane() as plane:
+            shared = share_frames(plane, {key: datasets[key] for key in used_keys})
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks)), initializer=_init_worker,
+                                     initargs=(type(suite), _suite_settings(suite), shared)) as executor:
+                futures = {executor.submit(_run_fold, jobs[job_id], period_id, period): (job_id, period_id)
+                           for job_id, period_id, period in tasks}
+
+                for done, future in enumerate(as_completed(futures), 1):
+                    job_id, period_id = futures[future]
+                    try:
+                        fold_results[(job_id, period_id)] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error in walk-forward period {period_id + 1}: {e}")
+                        fold_results[(job_id, period_id)] = None
+                    report(done, job_id, period_id)
+    else:
+        for done, (job_id, period_id, period) in enumerate(tasks, 1):
+            job = jobs[job_id]
+            fold_results[(job_id, period_id)] = suite._run_walk_forward_period(
+                datasets[job.data_key], period_id, period, job.strategy_name, job.param_grid, job.product_id
+            )
+            report(done, job_id, period_id)
+
+    outputs = []
+    for job_id, job in enumerate(jobs):
+        if plans[job_id] is None:
+            outputs.append({'error': 'Insufficient data for walk-forward analysis'})
+            continue
+
+        results = [fold_results[(job_id, period_id)] for period_id in range(len(plans[job_id]))]
+        outputs.append(suite._finalize_walk_forward(
+            [result for result in results if result is not None],
+            job.strategy_name, job.param_grid, job.product_id,
+            job.train_period_days, job.test_period_days, job.step_days
+        ))
+
+    return outputs
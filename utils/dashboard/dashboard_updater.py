@@ -50,6 +50,7 @@ class DashboardUpdater:
             self._update_logs_data()
             self._update_performance_data(portfolio)  # Add performance data update
             self._update_live_performance_data()  # Add live performance tracking
+            self._update_latency_metrics()  # Per-stage latency histograms
             self._update_html_detailed_analysis()  # Add HTML detailed analysis update
             self._create_individual_latest_files()  # Create individual latest files for dashboard
             self._update_timestamp()
@@ -568,6 +569,20 @@ class DashboardUpdater:
         except Exception as e:
             logger.error(f"Error updating live performance data: {e}")
     
+    def _update_latency_metrics(self) -> None:
+        """Write the per-stage latency snapshot (JSON and Prometheus text) for the dashboard"""
+        try:
+            from utils.monitoring.latency_metrics import registry
+            
+            if not registry.enabled:
+                return
+            
+            paths = registry.export("data/dashboard/latency")
+            logger.info(f"Latency metrics updated for dashboard: {paths['json']}")
+                
+        except Exception as e:
+            logger.error(f"Error updating latency metrics: {e}")
+    
     def get_performance_data_for_period(self, period: str = "30d") -> Dict[str, Any]:
         """
         Get performance data for specific period (for API endpoints)
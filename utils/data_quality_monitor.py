@@ -0,0 +1,525 @@
+"""
+Data Quality Monitor - Validation and Repair of Market Data
+
+Vectorized checks for OHLCV candle frames (gaps, spikes, zero volume, stale or
+duplicate timestamps, OHLC inconsistencies) plus a repair stage that re-fetches
+or forward-fills missing bars. The same checks run incrementally on live
+candles with constant-size state, and every run produces a compact
+DataQualityReport that strategies can gate on.
+"""
+
+import functools
+import inspect
+import logging
+import math
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from enum import IntFlag
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+class DataQualityError(Exception):
+    """Raised when market data fails quality validation"""
+
+    def __init__(self, errors: Dict[str, List[str]]):
+        self.errors = errors
+        super().__init__(f"Data quality validation failed: {errors}")
+
+
+class QualityFlag(IntFlag):
+    """Per-candle quality flags (stored as a uint8 bitmask)"""
+    OK = 0
+    GAP = 1              # One or more bars missing before this candle
+    DUPLICATE = 2        # Same timestamp as the previous candle
+    STALE = 4            # Timestamp older than the previous candle
+    SPIKE = 8            # Close moved more than spike_threshold vs previous close
+    ZERO_VOLUME = 16     # No volume traded
+    OHLC_INVALID = 32    # High/low do not bracket open/close, or non-positive/NaN prices
+    NEGATIVE_VOLUME = 64
+
+
+_FLAG_MEMBERS = [member for member in QualityFlag if member]
+
+
+@dataclass
+class DataQualityReport:
+    """Compact summary of a validation or repair run"""
+    total_rows: int = 0
+    expected_rows: int = 0
+    gaps: int = 0
+    missing_bars: int = 0
+    duplicates: int = 0
+    stale: int = 0
+    spikes: int = 0
+    zero_volume: int = 0
+    ohlc_invalid: int = 0
+    negative_volume: int = 0
+    filled_bars: int = 0
+    refetched_bars: int = 0
+    dropped_rows: int = 0
+    quality_score: float = 100.0
+    passed: bool = True
+    issues: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert report to a JSON-serializable dict"""
+        return asdict(self)
+
+
+def _infer_frequency(index: pd.DatetimeIndex) -> Optional[pd.Timedelta]:
+    """Most common positive spacing between timestamps"""
+    if len(index) < 2:
+        return None
+    diffs = np.diff(index.as_unit('ns').asi8)
+    diffs = diffs[diffs > 0]
+    if len(diffs) == 0:
+        return None
+    values, counts = np.unique(diffs, return_counts=True)
+    return pd.Timedelta(int(values[np.argmax(counts)]), unit='ns')
+
+
+class DataQualityMonitor:
+    """Validate and repair OHLCV candles, in bulk or one live candle at a time"""
+
+    def __init__(self, logger_instance: Optional[logging.Logger] = None,
+                 spike_threshold: float = 0.20, min_quality_score: float = 99.5,
+                 max_data_age_seconds: float = 900):
+        """
+        Initialize the monitor
+
+        Args:
+            logger_instance: Logger to report issues to (defaults to module logger)
+            spike_threshold: Close-to-close move treated as a spike (0.20 = 20%)
+            min_quality_score: Minimum score for a report to pass
+            max_data_age_seconds: Maximum age of a live market data snapshot
+        """
+        self.logger = logger_instance or logger
+        self.spike_threshold = spike_threshold
+        self.min_quality_score = min_quality_score
+        self.max_data_age_seconds = max_data_age_seconds
+        self.warnings: List[str] = []
+        self.reset_live_state()
+
+    # ===== BULK VALIDATION AND REPAIR =====
+
+    def compute_flags(self, df: pd.DataFrame,
+                      expected_freq: Optional[pd.Timedelta] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute per-row quality flags with array operations
+
+        Args:
+            df: OHLCV DataFrame indexed by timestamp, in received order
+            expected_freq: Candle spacing (inferred from the data if omitted)
+
+        Returns:
+            Tuple of (uint8 flag array, int64 array of missing bars before each row)
+        """
+        n = len(df)
+        flags = np.zeros(n, dtype=np.uint8)
+        missing = np.zeros(n, dtype=np.int64)
+        if n == 0:
+            return flags, missing
+
+        index = pd.DatetimeIndex(df.index)
+        freq = expected_freq or _infer_frequency(index)
+
+        ts = index.as_unit('ns').asi8
+        step = np.diff(ts)
+        if freq is not None and len(step):
+            freq_ns = pd.Timedelta(freq).value
+            gap = step > freq_ns * 1.5
+            missing[1:] = np.where(gap, np.rint(step / freq_ns).astype(np.int64) - 1, 0)
+            flags[1:][gap] |= np.uint8(QualityFlag.GAP)
+        flags[1:][step == 0] |= np.uint8(QualityFlag.DUPLICATE)
+        flags[1:][step < 0] |= np.uint8(QualityFlag.STALE)
+
+        o = df['open'].to_numpy(dtype=np.float64)
+        h = df['high'].to_numpy(dtype=np.float64)
+        l = df['low'].to_numpy(dtype=np.float64)
+        c = df['close'].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            bad_prices = ~((o > 0) & (h > 0) & (l > 0) & (c > 0))
+            inconsistent = (h < np.maximum(o, c)) | (l > np.minimum(o, c)) | (h < l)
+        flags[bad_prices | inconsistent] |= np.uint8(QualityFlag.OHLC_INVALID)
+
+        if n > 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = np.abs(c[1:] / c[:-1] - 1.0)
+            flags[1:][change > self.spike_threshold] |= np.uint8(QualityFlag.SPIKE)
+
+        if 'volume' in df.columns:
+            v = df['volume'].to_numpy(dtype=np.float64)
+            flags[v == 0] |= np.uint8(QualityFlag.ZERO_VOLUME)
+            flags[v < 0] |= np.uint8(QualityFlag.NEGATIVE_VOLUME)
+
+        return flags, missing
+
+    def validate_candles(self, df: pd.DataFrame,
+                         expected_freq: Optional[pd.Timedelta] = None) -> DataQualityReport:
+        """
+        Validate a block of candles and summarize the result
+
+        Args:
+            df: OHLCV DataFrame indexed by timestamp
+            expected_freq: Candle spacing (inferred from the data if omitted)
+
+        Returns:
+            DataQualityReport for the block
+        """
+        if df is None or df.empty:
+            return DataQualityReport(passed=False, quality_score=0.0, issues=["Empty DataFrame"])
+
+        flags, missing = self.compute_flags(df, expected_freq)
+        report = self._summarize(flags, missing)
+        self._log_report(report)
+        return report
+
+    def repair_candles(self, df: pd.DataFrame, expected_freq: Optional[pd.Timedelta] = None,
+                       refetch: Optional[Callable[[pd.Timestamp, pd.Timestamp], pd.DataFrame]] = None,
+                       fill_gaps: bool = True) -> Tuple[pd.DataFrame, DataQualityReport]:
+        """
+        Repair a block of candles onto a regular time grid
+
+        Duplicates keep the last received candle, unusable price rows are
+        dropped, high/low are widened to bracket open/close, and missing bars
+        are re-fetched through `refetch(start, end)` when given. Whatever is
+        still missing is forward-filled as flat zero-volume bars unless
+        `fill_gaps` is False. Spikes are only flagged because they may be
+        genuine market moves.
+
+        Args:
+            df: OHLCV DataFrame indexed by timestamp
+            expected_freq: Candle spacing (inferred from the data if omitted)
+            refetch: Optional callback returning candles for [start, end]
+            fill_gaps: Reindex onto the full time grid, forward-filling holes
+
+        Returns:
+            Tuple of (repaired DataFrame, DataQualityReport of the input)
+        """
+        if df is None or df.empty:
+            return df, self.validate_candles(df)
+
+        freq = expected_freq or _infer_frequency(pd.DatetimeIndex(df.index))
+        flags, missing = self.compute_flags(df, freq)
+        report = self._summarize(flags, missing)
+
+        repaired = df.sort_index(kind='stable')
+        repaired = repaired[~repaired.index.duplicated(keep='last')]
+
+        o = repaired['open'].to_numpy(dtype=np.float64)
+        h = repaired['high'].to_numpy(dtype=np.float64)
+        l = repaired['low'].to_numpy(dtype=np.float64)
+        c = repaired['close'].to_numpy(dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            usable = (o > 0) & (h > 0) & (l > 0) & (c > 0)
+        report.dropped_rows = int(len(repaired) - usable.sum())
+        repaired = repaired[usable].copy()
+        repaired['high'] = np.maximum.reduce([repaired['high'], repaired['open'], repaired['close']])
+        repaired['low'] = np.minimum.reduce([repaired['low'], repaired['open'], repaired['close']])
+        if 'volume' in repaired.columns:
+            repaired['volume'] = repaired['volume'].clip(lower=0)
+
+        if freq is None or len(repaired) < 2 or (refetch is None and not fill_gaps):
+            self._log_report(report)
+            return repaired, report
+
+        grid = pd.date_range(repaired.index[0], repaired.index[-1], freq=freq, name=repaired.index.name)
+        holes = grid.difference(repaired.index)
+
+        if refetch is not None and len(holes):
+            fetched = self._refetch_holes(holes, freq, refetch)
+            if fetched is not None and not fetched.empty:
+                fetched = fetched[fetched.index.isin(holes)]
+                fetched = fetched[~fetched.index.duplicated(keep='last')]
+                report.refetched_bars = len(fetched)
+                repaired = pd.concat([repaired, fetched[repaired.columns]]).sort_index()
+
+        if not fill_gaps:
+            self._log_report(report)
+            return repaired, report
+
+        repaired = repaired.reindex(grid)
+        fill_mask = repaired['close'].isna().to_numpy()
+        report.filled_bars = int(fill_mask.sum())
+        if report.filled_bars:
+            close = repaired['close'].ffill()
+            repaired['close'] = close
+            for column in ['open', 'high', 'low']:
+                repaired[column] = repaired[column].fillna(close)
+            if 'volume' in repaired.columns:
+                repaired['volume'] = repaired['volume'].fillna(0.0)
+            repaired = repaired.ffill()
+
+        self._log_report(report)
+        return repaired, report
+
+    def _refetch_holes(self, holes: pd.DatetimeIndex, freq: pd.Timedelta,
+                       refetch: Callable[[pd.Timestamp, pd.Timestamp], pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Call refetch once per contiguous run of missing bars"""
+        ts = holes.as_unit('ns').asi8
+        breaks = np.flatnonzero(np.diff(ts) != pd.Timedelta(freq).value) + 1
+        starts = np.concatenate([[0], breaks])
+        ends = np.concatenate([breaks, [len(ts)]]) - 1
+
+        frames = []
+        for start, end in zip(starts, ends):
+            try:
+                chunk = refetch(holes[start], holes[end])
+                if chunk is not None and not chunk.empty:
+                    frames.append(chunk)
+            except Exception as e:
+                self.logger.warning(f"Re-fetch of {holes[start]} to {holes[end]} failed: {e}")
+
+        return pd.concat(frames) if frames else None
+
+    def _summarize(self, flags: np.ndarray, missing: np.ndarray) -> DataQualityReport:
+        """Build a report from per-row flags"""
+        counts = {flag: int(np.count_nonzero(flags & flag)) for flag in _FLAG_MEMBERS}
+        report = DataQualityReport(
+            total_rows=len(flags),
+            expected_rows=len(flags) + int(missing.sum()),
+            gaps=counts[QualityFlag.GAP],
+            missing_bars=int(missing.sum()),
+            duplicates=counts[QualityFlag.DUPLICATE],
+            stale=counts[QualityFlag.STALE],
+            spikes=counts[QualityFlag.SPIKE],
+            zero_volume=counts[QualityFlag.ZERO_VOLUME],
+            ohlc_invalid=counts[QualityFlag.OHLC_INVALID],
+            negative_volume=counts[QualityFlag.NEGATIVE_VOLUME],
+        )
+        self._score(report, flagged=int(np.count_nonzero(flags & ~np.uint8(QualityFlag.ZERO_VOLUME))))
+        return report
+
+    def _score(self, report: DataQualityReport, flagged: int):
+        """Fill in score, pass/fail and issue strings (zero volume is informational)"""
+        expected = max(report.expected_rows, 1)
+        report.quality_score = round(max(0.0, 100 - (flagged + report.missing_bars) / expected * 100), 2)
+        report.passed = report.quality_score >= self.min_quality_score
+
+        labels = [('gaps', 'time gaps'), ('duplicates', 'duplicate timestamps'),
+                  ('stale', 'out-of-order timestamps'), ('spikes', f'price spikes (>{self.spike_threshold:.0%})'),
+                  ('zero_volume', 'zero-volume candles'), ('ohlc_invalid', 'invalid OHLC rows'),
+                  ('negative_volume', 'negative volume rows')]
+        report.issues = [f"Found {getattr(report, name)} {label}" for name, label in labels if getattr(report, name)]
+
+    def _log_report(self, report: DataQualityReport):
+        if report.issues:
+            self.logger.info(f"Data quality {report.quality_score}%: {'; '.join(report.issues)}")
+
+    # ===== INCREMENTAL LIVE VALIDATION =====
+
+    def reset_live_state(self, expected_freq: Optional[pd.Timedelta] = None):
+        """Reset the constant-size state used by update()"""
+        self._live_freq_ns = pd.Timedelta(expected_freq).value if expected_freq is not None else None
+        self._live_last_ts: Optional[int] = None
+        self._live_last_close: Optional[float] = None
+        self._live_flags = np.zeros(len(_FLAG_MEMBERS), dtype=np.int64)
+        self._live_rows = 0
+        self._live_missing = 0
+
+    def update(self, timestamp, open_: float, high: float, low: float, close: float,
+               volume: float = 0.0) -> QualityFlag:
+        """
+        Check one live candle against the previous one (O(1) time and state)
+
+        Args:
+            timestamp: Candle start time (datetime, Timestamp or epoch seconds)
+            open_, high, low, close, volume: Candle values
+
+        Returns:
+            QualityFlag bitmask for the candle
+        """
+        if isinstance(timestamp, (int, float)):
+            ts = int(timestamp * 1_000_000_000)
+        else:
+            ts = pd.Timestamp(timestamp).value
+
+        flag = QualityFlag.OK
+        if self._live_last_ts is not None:
+            step = ts - self._live_last_ts
+            if step == 0:
+                flag |= QualityFlag.DUPLICATE
+            elif step < 0:
+                flag |= QualityFlag.STALE
+            elif self._live_freq_ns is None:
+                self._live_freq_ns = step
+            elif step > self._live_freq_ns * 1.5:
+                flag |= QualityFlag.GAP
+                self._live_missing += int(round(step / self._live_freq_ns)) - 1
+
+        if not all(self._is_number(x) and x > 0 for x in (open_, high, low, close)) \
+                or high < max(open_, close) or low > min(open_, close):
+            flag |= QualityFlag.OHLC_INVALID
+        elif self._live_last_close and abs(close / self._live_last_close - 1.0) > self.spike_threshold:
+            flag |= QualityFlag.SPIKE
+
+        if volume == 0:
+            flag |= QualityFlag.ZERO_VOLUME
+        elif volume < 0:
+            flag |= QualityFlag.NEGATIVE_VOLUME
+
+        for bit, member in enumerate(_FLAG_MEMBERS):
+            if flag & member:
+                self._live_flags[bit] += 1
+        self._live_rows += 1
+
+        if not flag & (QualityFlag.DUPLICATE | QualityFlag.STALE):
+            self._live_last_ts = ts
+            if not flag & QualityFlag.OHLC_INVALID:
+                self._live_last_close = close
+
+        return flag
+
+    def live_report(self) -> DataQualityReport:
+        """Summarize every candle seen by update() since the last reset"""
+        counts = dict(zip(_FLAG_MEMBERS, self._live_flags.tolist()))
+        report = DataQualityReport(
+            total_rows=self._live_rows,
+            expected_rows=self._live_rows + self._live_missing,
+            gaps=counts[QualityFlag.GAP],
+            missing_bars=self._live_missing,
+            duplicates=counts[QualityFlag.DUPLICATE],
+            stale=counts[QualityFlag.STALE],
+            spikes=counts[QualityFlag.SPIKE],
+            zero_volume=counts[QualityFlag.ZERO_VOLUME],
+            ohlc_invalid=counts[QualityFlag.OHLC_INVALID],
+            negative_volume=counts[QualityFlag.NEGATIVE_VOLUME],
+        )
+        flagged = sum(v for m, v in counts.items() if m != QualityFlag.ZERO_VOLUME)
+        self._score(report, flagged=flagged)
+        return report
+
+    # ===== SNAPSHOT VALIDATION (market data / indicators / portfolio) =====
+
+    def validate_all(self, market_data: Dict[str, Any], technical_indicators: Dict[str, Any],
+                     portfolio: Dict[str, Any]) -> Tuple[bool, Dict[str, List[str]]]:
+        """
+        Validate the inputs of a single trading decision
+
+        Args:
+            market_data: Current market data (price, price_changes, volume, timestamp)
+            technical_indicators: Indicator values for the product
+            portfolio: Portfolio dict keyed by asset
+
+        Returns:
+            Tuple of (is_valid, errors keyed by section); warnings go to self.warnings
+        """
+        self.warnings = []
+        errors: Dict[str, List[str]] = {}
+
+        for section, problems in (('market_data', self._check_market_data(market_data)),
+                                  ('technical_indicators', self._check_indicators(technical_indicators)),
+                                  ('portfolio', self._check_portfolio(portfolio))):
+            if problems:
+                errors[section] = problems
+
+        return not errors, errors
+
+    @staticmethod
+    def _is_number(value: Any) -> bool:
+        return isinstance(value, (int, float, np.number)) and not isinstance(value, bool) and math.isfinite(value)
+
+    def _check_market_data(self, market_data: Dict[str, Any]) -> List[str]:
+        if not isinstance(market_data, dict):
+            return ["market data is not a dict"]
+
+        problems = []
+        price = market_data.get('price')
+        if not self._is_number(price) or price <= 0:
+            problems.append(f"invalid price: {price}")
+
+        for period, change in (market_data.get('price_changes') or {}).items():
+            if not self._is_number(change):
+                problems.append(f"invalid {period} price change: {change}")
+
+        volume = market_data.get('volume')
+        if isinstance(volume, dict):
+            for key, value in volume.items():
+                if not self._is_number(value) or value < 0:
+                    problems.append(f"invalid {key} volume: {value}")
+        elif volume is not None and (not self._is_number(volume) or volume < 0):
+            problems.append(f"invalid volume: {volume}")
+
+        timestamp = market_data.get('timestamp')
+        if timestamp:
+            try:
+                ts = pd.Timestamp(timestamp)
+                if ts.tzinfo is None:
+                    ts = ts.tz_localize(timezone.utc)
+                age = (datetime.now(timezone.utc) - ts.to_pydatetime()).total_seconds()
+                if age > self.max_data_age_seconds:
+                    self.warnings.append(f"market data is {age:.0f}s old")
+            except (ValueError, TypeError):
+                problems.append(f"invalid timestamp: {timestamp}")
+
+        return problems
+
+    def _check_indicators(self, indicators: Dict[str, Any]) -> List[str]:
+        if not isinstance(indicators, dict):
+            return ["technical indicators are not a dict"]
+
+        problems = []
+        rsi = indicators.get('rsi')
+        if rsi is not None and (not self._is_number(rsi) or not 0 <= rsi <= 100):
+            problems.append(f"RSI out of range: {rsi}")
+
+        bands = [indicators.get(k) for k in ('bb_lower', 'bb_middle', 'bb_upper')]
+        if all(b is not None for b in bands):
+            if not all(self._is_number(b) for b in bands):
+                problems.append("non-numeric Bollinger Bands")
+            elif not bands[0] <= bands[1] <= bands[2]:
+                problems.append(f"Bollinger Bands out of order: {bands}")
+
+        macd = indicators.get('macd')
+        if isinstance(macd, dict):
+            if not all(self._is_number(v) for v in macd.values()):
+                problems.append("non-numeric MACD values")
+        elif macd is not None and not self._is_number(macd):
+            problems.append(f"invalid MACD: {macd}")
+
+        return problems
+
+    def _check_portfolio(self, portfolio: Dict[str, Any]) -> List[str]:
+        if not isinstance(portfolio, dict):
+            return ["portfolio is not a dict"]
+
+        problems = []
+        for asset, holding in portfolio.items():
+            if not isinstance(holding, dict):
+                continue
+            amount = holding.get('amount')
+            if amount is not None and (not self._is_number(amount) or amount < 0):
+                problems.append(f"invalid {asset} amount: {amount}")
+        return problems
+
+
+def validate_data_quality(logger_instance: Optional[logging.Logger] = None):
+    """
+    Decorator that validates market_data/technical_indicators/portfolio
+    arguments with DataQualityMonitor.validate_all before calling the function
+
+    Raises:
+        DataQualityError: If validation fails
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            monitor = DataQualityMonitor(logger_instance)
+            is_valid, errors = monitor.validate_all(bound.get('market_data', {}),
+                                                    bound.get('technical_indicators', {}),
+                                                    bound.get('portfolio', {}))
+            if not is_valid:
+                raise DataQualityError(errors)
+            for warning in monitor.warnings:
+                monitor.logger.warning(f"Data quality warning: {warning}")
+            return func(*args, **kwargs)
+
+        return wrapper
+    return decorator
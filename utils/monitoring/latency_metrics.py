@@ -0,0 +1,295 @@
+"""
+Hot-Path Latency Metrics
+Per-stage latency histograms and counters for the trading decision pipeline
+
+Stages are instrumented with the timed() decorator or the measure() context
+manager. Durations are recorded in nanoseconds into log-linear (HDR-style)
+histograms: values below 128ns are exact, larger values fall into one of 64
+sub-buckets per power of two, so every recorded percentile is within ~1.6%
+of the true value and a histogram is a fixed 2.4k-slot list regardless of how
+many samples it holds.
+
+Recording is off unless LATENCY_METRICS_ENABLED is set in the config or the
+environment (or configure(enabled=True) is called); when off the wrappers
+cost one attribute check per call.
+
+Snapshots are exported as JSON (snapshot()) and Prometheus text format
+(to_prometheus()); the dashboard updater writes both next to its other
+data files.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+HIGHEST_TRACKABLE_NS = (1 << 42) - 1  # ~73 minutes; longer stages are clamped
+
+PERCENTILES = (50.0, 90.0, 95.0, 99.0, 99.9)
+METRIC_PREFIX = "trading_stage"
+
+def _bucket_index(value: int) -> int:
+    """Log-linear bucket of a non-negative integer value"""
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    if shift <= 0:
+        return value
+    return shift * SUB_BUCKET_HALF + (value >> shift)
+
+def _bucket_bounds(index: int) -> tuple:
+    """Inclusive (lowest, highest) value that maps to a bucket"""
+    if index < SUB_BUCKET_COUNT:
+        return index, index
+    shift = index // SUB_BUCKET_HALF - 1
+    mantissa = index - shift * SUB_BUCKET_HALF
+    lowest = mantissa << shift
+    return lowest, lowest + (1 << shift) - 1
+
+BUCKET_COUNT = _bucket_index(HIGHEST_TRACKABLE_NS) + 1
+
+# ===== HISTOGRAM =====
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond durations with running count, sum, min and max"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max', 'errors', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, value_ns: int, error: bool = False) -> None:
+        """Record one duration in nanoseconds"""
+        value_ns = min(max(int(value_ns), 0), HIGHEST_TRACKABLE_NS)
+        index = _bucket_index(value_ns)
+        with self._lock:
+            self.counts[index] += 1
+            if self.count == 0 or value_ns < self.min:
+                self.min = value_ns
+            if value_ns > self.max:
+                self.max = value_ns
+            self.count += 1
+            self.total += value_ns
+            if error:
+                self.errors += 1
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add another histogram's samples into this one"""
+        with other._lock:
+            counts = list(other.counts)
+            count, total, low, high, errors = other.count, other.total, other.min, other.max, other.errors
+        if count == 0:
+            return
+        with self._lock:
+            self.counts = [a + b for a, b in zip(self.counts, counts)]
+            self.min = low if self.count == 0 else min(self.min, low)
+            self.max = max(self.max, high)
+            self.count += count
+            self.total += total
+            self.errors += errors
+
+    def percentile(self, percentile: float) -> int:
+        """Value at a percentile (0-100), reported as the top of its bucket and capped at max"""
+        with self._lock:
+            if self.count == 0:
+                return 0
+            rank = max(1, -(-self.count * percentile // 100))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return min(_bucket_bounds(index)[1], self.max)
+            return self.max
+
+    def reset(self) -> None:
+        """Drop all samples"""
+        with self._lock:
+            self.counts = [0] * BUCKET_COUNT
+            self.count = self.total = self.min = self.max = self.errors = 0
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, errors and latency statistics in milliseconds"""
+        count = self.count
+        summary = {
+            'count': count,
+            'errors': self.errors,
+            'sum_ms': self.total / 1e6,
+            'mean_ms': self.total / count / 1e6 if count else 0.0,
+            'min_ms': self.min / 1e6,
+            'max_ms': self.max / 1e6,
+        }
+        for percentile in PERCENTILES:
+            summary[f"p{percentile:g}_ms".replace('.', '_')] = self.percentile(percentile) / 1e6
+        return summary
+
+# ===== REGISTRY =====
+
+class LatencyRegistry:
+    """Named stage histograms shared by the whole process"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started_at = datetime.now()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        """Histogram for a stage, created on first use"""
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, LatencyHistogram())
+        return histogram
+
+    def record(self, stage: str, value_ns: int, error: bool = False) -> None:
+        """Record a stage duration in nanoseconds"""
+        self.histogram(stage).record(value_ns, error)
+
+    def stages(self) -> List[str]:
+        """Names of the stages recorded so far"""
+        return sorted(self._histograms)
+
+    def reset(self) -> None:
+        """Drop every stage"""
+        with self._lock:
+            self._histograms = {}
+            self.started_at = datetime.now()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serialisable summary of every stage"""
+        return {
+            'enabled': self.enabled,
+            'generated_at': datetime.now().isoformat(),
+            'started_at': self.started_at.isoformat(),
+            'unit': 'ms',
+            'stages': {stage: self._histograms[stage].summary() for stage in self.stages()},
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        """Snapshot as a JSON document"""
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = METRIC_PREFIX) -> str:
+        """Every stage in Prometheus text exposition format (seconds)"""
+        latency = f"{prefix}_latency_seconds"
+        lines = [
+            f"# HELP {latency} Latency of trading pipeline stages.",
+            f"# TYPE {latency} summary",
+        ]
+        errors, maxima = [], []
+        for stage in self.stages():
+            histogram = self._histograms[stage]
+            label = 'stage="{}"'.format(stage.replace('\\', '\\\\').replace('"', '\\"'))
+            for percentile in PERCENTILES:
+                lines.append(f'{latency}{{{label},quantile="{percentile / 100:g}"}} '
+                             f'{histogram.percentile(percentile) / 1e9:.9g}')
+            lines.append(f"{latency}_sum{{{label}}} {histogram.total / 1e9:.9g}")
+            lines.append(f"{latency}_count{{{label}}} {histogram.count}")
+            errors.append(f"{prefix}_errors_total{{{label}}} {histogram.errors}")
+            maxima.append(f"{prefix}_latency_max_seconds{{{label}}} {histogram.max / 1e9:.9g}")
+
+        lines += [f"# HELP {prefix}_errors_total Calls of a stage that raised.",
+                  f"# TYPE {prefix}_errors_total counter"] + errors
+        lines += [f"# HELP {prefix}_latency_max_seconds Slowest call of a stage since start.",
+                  f"# TYPE {prefix}_latency_max_seconds gauge"] + maxima
+        return "\n".join(lines) + "\n"
+
+    def export(self, output_dir: str = "data/dashboard/latency") -> Dict[str, str]:
+        """Write latest.json and latest.prom into a directory"""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {'json': os.path.join(output_dir, 'latest.json'),
+                 'prometheus': os.path.join(output_dir, 'latest.prom')}
+        with open(paths['json'], 'w') as f:
+            f.write(self.to_json())
+        with open(paths['prometheus'], 'w') as f:
+            f.write(self.to_prometheus())
+        return paths
+
+def _enabled_from_config() -> bool:
+    """LATENCY_METRICS_ENABLED from the config, falling back to the environment"""
+    value = None
+    try:
+        import config as config_module
+        settings = getattr(config_module, 'config', None) or getattr(config_module, 'Config', None)
+        value = getattr(settings, 'LATENCY_METRICS_ENABLED', None)
+    except Exception as e:
+        logger.debug(f"Config not available for latency metrics: {e}")
+    if value is None:
+        value = os.getenv('LATENCY_METRICS_ENABLED', 'false')
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'on')
+    return bool(value)
+
+registry = LatencyRegistry(enabled=_enabled_from_config())
+
+def configure(enabled: bool) -> LatencyRegistry:
+    """Turn recording on or off at runtime"""
+    registry.enabled = bool(enabled)
+    logger.info(f"Latency metrics {'enabled' if registry.enabled else 'disabled'}")
+    return registry
+
+# ===== INSTRUMENTATION =====
+
+def timed(stage: str) -> Callable:
+    """
+    Decorator recording the latency of every call under a stage name
+
+    Exceptions are counted as errors for the stage and re-raised.
+
+    Args:
+        stage: Stage name, e.g. 'coinbase.place_market_order'
+
+    Returns:
+        Decorator for the function to measure
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            error = False
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                registry.record(stage, time.perf_counter_ns() - start, error)
+        return wrapper
+    return decorator
+
+@contextmanager
+def measure(stage: str) -> Iterator[None]:
+    """
+    Context manager recording the latency of a block under a stage name
+
+    Args:
+        stage: Stage name, e.g. 'strategy.momentum.analyze'
+    """
+    if not registry.enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        registry.record(stage, time.perf_counter_ns() - start, error)
@@ -0,0 +1,235 @@
+"""
+Product Analysis Pipeline
+Analyses every trading pair concurrently and feeds the results to the OpportunityManager
+"""
+
+import asyncio
+import inspect
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.monitoring.latency_metrics import measure
+from utils.trading.api_budget import ApiBudget
+
+
+# ===== Analysis worker process =====
+
+# Per-process state, set once by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(analyze: Callable[[str, Any], Dict]):
+    """Unpickle analyze() once per worker instead of once per product"""
+    _worker_state['analyze'] = analyze
+
+
+def _analyze_in_worker(product_id: str, data: Any) -> Dict:
+    return _worker_state['analyze'](product_id, data)
+
+
+class ProductAnalysisPipeline:
+    """
+    Runs fetch -> analyze for every product concurrently
+
+    Fetching is exchange I/O: coroutine functions are awaited on the event
+    loop and plain functions run on a fetch thread pool, at most
+    max_concurrent_fetches products at a time. Indicators and strategies
+    are CPU-bound, so they run on a process pool where the GIL does not
+    serialise them; one product's analysis overlaps the next product's
+    download and a cycle takes roughly the slowest product instead of the
+    sum of all of them.
+
+    Rate limiting belongs to the exchange client: fetch() functions built on
+    CoinbaseClient already share its thread-safe client.api_budget. Pass
+    that same budget as `budget` only for fetchers that call the exchange
+    some other way, so every request is charged against one limiter.
+
+    With analysis_processes=True, analyze() and its results must be
+    picklable (a module-level function or an object with one, e.g. building
+    its StrategyManager per process). Use analysis_processes=False for
+    analyzers that cannot be pickled or are dominated by I/O (LLM calls);
+    they then run on threads and must not share mutable per-product state.
+
+    Nothing in this tree drives a trading cycle through the pipeline yet:
+    the Coinbase cycle driver that owned the OpportunityManager is not part
+    of the repository, so callers supply fetch() and analyze() and call
+    run_cycle() themselves.
+    """
+
+    def __init__(self,
+                 fetch: Callable[[str], Any],
+                 analyze: Callable[[str, Any], Dict],
+                 budget: Optional[ApiBudget] = None,
+                 requests_per_product: int = 4,
+                 max_concurrent_fetches: int = 8,
+                 analysis_workers: int = 4,
+                 analysis_processes: bool = True,
+                 cycle_timeout: Optional[float] = None):
+        """
+        Args:
+            fetch: fetch(product_id) -> data; market data, candles, etc. (sync or async)
+            analyze: analyze(product_id, data) -> analysis dict as expected by
+                OpportunityManager.rank_trading_opportunities
+            budget: Exchange client's shared API budget, for fetchers that bypass
+                the client's own rate limiting (None = the client limits itself)
+            requests_per_product: API requests one fetch() makes, charged to budget
+            max_concurrent_fetches: Products downloading at the same time
+            analysis_workers: Workers computing indicators and strategies
+            analysis_processes: Run analyze() in worker processes (False = threads)
+            cycle_timeout: Seconds after which unfinished products are left out
+        """
+        self.fetch = fetch
+        self.analyze = analyze
+        self.budget = budget
+        self.requests_per_product = requests_per_product
+        self.max_concurrent_fetches = max(1, max_concurrent_fetches)
+        self.cycle_timeout = cycle_timeout
+        self.logger = logging.getLogger("supervisor")
+
+        self._fetch_pool = ThreadPoolExecutor(max_workers=self.max_concurrent_fetches,
+                                              thread_name_prefix="fetch")
+        self.analysis_processes = analysis_processes
+        if analysis_processes:
+            # spawn: the fetch threads are already running when the pool starts
+            # its workers, and forking a threaded process can deadlock the child
+            self._analysis_pool = ProcessPoolExecutor(max_workers=max(1, analysis_workers),
+                                                      mp_context=multiprocessing.get_context("spawn"),
+                                                      initializer=_init_worker, initargs=(analyze,))
+        else:
+            self._analysis_pool = ThreadPoolExecutor(max_workers=max(1, analysis_workers),
+                                                     thread_name_prefix="analysis")
+
+        # Outcome of the last cycle
+        self.last_errors: Dict[str, str] = {}
+        self.last_timed_out: List[str] = []
+        self.last_duration = 0.0
+
+    def close(self):
+        """Stop the worker pools"""
+        self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._analysis_pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ===== Per product =====
+
+    def _acquire_budget(self) -> float:
+        return self.budget.acquire(self.requests_per_product) if self.budget else 0.0
+
+    def _fetch_sync(self, product_id: str) -> Any:
+        self._acquire_budget()
+        with measure("analysis_pipeline.fetch"):
+            return self.fetch(product_id)
+
+    async def _run_product(self, product_id: str, semaphore: asyncio.Semaphore) -> Tuple[str, Optional[Dict], Optional[str]]:
+        loop = asyncio.get_running_loop()
+        try:
+            async with semaphore:
+                if inspect.iscoroutinefunction(self.fetch):
+                    await loop.run_in_executor(self._fetch_pool, self._acquire_budget)
+                    with measure("analysis_pipeline.fetch"):
+                        data = await self.fetch(product_id)
+                else:
+                    data = await loop.run_in_executor(self._fetch_pool, self._fetch_sync, product_id)
+
+            analyze = _analyze_in_worker if self.analysis_processes else self.analyze
+            # Timed here: metrics recorded inside a worker process never reach this one
+            with measure("analysis_pipeline.analyze"):
+                analysis = await loop.run_in_executor(self._analysis_pool, analyze, product_id, data)
+            return product_id, analysis, None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return product_id, None, str(e)
+
+    # ===== Cycle =====
+
+    async def run_async(self,
+                        product_ids: List[str],
+                        on_result: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Dict]:
+        """
+        Analyse all products, handing each result to on_result as soon as it completes
+
+        Args:
+            product_ids: Trading pairs to analyse
+            on_result: Optional on_result(product_id, analysis) callback
+
+        Returns:
+            Dict of {product_id: analysis} for the products that finished in time
+        """
+        start = time.monotonic()
+        self.last_errors = {}
+        self.last_timed_out = []
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        tasks = {asyncio.ensure_future(self._run_product(product_id, semaphore)): product_id
+                 for product_id in product_ids}
+        analyses: Dict[str, Dict] = {}
+
+        try:
+            for next_done in asyncio.as_completed(list(tasks), timeout=self.cycle_timeout):
+                product_id, analysis, error = await next_done
+                if error is not None:
+                    self.last_errors[product_id] = error
+                    self.logger.error(f"Analysis failed for {product_id}: {error}")
+                    continue
+
+                analyses[product_id] = analysis
+                if on_result:
+                    on_result(product_id, analysis)
+        except asyncio.TimeoutError:
+            self.last_timed_out = [product_id for task, product_id in tasks.items() if not task.done()]
+            self.logger.warning(f"⏱️ Analysis cycle timeout ({self.cycle_timeout}s): "
+                                f"continuing without {', '.join(self.last_timed_out)}")
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        self.last_duration = time.monotonic() - start
+        budget_wait = f" (API budget wait: {self.budget.waited:.1f}s total)" if self.budget else ""
+        self.logger.info(f"🔎 Analysed {len(analyses)}/{len(product_ids)} products in "
+                         f"{self.last_duration:.1f}s{budget_wait}")
+        return analyses
+
+    def run(self,
+            product_ids: List[str],
+            on_result: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Dict]:
+        """Blocking version of run_async(); use run_async() from inside an event loop"""
+        return asyncio.run(self.run_async(product_ids, on_result))
+
+    def run_cycle(self,
+                  product_ids: List[str],
+                  opportunity_manager,
+                  available_eur: float,
+                  portfolio: Dict = None,
+                  on_result: Optional[Callable[[str, Dict], None]] = None) -> Tuple[List[Dict], Dict[str, float]]:
+        """
+        Analyse all products and rank/allocate the ones that completed
+
+        Each analysis is scored by the OpportunityManager as soon as it
+        completes. Only ordering and capital allocation wait for the whole
+        cycle: allocate_trading_capital() splits available_eur across every
+        actionable opportunity, so allocating before the slowest product is
+        in would hand out capital that a stronger late opportunity should get.
+
+        Returns:
+            (ranked_opportunities, capital_allocations)
+        """
+        opportunities = []
+
+        def score(product_id: str, analysis: Dict):
+            opportunities.append(opportunity_manager.score_opportunity(product_id, analysis))
+            if on_result:
+                on_result(product_id, analysis)
+
+        self.run(product_ids, score)
+        ranked = opportunity_manager.order_opportunities(opportunities)
+        allocations = opportunity_manager.allocate_trading_capital(ranked, available_eur, portfolio)
+        return ranked, allocations
@@ -0,0 +1,49 @@
+"""
+API Budget
+Thread-safe token bucket shared by every caller of one exchange client
+"""
+
+import threading
+import time
+
+
+class ApiBudget:
+    """
+    Token bucket shared by every thread that calls the exchange API
+
+    Callers reserve their requests under a lock and then sleep outside it,
+    so concurrent products are served in arrival order and never exceed
+    the average rate.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10):
+        """
+        Args:
+            rate: Requests per second allowed on average
+            burst: Requests that may be sent back to back
+        """
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.waited = 0.0  # Total seconds callers spent waiting for budget
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cost: int = 1) -> float:
+        """
+        Block until `cost` requests fit in the budget
+
+        Returns:
+            Seconds waited
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= cost
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
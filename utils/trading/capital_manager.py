@@ -6,6 +6,7 @@ Prevents "all money in one coin" problem by managing trading reserves and positi
 import logging
 from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from utils.monitoring.latency_metrics import timed
 
 class CapitalManager:
     """
@@ -44,6 +45,7 @@ class CapitalManager:
         self.logger.info(f"  Max EUR usage per trade: {self.max_eur_usage_per_trade*100:.1f}%")
         self.logger.info(f"  Target EUR allocation: {self.target_eur_allocation*100:.1f}%")
     
+    @timed('capital_manager.calculate_safe_trade_size')
     def calculate_safe_trade_size(self, action: str, asset: str, portfolio: Dict, 
                                  original_trade_size: float) -> Tuple[float, str]:
         """
@@ -216,6 +218,7 @@ class CapitalManager:
         
         return None
     
+    @timed('capital_manager.check_trading_limits')
     def _check_trading_limits(self, asset: str, trade_size: float, total_value: float) -> bool:
         """Check if trade is within daily limits"""
         
@@ -43,42 +43,67 @@ class OpportunityManager:
         Returns:
             List of opportunities ranked by strength (highest first)
         """
-        opportunities = []
+        opportunities = [self.score_opportunity(product_id, analysis)
+                         for product_id, analysis in trading_analyses.items()]
+        return self.order_opportunities(opportunities)
+    
+    def score_opportunity(self, product_id: str, analysis: Dict) -> Dict:
+        """
+        Score one coin's analysis
         
-        for product_id, analysis in trading_analyses.items():
-            try:
-                # Calculate opportunity score
-                opportunity_score = self._calculate_opportunity_score(analysis, product_id)
-                
-                opportunities.append({
-                    'product_id': product_id,
-                    'analysis': analysis,
-                    'opportunity_score': opportunity_score,
-                    'action': analysis.get('action', 'HOLD'),
-                    'confidence': analysis.get('confidence', 0),
-                    'reasoning': analysis.get('reasoning', ''),
-                    'market_data': analysis.get('market_data', {}),
-                    'strategy_details': analysis.get('strategy_details', {})
-                })
-                
-                self.logger.debug(f"🎯 {product_id}: {analysis.get('action', 'HOLD')} "
-                                f"(confidence: {analysis.get('confidence', 0):.1f}%, "
-                                f"opportunity: {opportunity_score:.1f})")
-                
-            except Exception as e:
-                self.logger.error(f"Error calculating opportunity score for {product_id}: {e}")
-                # Add with minimal score to avoid breaking the flow
-                opportunities.append({
-                    'product_id': product_id,
-                    'analysis': analysis,
-                    'opportunity_score': 0,
-                    'action': 'HOLD',
-                    'confidence': 0,
-                    'reasoning': f'Scoring error: {str(e)}',
-                    'market_data': {},
-                    'strategy_details': {}
-                })
+        Scores depend only on that coin's analysis, so coins can be scored
+        as their analyses complete and ordered once all are in.
+        
+        Args:
+            product_id: Trading pair
+            analysis: Analysis result for the pair
+            
+        Returns:
+            Opportunity dict as listed by rank_trading_opportunities
+        """
+        try:
+            # Calculate opportunity score
+            opportunity_score = self._calculate_opportunity_score(analysis, product_id)
+            
+            self.logger.debug(f"🎯 {product_id}: {analysis.get('action', 'HOLD')} "
+                            f"(confidence: {analysis.get('confidence', 0):.1f}%, "
+                            f"opportunity: {opportunity_score:.1f})")
+            
+            return {
+                'product_id': product_id,
+                'analysis': analysis,
+                'opportunity_score': opportunity_score,
+                'action': analysis.get('action', 'HOLD'),
+                'confidence': analysis.get('confidence', 0),
+                'reasoning': analysis.get('reasoning', ''),
+                'market_data': analysis.get('market_data', {}),
+                'strategy_details': analysis.get('strategy_details', {})
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error calculating opportunity score for {product_id}: {e}")
+            # Add with minimal score to avoid breaking the flow
+            return {
+                'product_id': product_id,
+                'analysis': analysis,
+                'opportunity_score': 0,
+                'action': 'HOLD',
+                'confidence': 0,
+                'reasoning': f'Scoring error: {str(e)}',
+                'market_data': {},
+                'strategy_details': {}
+            }
+    
+    def order_opportunities(self, opportunities: List[Dict]) -> List[Dict]:
+        """
+        Sort scored opportunities by strength (highest first) and log the ranking
         
+        Args:
+            opportunities: Opportunity dicts from score_opportunity
+            
+        Returns:
+            List of opportunities ranked by strength (highest first)
+        """
         # Sort by opportunity score (highest first)
         ranked_opportunities = sorted(opportunities, 
                                     key=lambda x: x['opportunity_score'], 